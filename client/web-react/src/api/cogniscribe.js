@@ -2,6 +2,8 @@ const API_BASE_URL = import.meta.env.VITE_API_URL ?? 'http://localhost:8080'
 const API_KEY = import.meta.env.VITE_API_KEY || ''
 const DEFAULT_POLL_INTERVAL_MS = 1500
 const DEFAULT_POLL_TIMEOUT_MS = 10 * 60 * 1000
+// Seconds the server holds each status request open until the task changes
+const LONG_POLL_WAIT_S = 30
 
 function buildHeaders(extraHeaders = {}) {
   const headers = { ...extraHeaders }
@@ -111,27 +113,52 @@ async function pollTask(taskId, options = {}) {
   const timeoutMs = options.timeoutMs || DEFAULT_POLL_TIMEOUT_MS
   const startedAt = Date.now()
 
-  while (true) {
-    const status = await fetchJson(`${API_BASE_URL}/api/pipeline/${taskId}`)
-
-    if (status.status === 'completed' && status.result) {
-      return status.result
-    }
+  // Segment timings are not displayed, so they are not downloaded
+  const params = new URLSearchParams({ wait: LONG_POLL_WAIT_S, exclude: 'result.transcript.segments' })
+  let etag = null
 
-    if (status.status === 'failed') {
-      const message = status.error || 'Processing failed'
-      throw new Error(message)
-    }
+  while (true) {
+    const requestedAt = Date.now()
+    // With the last ETag the server holds the request until the task changes,
+    // and answers 304 without a body if it has not
+    const response = await fetch(`${API_BASE_URL}/api/pipeline/${taskId}?${params}`, {
+      headers: buildHeaders(etag ? { 'If-None-Match': etag } : {}),
+    })
 
-    if (status.status === 'cancelled') {
-      throw new Error('Processing cancelled')
+    if (response.status !== 304) {
+      if (!response.ok) {
+        throw new Error(await parseErrorMessage(response))
+      }
+      etag = response.headers.get('ETag')
+      const status = await response.json()
+
+      if (options.onProgress && status.progress) {
+        options.onProgress(status.progress)
+      }
+
+      if (status.status === 'completed' && status.result) {
+        return status.result
+      }
+
+      if (status.status === 'failed') {
+        const message = status.error || 'Processing failed'
+        throw new Error(message)
+      }
+
+      if (status.status === 'cancelled') {
+        throw new Error('Processing cancelled')
+      }
     }
 
     if (Date.now() - startedAt > timeoutMs) {
       throw new Error('Processing timed out. Please try again.')
     }
 
-    await sleep(intervalMs)
+    // Long polls return as soon as the task changes; only wait between
+    // requests if the server answered immediately without waiting
+    if (Date.now() - requestedAt < intervalMs) {
+      await sleep(intervalMs)
+    }
   }
 }
 
@@ -161,6 +188,7 @@ export async function uploadAudio(file, ratio = 0.15, subject = '', options = {}
     return await pollTask(response.task_id, {
       intervalMs: options.pollIntervalMs,
       timeoutMs: options.pollTimeoutMs,
+      onProgress: options.onProgress,
     })
   }
 
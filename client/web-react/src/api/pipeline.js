@@ -4,3 +4,41 @@ export async function runPipeline(file) {
   const r = await fetch("/api/pipeline", { method:"POST", body:fd })
   return r.json()
 }
+
+// Follow a task's progress pushed from /api/pipeline/{taskId}/events.
+// Resolves once the task completes (fetch /api/pipeline/{taskId} for the
+// result); rejects if it fails or is cancelled. onEvent receives (event, data) for every update.
+export function watchPipeline(taskId, onEvent = () => {}) {
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`/api/pipeline/${taskId}/events`)
+    const listen = (event, handler) =>
+      source.addEventListener(event, (e) => {
+        // Connection errors also dispatch "error", without data
+        if (e.data === undefined) {
+          return
+        }
+        const data = JSON.parse(e.data)
+        onEvent(event, data)
+        if (handler) {
+          source.close()
+          handler(data)
+        }
+      })
+
+    listen("snapshot")
+    listen("progress")
+    listen("token")
+    listen("section")
+    listen("summary_reset")
+    listen("complete", resolve)
+    listen("error", (data) => reject(new Error(data.error || "Processing failed")))
+    listen("cancelled", () => reject(new Error("Processing cancelled")))
+    source.onerror = () => {
+      // EventSource reconnects on its own after network errors; give up
+      // only once the stream has been closed for good
+      if (source.readyState === EventSource.CLOSED) {
+        reject(new Error("Lost connection to the server"))
+      }
+    }
+  })
+}
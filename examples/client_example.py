@@ -13,11 +13,15 @@ Usage:
 import argparse
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
 import requests
 
+# Seconds the server may hold each status request open waiting for progress
+LONG_POLL_WAIT = 30
+
 
 class CogniScribeClient:
     """Simple client for CogniScribe API."""
@@ -62,7 +66,43 @@ class CogniScribeClient:
             )
         
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        
+        # Large uploads are processed in the background
+        if result.get("task_id") and result.get("status") == "processing":
+            return self.wait_for_result(result["task_id"])
+        return result
+    
+    def wait_for_result(self, task_id: str, timeout: float = 3600) -> dict:
+        """
+        Wait for a background task to finish and return its result.
+        
+        Uses long polling: each request is held by the server until the
+        task's progress changes (up to LONG_POLL_WAIT seconds), so progress
+        is printed as it happens without polling on a timer.
+        """
+        deadline = time.monotonic() + timeout
+        last_progress = None
+        while time.monotonic() < deadline:
+            response = requests.get(
+                f"{self.api_url}/pipeline/{task_id}",
+                params={"wait": LONG_POLL_WAIT},
+                timeout=LONG_POLL_WAIT + 30
+            )
+            response.raise_for_status()
+            status = response.json()
+            
+            progress = status["progress"]
+            if progress != last_progress:
+                print(f"   [{progress['percent']:3d}%] {progress['message']}")
+                last_progress = progress
+            
+            if status["status"] == "completed":
+                return status["result"]
+            if status["status"] in ("failed", "cancelled"):
+                return {"success": False, "message": status.get("error") or f"Task {status['status']}"}
+        
+        raise TimeoutError(f"Task {task_id} did not finish within {timeout} seconds")
 
 
 def save_results(result: dict, output_dir: Path):
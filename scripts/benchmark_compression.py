@@ -0,0 +1,145 @@
+"""Benchmark extractive transcript compression: kept ratio vs. content retained.
+
+For each keep ratio the transcript is compressed and compared with the
+original:
+
+* ``terms``: share of the 50 highest TF-IDF terms of the full transcript
+  still present (are the key concepts kept?)
+* ``recall``: share of distinct content words still present (ROUGE-1
+  recall over non-stopwords)
+* ``ms``: compression time
+
+With ``--ollama``, the full and compressed transcripts are also summarized
+and the report adds Ollama's prompt-eval time and the ROUGE-1 F1 overlap
+between the two summaries.
+
+Usage:
+    python scripts/benchmark_compression.py --transcript result.json
+    python scripts/benchmark_compression.py --ollama --ratios 0.4 0.6
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.services import summarizer
+from src.api.services.token_budget import count_tokens
+from src.api.services.transcript_compression import (
+    _STOPWORDS,
+    _WORD_RE,
+    _split_sentences,
+    _tfidf_matrix,
+    compress_segments,
+)
+from src.utils.settings import OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE
+
+SAMPLE = [
+    "Um, good morning everyone, so today we're going to talk about heart failure.",
+    "Heart failure is a syndrome where the heart cannot pump enough blood to meet the body's needs.",
+    "Uh, it can be caused by, you know, ischemic heart disease, hypertension or valvular disease.",
+    "Left-sided failure causes pulmonary congestion, so patients present with dyspnea and orthopnea.",
+    "Right-sided failure causes peripheral edema, hepatomegaly and jugular venous distension.",
+    "So again, left-sided failure backs blood up into the lungs and causes dyspnea.",
+    "The ejection fraction separates reduced ejection fraction from preserved ejection fraction.",
+    "Okay, can everyone see the slide? Okay, good.",
+    "First-line therapy for reduced ejection fraction includes ACE inhibitors and beta blockers.",
+    "Loop diuretics such as furosemide relieve congestion but do not improve survival.",
+    "Nurses monitor daily weights, and a gain of two kilograms in three days should be reported.",
+    "Um, so, daily weights, really important, make sure you remember daily weights.",
+    "Digoxin has a narrow therapeutic range, so check potassium because hypokalemia increases toxicity.",
+    "Alright, we'll take a quick break and come back in ten minutes.",
+]
+
+
+def load_segments(path: str) -> list:
+    """Segment texts from a pipeline result or transcription JSON file."""
+    with open(path) as f:
+        data = json.load(f)
+    transcript = data.get("transcript", data)
+    return [segment["text"] for segment in transcript["segments"]]
+
+
+def content_words(text: str) -> set:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def key_terms(segments: list, count: int = 50) -> set:
+    """Highest-weighted TF-IDF terms across the transcript."""
+    matrix, vocabulary = _tfidf_matrix(_split_sentences(segments))
+    top = np.argsort(-matrix.sum(axis=0))[:count]
+    return {vocabulary[i] for i in top}
+
+
+def rouge1_f1(reference: str, candidate: str) -> float:
+    ref, cand = content_words(reference), content_words(candidate)
+    if not ref or not cand:
+        return 0.0
+    overlap = len(ref & cand)
+    precision, recall = overlap / len(cand), overlap / len(ref)
+    return 2 * precision * recall / (precision + recall) if overlap else 0.0
+
+
+def summarize(client: httpx.Client, text: str) -> tuple:
+    """Summary text and prompt-eval milliseconds from Ollama."""
+    payload = summarizer._build_payload(
+        summarizer.SUMMARY_SYSTEM_PROMPT,
+        summarizer._build_user_prompt(text, None, label="Transcript"),
+        summarizer._summary_predict(count_tokens(text), 0.15),
+        stream=False,
+    )
+    payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+    result = client.post("/api/generate", json=payload).json()
+    return result.get("response", ""), result.get("prompt_eval_duration", 0) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript compression benchmark")
+    parser.add_argument("--transcript", help="Pipeline result or transcript JSON (default: built-in sample)")
+    parser.add_argument("--ratios", type=float, nargs="+", default=[0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0])
+    parser.add_argument("--ollama", action="store_true", help="Also compare summaries from Ollama")
+    parser.add_argument("--host", default=OLLAMA_BASE_URL, help="Ollama base URL")
+    args = parser.parse_args()
+    logging.getLogger("src.api.services.transcript_compression").setLevel(logging.WARNING)
+
+    segments = load_segments(args.transcript) if args.transcript else SAMPLE
+    full_text = " ".join(segments)
+    original = count_tokens(full_text)
+    terms = key_terms(segments)
+    words = content_words(full_text)
+    print(f"{len(segments)} segments, {original} tokens, {len(terms)} key terms")
+
+    client = httpx.Client(base_url=args.host, timeout=900) if args.ollama else None
+    if client:
+        reference, reference_ms = summarize(client, full_text)
+        print(f"full transcript: prompt eval {reference_ms:.0f}ms")
+
+    print(f"{'ratio':>6} {'kept':>6} {'terms':>6} {'recall':>7} {'ms':>7}" + ("  eval_ms  rouge1" if client else ""))
+    for ratio in args.ratios:
+        started = time.perf_counter()
+        kept, stats = compress_segments(segments, max(1, int(original * ratio)))
+        elapsed = (time.perf_counter() - started) * 1000
+        text = " ".join(kept)
+        kept_words = content_words(text)
+        line = (
+            f"{ratio:>6.2f} {stats['ratio']:>6.2f} {len(terms & kept_words) / len(terms):>6.2f} "
+            f"{len(words & kept_words) / len(words):>7.2f} {elapsed:>7.1f}"
+        )
+        if client:
+            summary, eval_ms = summarize(client, text)
+            line += f"  {eval_ms:>7.0f}  {rouge1_f1(reference, summary):>6.2f}"
+        print(line)
+
+    if client:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
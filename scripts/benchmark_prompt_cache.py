@@ -0,0 +1,127 @@
+"""Benchmark Ollama prompt evaluation with and without a cached prompt prefix.
+
+Sends the same set of transcripts twice against a running Ollama instance:
+
+* ``inline``: the previous layout, a single prompt made of the instructions,
+  the subject sentence appended to them, then the transcript.
+* ``system``: the current layout, with the instructions in a fixed system
+  prompt followed by the variable content.
+
+Each request generates only a few tokens, so the reported prompt-eval time
+dominates. Ollama reports ``prompt_eval_count`` as the number of tokens it
+actually evaluated, so a reused prefix shows up as a lower count.
+
+Before sending anything, the tokens each request shares with the previous
+one (the most Ollama's prompt cache can reuse) are counted locally; with
+``--offline`` only that count is reported.
+
+Usage:
+    python scripts/benchmark_prompt_cache.py --host http://localhost:11434 --runs 8
+    python scripts/benchmark_prompt_cache.py --offline
+"""
+import argparse
+import os
+import statistics
+import sys
+
+import httpx
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.services.summarizer import SUMMARY_SYSTEM_PROMPT, _build_options, _build_user_prompt
+from src.api.services.token_budget import count_tokens
+from src.utils.settings import OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, OLLAMA_MODEL
+
+SUBJECTS = ["anatomy", "pharmacology", "physiology", "pathology"]
+TOPICS = ["cardiac output", "renal clearance", "beta blockers", "inflammation", "wound healing", "sepsis"]
+
+
+def sample_transcript(index: int, words: int) -> str:
+    """A distinct transcript per run so only the instructions can be reused."""
+    topic = TOPICS[index % len(TOPICS)]
+    sentence = f"Lecture {index} continues the discussion of {topic} and its clinical relevance for nurses."
+    repeats = max(1, words // len(sentence.split()))
+    return " ".join([sentence] * repeats)
+
+
+def inline_payload(transcript: str, subject: str, index: int) -> dict:
+    """Request as the summarizer built it before the system prompt was split out."""
+    prompt = f"{SUMMARY_SYSTEM_PROMPT} Focus on {subject} content.\n\nTranscript:\n{transcript}\n"
+    return {"model": OLLAMA_MODEL, "prompt": prompt}
+
+
+def system_payload(transcript: str, subject: str, index: int) -> dict:
+    """Request as sent by the summarizer: fixed system prompt, variable user prompt."""
+    return {
+        "model": OLLAMA_MODEL,
+        "system": SUMMARY_SYSTEM_PROMPT,
+        "prompt": _build_user_prompt(transcript, subject, label="Transcript"),
+    }
+
+
+def rendered(payload: dict) -> str:
+    """Text the model sees, ignoring the chat template's fixed markers."""
+    if "system" in payload:
+        return f"{payload['system']}\n\n{payload['prompt']}"
+    return payload["prompt"]
+
+
+def shared_prefix_tokens(build, runs: int, words: int) -> list:
+    """Tokens each request shares with the one before it."""
+    texts = [
+        rendered(build(sample_transcript(index, words), SUBJECTS[index % len(SUBJECTS)], index))
+        for index in range(runs)
+    ]
+    return [count_tokens(os.path.commonprefix([previous, text])) for previous, text in zip(texts, texts[1:])]
+
+
+def run(client: httpx.Client, build, runs: int, words: int) -> tuple:
+    counts, durations = [], []
+    for index in range(runs):
+        payload = build(sample_transcript(index, words), SUBJECTS[index % len(SUBJECTS)], index)
+        payload.update(stream=False, keep_alive=OLLAMA_KEEP_ALIVE, options=_build_options(num_predict=4))
+        result = client.post("/api/generate", json=payload).json()
+        counts.append(result.get("prompt_eval_count", 0))
+        durations.append(result.get("prompt_eval_duration", 0) / 1e6)
+    return counts, durations
+
+
+def report(name: str, counts: list, durations: list) -> None:
+    # The first request of each layout pays for the cold prefix
+    warm = durations[1:] or durations
+    print(
+        f"{name:>7}: first {durations[0]:8.1f}ms  "
+        f"warm mean {statistics.mean(warm):8.1f}ms  "
+        f"tokens evaluated (warm mean) {statistics.mean(counts[1:] or counts):7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama prompt-cache benchmark")
+    parser.add_argument("--host", default=OLLAMA_BASE_URL, help="Ollama base URL")
+    parser.add_argument("--runs", type=int, default=8, help="Requests per layout")
+    parser.add_argument("--words", type=int, default=300, help="Words per transcript")
+    parser.add_argument("--offline", action="store_true", help="Only count shared prefix tokens")
+    args = parser.parse_args()
+
+    print(f"{args.runs} runs of {args.words} words")
+    for name, build in (("inline", inline_payload), ("system", system_payload)):
+        shared = shared_prefix_tokens(build, args.runs, args.words)
+        print(f"{name:>7}: prefix shared with previous request {statistics.mean(shared):7.1f} tokens")
+    if args.offline:
+        return
+
+    with httpx.Client(base_url=args.host, timeout=600) as client:
+        # Load the model with the same options so neither layout pays for loading
+        client.post(
+            "/api/generate",
+            json={"model": OLLAMA_MODEL, "keep_alive": OLLAMA_KEEP_ALIVE, "options": _build_options(1)},
+        ).raise_for_status()
+        print(f"Model {OLLAMA_MODEL} at {args.host}")
+        report("inline", *run(client, inline_payload, args.runs, args.words))
+        report("system", *run(client, system_payload, args.runs, args.words))
+
+
+if __name__ == "__main__":
+    main()
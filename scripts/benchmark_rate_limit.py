@@ -0,0 +1,128 @@
+"""Benchmark the in-memory rate limiter with many distinct clients.
+
+Compares the previous fallback, a list of request timestamps per client
+rebuilt on every check and swept by a periodic cleanup, with
+MemoryRateLimiter, which keeps one GCRA timestamp per client in an LRU
+and evicts idle clients as it goes. For each it reports:
+
+* time per check while ``--clients`` distinct clients each send
+  ``--requests`` requests, interleaved;
+* time per check for one client at its limit (the rejection path);
+* memory held once every client has been seen (tracemalloc);
+* time for the periodic cleanup sweep once every client is idle.
+
+Usage:
+    python scripts/benchmark_rate_limit.py
+    python scripts/benchmark_rate_limit.py --clients 100000 --requests 5 --limit 10 --window 60
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.middleware.rate_limit import MemoryRateLimiter
+
+
+class LegacyRateLimiter:
+    """The previous fallback: request timestamps per client."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.store = {}
+
+    def check(self, client_id: str, now: float) -> tuple:
+        window_start = now - self.window
+        if client_id not in self.store:
+            self.store[client_id] = []
+        requests = self.store[client_id]
+        requests[:] = [req_time for req_time in requests if req_time > window_start]
+        request_count = len(requests)
+        remaining = max(0, self.limit - request_count)
+        if request_count >= self.limit:
+            oldest_request = min(requests) if requests else now
+            return False, 0, int(oldest_request + self.window - now) + 1
+        requests.append(now)
+        return True, remaining - 1, 0
+
+    def evict(self, now: float) -> int:
+        window_start = now - self.window
+        cleaned = 0
+        for client_id in list(self.store.keys()):
+            requests = self.store[client_id]
+            original_count = len(requests)
+            requests[:] = [req_time for req_time in requests if req_time > window_start]
+            cleaned += original_count - len(requests)
+            if not requests:
+                del self.store[client_id]
+        return cleaned
+
+
+def fill(limiter, client_ids: list, requests: int, now: float) -> None:
+    for _ in range(requests):
+        for client_id in client_ids:
+            limiter.check(client_id, now)
+
+
+def measure(make_limiter, client_ids: list, requests: int, limit: int, window: float) -> dict:
+    now = 1000.0
+    # Memory in a separate pass, since tracing allocations slows them down
+    gc.collect()
+    tracemalloc.start()
+    limiter = make_limiter()
+    fill(limiter, client_ids, requests, now)
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del limiter
+
+    gc.collect()
+    limiter = make_limiter()
+    started = time.perf_counter()
+    fill(limiter, client_ids, requests, now)
+    spread_us = (time.perf_counter() - started) * 1e6 / (requests * len(client_ids))
+
+    hot = [limiter.check("hot", now) for _ in range(limit)]
+    assert all(allowed for allowed, _, _ in hot)
+    checks = 100000
+    started = time.perf_counter()
+    for _ in range(checks):
+        limiter.check("hot", now)
+    rejected_us = (time.perf_counter() - started) * 1e6 / checks
+
+    started = time.perf_counter()
+    limiter.evict(now + window + 1)
+    cleanup_ms = (time.perf_counter() - started) * 1000
+    return {"check_us": spread_us, "rejected_us": rejected_us, "memory_mb": memory_mb, "cleanup_ms": cleanup_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory rate limiter benchmark")
+    parser.add_argument("--clients", type=int, default=100000, help="Distinct clients")
+    parser.add_argument("--requests", type=int, default=5, help="Requests per client")
+    parser.add_argument("--limit", type=int, default=10, help="Requests allowed per window")
+    parser.add_argument("--window", type=float, default=60, help="Window in seconds")
+    args = parser.parse_args()
+
+    client_ids = [f"ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    limiters = [
+        ("legacy", lambda: LegacyRateLimiter(args.limit, args.window)),
+        ("gcra", lambda: MemoryRateLimiter(args.limit, args.window, max_clients=args.clients + 1)),
+    ]
+
+    print(f"{args.clients} clients, {args.requests} requests each, limit {args.limit} per {args.window:g}s")
+    print(f"{'limiter':>8} {'us/check':>9} {'us/reject':>10} {'memory MB':>10} {'cleanup ms':>11}")
+    for name, make_limiter in limiters:
+        result = measure(make_limiter, client_ids, args.requests, args.limit, args.window)
+        print(
+            f"{name:>8} {result['check_us']:>9.2f} {result['rejected_us']:>10.2f} "
+            f"{result['memory_mb']:>10.1f} {result['cleanup_ms']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark Redis round trips for task writes and reads.
+
+Counts the requests sent to Redis (one per command, one per pipeline or
+MULTI) for the previous task operations and their pipelined replacements:
+
+* ``set_task``: HSET then EXPIRE, against both in one MULTI.
+* ``set_progress``: HGETALL then an HSET of the whole task, against one
+  HSET of progress and updated_at (plus HLEN in the same MULTI).
+* ``debounced``: the same progress updates through ProgressDebouncer,
+  which coalesces updates closer together than its interval.
+* ``get_tasks``: one HGETALL per task, against one pipeline.
+* ``hot reads``: one task read ``--reads`` times straight from Redis,
+  against RedisClient.get_task served by the local cache tier.
+
+Runs against an in-process fakeredis server unless ``--url`` is given; the
+estimated time multiplies round trips by ``--rtt-ms``, the network latency
+the counts would cost against a remote Redis.
+
+Usage:
+    python scripts/benchmark_redis.py
+    python scripts/benchmark_redis.py --tasks 500 --updates 50 --rtt-ms 1
+    python scripts/benchmark_redis.py --url redis://localhost:6379/15
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import redis
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache.redis_config import ProgressDebouncer, RedisClient
+
+
+class RoundTripCounter:
+    """Counts packed commands sent by any redis-py connection."""
+
+    def __init__(self):
+        self.count = 0
+        self._send = redis.connection.AbstractConnection.send_packed_command
+        counter = self
+
+        def send_packed_command(connection, *args, **kwargs):
+            counter.count += 1
+            return counter._send(connection, *args, **kwargs)
+
+        redis.connection.AbstractConnection.send_packed_command = send_packed_command
+
+    def measure(self, func) -> tuple:
+        """Run func; returns (round trips, elapsed ms)."""
+        before = self.count
+        started = time.perf_counter()
+        func()
+        return self.count - before, (time.perf_counter() - started) * 1000
+
+
+def make_client(url: str) -> RedisClient:
+    if url:
+        client = RedisClient(url)
+    else:
+        import fakeredis
+        client = RedisClient(client=fakeredis.FakeRedis(decode_responses=True))
+    client.redis.ping()
+    return client
+
+
+def task_data(index: int) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "task_id": f"bench-{index}",
+        "filename": f"lecture_{index}.mp3",
+        "status": "pending",
+        "created_at": now,
+        "updated_at": now,
+        "progress": "0",
+    }
+
+
+def legacy_set_task(client: RedisClient, task_id: str, data: dict) -> None:
+    client.redis.hset(f"task:{task_id}", mapping=data)
+    client.redis.expire(f"task:{task_id}", 86400)
+
+
+def legacy_get_tasks(client: RedisClient, task_ids: list) -> None:
+    for task_id in task_ids:
+        client.redis.hgetall(f"task:{task_id}")
+
+
+def uncached_get_tasks(client: RedisClient, task_ids: list) -> None:
+    client.local.clear()
+    client.get_tasks(task_ids)
+
+
+def legacy_set_progress(client: RedisClient, task_id: str, progress: str) -> None:
+    task = client.redis.hgetall(f"task:{task_id}")
+    if task:
+        task["progress"] = progress
+        task["updated_at"] = datetime.now(timezone.utc).isoformat()
+        client.redis.hset(f"task:{task_id}", mapping=task)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis task round-trip benchmark")
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks written and read")
+    parser.add_argument("--updates", type=int, default=20, help="Progress updates per task")
+    parser.add_argument("--reads", type=int, default=1000, help="Reads of one hot task")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Network round-trip time used for the estimate")
+    parser.add_argument("--url", default="", help="Redis URL (default: in-process fakeredis)")
+    args = parser.parse_args()
+
+    client = make_client(args.url)
+    counter = RoundTripCounter()
+    ids = [f"bench-{i}" for i in range(args.tasks)]
+    updates = [str(percent * 100 // args.updates) for percent in range(1, args.updates + 1)]
+
+    def progress(write):
+        for task_id in ids:
+            for value in updates:
+                write(task_id, value)
+
+    def debounced():
+        # A long interval so every update after the first is coalesced into
+        # the trailing write made by flush()
+        debouncer = ProgressDebouncer(
+            lambda task_id, value: client.set_progress(task_id, value, datetime.now(timezone.utc).isoformat()),
+            interval=60,
+        )
+        progress(debouncer.update)
+        debouncer.flush()
+
+    rows = [
+        ("set_task", "legacy", lambda: [legacy_set_task(client, i, task_data(n)) for n, i in enumerate(ids)]),
+        ("set_task", "multi", lambda: [client.set_task(i, task_data(n)) for n, i in enumerate(ids)]),
+        ("set_progress", "legacy", lambda: progress(lambda i, v: legacy_set_progress(client, i, v))),
+        (
+            "set_progress", "hset",
+            lambda: progress(lambda i, v: client.set_progress(i, v, datetime.now(timezone.utc).isoformat())),
+        ),
+        ("set_progress", "debounced", debounced),
+        ("get_tasks", "legacy", lambda: legacy_get_tasks(client, ids)),
+        ("get_tasks", "pipeline", lambda: uncached_get_tasks(client, ids)),
+        ("hot reads", "redis", lambda: legacy_get_tasks(client, ids[:1] * args.reads)),
+        ("hot reads", "local", lambda: [client.get_task(ids[0]) for _ in range(args.reads)]),
+    ]
+
+    print(f"{args.tasks} tasks, {args.updates} progress updates each, {args.url or 'fakeredis'}")
+    print(f"{'operation':>14} {'variant':>10} {'round trips':>12} {'ms':>8} {f'est. ms @ {args.rtt_ms}ms':>18}")
+    for operation, variant, func in rows:
+        round_trips, elapsed_ms = counter.measure(func)
+        print(f"{operation:>14} {variant:>10} {round_trips:>12} {elapsed_ms:>8.1f} {round_trips * args.rtt_ms:>18.1f}")
+
+    client.redis.delete(*[f"task:{task_id}" for task_id in ids])
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
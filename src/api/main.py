@@ -1,4 +1,5 @@
 import asyncio
+import os
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -7,7 +8,12 @@ from src.api.routers.healthcheck import router as health_router
 from src.api.routers.transcribe_chunk import router as transcribe_router
 from src.api.routers.stats import router as stats_router
 from src.api.services.cleanup import cleanup_old_audio
+from src.api.services.ollama_client import close_ollama_clients
+from src.api.services.ollama_pool import get_ollama_pool
+from src.api.services import summarizer
+from src.api.services.token_budget import load_tokenizer
 from src.api.services.task_manager import task_manager
+from src.cache.redis_config import close_async_redis
 from src.middleware.auth import authenticate_request
 from src.middleware.rate_limit import rate_limit_middleware, cleanup_old_entries
 from src.utils.settings import (
@@ -16,7 +22,9 @@ from src.utils.settings import (
     API_DESCRIPTION,
     CORS_ALLOW_ORIGINS,
     CORS_ALLOW_CREDENTIALS,
+    OLLAMA_WARMUP_ON_STARTUP,
 )
+from src.utils.connections import start_connections, stop_connections
 from src.utils.errors import CliniScribeException
 from src.utils.logger import setup_logger
 
@@ -35,7 +43,7 @@ app.add_middleware(
     allow_credentials=CORS_ALLOW_CREDENTIALS,
     allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["Content-Type", "X-API-Key"],
-    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "ETag"],
 )
 
 
@@ -82,7 +90,7 @@ async def security_middleware(request: Request, call_next):
     
     try:
         # Skip middleware for health check
-        if request.url.path in ["/health", "/api/health"]:
+        if request.url.path in ["/health", "/api/health", "/api/health/ready"]:
             response = await call_next(request)
             response.headers["X-Request-ID"] = request_id
             return response
@@ -123,6 +131,9 @@ app.include_router(stats_router, prefix="/api", tags=["Statistics"])
 cleanup_task = None
 rate_limit_cleanup_task = None
 task_cleanup_task = None
+ollama_warmup_task = None
+ollama_health_task = None
+tokenizer_task = None
 
 
 async def run_daily_cleanup():
@@ -151,7 +162,8 @@ async def run_rate_limit_cleanup():
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
-    global cleanup_task, rate_limit_cleanup_task, task_cleanup_task
+    global cleanup_task, rate_limit_cleanup_task, task_cleanup_task, ollama_warmup_task, ollama_health_task
+    global tokenizer_task
     
     # Run startup validation
     from src.utils.startup_validation import validate_on_startup
@@ -163,10 +175,27 @@ async def startup_event():
     logger.info(f"Starting {API_TITLE} v{API_VERSION}")
     logger.info(f"CORS origins: {CORS_ALLOW_ORIGINS}")
 
+    # Connect to Redis (and the database, when configured) in the
+    # background; requests are served with local fallbacks until they are
+    # ready. SQLAlchemy is only imported when a database is configured.
+    if os.getenv("DATABASE_URL"):
+        import src.database.config  # noqa: F401  (registers its connection)
+    start_connections()
+
     # Start background cleanup tasks
     cleanup_task = asyncio.create_task(run_daily_cleanup())
     rate_limit_cleanup_task = asyncio.create_task(run_rate_limit_cleanup())
     task_cleanup_task = asyncio.create_task(task_manager.start_cleanup_worker())
+    ollama_health_task = asyncio.create_task(get_ollama_pool().run_health_checks())
+
+    # Load the prompt tokenizer (possibly downloading it) off the event loop
+    # before the first summary needs it
+    tokenizer_task = asyncio.create_task(load_tokenizer())
+
+    # Load the summarization model and cache its system prompt in the
+    # background so startup is not blocked
+    if OLLAMA_WARMUP_ON_STARTUP:
+        ollama_warmup_task = asyncio.create_task(summarizer.warm_up())
 
     logger.info("Application startup complete")
     logger.info("API documentation available at /docs")
@@ -175,7 +204,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on application shutdown."""
-    global cleanup_task, rate_limit_cleanup_task, task_cleanup_task
+    global cleanup_task, rate_limit_cleanup_task, task_cleanup_task, ollama_warmup_task, ollama_health_task
+    global tokenizer_task
     
     logger.info("Shutting down application...")
     
@@ -186,13 +216,24 @@ async def shutdown_event():
         rate_limit_cleanup_task.cancel()
     if task_cleanup_task:
         task_cleanup_task.cancel()
+    if ollama_warmup_task:
+        ollama_warmup_task.cancel()
+    if ollama_health_task:
+        ollama_health_task.cancel()
+    if tokenizer_task:
+        tokenizer_task.cancel()
+    
+    # Release pooled Ollama and Redis connections
+    await stop_connections()
+    await close_ollama_clients()
+    await close_async_redis()
+    task_manager.close()
     
     logger.info("Application shutdown complete")
 
 
 if __name__ == "__main__":
     import uvicorn
-    import os
 
     # Get configuration from environment variables
     port = int(os.getenv("PORT", 8080))
@@ -1,9 +1,11 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from src.api.services import transcriber
+from src.api.services.ollama_pool import get_ollama_pool
+from src.api.services.token_budget import working_context_size
+from src.utils.connections import get_readiness
 from src.utils.settings import OLLAMA_URL, OLLAMA_MODEL, WHISPER_MODEL, DEVICE
 from src.utils.logger import setup_logger
-import requests
 
 logger = setup_logger(__name__)
 router = APIRouter()
@@ -41,26 +43,31 @@ async def healthcheck():
         status["whisper"]["error"] = str(e)
         logger.warning(f"Whisper health check failed: {str(e)}")
     
-    # Check Ollama service
+    # Check Ollama service (on the host the next job would be routed to)
     try:
-        tags_response = requests.get(
-            OLLAMA_URL.replace("/api/generate", "/api/tags"),
-            timeout=5,
-        )
+        pool = get_ollama_pool()
+        status["ollama"]["hosts"] = len(pool.backends)
+        status["ollama"]["healthy_hosts"] = sum(not b.is_ejected() for b in pool.backends)
+        ollama = pool.select(OLLAMA_MODEL).client
+        status["ollama"]["url"] = f"{ollama.base_url}/api/generate"
+        tags_response = await ollama.request("GET", "/api/tags", timeout=5)
 
         if tags_response.status_code != 200:
             status["status"] = "degraded"
             status["ollama"]["error"] = f"Tags check returned {tags_response.status_code}"
         else:
             # Validate that the model runner can actually start (tags alone can be green
-            # even when generation fails).
-            generate_response = requests.post(
-                OLLAMA_URL,
+            # even when generation fails). Send the keep-alive and num_ctx summaries use,
+            # so the probe neither shortens the model's stay nor reloads it.
+            generate_response = await ollama.request(
+                "POST",
+                "/api/generate",
                 json={
                     "model": OLLAMA_MODEL,
                     "prompt": "healthcheck",
                     "stream": False,
-                    "options": {"num_predict": 1, "temperature": 0.0},
+                    "keep_alive": ollama.keep_alive,
+                    "options": {"num_predict": 1, "temperature": 0.0, "num_ctx": working_context_size()},
                 },
                 timeout=10,
             )
@@ -85,3 +92,20 @@ async def healthcheck():
         status_code=200 if status["status"] == "healthy" else 503,
         content=status
     )
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    Report whether backing services are connected, without waiting on them.
+    
+    Redis and the database connect in the background after startup. The
+    status is "ready" when every configured service is connected,
+    "degraded" while optional ones are not (local fallbacks are in use),
+    and "unavailable" (503) while a required one is not.
+    """
+    readiness_status = get_readiness()
+    return JSONResponse(
+        status_code=200 if readiness_status["ready"] else 503,
+        content=readiness_status
+    )
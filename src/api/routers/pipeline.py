@@ -1,18 +1,23 @@
 import os
+import json
 import uuid
+import zlib
 import asyncio
 from datetime import datetime, timezone
-from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
+from typing import Dict, Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from src.api.services import audio_preprocess, transcriber, summarizer
-from src.api.services.task_manager import task_manager, ProcessingStage
+from src.api.services.ollama_pool import get_ollama_pool
+from src.api.services.task_manager import task_manager, ProcessingStage, Task, TaskStatus, TERMINAL_STATUSES
 from src.utils.settings import (
     AUDIO_STORAGE_DIR,
     MAX_FILE_SIZE_MB,
     ALLOWED_AUDIO_FORMATS,
     DEEPFILTERNET_ENABLED,
     PHI_DETECTION_ENABLED,
+    SUMMARY_PENDING_ENABLED,
+    SUMMARY_PENDING_TIMEOUT,
 )
 from src.utils.validation import (
     sanitize_filename,
@@ -24,6 +29,7 @@ from src.utils.validation import (
 )
 from src.utils.file_utils import check_disk_space, safe_remove_file
 from src.utils.file_deduplication import check_duplicate_file, cache_file_result
+from src.utils.summary_cache import cache_summary, get_cached_summary, get_transcript_hash
 from src.utils.errors import (
     CliniScribeException,
     ValidationError,
@@ -31,7 +37,8 @@ from src.utils.errors import (
     ServiceUnavailableError,
     ErrorCode,
 )
-from src.utils.phi_detector import get_phi_detector
+from src.utils.phi_detector import PHIDetectionResult, get_phi_detector
+from src.utils.circuit_breaker import CircuitState
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -60,6 +67,309 @@ def validate_audio_file(file: UploadFile) -> str:
     return filename
 
 
+def _is_transient_outage(exc: ServiceUnavailableError) -> bool:
+    """Whether a summarization failure may clear up on its own (not a missing model or bad request)."""
+    status_code = exc.details.get("status_code")
+    return "model" not in exc.details and (status_code is None or status_code >= 500)
+
+
+async def _is_cancelled(task_id: str) -> bool:
+    """Whether a task was cancelled (or removed) while it was waiting."""
+    task = await task_manager.get_task_async(task_id)
+    if task is None or task.status == TaskStatus.CANCELLED:
+        logger.info(f"Task {task_id} cancelled while waiting for summarization")
+        return True
+    return False
+
+
+async def _summarize_when_available(
+    task_id: str,
+    transcript: dict,
+    ratio: float,
+    subject: Optional[str],
+) -> Optional[str]:
+    """Generate the summary, parking the task while Ollama is unavailable.
+    
+    With SUMMARY_PENDING_ENABLED, a job whose transcript is finished waits in
+    the summary_pending stage instead of failing and resumes once the Ollama
+    circuit admits requests again (up to SUMMARY_PENDING_TIMEOUT seconds).
+    
+    Returns:
+        Summary text, or None if the task was cancelled while parked
+        
+    Raises:
+        ServiceUnavailableError: If Ollama does not recover in time
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SUMMARY_PENDING_TIMEOUT
+    breaker = get_ollama_pool().breaker
+    
+    while True:
+        try:
+            return await summarizer.generate_summary(
+                transcript["text"],
+                ratio=ratio,
+                subject=subject,
+                on_token=lambda token: task_manager.append_summary_tokens(task_id, token),
+                on_section=lambda key, content: task_manager.set_summary_section(task_id, key, content),
+                segments=[segment["text"] for segment in transcript["segments"]],
+            )
+        except ServiceUnavailableError as exc:
+            remaining = deadline - loop.time()
+            if not SUMMARY_PENDING_ENABLED or remaining <= 0 or not _is_transient_outage(exc):
+                raise
+            if await _is_cancelled(task_id):
+                return None
+            
+            logger.warning(f"Task {task_id} waiting for summarization service: {exc.message}")
+            task_manager.reset_summary(task_id)
+            task_manager.update_progress(
+                task_id,
+                ProcessingStage.SUMMARY_PENDING,
+                75,
+                "Summarization service unavailable; study notes will be generated when it recovers"
+            )
+            try:
+                if breaker.state is CircuitState.CLOSED:
+                    # Not yet tripped: retry after the breaker's reset period
+                    await asyncio.sleep(min(breaker.reset_timeout, remaining))
+                else:
+                    await asyncio.wait_for(breaker.wait_until_ready(), timeout=remaining)
+            except asyncio.TimeoutError:
+                raise exc
+        
+        if await _is_cancelled(task_id):
+            return None
+        
+        task_manager.update_progress(
+            task_id,
+            ProcessingStage.SUMMARIZING,
+            75,
+            "Summarization service recovered; generating structured study notes"
+        )
+
+
+def _summary_matches(result: Optional[dict], ratio: float, subject: Optional[str]) -> bool:
+    """Whether a stored result already holds a summary generated with these parameters."""
+    if not result or not result.get("success") or "summary" not in result:
+        return False
+    metadata = result.get("metadata", {})
+    return metadata.get("ratio") == ratio and (metadata.get("subject") or "").lower() == (subject or "").lower()
+
+
+def _summary_result(
+    source_task_id: str,
+    source_result: dict,
+    summary_sections: dict,
+    summary_text: str,
+    ratio: float,
+    subject: Optional[str],
+) -> dict:
+    """Build a task result for a new summary of a stored transcript."""
+    transcript = source_result["transcript"]
+    return {
+        "success": True,
+        "transcription": transcript["text"],
+        "transcript": transcript,
+        "summary": summary_sections,
+        "summary_text": summary_text,
+        "metadata": {
+            **source_result.get("metadata", {}),
+            "ratio": ratio,
+            "subject": subject,
+            "source_task_id": source_task_id,
+        },
+    }
+
+
+# Summary-only tasks by (transcript hash, ratio, subject), so identical
+# re-summarize requests share one task instead of one LLM call each
+_summary_tasks: Dict[Tuple[str, float, str], str] = {}
+_MAX_TRACKED_SUMMARY_TASKS = 1000
+
+
+async def _find_summary_task(key: Tuple[str, float, str]) -> Optional[Task]:
+    """Return a live or completed summary task for the key, forgetting failed ones."""
+    task_id = _summary_tasks.get(key)
+    task = await task_manager.get_task_async(task_id) if task_id else None
+    if task is None or task.status in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+        _summary_tasks.pop(key, None)
+        return None
+    return task
+
+
+def _track_summary_task(key: Tuple[str, float, str], task_id: str) -> None:
+    if len(_summary_tasks) >= _MAX_TRACKED_SUMMARY_TASKS:
+        # Forget the oldest entry; its result remains in the summary cache
+        del _summary_tasks[next(iter(_summary_tasks))]
+    _summary_tasks[key] = task_id
+
+
+async def process_summary_task(
+    task_id: str,
+    source_task_id: str,
+    source_result: dict,
+    ratio: float,
+    subject: Optional[str],
+) -> None:
+    """Summarize a stored transcript again in background.
+    
+    Args:
+        task_id: Unique task identifier for the new summary
+        source_task_id: Task whose transcript is summarized
+        source_result: Result of the source task (with its transcript)
+        ratio: Summary length ratio
+        subject: Optional subject for tailored summary
+    """
+    transcript = source_result["transcript"]
+    
+    try:
+        task_manager.update_progress(
+            task_id,
+            ProcessingStage.SUMMARIZING,
+            75,
+            "Generating structured study notes from the stored transcript"
+        )
+        
+        summary_text = await _summarize_when_available(task_id, transcript, ratio, subject)
+        if summary_text is None:
+            return
+        summary_sections = summarizer.parse_summary_sections(summary_text)
+        
+        result = _summary_result(source_task_id, source_result, summary_sections, summary_text, ratio, subject)
+        task_manager.complete_task(task_id, result)
+        await cache_summary(get_transcript_hash(transcript["text"]), ratio, subject, summary_sections, summary_text)
+        
+        logger.info(f"Summary task {task_id} completed for transcript of task {source_task_id}")
+    
+    except CliniScribeException as exc:
+        logger.error(f"Summary task {task_id} failed: {exc.message}")
+        task_manager.fail_task(
+            task_id,
+            error=exc.message,
+            error_code=exc.error_code.value,
+            result={
+                "success": False,
+                "transcription": transcript["text"],
+                "transcript": transcript,
+            },
+        )
+    
+    except Exception as e:
+        logger.error(f"Summary task {task_id} failed: {str(e)}", exc_info=True)
+        task_manager.fail_task(
+            task_id,
+            error=str(e),
+            error_code=ErrorCode.SUMMARIZATION_FAILED.value
+        )
+
+
+def _cached_summary_response(task_id: str, result: dict, async_mode: bool) -> dict:
+    """Response for a summary that already exists (the bare result in sync mode)."""
+    if not async_mode:
+        return result
+    return {
+        "success": True,
+        "task_id": task_id,
+        "status": "completed",
+        "cached": True,
+        "result": result,
+    }
+
+
+async def _start_summary_task(
+    background_tasks: BackgroundTasks,
+    source_task_id: str,
+    source_result: dict,
+    ratio: float,
+    subject: Optional[str],
+    async_mode: bool = True,
+) -> dict:
+    """Summarize a stored transcript, reusing cached or in-flight summaries.
+    
+    Returns:
+        Response body with the summary task ID (and result when available)
+    """
+    source_task_id = source_result.get("metadata", {}).get("source_task_id", source_task_id)
+    transcript_hash = get_transcript_hash(source_result["transcript"]["text"])
+    key = (transcript_hash, ratio, (subject or "").lower())
+    
+    existing = await _find_summary_task(key)
+    if existing and existing.status == TaskStatus.COMPLETED:
+        return _cached_summary_response(existing.task_id, await existing.load_result(), async_mode)
+    if existing and async_mode:
+        return {
+            "success": True,
+            "task_id": existing.task_id,
+            "status": existing.status.value,
+            "message": "An identical summary is already being generated. Use GET /api/pipeline/{task_id} to check status.",
+        }
+    
+    task_id = await task_manager.create_task_async()
+    _track_summary_task(key, task_id)
+    
+    cached = await get_cached_summary(transcript_hash, ratio, subject)
+    if cached:
+        result = _summary_result(
+            source_task_id, source_result, cached["summary"], cached["summary_text"], ratio, subject
+        )
+        task_manager.complete_task(task_id, result)
+        return _cached_summary_response(task_id, result, async_mode)
+    
+    if async_mode:
+        background_tasks.add_task(process_summary_task, task_id, source_task_id, source_result, ratio, subject)
+        return {
+            "success": True,
+            "task_id": task_id,
+            "status": "processing",
+            "message": "Summarization started. Use GET /api/pipeline/{task_id} to check status.",
+        }
+    
+    await process_summary_task(task_id, source_task_id, source_result, ratio, subject)
+    task = await task_manager.get_task_async(task_id)
+    if task and task.status == TaskStatus.COMPLETED:
+        return await task.load_result()
+    raise ProcessingError(
+        message=(task.error if task and task.error else "Summarization failed with unknown error"),
+        error_code=ErrorCode(task.error_code) if task and task.error_code else ErrorCode.SUMMARIZATION_FAILED
+    )
+
+
+def _phi_rejection(
+    task_id: str,
+    filename: str,
+    phi_result: PHIDetectionResult,
+    early: bool = False,
+) -> ValidationError:
+    """Log a PHI rejection (without content) and build the error to fail the task with.
+    
+    Args:
+        early: Whether PHI was found while transcription was still running
+    """
+    detected_types = list(set(m.phi_type.value for m in phi_result.matches))
+    logger.warning(
+        f"PHI_REJECTION: Task {task_id} rejected" + (" during transcription" if early else ""),
+        extra={
+            "task_id": task_id,
+            # "filename" is reserved by LogRecord
+            "upload_filename": filename,
+            "confidence": phi_result.confidence_score,
+            "num_matches": len(phi_result.matches),
+            "phi_types": detected_types,
+            "early_abort": early,
+        }
+    )
+    return ValidationError(
+        message=phi_result.recommendation,
+        error_code=ErrorCode.PHI_DETECTED,
+        details={
+            "confidence": round(phi_result.confidence_score, 2),
+            "detected_types": detected_types,
+            "help_url": "https://github.com/Excelsior2026/COGNISCRIBE#educational-use-notice"
+        }
+    )
+
+
 async def process_pipeline_task(
     task_id: str,
     raw_path: str,
@@ -79,6 +389,7 @@ async def process_pipeline_task(
         use_deepfilter: Whether to use DeepFilterNet enhancement
     """
     clean_path = None
+    transcript = None
     
     try:
         # Stage 1: Preprocess audio
@@ -95,7 +406,9 @@ async def process_pipeline_task(
             use_deepfilter=use_deepfilter,
         )
         
-        # Stage 2: Transcribe
+        # Stage 2: Transcribe, scanning for PHI as segments arrive (if enabled)
+        phi_detector = get_phi_detector() if PHI_DETECTION_ENABLED else None
+        phi_scanner = phi_detector.stream_scanner() if phi_detector else None
         task_manager.update_progress(
             task_id,
             ProcessingStage.TRANSCRIBING,
@@ -103,13 +416,19 @@ async def process_pipeline_task(
             "Transcribing audio with Whisper"
         )
         
+        def scan_segment(segment: dict) -> None:
+            phi_result = phi_scanner.feed(segment["text"])
+            if phi_result is not None:
+                raise _phi_rejection(task_id, filename, phi_result, early=True)
+        
         transcript = await asyncio.to_thread(
             transcriber.transcribe_audio,
-            clean_path
+            clean_path,
+            on_segment=scan_segment if phi_scanner else None,
         )
         
-        # Stage 2.5: PHI Detection (if enabled)
-        if PHI_DETECTION_ENABLED:
+        # Stage 2.5: Confirm PHI scan over the complete transcript (if enabled)
+        if phi_detector:
             task_manager.update_progress(
                 task_id,
                 ProcessingStage.TRANSCRIBING,
@@ -117,37 +436,10 @@ async def process_pipeline_task(
                 "Scanning for protected health information"
             )
             
-            phi_detector = get_phi_detector()
             phi_result = phi_detector.scan_text(transcript["text"])
             
             if phi_detector.should_reject(phi_result):
-                # Log PHI detection (without actual content)
-                logger.warning(
-                    f"PHI_REJECTION: Task {task_id} rejected",
-                    extra={
-                        "task_id": task_id,
-                        "filename": filename,
-                        "confidence": phi_result.confidence_score,
-                        "num_matches": len(phi_result.matches),
-                        "phi_types": list(set(m.phi_type.value for m in phi_result.matches))
-                    }
-                )
-                
-                # Cleanup files
-                if clean_path:
-                    audio_preprocess.cleanup_temp_file(clean_path)
-                safe_remove_file(raw_path)
-                
-                # Fail task with PHI error
-                raise ValidationError(
-                    message=phi_result.recommendation,
-                    error_code=ErrorCode.PHI_DETECTED,
-                    details={
-                        "confidence": round(phi_result.confidence_score, 2),
-                        "detected_types": list(set(m.phi_type.value for m in phi_result.matches)),
-                        "help_url": "https://github.com/Excelsior2026/COGNISCRIBE#educational-use-notice"
-                    }
-                )
+                raise _phi_rejection(task_id, filename, phi_result)
             
             # Log successful PHI scan
             logger.info(
@@ -167,12 +459,11 @@ async def process_pipeline_task(
             "Generating structured study notes"
         )
         
-        summary_text = await asyncio.to_thread(
-            summarizer.generate_summary,
-            transcript["text"],
-            ratio=ratio,
-            subject=subject
-        )
+        summary_text = await _summarize_when_available(task_id, transcript, ratio, subject)
+        if summary_text is None:
+            if clean_path:
+                audio_preprocess.cleanup_temp_file(clean_path)
+            return
         summary_sections = summarizer.parse_summary_sections(summary_text)
         
         # Cleanup temporary processed file
@@ -202,7 +493,8 @@ async def process_pipeline_task(
         task_manager.complete_task(task_id, result)
         
         # Cache result for deduplication
-        cache_file_result(raw_path, task_id, result)
+        await cache_file_result(raw_path, task_id, result)
+        await cache_summary(get_transcript_hash(transcript["text"]), ratio, subject, summary_sections, summary_text)
         
         logger.info(f"Pipeline completed successfully for task {task_id}")
         
@@ -214,10 +506,20 @@ async def process_pipeline_task(
             audio_preprocess.cleanup_temp_file(clean_path)
         safe_remove_file(raw_path)
 
+        # Keep a finished transcript when only summarization was unavailable
+        partial_result = None
+        if transcript is not None and isinstance(exc, ServiceUnavailableError):
+            partial_result = {
+                "success": False,
+                "transcription": transcript["text"],
+                "transcript": transcript,
+            }
+
         task_manager.fail_task(
             task_id,
             error=exc.message,
             error_code=exc.error_code.value,
+            result=partial_result,
         )
 
     except Exception as e:
@@ -343,7 +645,20 @@ async def pipeline(
         await file.close()
         
         # Check for duplicate file (optional optimization)
-        duplicate_result = check_duplicate_file(raw_path)
+        duplicate_result = await check_duplicate_file(raw_path)
+        cached_result = (duplicate_result or {}).get("result") or {}
+        if cached_result.get("transcript") and not _summary_matches(cached_result, ratio, subject):
+            # Same audio, different summary parameters: only summarize again
+            logger.info(f"File already transcribed (task: {duplicate_result.get('task_id')}), re-summarizing")
+            safe_remove_file(raw_path)
+            return await _start_summary_task(
+                background_tasks,
+                duplicate_result.get("task_id"),
+                cached_result,
+                ratio,
+                subject,
+                async_mode,
+            )
         if duplicate_result:
             logger.info(f"File already processed, returning cached result (task: {duplicate_result.get('task_id')})")
             # Return cached result instead of processing
@@ -380,7 +695,7 @@ async def pipeline(
         
         # Async mode: Create task and process in background
         if async_mode:
-            task_id = task_manager.create_task()
+            task_id = await task_manager.create_task_async()
             
             # Queue background processing
             background_tasks.add_task(
@@ -403,7 +718,7 @@ async def pipeline(
         
         # Sync mode: Process immediately (for smaller files)
         else:
-            task_id = task_manager.create_task()
+            task_id = await task_manager.create_task_async()
             await process_pipeline_task(
                 task_id,
                 raw_path,
@@ -413,9 +728,10 @@ async def pipeline(
                 use_deepfilter
             )
             
-            task = task_manager.get_task(task_id)
-            if task and task.result:
-                return task.result
+            task = await task_manager.get_task_async(task_id)
+            result = await task.load_result() if task else None
+            if result:
+                return result
             elif task and task.error:
                 raise ProcessingError(
                     message=task.error,
@@ -449,24 +765,108 @@ async def pipeline(
         )
 
 
-@router.get("/pipeline/{task_id}")
-async def get_pipeline_status(task_id: str):
-    """
-    Get status and results of a pipeline task.
+# Longest a status request may wait for the task to change
+LONG_POLL_MAX_WAIT = 60
+
+# Memory for encoded status responses of finished tasks
+STATUS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+class _EncodedResponseCache:
+    """Encoded JSON bodies, least recently used evicted first, bounded in bytes."""
     
-    Returns task status, progress, and results if completed.
-    """
-    task = task_manager.get_task(task_id)
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._bodies: Dict[Tuple[str, int, str], bytes] = {}
+        self._size = 0
     
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "task_not_found",
-                "message": f"Task {task_id} not found"
-            }
-        )
+    def get(self, key: Tuple[str, int, str]) -> Optional[bytes]:
+        body = self._bodies.pop(key, None)
+        if body is not None:
+            self._bodies[key] = body
+        return body
     
+    def put(self, key: Tuple[str, int, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._bodies.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._bodies[key] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            self._size -= len(self._bodies.pop(next(iter(self._bodies))))
+
+
+# Finished tasks no longer change, so their encoded responses are reused
+_status_cache = _EncodedResponseCache(STATUS_CACHE_MAX_BYTES)
+
+
+def _task_not_found(task_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=404,
+        detail={
+            "error": "task_not_found",
+            "message": f"Task {task_id} not found"
+        }
+    )
+
+
+def _parse_paths(value: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma-separated list of dotted response paths."""
+    if not value:
+        return ()
+    return tuple(sorted({path.strip() for path in value.split(",") if path.strip()}))
+
+
+def _path_tree(paths: Tuple[str, ...]) -> dict:
+    """Nest dotted paths by key; None marks a whole value."""
+    tree: dict = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            if node.get(part, {}) is None:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _select(value, tree: Optional[dict]):
+    if tree is None or not isinstance(value, dict):
+        return value
+    return {key: _select(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+def _omit(value, tree: dict):
+    if not isinstance(value, dict):
+        return value
+    kept = {}
+    for key, item in value.items():
+        if key in tree:
+            if tree[key] is None:
+                continue
+            item = _omit(item, tree[key])
+        kept[key] = item
+    return kept
+
+
+def _etag(task: Task, projection: str) -> str:
+    if not projection:
+        return f'"{task.version}"'
+    return f'"{task.version}-{zlib.crc32(projection.encode()):08x}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _status_response(task: Task, result: Optional[dict]) -> dict:
     response = {
         "task_id": task.task_id,
         "status": task.status.value,
@@ -481,8 +881,11 @@ async def get_pipeline_status(task_id: str):
     if task.completed_at:
         response["completed_at"] = task.completed_at.isoformat()
     
-    if task.result:
-        response["result"] = task.result
+    if result:
+        response["result"] = result
+    
+    if task.partial_summary:
+        response["partial_summary"] = task.partial_summary
     
     if task.error:
         response["error"] = task.error
@@ -491,12 +894,229 @@ async def get_pipeline_status(task_id: str):
     return response
 
 
+@router.get("/pipeline/{task_id}")
+async def get_pipeline_status(
+    task_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=LONG_POLL_MAX_WAIT,
+        description="Seconds to wait for the task's status or progress to change before responding (long polling)",
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated response fields to return, e.g. 'status,progress' or 'result.summary'",
+    ),
+    exclude: Optional[str] = Query(
+        None,
+        description="Comma-separated response fields to omit, e.g. 'result.transcript.segments,result.transcription'",
+    ),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Get status and results of a pipeline task.
+    
+    Returns task status, progress, and results if completed. With `wait`,
+    an unfinished task's response is held until its status, progress or
+    summary sections change, or the wait expires, so clients can poll in a
+    loop without a delay between requests. Finished tasks respond at once.
+    For every individual update use `GET /api/pipeline/{task_id}/events`.
+    
+    `fields` and `exclude` take dotted paths into the response; `task_id`
+    is always returned. Responses carry an `ETag` that changes whenever the
+    task does: send it back in `If-None-Match` to get an empty `304 Not
+    Modified` while nothing has changed. Combined with `wait`, the request
+    is only held while the client's copy is current.
+    """
+    task = await task_manager.get_task_async(task_id)
+    
+    if not task:
+        raise _task_not_found(task_id)
+    
+    field_paths = _parse_paths(fields)
+    exclude_paths = _parse_paths(exclude)
+    projection = f"{','.join(field_paths)}|{','.join(exclude_paths)}" if field_paths or exclude_paths else ""
+    
+    if wait and (not if_none_match or _etag_matches(if_none_match, _etag(task, projection))):
+        await task_manager.wait_for_update(task_id, wait)
+        # The task may have been expired or evicted while waiting
+        task = await task_manager.get_task_async(task_id)
+        if not task:
+            raise _task_not_found(task_id)
+    
+    etag = _etag(task, projection)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    finished = task.status in TERMINAL_STATUSES
+    cache_key = (task_id, task.version, projection)
+    if finished:
+        body = _status_cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=headers)
+    
+    field_tree = _path_tree(field_paths)
+    exclude_tree = _path_tree(exclude_paths)
+    # Skip reading the result (possibly from disk) if it is not returned
+    include_result = (not field_tree or "result" in field_tree) and exclude_tree.get("result", {}) is not None
+    response = _status_response(task, await task.load_result() if include_result else None)
+    if field_tree:
+        response = {"task_id": task.task_id, **_select(response, field_tree)}
+    if exclude_tree:
+        response = {**_omit(response, exclude_tree), "task_id": task.task_id}
+    
+    encoded = JSONResponse(content=response, headers=headers)
+    if finished:
+        _status_cache.put(cache_key, encoded.body)
+    return encoded
+
+
+@router.post("/pipeline/{task_id}/summary")
+async def resummarize_pipeline_task(
+    task_id: str,
+    background_tasks: BackgroundTasks,
+    ratio: float = Query(0.15, ge=0.05, le=1.0, description="Summary length ratio (0.05-1.0)"),
+    subject: Optional[str] = Query(None, description="Optional subject/topic (e.g., 'anatomy', 'pharmacology')"),
+    async_mode: bool = Query(True, description="Process asynchronously"),
+):
+    """
+    Generate a new summary of an already transcribed lecture.
+    
+    Re-runs only the summarization stage against the task's stored
+    transcript, as a new task. Summaries already generated for the same
+    transcript, ratio and subject are returned from cache.
+    """
+    task = await task_manager.get_task_async(task_id)
+    
+    if not task:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "task_not_found",
+                "message": f"Task {task_id} not found"
+            }
+        )
+    
+    # Read once: a spilled result is loaded from disk on each access
+    source_result = await task.load_result()
+    if not source_result or not source_result.get("transcript"):
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": "transcript_not_available",
+                "message": f"Task {task_id} has no transcript to summarize yet"
+            }
+        )
+    
+    ratio = validate_ratio(ratio)
+    subject = sanitize_subject(subject)
+    logger.info(f"Re-summarize request for task {task_id} (ratio={ratio}, subject={subject})")
+    
+    if _summary_matches(source_result, ratio, subject):
+        return _cached_summary_response(task_id, source_result, async_mode)
+    
+    return await _start_summary_task(background_tasks, task_id, source_result, ratio, subject, async_mode)
+
+
+# Seconds between SSE keep-alive comments while a task is idle
+SSE_KEEPALIVE_INTERVAL = 15
+
+_TERMINAL_EVENTS = {"complete", "error", "cancelled"}
+
+
+def _format_sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _unavailable_event(exc: ServiceUnavailableError) -> str:
+    """Error event ending a stream when the task store cannot be reached."""
+    return _format_sse("error", {"error": exc.message, "error_code": exc.error_code.value})
+
+
+@router.get("/pipeline/{task_id}/events")
+async def stream_pipeline_events(task_id: str):
+    """
+    Stream task progress as server-sent events.
+    
+    Emits a `snapshot` event with the current state, then `progress`,
+    `token` (streamed summary text), `section` (each completed summary
+    section) and finally one of `complete`, `error` or `cancelled`.
+    """
+    task = await task_manager.get_task_async(task_id)
+    
+    if not task:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "task_not_found",
+                "message": f"Task {task_id} not found"
+            }
+        )
+    
+    async def event_stream():
+        # Subscribe, then read the snapshot: a change made in between is in
+        # the snapshot or delivered as an event, never lost
+        try:
+            queue = task_manager.subscribe(task_id)
+        except ServiceUnavailableError as exc:
+            yield _unavailable_event(exc)
+            return
+        try:
+            try:
+                task = await task_manager.get_task_async(task_id, fresh=True)
+            except ServiceUnavailableError as exc:
+                yield _unavailable_event(exc)
+                return
+            if task is None:
+                return
+            status = task.status
+            yield _format_sse("snapshot", {
+                "status": status.value,
+                "stage": task.progress.stage.value,
+                "percent": task.progress.percent,
+                "message": task.progress.message,
+                "partial_summary": task.partial_summary,
+                "sections": task.partial_sections,
+            })
+            
+            if status == TaskStatus.COMPLETED:
+                yield _format_sse("complete", {"status": status.value})
+                return
+            if status in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+                yield _format_sse(
+                    "error" if status == TaskStatus.FAILED else "cancelled",
+                    {"status": status.value, "error": task.error, "error_code": task.error_code},
+                )
+                return
+            
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield _format_sse(event, data)
+                if event in _TERMINAL_EVENTS:
+                    return
+        finally:
+            task_manager.unsubscribe(task_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/pipeline/{task_id}")
 async def cancel_pipeline_task(task_id: str):
     """
     Cancel a pending or processing task.
     """
-    cancelled = task_manager.cancel_task(task_id)
+    cancelled = await task_manager.cancel_task_async(task_id)
     
     if not cancelled:
         raise HTTPException(
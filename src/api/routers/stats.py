@@ -1,7 +1,9 @@
 """Statistics and metrics endpoint."""
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
+from src.api.services.ollama_pool import get_ollama_pool
 from src.api.services.task_manager import task_manager
+from src.cache.redis_config import get_async_redis
 from src.middleware.rate_limit import get_rate_limit_stats
 from src.utils.logger import setup_logger
 
@@ -18,17 +20,23 @@ async def get_stats():
         Dictionary with statistics about:
         - Tasks (total, by status)
         - Rate limiting
+        - Ollama hosts (load, health, queue waits)
+        - Local cache tier in front of Redis (hits, misses)
         - System health
     """
     try:
-        task_stats = task_manager.get_stats()
+        task_stats = await task_manager.get_stats_async()
         rate_limit_stats = get_rate_limit_stats()
+        ollama_stats = get_ollama_pool().get_stats()
+        cache_stats = get_async_redis().get_cache_stats()
         
         return JSONResponse(
             status_code=200,
             content={
                 "tasks": task_stats,
                 "rate_limiting": rate_limit_stats,
+                "ollama": ollama_stats,
+                "cache": cache_stats,
                 "status": "healthy"
             }
         )
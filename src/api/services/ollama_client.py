@@ -0,0 +1,340 @@
+"""Shared async HTTP client for the Ollama API.
+
+One pooled ``httpx.AsyncClient`` is kept per Ollama host so keep-alive
+connections are reused across jobs, and generation requests pass through a
+per-host governor so no more than ``OLLAMA_NUM_PARALLEL`` run at once.
+"""
+import asyncio
+import contextlib
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+import httpx
+
+from src.utils.settings import (
+    OLLAMA_BASE_URL,
+    OLLAMA_MODEL,
+    OLLAMA_TIMEOUT,
+    OLLAMA_CONNECT_TIMEOUT,
+    OLLAMA_READ_TIMEOUT,
+    OLLAMA_MAX_CONNECTIONS,
+    OLLAMA_MAX_KEEPALIVE,
+    OLLAMA_NUM_PARALLEL,
+    OLLAMA_KEEP_ALIVE,
+)
+from src.api.services.ollama_governor import OllamaGovernor, Priority
+from src.utils.errors import ServiceUnavailableError, ErrorCode
+from src.utils.retry import RetryConfig
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Retry behaviour for generation requests (2s, 4s between attempts)
+DEFAULT_RETRY = RetryConfig(max_attempts=3, initial_delay=2.0, max_delay=30.0)
+
+# Prompt for warming a system prompt: Ollama treats an empty prompt as
+# load-only and would not evaluate the system prompt
+WARM_UP_PROMPT = " "
+
+
+def _parse_keep_alive(value: str) -> Union[int, str]:
+    """Convert a keep_alive setting to the form Ollama expects.
+
+    Bare numbers are seconds (``-1`` keeps the model loaded forever) and must
+    be sent as integers; anything else is a duration string such as ``30m``.
+    """
+    value = str(value).strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+class OllamaClient:
+    """Connection-pooled async client for a single Ollama host."""
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_BASE_URL,
+        connect_timeout: float = OLLAMA_CONNECT_TIMEOUT,
+        read_timeout: float = OLLAMA_READ_TIMEOUT,
+        total_timeout: float = OLLAMA_TIMEOUT,
+        max_connections: int = OLLAMA_MAX_CONNECTIONS,
+        max_keepalive: int = OLLAMA_MAX_KEEPALIVE,
+        num_parallel: int = OLLAMA_NUM_PARALLEL,
+        keep_alive: str = OLLAMA_KEEP_ALIVE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """Initialize client configuration (the connection pool is created lazily).
+
+        Args:
+            base_url: Ollama base URL, e.g. ``http://localhost:11434``
+            connect_timeout: Seconds allowed to establish a connection
+            read_timeout: Seconds allowed between bytes received
+            total_timeout: Upper bound in seconds for a whole request
+            max_connections: Maximum concurrent connections to this host
+            max_keepalive: Maximum idle connections kept open for reuse
+            num_parallel: Maximum generation requests in flight to this host
+            keep_alive: How long Ollama keeps the model loaded after a request
+            transport: Optional custom transport (used by tests)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.total_timeout = total_timeout
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=connect_timeout,
+            pool=total_timeout,
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=30.0,
+        )
+        self.governor = OllamaGovernor(num_parallel)
+        self.keep_alive = _parse_keep_alive(keep_alive)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, creating it for the running event loop."""
+        loop = asyncio.get_running_loop()
+        # Pooled connections are bound to the loop that opened them
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport,
+            )
+            self._loop = loop
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a single request without retries.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL (e.g. ``/api/tags``)
+            timeout: Optional overall timeout overriding the client defaults
+            **kwargs: Extra arguments passed to ``httpx.AsyncClient.request``
+
+        Raises:
+            httpx.HTTPError: On transport failures
+            asyncio.TimeoutError: If the total timeout is exceeded
+        """
+        client = self._get_client()
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout)
+        total = self.total_timeout if timeout is None else timeout
+        return await asyncio.wait_for(client.request(method, path, **kwargs), timeout=total)
+
+    def _timeout_error(self, attempts: int) -> ServiceUnavailableError:
+        """Build the error raised when every attempt timed out."""
+        logger.error(f"Ollama request timed out after {attempts} attempts")
+        return ServiceUnavailableError(
+            message=(
+                "Summarization timed out after multiple attempts. "
+                "The transcript may be too long or Ollama is overloaded. "
+                "Try increasing OLLAMA_TIMEOUT or reducing the audio length."
+            ),
+            error_code=ErrorCode.OLLAMA_TIMEOUT,
+        )
+
+    def _connect_error(self, attempts: int) -> ServiceUnavailableError:
+        """Build the error raised when Ollama could not be reached."""
+        logger.error(f"Could not connect to Ollama at {self.base_url} after {attempts} attempts")
+        return ServiceUnavailableError(
+            message=(
+                f"Cannot connect to Ollama service at {self.base_url} after {attempts} attempts. "
+                "Ensure Ollama is running and accessible."
+            ),
+            error_code=ErrorCode.OLLAMA_UNAVAILABLE,
+        )
+
+    def _status_error(self, exc: httpx.HTTPStatusError) -> ServiceUnavailableError:
+        """Build the error raised when Ollama answers with an HTTP error."""
+        logger.error(f"Ollama request failed: {str(exc)}")
+        return ServiceUnavailableError(
+            message="Summarization service returned an error.",
+            error_code=ErrorCode.OLLAMA_UNAVAILABLE,
+            details={"status_code": exc.response.status_code},
+        )
+
+    async def generate(
+        self,
+        payload: Dict[str, Any],
+        retry: Optional[RetryConfig] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> httpx.Response:
+        """POST to ``/api/generate`` with async exponential backoff.
+
+        Each attempt holds a governor slot; timeouts and connection failures
+        are retried, HTTP errors are not.
+
+        Raises:
+            ServiceUnavailableError: If Ollama times out, is unreachable or returns an error
+        """
+        retry = retry or DEFAULT_RETRY
+        payload = {"keep_alive": self.keep_alive, **payload}
+        for attempt in range(1, retry.max_attempts + 1):
+            delay = min(retry.initial_delay * (retry.exponential_base ** (attempt - 1)), retry.max_delay)
+            try:
+                async with self.governor.slot(priority):
+                    logger.debug(
+                        f"Sending request to Ollama at {self.base_url} (attempt {attempt}/{retry.max_attempts})"
+                    )
+                    response = await self.request("POST", "/api/generate", json=payload)
+                response.raise_for_status()
+                return response
+            except (httpx.TimeoutException, asyncio.TimeoutError) as exc:
+                if attempt < retry.max_attempts:
+                    logger.warning(
+                        f"Ollama request timed out (attempt {attempt}/{retry.max_attempts}), "
+                        f"retrying in {delay}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                raise self._timeout_error(attempt) from exc
+            except httpx.TransportError as exc:
+                if attempt < retry.max_attempts:
+                    logger.warning(
+                        f"Ollama connection failed (attempt {attempt}/{retry.max_attempts}), "
+                        f"retrying in {delay}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                raise self._connect_error(attempt) from exc
+            except httpx.HTTPStatusError as exc:
+                raise self._status_error(exc) from exc
+
+        raise RuntimeError("Retry logic failed unexpectedly")
+
+    async def stream_generate(
+        self,
+        payload: Dict[str, Any],
+        retry: Optional[RetryConfig] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """POST to ``/api/generate`` in streaming mode, yielding each JSON chunk.
+
+        A governor slot is held while the response streams. Failures are retried with backoff only until the first chunk arrives;
+        once output has been streamed a failure is raised immediately.
+
+        Raises:
+            ServiceUnavailableError: If Ollama times out, is unreachable or returns an error
+            json.JSONDecodeError: If a streamed line is not valid JSON
+        """
+        retry = retry or DEFAULT_RETRY
+        payload = {"keep_alive": self.keep_alive, **payload, "stream": True}
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, retry.max_attempts + 1):
+            delay = min(retry.initial_delay * (retry.exponential_base ** (attempt - 1)), retry.max_delay)
+            received = False
+            try:
+                async with self.governor.slot(priority):
+                    deadline = loop.time() + self.total_timeout
+                    logger.debug(
+                        f"Streaming request to Ollama at {self.base_url} (attempt {attempt}/{retry.max_attempts})"
+                    )
+                    async with self._get_client().stream("POST", "/api/generate", json=payload) as response:
+                        response.raise_for_status()
+                        async with contextlib.aclosing(response.aiter_lines()) as lines:
+                            async for line in lines:
+                                if loop.time() > deadline:
+                                    raise asyncio.TimeoutError()
+                                if not line.strip():
+                                    continue
+                                chunk = json.loads(line)
+                                received = True
+                                yield chunk
+                                if chunk.get("done"):
+                                    return
+                return
+            except (httpx.TimeoutException, asyncio.TimeoutError) as exc:
+                if not received and attempt < retry.max_attempts:
+                    logger.warning(
+                        f"Ollama request timed out (attempt {attempt}/{retry.max_attempts}), "
+                        f"retrying in {delay}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                raise self._timeout_error(attempt) from exc
+            except httpx.TransportError as exc:
+                if not received and attempt < retry.max_attempts:
+                    logger.warning(
+                        f"Ollama connection failed (attempt {attempt}/{retry.max_attempts}), "
+                        f"retrying in {delay}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                raise self._connect_error(attempt) from exc
+            except httpx.HTTPStatusError as exc:
+                raise self._status_error(exc) from exc
+
+    async def warm_up(
+        self,
+        model: str = OLLAMA_MODEL,
+        system: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Load a model into memory so the first job does not pay for a cold start.
+
+        Ollama loads the model without generating when the prompt is omitted.
+        With ``system``, one token is generated from a minimal prompt so the
+        system prompt is evaluated and later requests starting with it reuse
+        the cached prefix.
+
+        Raises:
+            httpx.HTTPError: If Ollama is unreachable or rejects the request
+            asyncio.TimeoutError: If loading exceeds the total timeout
+        """
+        payload: Dict[str, Any] = {"model": model, "keep_alive": self.keep_alive}
+        if options:
+            payload["options"] = dict(options)
+        if system:
+            payload.update(system=system, prompt=WARM_UP_PROMPT, stream=False)
+            payload["options"] = {**payload.get("options", {}), "num_predict": 1}
+        response = await self.request("POST", "/api/generate", json=payload)
+        response.raise_for_status()
+
+    def get_stats(self) -> dict:
+        """Concurrency and queue-wait metrics for this host."""
+        return {"base_url": self.base_url, **self.governor.get_stats()}
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+# Shared clients keyed by base URL
+_clients: Dict[str, OllamaClient] = {}
+
+
+def get_ollama_client(base_url: str = OLLAMA_BASE_URL) -> OllamaClient:
+    """Get the shared client for an Ollama host."""
+    key = base_url.rstrip("/")
+    client = _clients.get(key)
+    if client is None:
+        client = OllamaClient(key)
+        _clients[key] = client
+    return client
+
+
+async def close_ollama_clients() -> None:
+    """Close all shared Ollama clients (called on shutdown)."""
+    for client in list(_clients.values()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close Ollama client for {client.base_url}: {str(e)}")
+    _clients.clear()
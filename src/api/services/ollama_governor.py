@@ -0,0 +1,114 @@
+"""Client-side concurrency governor for Ollama requests.
+
+Ollama serves at most ``OLLAMA_NUM_PARALLEL`` requests per model at once and
+queues the rest internally, where they silently burn the request timeout.
+The governor keeps that queue on our side instead: requests wait for a free
+slot, interactive work is admitted ahead of batch work, and the time spent
+waiting is recorded.
+"""
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority for Ollama requests (lower is served first)."""
+    INTERACTIVE = 0  # A user is waiting on the result (streamed summaries)
+    BATCH = 1  # Background work (partial notes for long transcripts)
+
+
+class OllamaGovernor:
+    """Priority semaphore limiting concurrent requests to one Ollama host."""
+
+    def __init__(self, slots: int):
+        """
+        Args:
+            slots: Maximum number of requests in flight (match OLLAMA_NUM_PARALLEL)
+        """
+        self.slots = max(1, slots)
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._acquired = {priority: 0 for priority in Priority}
+        self._wait_total = {priority: 0.0 for priority in Priority}
+        self._wait_max = {priority: 0.0 for priority in Priority}
+
+    async def acquire(self, priority: Priority = Priority.BATCH) -> float:
+        """Wait for a slot and return the seconds spent waiting."""
+        started = time.monotonic()
+        if self._active < self.slots and not self._waiters:
+            self._active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over just as we were cancelled
+                    self.release()
+                raise
+
+        waited = time.monotonic() - started
+        self._acquired[priority] += 1
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+        if waited > 1.0:
+            logger.info(f"Waited {waited:.1f}s for an Ollama slot ({priority.name.lower()})")
+        return waited
+
+    def release(self) -> None:
+        """Release a slot, handing it to the highest-priority waiter."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: Priority = Priority.BATCH) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def active(self) -> int:
+        """Number of slots currently in use."""
+        return self._active
+
+    def waiting(self) -> Dict[str, int]:
+        """Number of queued requests by priority."""
+        counts = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                counts[Priority(priority).name.lower()] += 1
+        return counts
+
+    def get_stats(self) -> dict:
+        """Slot usage and queue-wait metrics."""
+        wait = {}
+        for priority in Priority:
+            acquired = self._acquired[priority]
+            wait[priority.name.lower()] = {
+                "acquired": acquired,
+                "avg_wait_seconds": round(self._wait_total[priority] / acquired, 3) if acquired else 0.0,
+                "max_wait_seconds": round(self._wait_max[priority], 3),
+            }
+        return {
+            "slots": self.slots,
+            "active": self._active,
+            "waiting": self.waiting(),
+            "wait": wait,
+        }
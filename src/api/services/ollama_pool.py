@@ -0,0 +1,414 @@
+"""Health-aware load balancing across Ollama hosts.
+
+Requests go to the host with the fewest outstanding requests relative to its
+slot count. Hosts are tracked passively: timeouts, connection failures and
+5xx responses count against a host, and after ``OLLAMA_EJECT_AFTER_FAILURES``
+in a row it is ejected from rotation for a back-off period. A periodic check
+of ``/api/tags`` refreshes which models each host has installed and
+re-admits hosts that answer again. A circuit breaker shared by all jobs
+fails requests fast once the service as a whole keeps failing.
+"""
+import asyncio
+import contextlib
+import itertools
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Set
+
+import httpx
+
+from src.api.services.ollama_client import DEFAULT_RETRY, OllamaClient, get_ollama_client
+from src.api.services.ollama_governor import Priority
+from src.utils.settings import (
+    OLLAMA_HOSTS,
+    OLLAMA_MODEL,
+    OLLAMA_EJECT_AFTER_FAILURES,
+    OLLAMA_EJECTION_SECONDS,
+    OLLAMA_HEALTH_INTERVAL,
+    OLLAMA_CIRCUIT_FAILURE_THRESHOLD,
+    OLLAMA_CIRCUIT_RESET_SECONDS,
+)
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.errors import ServiceUnavailableError, ErrorCode
+from src.utils.retry import RetryConfig
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# The pool retries across hosts, so each host gets a single attempt per try
+_SINGLE_ATTEMPT = RetryConfig(max_attempts=1)
+
+# Longest time a repeatedly failing host is kept out of rotation
+MAX_EJECTION_SECONDS = 300.0
+
+
+def _normalize_model(name: str) -> str:
+    """Ollama treats an untagged model name as ``<name>:latest``."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class Backend:
+    """Routing and health state for one Ollama host."""
+
+    def __init__(self, client: OllamaClient):
+        self.client = client
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.models: Optional[Set[str]] = None  # None until /api/tags is read
+        self.last_selected = 0
+
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+
+    @property
+    def load(self) -> float:
+        """Outstanding requests per governor slot."""
+        return self.outstanding / self.client.governor.slots
+
+    def is_ejected(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) < self.ejected_until
+
+    def serves(self, model: str) -> bool:
+        return self.models is None or _normalize_model(model) in self.models
+
+    def get_stats(self) -> dict:
+        remaining = max(0.0, self.ejected_until - time.monotonic())
+        return {
+            **self.client.get_stats(),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected": remaining > 0,
+            "ejected_for_seconds": round(remaining, 1),
+            "models": sorted(self.models) if self.models is not None else None,
+        }
+
+
+class OllamaPool:
+    """Route generation requests across several Ollama hosts."""
+
+    def __init__(
+        self,
+        clients: Sequence[OllamaClient],
+        eject_after_failures: int = OLLAMA_EJECT_AFTER_FAILURES,
+        ejection_seconds: float = OLLAMA_EJECTION_SECONDS,
+        max_ejection_seconds: float = MAX_EJECTION_SECONDS,
+        circuit_failure_threshold: int = OLLAMA_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_reset_seconds: float = OLLAMA_CIRCUIT_RESET_SECONDS,
+    ):
+        """
+        Args:
+            clients: One client per Ollama host
+            eject_after_failures: Consecutive failures before a host is ejected
+            ejection_seconds: First ejection period (doubles on each repeat)
+            max_ejection_seconds: Upper bound on the ejection period
+            circuit_failure_threshold: Consecutive failed attempts before failing fast
+            circuit_reset_seconds: Time the circuit stays open before a probe
+        """
+        if not clients:
+            raise ValueError("OllamaPool requires at least one client")
+        self.backends = [Backend(client) for client in clients]
+        self.eject_after_failures = eject_after_failures
+        self.ejection_seconds = ejection_seconds
+        self.max_ejection_seconds = max_ejection_seconds
+        self._sequence = itertools.count(1)
+        self.breaker = CircuitBreaker("ollama", circuit_failure_threshold, circuit_reset_seconds)
+
+    def select(self, model: str, avoid: Optional[Backend] = None) -> Backend:
+        """Pick the least-loaded healthy host that has the model.
+
+        If every capable host is ejected, the one due back soonest is used
+        rather than failing outright.
+
+        Raises:
+            ServiceUnavailableError: If no host has the model installed
+        """
+        now = time.monotonic()
+        capable = [b for b in self.backends if b.serves(model)]
+        if not capable:
+            raise ServiceUnavailableError(
+                message=f"No Ollama host has the model '{model}' installed. Run 'ollama pull {model}'.",
+                error_code=ErrorCode.OLLAMA_UNAVAILABLE,
+                details={"model": model},
+            )
+        healthy = [b for b in capable if not b.is_ejected(now)]
+        if not healthy:
+            backend = min(capable, key=lambda b: b.ejected_until)
+        else:
+            # Prefer a different host when retrying
+            candidates = [b for b in healthy if b is not avoid] or healthy
+            backend = min(candidates, key=lambda b: (b.load, b.last_selected))
+        backend.last_selected = next(self._sequence)
+        return backend
+
+    def _admit(self) -> None:
+        """Fail fast while the circuit is open.
+
+        Raises:
+            ServiceUnavailableError: If the circuit breaker rejects the request
+        """
+        if not self.breaker.allow_request():
+            retry_after = self.breaker.retry_after()
+            logger.warning(f"Ollama circuit open, rejecting request (retry in {retry_after:.0f}s)")
+            raise ServiceUnavailableError(
+                message=(
+                    "Summarization service is temporarily unavailable after repeated failures. "
+                    "Please try again shortly."
+                ),
+                error_code=ErrorCode.OLLAMA_UNAVAILABLE,
+                details={"circuit": self.breaker.state.value, "retry_after": round(retry_after, 1)},
+            )
+
+    def record_success(self, backend: Backend) -> None:
+        """Reset failure tracking after a successful request."""
+        self.breaker.record_success()
+        backend.consecutive_failures = 0
+        if backend.ejections and not backend.is_ejected():
+            logger.info(f"Ollama host {backend.base_url} recovered")
+            backend.ejections = 0
+
+    def record_failure(self, backend: Backend) -> None:
+        """Count a timeout, connection failure or 5xx against a host."""
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= self.eject_after_failures:
+            self._eject(backend)
+
+    def _eject(self, backend: Backend) -> None:
+        backend.ejections += 1
+        duration = min(self.ejection_seconds * (2 ** (backend.ejections - 1)), self.max_ejection_seconds)
+        backend.ejected_until = time.monotonic() + duration
+        # A single failure on re-admission ejects the host again
+        backend.consecutive_failures = self.eject_after_failures - 1
+        logger.warning(
+            f"Ejecting Ollama host {backend.base_url} for {duration:.0f}s "
+            f"after repeated failures (ejection #{backend.ejections})"
+        )
+
+    def _readmit(self, backend: Backend) -> None:
+        """Return an ejected host to rotation early (still one failure from re-ejection)."""
+        if backend.is_ejected():
+            logger.info(f"Re-admitting Ollama host {backend.base_url}")
+            backend.ejected_until = 0.0
+
+    def _handle_failure(self, backend: Backend, model: str, exc: ServiceUnavailableError) -> bool:
+        """Update host health for a failed request; return whether to retry."""
+        status_code = exc.details.get("status_code")
+        if status_code is not None and status_code < 500:
+            self.breaker.release()
+            if status_code == 404:
+                # Ollama answers 404 when the model is not installed on this host
+                backend.models = (backend.models or set()) - {_normalize_model(model)}
+                return any(b.serves(model) for b in self.backends)
+            return False
+        self.record_failure(backend)
+        self.breaker.record_failure()
+        if status_code is not None:
+            # Server errors are only worth retrying on a different host
+            now = time.monotonic()
+            return any(
+                b is not backend and b.serves(model) and not b.is_ejected(now)
+                for b in self.backends
+            )
+        return True
+
+    async def _choose(
+        self,
+        model: str,
+        previous: Optional[Backend],
+        attempt: int,
+        retry: RetryConfig,
+    ) -> Backend:
+        """Select a host, backing off first if the retry lands on the same one."""
+        backend = self.select(model, avoid=previous)
+        if backend is previous:
+            delay = min(retry.initial_delay * (retry.exponential_base ** (attempt - 2)), retry.max_delay)
+            logger.warning(
+                f"Retrying Ollama request on {backend.base_url} "
+                f"(attempt {attempt}/{retry.max_attempts}) in {delay}s..."
+            )
+            await asyncio.sleep(delay)
+        elif previous is not None:
+            logger.warning(
+                f"Retrying Ollama request on {backend.base_url} "
+                f"(attempt {attempt}/{retry.max_attempts})"
+            )
+        return backend
+
+    async def generate(
+        self,
+        payload: Dict[str, Any],
+        retry: Optional[RetryConfig] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> httpx.Response:
+        """Route a ``/api/generate`` request, failing over between hosts.
+
+        Raises:
+            ServiceUnavailableError: If every attempt fails or the circuit is open
+        """
+        retry = retry or DEFAULT_RETRY
+        model = payload.get("model", OLLAMA_MODEL)
+        previous = None
+        for attempt in range(1, retry.max_attempts + 1):
+            backend = await self._choose(model, previous, attempt, retry)
+            self._admit()
+            backend.outstanding += 1
+            backend.requests += 1
+            try:
+                response = await backend.client.generate(payload, retry=_SINGLE_ATTEMPT, priority=priority)
+            except ServiceUnavailableError as exc:
+                if not self._handle_failure(backend, model, exc) or attempt == retry.max_attempts:
+                    raise
+                previous = backend
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            finally:
+                backend.outstanding -= 1
+            self.record_success(backend)
+            return response
+
+        raise RuntimeError("Retry logic failed unexpectedly")
+
+    async def stream_generate(
+        self,
+        payload: Dict[str, Any],
+        retry: Optional[RetryConfig] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Route a streaming ``/api/generate`` request.
+
+        Failover happens only before the first chunk; once output has been
+        streamed a failure is raised immediately.
+
+        Raises:
+            ServiceUnavailableError: If every attempt fails or the circuit is open
+            json.JSONDecodeError: If a streamed line is not valid JSON
+        """
+        retry = retry or DEFAULT_RETRY
+        model = payload.get("model", OLLAMA_MODEL)
+        previous = None
+        for attempt in range(1, retry.max_attempts + 1):
+            backend = await self._choose(model, previous, attempt, retry)
+            self._admit()
+            backend.outstanding += 1
+            backend.requests += 1
+            received = False
+            try:
+                chunks = backend.client.stream_generate(payload, retry=_SINGLE_ATTEMPT, priority=priority)
+                async with contextlib.aclosing(chunks):
+                    async for chunk in chunks:
+                        received = True
+                        yield chunk
+            except ServiceUnavailableError as exc:
+                retryable = self._handle_failure(backend, model, exc)
+                if received or not retryable or attempt == retry.max_attempts:
+                    raise
+                previous = backend
+                continue
+            except BaseException:
+                # Consumer stopped early or the stream was malformed
+                self.breaker.release()
+                raise
+            finally:
+                backend.outstanding -= 1
+            self.record_success(backend)
+            return
+
+    async def refresh(self) -> None:
+        """Check every host's ``/api/tags``: update models and re-admit hosts that answer."""
+        await asyncio.gather(*(self._refresh_backend(backend) for backend in self.backends))
+
+    async def _refresh_backend(self, backend: Backend) -> None:
+        try:
+            response = await backend.client.request("GET", "/api/tags", timeout=5)
+            response.raise_for_status()
+            models = response.json().get("models", [])
+        except (httpx.HTTPError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"Ollama host {backend.base_url} failed health check: {str(e)}")
+            self.record_failure(backend)
+            return
+        backend.models = {
+            _normalize_model(m.get("name") or m.get("model", ""))
+            for m in models
+            if m.get("name") or m.get("model")
+        }
+        self._readmit(backend)
+
+    async def run_health_checks(self, interval: float = OLLAMA_HEALTH_INTERVAL) -> None:
+        """Refresh host health and models periodically (runs until cancelled)."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Ollama health check failed: {str(e)}")
+
+    async def warm_up(
+        self,
+        model: str = OLLAMA_MODEL,
+        system: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Load a model on every healthy host that has it; return how many succeeded."""
+        now = time.monotonic()
+        backends = [b for b in self.backends if b.serves(model) and not b.is_ejected(now)]
+        results = await asyncio.gather(
+            *(backend.client.warm_up(model, system=system, options=options) for backend in backends),
+            return_exceptions=True,
+        )
+        loaded = 0
+        for backend, result in zip(backends, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not warm up Ollama model {model} at {backend.base_url}: {str(result)}")
+            else:
+                loaded += 1
+        return loaded
+
+    def get_stats(self) -> dict:
+        """Circuit state plus routing, health and queue metrics for every host."""
+        return {
+            "circuit": self.breaker.get_stats(),
+            "hosts": [backend.get_stats() for backend in self.backends],
+        }
+
+
+_pool: Optional[OllamaPool] = None
+
+
+def get_ollama_pool() -> OllamaPool:
+    """Get the shared pool for the configured Ollama hosts."""
+    global _pool
+    if _pool is None:
+        _pool = OllamaPool([get_ollama_client(url) for url in OLLAMA_HOSTS])
+    return _pool
+
+
+async def warm_up_ollama(
+    model: str = OLLAMA_MODEL,
+    system: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Discover models and load the summarization model at startup.
+
+    ``system`` and ``options`` are passed to ``OllamaClient.warm_up``.
+    Failures are logged, not raised, so startup never blocks on Ollama.
+    """
+    pool = get_ollama_pool()
+    started = time.monotonic()
+    await pool.refresh()
+    try:
+        loaded = await pool.warm_up(model, system=system, options=options)
+    except Exception as e:
+        logger.warning(f"Could not warm up Ollama model {model}: {str(e)}")
+        return False
+    if not loaded:
+        return False
+    logger.info(f"Ollama model {model} loaded on {loaded} host(s) in {time.monotonic() - started:.1f}s")
+    return True
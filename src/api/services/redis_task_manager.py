@@ -0,0 +1,763 @@
+"""Redis-backed task store shared by all API workers.
+
+With several uvicorn workers, a status request can reach a different
+worker from the one processing the upload, so task state must live
+outside the process. Keys (all expiring with the task):
+
+    task:{id}            hash of status, progress, error fields and version
+    task:{id}:partial    streamed summary text
+    task:{id}:sections   hash of completed summary sections
+    task:{id}:result     result in the deduplicated stored form, encoded by src.cache.serializer
+    tasks:status:{s}     set of task IDs per status
+    tasks:expiry         sorted set of task IDs by expiry time
+
+Status changes run in WATCH/MULTI transactions so the status sets always
+agree with the task hashes. Every change is published on
+``task-events:{id}`` in the same transaction; each worker relays events
+from other workers to its own subscribers and drops its cached copy of
+the task.
+
+Redis is only called from one thread per worker, so the event loop never
+waits on it. Writes are queued and return at once; reads queue behind
+them and so always see this worker's earlier writes. Streamed summary
+tokens reach this worker's subscribers immediately but are written to
+Redis (and relayed to other workers) in one batch per flush interval.
+"""
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+from src.api.services.result_store import from_stored_form, to_stored_form
+from src.api.services.task_manager import (
+    BaseTaskManager,
+    ProcessingStage,
+    Task,
+    TaskProgress,
+    TaskStatus,
+    TERMINAL_STATUSES,
+)
+from src.cache import serializer
+from src.cache.local_cache import MISSING, LocalCache
+from src.utils.connections import LazyConnection
+from src.utils.errors import ErrorCode, ServiceUnavailableError
+from src.utils.settings import PROGRESS_DEBOUNCE_SECONDS, TASK_CACHE_SECONDS
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+STATUS_SET = "tasks:status:{}"
+EXPIRY_KEY = "tasks:expiry"
+EVENT_CHANNEL = "task-events:{}"
+_EVENT_PATTERN = EVENT_CHANNEL.format("*")
+_EVENT_PREFIX_LENGTH = len(EVENT_CHANNEL.format(""))
+
+# Task IDs removed per round trip during cleanup
+_CLEANUP_BATCH = 500
+
+# Tasks kept in each worker's local cache
+_CACHE_ENTRIES = 1000
+
+
+def _key(task_id: str, suffix: str = "") -> str:
+    return f"task:{task_id}{suffix}"
+
+
+def _task_keys(task_id: str) -> Tuple[str, ...]:
+    return (_key(task_id), _key(task_id, ":partial"), _key(task_id, ":sections"), _key(task_id, ":result"))
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _unavailable(details: Dict[str, Any]) -> ServiceUnavailableError:
+    return ServiceUnavailableError(
+        message="Task store is unavailable: Redis cannot be reached. Please try again shortly.",
+        error_code=ErrorCode.TASK_STORE_UNAVAILABLE,
+        details=details,
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _RedisResultLoader:
+    """Reads a task's result from Redis when Task.result is accessed."""
+
+    def __init__(self, client: redis.Redis, lane: ThreadPoolExecutor):
+        self._redis = client
+        self._lane = lane
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        data = self._redis.execute_command("GET", _key(task_id, ":result"), NEVER_DECODE=True)
+        return from_stored_form(serializer.loads(data)) if data else None
+
+    async def load_async(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.wrap_future(self._lane.submit(self.load, task_id))
+
+
+class RedisTaskManager(BaseTaskManager):
+    """Task store in Redis with the TaskManager interface.
+
+    Reads go through a small local cache for up to cache_seconds, so a
+    task polled from many clients costs one Redis read per interval.
+    Results are only fetched from Redis when Task.result is accessed.
+    Callers on the event loop use the async reads (get_task_async() and
+    friends); the sync ones wait for the Redis thread.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        cache_seconds: float = TASK_CACHE_SECONDS,
+        connection: Optional[LazyConnection] = None,
+        token_flush_seconds: float = PROGRESS_DEBOUNCE_SECONDS,
+    ):
+        """
+        Args:
+            client: Redis client created with decode_responses=True
+            cache_seconds: How long a task read from Redis is reused
+            connection: Background connection reporting whether Redis is
+                reachable; None treats Redis as always reachable
+            token_flush_seconds: How long streamed summary tokens are
+                batched before being written (0 writes each token)
+        """
+        super().__init__()
+        self._redis = client
+        self._connection = connection
+        # Runs every Redis call in submission order, off the event loop
+        self._lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix="redis-tasks")
+        self._results = _RedisResultLoader(client, self._lane)
+        self._cache = LocalCache(max_entries=_CACHE_ENTRIES, ttl=cache_seconds)
+        self._token_flush_seconds = token_flush_seconds
+        self._pending_tokens: Dict[str, List[str]] = {}
+        self._token_flushes: Dict[str, asyncio.TimerHandle] = {}
+        # Identifies this worker's events so its own are not relayed twice
+        self._origin = uuid.uuid4().hex
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener = None
+
+    @classmethod
+    def from_url(cls, url: str, connection: Optional[LazyConnection] = None) -> "RedisTaskManager":
+        """Create the store for a Redis URL without connecting.
+
+        The client connects on its first command; until ``connection``
+        is ready, creating and reading tasks raises ServiceUnavailableError.
+        """
+        client = redis.Redis.from_url(
+            url,
+            decode_responses=True,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+            health_check_interval=30,
+        )
+        return cls(client, connection=connection)
+
+    def _require_connection(self) -> None:
+        """
+        Raises:
+            ServiceUnavailableError: If the background connection has not reached Redis
+        """
+        if self._connection is None or self._connection.ready:
+            return
+        self._connection.start()
+        raise _unavailable({"service": self._connection.name, "state": self._connection.state.value})
+
+    def _report_failure(self, error: BaseException) -> None:
+        """Have the background connection re-check Redis after a failed call."""
+        if self._connection is not None and isinstance(error, redis.RedisError):
+            self._call_on_loop(self._connection.report_failure, error)
+
+    # ======= Redis thread =======
+
+    def _run(self, call: Callable[..., Any], *args: Any) -> Future:
+        """Queue a call on the Redis thread."""
+        return self._lane.submit(call, *args)
+
+    async def _run_async(self, call: Callable[..., Any], *args: Any) -> Any:
+        """Run a call on the Redis thread and wait for it without blocking the event loop.
+
+        Raises:
+            ServiceUnavailableError: If Redis fails the call
+        """
+        return await self._wait(self._run(call, *args))
+
+    async def _wait(self, future: Future) -> Any:
+        """Await a call queued on the Redis thread.
+
+        Raises:
+            ServiceUnavailableError: If Redis fails the call
+        """
+        try:
+            return await asyncio.wrap_future(future)
+        except redis.RedisError as e:
+            self._report_failure(e)
+            raise _unavailable({"error": str(e)}) from e
+
+    def _write(self, task_id: str, call: Callable[..., Any], *args: Any) -> Future:
+        """Queue a write without waiting for it; failures are logged.
+
+        The task's cached copy is dropped now, so later reads queue
+        behind the write instead of returning the old state.
+        """
+        loop = _running_loop()
+        if loop is not None:
+            self._loop = loop
+        self._cache.invalidate(task_id, count=False)
+        future = self._run(call, *args)
+        future.add_done_callback(self._write_done)
+        return future
+
+    def _write_done(self, future: Future) -> None:
+        # Runs on the Redis thread
+        error = future.exception()
+        if error is None:
+            return
+        logger.error(f"Task store write failed: {error}")
+        self._report_failure(error)
+
+    def _call_on_loop(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run a callback on the event loop this store is used from, or here if there is none."""
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(callback, *args)
+                return
+            except RuntimeError:
+                pass  # The loop is closed
+        callback(*args)
+
+    # ======= Events =======
+
+    def _start_listener(self) -> None:
+        """Relay events published by other workers to local subscribers.
+
+        Subscribing talks to Redis, so it is queued on the Redis thread;
+        reads queued after it only return state whose later changes are
+        relayed.
+        """
+        if self._listener is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._listener = self._run(self._listen)
+        self._listener.add_done_callback(self._listen_done)
+
+    def _listen(self):
+        # Runs on the Redis thread; returns the relay's worker thread
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{_EVENT_PATTERN: self._on_message})
+        return pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def _listen_done(self, future: Future) -> None:
+        error = future.exception()
+        if error is None:
+            return
+        logger.error(f"Could not subscribe to task events, retrying with the next subscriber: {error}")
+        self._listener = None
+        self._report_failure(error)
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        # Runs on the listener thread
+        task_id = message["channel"][_EVENT_PREFIX_LENGTH:]
+        origin, event, data = json.loads(message["data"])
+        if origin == self._origin:
+            return
+        self._cache.invalidate(task_id)
+        self._call_on_loop(self._deliver, task_id, event, data)
+
+    def _event(self, task_id: str, event: str, data: Dict[str, Any]) -> Tuple[str, str]:
+        """Channel and message for an event, to publish with the change."""
+        return EVENT_CHANNEL.format(task_id), json.dumps([self._origin, event, data])
+
+    def _changed(self, task_id: str, event: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Apply a committed change locally: drop the cached task and notify subscribers.
+
+        Runs on the Redis thread; without data, subscribers were already
+        notified when the change was queued.
+        """
+        self._cache.invalidate(task_id, count=False)
+        if data is not None:
+            self._call_on_loop(self._deliver, task_id, event, data)
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        """Register a queue that receives (event, data) tuples for a task.
+
+        Read the task with get_task_async() after subscribing: the read
+        queues behind the subscription to other workers' events.
+
+        Raises:
+            ServiceUnavailableError: If Redis is not reachable
+        """
+        self._require_connection()
+        self._start_listener()
+        return super().subscribe(task_id)
+
+    async def start_cleanup_worker(self) -> None:
+        """Start the event relay and the background worker for cleaning up old tasks."""
+        self._start_listener()
+        await super().start_cleanup_worker()
+
+    def flush(self) -> None:
+        """Write batched tokens and wait until every queued write has been made."""
+        for task_id in list(self._pending_tokens):
+            self._flush_tokens(task_id)
+        self._run(lambda: None).result()
+
+    def close(self) -> None:
+        """Write batched tokens, stop the event relay and close connections."""
+        for task_id in list(self._pending_tokens):
+            self._flush_tokens(task_id)
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                listener.result().stop()
+            except Exception:
+                pass  # Never subscribed
+        self._lane.shutdown(wait=True)
+        self._redis.close()
+
+    # ======= Writes =======
+
+    def _update(
+        self,
+        task_id: str,
+        fields: Dict[str, Any],
+        event: str,
+        status: Optional[TaskStatus] = None,
+        result: Optional[Dict[str, Any]] = None,
+        require_active: bool = False,
+        clear_summary: bool = False,
+        event_data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Atomically update a task's hash, status sets and result, and publish the change.
+
+        Runs on the Redis thread. The event carries the task's progress
+        after the update, merged with event_data.
+
+        Returns:
+            False if the task does not exist, or is finished and
+            require_active is set
+        """
+        key = _key(task_id)
+        data: Dict[str, Any] = {}
+
+        def apply(pipe) -> bool:
+            current = pipe.hgetall(key)
+            if not current.get("status"):
+                return False
+            if require_active and current["status"] in {s.value for s in TERMINAL_STATUSES}:
+                return False
+
+            state = {**current, **fields}
+            if status is not None:
+                state["status"] = status.value
+            data.clear()
+            data.update(
+                status=state["status"],
+                stage=state["stage"],
+                percent=int(state["percent"]),
+                message=state["message"],
+                **(event_data or {}),
+            )
+
+            mapping = dict(fields)
+            pipe.multi()
+            if state["status"] != current["status"]:
+                pipe.srem(STATUS_SET.format(current["status"]), task_id)
+                pipe.sadd(STATUS_SET.format(state["status"]), task_id)
+                mapping["status"] = state["status"]
+                if status in TERMINAL_STATUSES and status != TaskStatus.COMPLETED:
+                    # Failed and cancelled tasks are kept for a quarter of the retention
+                    retention = self._task_retention // 4
+                    pipe.zadd(EXPIRY_KEY, {task_id: time.time() + retention})
+                    for task_key in _task_keys(task_id):
+                        pipe.expire(task_key, retention)
+            pipe.hset(key, mapping=mapping)
+            pipe.hincrby(key, "version", 1)
+            if result is not None:
+                pipe.set(_key(task_id, ":result"), serializer.dumps(to_stored_form(result)), ex=self._task_retention)
+            if clear_summary:
+                pipe.delete(_key(task_id, ":partial"), _key(task_id, ":sections"))
+            pipe.publish(*self._event(task_id, event, data))
+            return True
+
+        if not self._redis.transaction(apply, key, value_from_callable=True):
+            return False
+        self._changed(task_id, event, data)
+        return True
+
+    def _append(self, task_id: str, event: str, data: Dict[str, Any], write, deliver: bool = True) -> None:
+        """Queue a summary write, a version bump and the event, sent in one round trip.
+
+        This worker's subscribers get the event now (unless deliver is
+        off because they already have it), in the order the writes are
+        made. Not guarded against missing tasks: stray keys expire, and
+        tasks without a status hash are treated as missing.
+        """
+        if deliver:
+            self._deliver(task_id, event, data)
+
+        def apply() -> None:
+            pipe = self._redis.pipeline()
+            write(pipe)
+            pipe.hincrby(_key(task_id), "version", 1)
+            pipe.expire(_key(task_id), self._task_retention)
+            pipe.publish(*self._event(task_id, event, data))
+            pipe.execute()
+            self._changed(task_id, event)
+
+        self._write(task_id, apply)
+
+    def _flush_tokens(self, task_id: str) -> None:
+        """Queue the batched summary tokens of a task as one append."""
+        handle = self._token_flushes.pop(task_id, None)
+        if handle is not None:
+            handle.cancel()
+        tokens = self._pending_tokens.pop(task_id, None)
+        if not tokens:
+            return
+        text = "".join(tokens)
+        partial_key = _key(task_id, ":partial")
+
+        def write(pipe):
+            pipe.append(partial_key, text)
+            pipe.expire(partial_key, self._task_retention)
+
+        # Local subscribers got each token as it arrived
+        self._append(task_id, "token", {"text": text}, write, deliver=False)
+
+    def _drop_tokens(self, task_id: str) -> None:
+        """Forget batched tokens that are about to be cleared anyway."""
+        handle = self._token_flushes.pop(task_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._pending_tokens.pop(task_id, None)
+
+    def _create(self) -> Tuple[str, Future]:
+        """Queue the creation of a task; returns its ID and the write's future."""
+        self._require_connection()
+        task_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+        key = _key(task_id)
+
+        def apply() -> None:
+            pipe = self._redis.pipeline()
+            pipe.hset(key, mapping={
+                "status": TaskStatus.PENDING.value,
+                "stage": ProcessingStage.UPLOADING.value,
+                "percent": 0,
+                "message": "Task created",
+                "updated_at": now.isoformat(),
+                "created_at": now.isoformat(),
+                "version": 0,
+            })
+            pipe.expire(key, self._task_retention)
+            pipe.sadd(STATUS_SET.format(TaskStatus.PENDING.value), task_id)
+            pipe.zadd(EXPIRY_KEY, {task_id: now.timestamp() + self._task_retention})
+            pipe.execute()
+
+        return task_id, self._write(task_id, apply)
+
+    def create_task(self) -> str:
+        """Create a new task and return its ID once it is stored.
+
+        Raises:
+            ServiceUnavailableError: If Redis is not reachable
+        """
+        task_id, future = self._create()
+        try:
+            future.result()
+        except redis.RedisError as e:
+            raise _unavailable({"error": str(e)}) from e
+        logger.info(f"Created task {task_id}")
+        return task_id
+
+    async def create_task_async(self) -> str:
+        """Create a new task and return its ID once it is stored, without blocking the event loop.
+
+        Raises:
+            ServiceUnavailableError: If Redis is not reachable or fails the write
+        """
+        task_id, future = self._create()
+        await self._wait(future)
+        logger.info(f"Created task {task_id}")
+        return task_id
+
+    def update_progress(
+        self,
+        task_id: str,
+        stage: ProcessingStage,
+        percent: int,
+        message: str = ""
+    ) -> None:
+        """Update task progress."""
+        fields = {
+            "stage": stage.value,
+            "percent": percent,
+            "message": message,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        def apply() -> None:
+            if not self._update(task_id, fields, "progress", status=TaskStatus.PROCESSING):
+                logger.warning(f"Attempted to update non-existent task {task_id}")
+                return
+            logger.debug(f"Task {task_id}: {stage.value} - {percent}% - {message}")
+
+        self._write(task_id, apply)
+
+    def append_summary_tokens(self, task_id: str, text: str) -> None:
+        """Accumulate streamed summary text for a task.
+
+        Subscribers on this worker get each token at once; on the event
+        loop the text is written to Redis in one append per flush interval.
+        """
+        self._deliver(task_id, "token", {"text": text})
+        self._pending_tokens.setdefault(task_id, []).append(text)
+        loop = _running_loop()
+        if loop is None or self._token_flush_seconds <= 0:
+            self._flush_tokens(task_id)
+        elif task_id not in self._token_flushes:
+            self._token_flushes[task_id] = loop.call_later(
+                self._token_flush_seconds, self._flush_tokens, task_id
+            )
+
+    def set_summary_section(self, task_id: str, key: str, content: str) -> None:
+        """Record a completed summary section for a task."""
+        self._flush_tokens(task_id)
+        sections_key = _key(task_id, ":sections")
+
+        def write(pipe):
+            pipe.hset(sections_key, key, content)
+            pipe.expire(sections_key, self._task_retention)
+
+        self._append(task_id, "section", {"key": key, "content": content}, write)
+
+    def reset_summary(self, task_id: str) -> None:
+        """Discard streamed summary output before summarization is retried."""
+        self._drop_tokens(task_id)
+        self._append(
+            task_id,
+            "summary_reset",
+            {},
+            lambda pipe: pipe.delete(_key(task_id, ":partial"), _key(task_id, ":sections")),
+        )
+
+    def complete_task(
+        self,
+        task_id: str,
+        result: Dict[str, Any]
+    ) -> None:
+        """Mark task as completed with result."""
+        self._drop_tokens(task_id)
+        now = datetime.now(timezone.utc).isoformat()
+        fields = {
+            "completed_at": now,
+            "stage": ProcessingStage.COMPLETED.value,
+            "percent": 100,
+            "message": "Processing completed successfully",
+            "updated_at": now,
+        }
+
+        def apply() -> None:
+            if not self._update(
+                task_id, fields, "complete", status=TaskStatus.COMPLETED, result=result, clear_summary=True
+            ):
+                logger.warning(f"Attempted to complete non-existent task {task_id}")
+                return
+            logger.info(f"Task {task_id} completed successfully")
+
+        self._write(task_id, apply)
+
+    def fail_task(
+        self,
+        task_id: str,
+        error: str,
+        error_code: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Mark task as failed with error, keeping any partial result."""
+        self._flush_tokens(task_id)
+        fields = {
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "error": error,
+            "error_code": error_code or "",
+        }
+
+        def apply() -> None:
+            if not self._update(
+                task_id,
+                fields,
+                "error",
+                status=TaskStatus.FAILED,
+                result=result,
+                event_data={"error": error, "error_code": error_code},
+            ):
+                logger.warning(f"Attempted to fail non-existent task {task_id}")
+                return
+            logger.error(f"Task {task_id} failed: {error}")
+
+        self._write(task_id, apply)
+
+    def _cancel(self, task_id: str) -> Future:
+        """Queue cancelling a pending or processing task; the future says whether it was."""
+        self._flush_tokens(task_id)
+        completed_at = datetime.now(timezone.utc).isoformat()
+
+        def apply() -> bool:
+            cancelled = self._update(
+                task_id,
+                {"completed_at": completed_at},
+                "cancelled",
+                status=TaskStatus.CANCELLED,
+                require_active=True,
+            )
+            if cancelled:
+                logger.info(f"Task {task_id} cancelled")
+            return cancelled
+
+        return self._write(task_id, apply)
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancel a pending or processing task."""
+        return self._cancel(task_id).result()
+
+    async def cancel_task_async(self, task_id: str) -> bool:
+        """Cancel a pending or processing task without blocking the event loop.
+
+        Raises:
+            ServiceUnavailableError: If Redis is not reachable
+        """
+        self._require_connection()
+        return await self._wait(self._cancel(task_id))
+
+    # ======= Reads =======
+
+    def _read_task(self, task_id: str) -> Optional[Task]:
+        # Runs on the Redis thread
+        pipe = self._redis.pipeline()
+        pipe.hgetall(_key(task_id))
+        pipe.get(_key(task_id, ":partial"))
+        pipe.hgetall(_key(task_id, ":sections"))
+        pipe.exists(_key(task_id, ":result"))
+        fields, partial_summary, sections, has_result = pipe.execute()
+        if not fields.get("status"):
+            return None
+
+        task = Task(
+            task_id=task_id,
+            status=TaskStatus(fields["status"]),
+            progress=TaskProgress(
+                stage=ProcessingStage(fields["stage"]),
+                percent=int(fields["percent"]),
+                message=fields["message"],
+                updated_at=_timestamp(fields["updated_at"]),
+            ),
+            created_at=_timestamp(fields["created_at"]),
+            completed_at=_timestamp(fields.get("completed_at")),
+            error=fields.get("error") or None,
+            error_code=fields.get("error_code") or None,
+            partial_summary=partial_summary or "",
+            partial_sections=sections,
+            version=int(fields.get("version", 0)),
+        )
+        if has_result:
+            task.result_store = self._results
+
+        self._cache.set(task_id, task)
+        return task
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Get task by ID, waiting for the Redis thread on a cache miss."""
+        cached = self._cache.get(task_id)
+        if cached is not MISSING:
+            return cached
+        return self._run(self._read_task, task_id).result()
+
+    async def get_task_async(self, task_id: str, fresh: bool = False) -> Optional[Task]:
+        """Get task by ID without blocking the event loop.
+
+        Args:
+            fresh: Read Redis even if this worker holds a cached copy
+
+        Raises:
+            ServiceUnavailableError: If Redis is not reachable
+        """
+        cached = MISSING if fresh else self._cache.get(task_id)
+        if cached is not MISSING:
+            return cached
+        self._require_connection()
+        return await self._run_async(self._read_task, task_id)
+
+    # ======= Cleanup =======
+
+    def _remove(self, task_ids: Iterable[str]) -> None:
+        pipe = self._redis.pipeline()
+        for task_id in task_ids:
+            pipe.delete(*_task_keys(task_id))
+            pipe.zrem(EXPIRY_KEY, task_id)
+            for status in TaskStatus:
+                pipe.srem(STATUS_SET.format(status.value), task_id)
+            self._cache.invalidate(task_id, count=False)
+        pipe.execute()
+
+    def _cleanup(self) -> int:
+        # Runs on the Redis thread
+        expired: List[str] = self._redis.zrangebyscore(EXPIRY_KEY, "-inf", time.time())
+        excess = self._redis.zcard(EXPIRY_KEY) - len(expired) - self._max_tasks
+        if excess > 0:
+            expired += self._redis.zrange(EXPIRY_KEY, len(expired), len(expired) + excess - 1)
+
+        for start in range(0, len(expired), _CLEANUP_BATCH):
+            self._remove(expired[start:start + _CLEANUP_BATCH])
+
+        if expired:
+            logger.info(f"Cleaned up {len(expired)} old tasks from Redis")
+        return len(expired)
+
+    def cleanup_old_tasks(self) -> int:
+        """Remove expired tasks, then the tasks closest to expiry beyond the limit."""
+        return self._run(self._cleanup).result()
+
+    async def cleanup_old_tasks_async(self) -> int:
+        """cleanup_old_tasks() without blocking the event loop."""
+        self._require_connection()
+        return await self._run_async(self._cleanup)
+
+    def _read_stats(self) -> dict:
+        # Runs on the Redis thread
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zcard(EXPIRY_KEY)
+        for status in TaskStatus:
+            pipe.scard(STATUS_SET.format(status.value))
+        total, *counts = pipe.execute()
+
+        return {
+            "backend": "redis",
+            "total_tasks": total,
+            "status_breakdown": {status.value: count for status, count in zip(TaskStatus, counts)},
+            "retention_hours": self._task_retention / 3600,
+            "local_cache": self._cache.get_stats(),
+        }
+
+    def get_stats(self) -> dict:
+        """Get task statistics across all workers."""
+        return self._run(self._read_stats).result()
+
+    async def get_stats_async(self) -> dict:
+        """Get task statistics across all workers without blocking the event loop.
+
+        Raises:
+            ServiceUnavailableError: If Redis is not reachable
+        """
+        self._require_connection()
+        return await self._run_async(self._read_stats)
@@ -0,0 +1,141 @@
+"""Compressed on-disk storage for task results that exceed the memory budget.
+
+Pipeline results carry the transcript twice (``transcription`` and
+``transcript.text``) and the summary twice (parsed ``summary`` sections and
+raw ``summary_text``). The stored form keeps one copy of each and restores
+the other on load, then the JSON is zlib-compressed into one file per task.
+"""
+import asyncio
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Keys recording which duplicated fields were dropped from the stored form
+_DEDUP_KEY = "_dedup"
+
+_SUFFIX = ".json.z"
+
+
+def _parse_summary(summary_text: str) -> Dict[str, str]:
+    # Imported lazily: the summarizer pulls in the Ollama client stack
+    from src.api.services.summarizer import parse_summary_sections
+    return parse_summary_sections(summary_text)
+
+
+def to_stored_form(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop fields that can be rebuilt from another field of the result."""
+    stored = dict(result)
+    dropped = []
+    transcript = stored.get("transcript")
+    if isinstance(transcript, dict) and "transcription" in stored and stored["transcription"] == transcript.get("text"):
+        del stored["transcription"]
+        dropped.append("transcription")
+    summary_text = stored.get("summary_text")
+    if isinstance(summary_text, str) and "summary" in stored and stored["summary"] == _parse_summary(summary_text):
+        del stored["summary"]
+        dropped.append("summary")
+    if dropped:
+        stored[_DEDUP_KEY] = dropped
+    return stored
+
+
+def from_stored_form(stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the fields dropped by to_stored_form()."""
+    result = dict(stored)
+    dropped = result.pop(_DEDUP_KEY, ())
+    if "transcription" in dropped:
+        result["transcription"] = result["transcript"]["text"]
+    if "summary" in dropped:
+        result["summary"] = _parse_summary(result["summary_text"])
+    return result
+
+
+def encode_result(result: Dict[str, Any]) -> bytes:
+    """Serialize a result's stored form as JSON (uncompressed)."""
+    return json.dumps(to_stored_form(result), separators=(",", ":"), default=str).encode("utf-8")
+
+
+def result_size(result: Dict[str, Any]) -> int:
+    """Size of a result's full JSON encoding, duplicated fields included.
+
+    Approximates the memory the result holds while it is kept in memory.
+    """
+    return len(json.dumps(result, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def decode_result(data) -> Dict[str, Any]:
+    """Deserialize a result written by encode_result()."""
+    return from_stored_form(json.loads(data))
+
+
+class ResultStore:
+    """One compressed file per spilled task result."""
+
+    def __init__(self, directory: str, max_age_seconds: Optional[float] = None):
+        """
+        Args:
+            directory: Spill directory, created if missing
+            max_age_seconds: Remove files older than this left by earlier runs
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        if max_age_seconds is not None:
+            self._remove_stale(max_age_seconds)
+
+    def _path(self, task_id: str) -> str:
+        return os.path.join(self.directory, f"{task_id}{_SUFFIX}")
+
+    def save(self, task_id: str, result: Dict[str, Any]) -> int:
+        """Write a result; returns its size on disk in bytes.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        data = zlib.compress(encode_result(result), 6)
+        path = self._path(task_id)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return len(data)
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read a spilled result, or None if it is missing or unreadable."""
+        try:
+            with open(self._path(task_id), "rb") as f:
+                return decode_result(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error) as e:
+            logger.error(f"Could not load spilled result for task {task_id}: {e}")
+            return None
+
+    async def load_async(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """load() in a worker thread, for callers on the event loop."""
+        return await asyncio.to_thread(self.load, task_id)
+
+    def discard(self, task_id: str) -> None:
+        try:
+            os.remove(self._path(task_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove spilled result for task {task_id}: {e}")
+
+    def _remove_stale(self, max_age_seconds: float) -> None:
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith((_SUFFIX, ".tmp")) and entry.stat().st_mtime < cutoff:
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+        if removed:
+            logger.info(f"Removed {removed} stale spilled task results from {self.directory}")
@@ -1,8 +1,27 @@
 import re
-import requests
-from typing import Optional, Dict
-from src.utils.settings import OLLAMA_URL, OLLAMA_MODEL, OLLAMA_TIMEOUT
-from src.utils.errors import ProcessingError, ServiceUnavailableError, ErrorCode
+import json
+import asyncio
+import contextlib
+from typing import Callable, Dict, List, Optional, Tuple
+from src.api.services.ollama_pool import get_ollama_pool, warm_up_ollama
+from src.api.services.ollama_governor import Priority
+from src.api.services.token_budget import (
+    TEMPLATE_OVERHEAD_TOKENS,
+    context_size,
+    count_tokens,
+    fits_context,
+    use_context_size,
+    working_context_size,
+)
+from src.api.services.transcript_compression import compress_segments
+from src.utils.settings import (
+    OLLAMA_MODEL,
+    OLLAMA_NUM_CTX,
+    SUMMARY_COMPRESSION_ENABLED,
+    SUMMARY_COMPRESSION_RATIO,
+    SUMMARY_MAP_CONCURRENCY,
+)
+from src.utils.errors import ProcessingError, ErrorCode
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -35,61 +54,145 @@ def _map_heading_to_key(heading: str) -> Optional[str]:
     return None
 
 
+_HEADING_RE = re.compile(r"^\s*#{2,4}\s*(.+?)\s*$")
+
+
+class SummarySectionParser:
+    """Incrementally parse streamed LLM output into summary sections.
+
+    Text is fed in arbitrary chunks; a section is emitted as soon as the
+    next heading closes it, and the final section is emitted on ``close()``.
+    """
+
+    def __init__(self):
+        self.sections: Dict[str, str] = dict(_EMPTY_SUMMARY)
+        self.text = ""
+        self._line_buffer = ""
+        self._seen_heading = False
+        self._current_key: Optional[str] = None
+        self._current_lines: List[str] = []
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk of text and return sections completed by it."""
+        self.text += chunk
+        self._line_buffer += chunk
+        *lines, self._line_buffer = self._line_buffer.split("\n")
+        completed: List[Tuple[str, str]] = []
+        for line in lines:
+            completed.extend(self._process_line(line))
+        return completed
+
+    def close(self) -> List[Tuple[str, str]]:
+        """Flush buffered text and return the final section(s)."""
+        completed = self._process_line(self._line_buffer) if self._line_buffer else []
+        self._line_buffer = ""
+        completed.extend(self._finish_section())
+        if not self._seen_heading or not any(self.sections.values()):
+            self.sections["summary"] = self.text.strip()
+        return completed
+
+    def _process_line(self, line: str) -> List[Tuple[str, str]]:
+        match = _HEADING_RE.match(line)
+        if not match:
+            self._current_lines.append(line)
+            return []
+        completed = self._finish_section()
+        self._seen_heading = True
+        self._current_key = _map_heading_to_key(match.group(1))
+        return completed
+
+    def _finish_section(self) -> List[Tuple[str, str]]:
+        key, content = self._current_key, "\n".join(self._current_lines).strip()
+        self._current_key = None
+        self._current_lines = []
+        if key and content:
+            self.sections[key] = content
+            return [(key, content)]
+        return []
+
+
 def parse_summary_sections(text: str) -> Dict[str, str]:
     """Parse LLM summary text into structured sections."""
-    sections = dict(_EMPTY_SUMMARY)
     if not text:
-        return sections
-
-    matches = list(re.finditer(r"^\s*#{2,4}\s*(.+?)\s*$", text, re.MULTILINE))
-    if not matches:
-        sections["summary"] = text.strip()
-        return sections
-
-    for idx, match in enumerate(matches):
-        key = _map_heading_to_key(match.group(1))
-        start = match.end()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-        content = text[start:end].strip()
-        if key and content:
-            sections[key] = content
+        return dict(_EMPTY_SUMMARY)
 
-    if not any(sections.values()):
-        sections["summary"] = text.strip()
+    parser = SummarySectionParser()
+    parser.feed(text)
+    parser.close()
+    return parser.sections
 
-    return sections
 
+# Output budget: the requested share of the transcript's tokens plus room
+# for the section headings, within these bounds
+_FORMAT_OVERHEAD_TOKENS = 96
+_MIN_PREDICT = 256
+_MAX_PREDICT = 2048
 
-def generate_summary(text: str, ratio: float = 0.15, subject: Optional[str] = None) -> str:
-    """
-    Generate structured clinical study notes using Ollama.
-    
-    Args:
-        text: Transcript text to summarize
-        ratio: Target summary length ratio (0.0-1.0)
-        subject: Optional subject/topic for tailored summaries (e.g., 'anatomy', 'pharmacology')
-        
-    Returns:
-        Formatted summary text
-        
-    Raises:
-        ServiceUnavailableError: If Ollama is unavailable
-        ProcessingError: If summarization fails
+# Tokens reserved for the instruction, subject and label in the user prompt
+_USER_PROMPT_OVERHEAD_TOKENS = 64
+
+# Upper bound on merge rounds when partial notes still overflow the context
+_MAX_MERGE_ROUNDS = 3
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _summary_predict(tokens: int, ratio: float) -> int:
+    """Output tokens to request for notes on ``tokens`` tokens of input."""
+    return min(max(int(tokens * ratio) + _FORMAT_OVERHEAD_TOKENS, _MIN_PREDICT), _MAX_PREDICT)
+
+
+def _split_oversized(words: List[str], max_tokens: int) -> List[Tuple[str, int]]:
+    """Cut a run of words into (piece, tokens) of at most ``max_tokens`` tokens."""
+    pieces = []
+    start = 0
+    while start < len(words):
+        end = len(words)
+        piece = " ".join(words[start:end])
+        tokens = count_tokens(piece)
+        while tokens > max_tokens and end - start > 1:
+            # Shrink proportionally, then by at least one word
+            end = start + max(1, min(end - start - 1, int((end - start) * max_tokens / tokens)))
+            piece = " ".join(words[start:end])
+            tokens = count_tokens(piece)
+        pieces.append((piece, tokens))
+        start = end
+    return pieces
+
+
+def split_into_windows(segments: List[str], max_tokens: int) -> List[str]:
+    """Pack consecutive transcript segments into windows of at most ``max_tokens``.
+
+    Windows always end on a segment boundary; a single segment longer than
+    the budget is cut on word boundaries instead.
     """
-    logger.info(f"Starting summarization (ratio={ratio}, subject={subject})")
-    
-    # Validate ratio
-    if not 0.0 <= ratio <= 1.0:
-        logger.warning(f"Invalid ratio {ratio}, using default 0.15")
-        ratio = 0.15
-    
-    # Calculate target tokens (Ollama uses num_predict)
-    num_predict = int(len(text.split()) * ratio * 1.8)
-    
-    # Build subject-specific prompt
-    subject_context = f" Focus on {subject} content." if subject else ""
-    
-    prompt = f"""You are CogniScribe, an AI assistant helping medical and nursing students learn from lecture recordings.
+    windows: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for segment in segments:
+        tokens = count_tokens(segment)
+        pieces = [(segment, tokens)] if tokens <= max_tokens else _split_oversized(segment.split(), max_tokens)
+        for piece, tokens in pieces:
+            if current and current_tokens + tokens > max_tokens:
+                windows.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        windows.append(" ".join(current))
+    return windows
+
+
+# Static instructions sent as the system prompt. Ollama keeps the evaluated
+# prompt in the KV cache of the loaded model and reuses the longest matching
+# prefix, so these must stay byte-identical between calls: everything that
+# varies (subject, transcript) goes in the user prompt after them.
+_ASSISTANT_INTRO = (
+    "You are CogniScribe, an AI assistant helping medical and nursing students "
+    "learn from lecture recordings."
+)
+
+SUMMARY_SYSTEM_PROMPT = f"""{_ASSISTANT_INTRO}
 
 Generate well-structured study notes in the following format:
 
@@ -106,121 +209,322 @@ Generate well-structured study notes in the following format:
 [Any clinical procedures, techniques, or protocols discussed]
 
 ### Summary
-[Concise overview connecting all concepts]{subject_context}
+[Concise overview connecting all concepts]"""
 
-Transcript:
-{text}
-"""
-    
-    payload = {
+NOTES_SYSTEM_PROMPT = f"""{_ASSISTANT_INTRO}
+
+You take intermediate notes on parts of a long lecture. Use concise bullet points covering learning objectives, core concepts, clinical terms (with definitions) and procedures. Keep every distinct fact and do not add an introduction or conclusion."""
+
+
+def _prompt_tokens(system: str, prompt: str) -> int:
+    """Tokens Ollama evaluates for a system and user prompt."""
+    return count_tokens(system) + count_tokens(prompt) + TEMPLATE_OVERHEAD_TOKENS
+
+
+def _window_budget() -> int:
+    """Token budget for one window's input (an equal share is left for output)."""
+    overhead = max(count_tokens(SUMMARY_SYSTEM_PROMPT), count_tokens(NOTES_SYSTEM_PROMPT))
+    return (OLLAMA_NUM_CTX - overhead - TEMPLATE_OVERHEAD_TOKENS - _USER_PROMPT_OVERHEAD_TOKENS) // 2
+
+
+def _build_user_prompt(body: str, subject: Optional[str], label: str, instruction: str = "") -> str:
+    """Build the variable part of a prompt; the instructions live in the system prompt."""
+    parts = [instruction] if instruction else []
+    if subject:
+        parts.append(f"Focus on {subject} content.")
+    parts.append(f"{label}:\n{body}\n")
+    return "\n\n".join(parts)
+
+
+def _build_options(num_predict: int, num_ctx: int = OLLAMA_NUM_CTX) -> Dict:
+    return {
+        "temperature": 0.2,
+        "num_predict": num_predict,
+        "num_ctx": num_ctx,
+    }
+
+
+def _build_payload(system: str, prompt: str, num_predict: int, stream: bool) -> Dict:
+    """Build a generate request with a context sized to the prompt and output."""
+    prompt_tokens = _prompt_tokens(system, prompt)
+    num_ctx = context_size(prompt_tokens + num_predict)
+    use_context_size(num_ctx)
+    # Never let generation push the prompt out of the context
+    num_predict = max(1, min(num_predict, num_ctx - prompt_tokens))
+    logger.debug(f"Prompt {prompt_tokens} tokens, num_predict={num_predict}, num_ctx={num_ctx}")
+    return {
         "model": OLLAMA_MODEL,
+        "system": system,
         "prompt": prompt,
-        "stream": False,
-        "options": {
-            "temperature": 0.2,
-            "num_predict": num_predict
-        }
+        "stream": stream,
+        "options": _build_options(num_predict, num_ctx),
     }
-    
-    # Retry configuration for Ollama requests
-    max_retries = 3
-    retry_delay = 2.0
-    
-    last_exception = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            logger.debug(f"Sending request to Ollama at {OLLAMA_URL} (attempt {attempt}/{max_retries})")
-            response = requests.post(
-                OLLAMA_URL,
-                json=payload,
-                timeout=OLLAMA_TIMEOUT
-            )
-            response.raise_for_status()
-            break  # Success, exit retry loop
-        except requests.exceptions.Timeout as exc:
-            last_exception = exc
-            if attempt < max_retries:
-                logger.warning(
-                    f"Ollama request timed out (attempt {attempt}/{max_retries}), "
-                    f"retrying in {retry_delay}s..."
-                )
-                import time
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-                continue
-            # Last attempt failed
-            logger.error(f"Ollama request timed out after {max_retries} attempts")
-            raise ServiceUnavailableError(
-                message=(
-                    "Summarization timed out after multiple attempts. "
-                    "The transcript may be too long or Ollama is overloaded. "
-                    "Try increasing OLLAMA_TIMEOUT or reducing the audio length."
-                ),
-                error_code=ErrorCode.OLLAMA_TIMEOUT,
-            ) from exc
-        except requests.exceptions.ConnectionError as exc:
-            last_exception = exc
-            if attempt < max_retries:
-                logger.warning(
-                    f"Ollama connection failed (attempt {attempt}/{max_retries}), "
-                    f"retrying in {retry_delay}s..."
-                )
-                import time
-                time.sleep(retry_delay)
-                retry_delay *= 2
-                continue
-            # Last attempt failed
-            logger.error(f"Could not connect to Ollama at {OLLAMA_URL} after {max_retries} attempts")
-            raise ServiceUnavailableError(
-                message=(
-                    f"Cannot connect to Ollama service at {OLLAMA_URL} after {max_retries} attempts. "
-                    "Ensure Ollama is running and accessible."
-                ),
-                error_code=ErrorCode.OLLAMA_UNAVAILABLE,
-            ) from exc
-    except requests.exceptions.Timeout as exc:
-        logger.error(f"Ollama request timed out after {OLLAMA_TIMEOUT}s")
-        raise ServiceUnavailableError(
-            message=(
-                "Summarization timed out. The transcript may be too long. "
-                "Try increasing OLLAMA_TIMEOUT or reducing the audio length."
-            ),
-            error_code=ErrorCode.OLLAMA_TIMEOUT,
-        ) from exc
-    except requests.exceptions.ConnectionError as exc:
-        logger.error(f"Could not connect to Ollama at {OLLAMA_URL}")
-        raise ServiceUnavailableError(
-            message=(
-                f"Cannot connect to Ollama service at {OLLAMA_URL}. "
-                "Ensure Ollama is running and accessible."
-            ),
-            error_code=ErrorCode.OLLAMA_UNAVAILABLE,
-        ) from exc
-    except requests.exceptions.RequestException as exc:
-        status_code = getattr(exc.response, "status_code", None)
-        details = {"status_code": status_code} if status_code else None
-        logger.error(f"Ollama request failed: {str(exc)}")
-        raise ServiceUnavailableError(
-            message="Summarization service returned an error.",
-            error_code=ErrorCode.OLLAMA_UNAVAILABLE,
-            details=details,
-        ) from exc
 
+
+def _log_eval_stats(result: Dict) -> None:
+    """Log prompt evaluation metrics from a final Ollama response."""
+    if "prompt_eval_count" in result:
+        logger.debug(
+            f"Ollama evaluated {result['prompt_eval_count']} prompt tokens in "
+            f"{result.get('prompt_eval_duration', 0) / 1e6:.0f}ms"
+        )
+
+
+def _ollama_error(error: str) -> ProcessingError:
+    logger.error(f"Ollama reported an error: {error}")
+    return ProcessingError(
+        message="Summarization service returned an error.",
+        error_code=ErrorCode.SUMMARIZATION_FAILED,
+        details={"ollama_error": error},
+    )
+
+
+def _invalid_json_error(exc: json.JSONDecodeError) -> ProcessingError:
+    logger.error(f"Invalid JSON response from Ollama: {str(exc)}")
+    return ProcessingError(
+        message="Summarization service returned invalid JSON.",
+        error_code=ErrorCode.SUMMARIZATION_FAILED,
+    )
+
+
+def _empty_response_error() -> ProcessingError:
+    return ProcessingError(
+        message="Summarization service returned empty response.",
+        error_code=ErrorCode.SUMMARIZATION_FAILED,
+    )
+
+
+async def _complete(system: str, prompt: str, num_predict: int, priority: Priority) -> str:
+    """Run a single non-streaming generation and return its text."""
+    payload = await asyncio.to_thread(_build_payload, system, prompt, num_predict, stream=False)
+    response = await get_ollama_pool().generate(payload, priority=priority)
     try:
         result = response.json()
-    except ValueError as exc:
-        logger.error(f"Invalid JSON response from Ollama: {str(exc)}")
-        raise ProcessingError(
-            message="Summarization service returned invalid JSON.",
-            error_code=ErrorCode.SUMMARIZATION_FAILED,
-        ) from exc
-
-    summary = result.get("response", "")
+    except json.JSONDecodeError as exc:
+        raise _invalid_json_error(exc) from exc
+    if result.get("error"):
+        raise _ollama_error(result["error"])
+    _log_eval_stats(result)
+    return result.get("response", "").strip()
+
+
+async def _stream_completion(
+    system: str,
+    prompt: str,
+    num_predict: int,
+    on_token: Optional[Callable[[str], None]],
+    on_section: Optional[Callable[[str, str], None]],
+    priority: Priority,
+) -> str:
+    """Run a streaming generation, reporting tokens and completed sections."""
+    parser = SummarySectionParser()
+    payload = await asyncio.to_thread(_build_payload, system, prompt, num_predict, stream=True)
+    try:
+        chunks = get_ollama_pool().stream_generate(payload, priority=priority)
+        async with contextlib.aclosing(chunks):
+            async for chunk in chunks:
+                if chunk.get("error"):
+                    raise _ollama_error(chunk["error"])
+                if chunk.get("done"):
+                    _log_eval_stats(chunk)
+                token = chunk.get("response", "")
+                if not token:
+                    continue
+                if on_token:
+                    on_token(token)
+                for key, content in parser.feed(token):
+                    if on_section:
+                        on_section(key, content)
+    except json.JSONDecodeError as exc:
+        raise _invalid_json_error(exc) from exc
+
+    summary = parser.text
     if not summary.strip():
-        raise ProcessingError(
-            message="Summarization service returned empty response.",
-            error_code=ErrorCode.SUMMARIZATION_FAILED,
+        raise _empty_response_error()
+
+    for key, content in parser.close():
+        if on_section:
+            on_section(key, content)
+    return summary
+
+
+async def _map_notes(
+    windows: List[str],
+    ratio: float,
+    subject: Optional[str],
+    instruction: str,
+    label: str,
+) -> List[str]:
+    """Generate notes for each window concurrently, preserving window order."""
+    semaphore = asyncio.Semaphore(SUMMARY_MAP_CONCURRENCY)
+    budget = await asyncio.to_thread(_window_budget)
+    total = len(windows)
+
+    async def run(index: int, window: str) -> str:
+        window_tokens = await asyncio.to_thread(count_tokens, window)
+        num_predict = min(_summary_predict(window_tokens, ratio), budget)
+        prompt = _build_user_prompt(
+            window,
+            subject,
+            label.format(index=index + 1, total=total),
+            instruction.format(index=index + 1, total=total),
         )
+        async with semaphore:
+            logger.debug(f"Generating partial notes {index + 1}/{total}")
+            return await _complete(NOTES_SYSTEM_PROMPT, prompt, num_predict, Priority.BATCH)
+
+    tasks = [asyncio.ensure_future(run(index, window)) for index, window in enumerate(windows)]
+    try:
+        notes = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return [note for note in notes if note]
+
+
+async def _map_reduce_summary(
+    segments: List[str],
+    num_predict: int,
+    ratio: float,
+    subject: Optional[str],
+    on_token: Optional[Callable[[str], None]],
+    on_section: Optional[Callable[[str, str], None]],
+    priority: Priority,
+) -> str:
+    """Summarize a transcript too long for one context window.
+
+    Map: each window of consecutive segments is condensed into partial notes
+    at batch priority. Reduce: the notes (merged further if they still
+    overflow) are turned into the five-section format with a final streaming
+    call at the job's priority.
+    """
+    # Token counting can take a while on long transcripts, so it runs off the event loop
+    budget = await asyncio.to_thread(_window_budget)
+    windows = await asyncio.to_thread(split_into_windows, segments, budget)
+    logger.info(
+        f"Transcript exceeds model context, summarizing {len(windows)} windows "
+        f"(concurrency={SUMMARY_MAP_CONCURRENCY})"
+    )
+    notes = await _map_notes(
+        windows,
+        ratio,
+        subject,
+        instruction="Below is part {index} of {total} of a lecture transcript. Write study notes for this part.",
+        label="Transcript part {index}/{total}",
+    )
+    if not notes:
+        raise _empty_response_error()
+
+    for _ in range(_MAX_MERGE_ROUNDS):
+        if await asyncio.to_thread(count_tokens, "\n\n".join(notes)) <= budget:
+            break
+        groups = await asyncio.to_thread(split_into_windows, notes, budget)
+        if len(groups) >= len(notes):
+            break
+        logger.info(f"Merging {len(notes)} partial notes into {len(groups)} groups")
+        notes = await _map_notes(
+            groups,
+            ratio,
+            subject,
+            instruction="Below are notes from consecutive parts of a lecture. Merge them into one set of notes, removing duplicates.",
+            label="Notes group {index}/{total}",
+        )
+        if not notes:
+            raise _empty_response_error()
+
+    body = "\n\n".join(f"Part {index}:\n{note}" for index, note in enumerate(notes, start=1))
+    prompt = _build_user_prompt(
+        body,
+        subject,
+        label="Partial notes (in lecture order)",
+        instruction=(
+            "The lecture was too long to process at once, so notes were taken from consecutive parts of it. "
+            "Merge these partial notes into a single set of study notes without repeating points."
+        ),
+    )
+    return await _stream_completion(
+        SUMMARY_SYSTEM_PROMPT, prompt, min(num_predict, budget), on_token, on_section, priority
+    )
+
+
+async def generate_summary(
+    text: str,
+    ratio: float = 0.15,
+    subject: Optional[str] = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    on_section: Optional[Callable[[str, str], None]] = None,
+    segments: Optional[List[str]] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> str:
+    """
+    Generate structured clinical study notes using Ollama's streaming API.
+    
+    Prompt tokens are counted to request the smallest context window that
+    holds the prompt and output. Transcripts that do not fit the largest
+    context (``OLLAMA_NUM_CTX``) are summarized map-reduce: windows are
+    condensed concurrently and the partial notes merged by a final call.
+    With ``SUMMARY_COMPRESSION_ENABLED``, fillers and redundant sentences are
+    removed first; the output budget still follows the full transcript.
+    
+    Args:
+        text: Transcript text to summarize
+        ratio: Target summary length ratio (0.0-1.0)
+        subject: Optional subject/topic for tailored summaries (e.g., 'anatomy', 'pharmacology')
+        on_token: Optional callback receiving each generated text chunk
+        on_section: Optional callback receiving (key, content) as each section completes
+        segments: Optional transcript segments used as window boundaries
+            (defaults to sentences of ``text``)
+        priority: Admission priority for the Ollama request queue
+        
+    Returns:
+        Formatted summary text
+        
+    Raises:
+        ServiceUnavailableError: If Ollama is unavailable
+        ProcessingError: If summarization fails
+    """
+    logger.info(f"Starting summarization (ratio={ratio}, subject={subject})")
+    
+    # Validate ratio
+    if not 0.0 <= ratio <= 1.0:
+        logger.warning(f"Invalid ratio {ratio}, using default 0.15")
+        ratio = 0.15
+    
+    # Token counts run off the event loop: long transcripts take a while to tokenize
+    original_tokens = await asyncio.to_thread(count_tokens, text)
+    num_predict = _summary_predict(original_tokens, ratio)
+    
+    if SUMMARY_COMPRESSION_ENABLED:
+        target = max(1, int(original_tokens * SUMMARY_COMPRESSION_RATIO))
+        segments, _ = await asyncio.to_thread(
+            compress_segments, segments or _SENTENCE_RE.split(text), target
+        )
+        text = " ".join(segments)
+    
+    prompt = _build_user_prompt(text, subject, label="Transcript")
+    
+    prompt_tokens = await asyncio.to_thread(_prompt_tokens, SUMMARY_SYSTEM_PROMPT, prompt)
+    if not fits_context(prompt_tokens + num_predict):
+        if not segments:
+            segments = _SENTENCE_RE.split(text)
+        summary = await _map_reduce_summary(segments, num_predict, ratio, subject, on_token, on_section, priority)
+    else:
+        summary = await _stream_completion(SUMMARY_SYSTEM_PROMPT, prompt, num_predict, on_token, on_section, priority)
 
     logger.info(f"Summarization completed: {len(summary)} characters")
     return summary
+
+
+async def warm_up() -> bool:
+    """Load the summarization model and pre-evaluate the summary system prompt.
+
+    Loads the working ``num_ctx``, which summary requests keep unless they
+    need a larger context, so the first job neither reloads the model nor
+    re-evaluates the static prompt prefix.
+    """
+    return await warm_up_ollama(
+        OLLAMA_MODEL,
+        system=SUMMARY_SYSTEM_PROMPT,
+        options=_build_options(num_predict=1, num_ctx=working_context_size()),
+    )
@@ -4,8 +4,10 @@ import os
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, Optional, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+from dataclasses import InitVar, dataclass, field
+from src.api.services.result_store import ResultStore, result_size
+from src.utils.settings import REDIS_URL, TASK_BACKEND, TASK_RESULT_DIR, TASK_RESULT_MEMORY_BYTES
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -26,6 +28,7 @@ class ProcessingStage(str, Enum):
     PREPROCESSING = "preprocessing"
     TRANSCRIBING = "transcribing"
     SUMMARIZING = "summarizing"
+    SUMMARY_PENDING = "summary_pending"
     COMPLETED = "completed"
 
 
@@ -46,23 +49,355 @@ class Task:
     progress: TaskProgress
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     completed_at: Optional[datetime] = None
-    result: Optional[Dict[str, Any]] = None
+    # Result the task starts with; read and replaced through the result property
+    initial_result: InitVar[Optional[Dict[str, Any]]] = None
     error: Optional[str] = None
     error_code: Optional[str] = None
+    partial_summary: str = ""
+    partial_sections: Dict[str, str] = field(default_factory=dict)
+    # Incremented on every change to the task's visible state
+    version: int = 0
+    # Set once the result has been spilled from memory; result loads from it
+    result_store: Optional[ResultStore] = field(default=None, repr=False)
+    _result: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    
+    def __post_init__(self, initial_result: Optional[Dict[str, Any]]) -> None:
+        self._result = initial_result
+    
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Task result, read back from the result store if it was spilled.
+        
+        Reading a spilled result blocks on the store; use load_result()
+        from the event loop.
+        """
+        if self.result_store is not None:
+            return self.result_store.load(self.task_id)
+        return self._result
+    
+    @result.setter
+    def result(self, value: Optional[Dict[str, Any]]) -> None:
+        self._result = value
+        self.result_store = None
+    
+    async def load_result(self) -> Optional[Dict[str, Any]]:
+        """Task result, read from the result store without blocking the event loop."""
+        if self.result_store is not None:
+            return await self.result_store.load_async(self.task_id)
+        return self._result
+
+
+TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
 
 
-class TaskManager:
-    """Manages background tasks for audio processing."""
+class BaseTaskManager:
+    """Event subscriptions, long polling and the cleanup loop shared by task stores.
+    
+    Subclasses store the tasks and call _deliver() with every change so
+    this process's subscribers (event streams, long polls) are notified.
+    """
     
     def __init__(self):
-        self.tasks: Dict[str, Task] = {}
         self._cleanup_interval = 3600  # Clean up old tasks every hour
         self._task_retention = 86400  # Keep tasks for 24 hours
-        self._max_tasks = int(os.getenv("COGNISCRIBE_MAX_TASKS", "10000"))  # Maximum tasks in memory
+        self._max_tasks = int(os.getenv("COGNISCRIBE_MAX_TASKS", "10000"))  # Maximum tasks kept
         self._cleanup_task: Optional[asyncio.Task] = None
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._subscriber_queue_size = 1000
+    
+    def get_task(self, task_id: str) -> Optional[Task]:
+        raise NotImplementedError
+    
+    def cleanup_old_tasks(self) -> int:
+        raise NotImplementedError
+    
+    # Stores that do network I/O override these so the event loop never
+    # waits on it; the in-memory store answers directly
+    
+    async def create_task_async(self) -> str:
+        """create_task() for callers on the event loop."""
+        return self.create_task()
+    
+    async def get_task_async(self, task_id: str, fresh: bool = False) -> Optional[Task]:
+        """get_task() for callers on the event loop; fresh skips any cached copy."""
+        return self.get_task(task_id)
+    
+    async def cancel_task_async(self, task_id: str) -> bool:
+        """cancel_task() for callers on the event loop."""
+        return self.cancel_task(task_id)
+    
+    async def get_stats_async(self) -> dict:
+        """get_stats() for callers on the event loop."""
+        return self.get_stats()
+    
+    async def cleanup_old_tasks_async(self) -> int:
+        """cleanup_old_tasks() for the cleanup worker."""
+        return self.cleanup_old_tasks()
+    
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        """Register a queue that receives (event, data) tuples for a task."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._subscriber_queue_size)
+        self._subscribers.setdefault(task_id, []).append(queue)
+        return queue
+    
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue) -> None:
+        """Remove a queue registered with subscribe()."""
+        queues = self._subscribers.get(task_id)
+        if not queues:
+            return
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            del self._subscribers[task_id]
+    
+    def _deliver(self, task_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Pass an event to this process's subscribers of a task.
+        
+        Token events are dropped for subscribers that fall behind; section,
+        progress and terminal events always carry the full state needed.
+        """
+        for queue in self._subscribers.get(task_id, ()):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                if event != "token":
+                    # Make room for state-carrying events
+                    queue.get_nowait()
+                    queue.put_nowait((event, data))
+    
+    async def wait_for_update(self, task_id: str, timeout: float) -> bool:
+        """Wait until a task's status, progress or summary sections change.
+        
+        Streamed summary tokens do not count as a change.
+        
+        Returns:
+            True if the task changed, False on timeout or if the task is
+            missing or already finished
+        """
+        # Subscribe before reading the task, so a change made in between is
+        # delivered rather than missed
+        queue = self.subscribe(task_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            task = await self.get_task_async(task_id)
+            if not task or task.status in TERMINAL_STATUSES:
+                return False
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                try:
+                    event, _ = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return False
+                if event != "token":
+                    return True
+        finally:
+            self.unsubscribe(task_id, queue)
+    
+    def close(self) -> None:
+        """Release resources held by the store."""
+    
+    async def start_cleanup_worker(self) -> None:
+        """Start background worker for cleaning up old tasks."""
+        while True:
+            await asyncio.sleep(self._cleanup_interval)
+            try:
+                await self.cleanup_old_tasks_async()
+            except Exception as e:
+                logger.error(f"Task cleanup failed: {str(e)}")
+
+
+class TaskManager(BaseTaskManager):
+    """Manages background tasks for audio processing in this process.
+    
+    Tasks are kept in creation order, and finished tasks are also indexed in
+    the order they finished, so expiry and eviction only ever look at the
+    oldest entries. Status counts are maintained as tasks change state.
+    Task status must therefore only be changed through this class.
+    
+    Results are held in memory up to a byte budget; beyond it the oldest
+    are compressed to the result store and loaded again when read.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.tasks: Dict[str, Task] = {}
+        # Finished task IDs in finishing order (dicts used as ordered sets)
+        self._finished: Dict[str, None] = {}
+        # Failed/cancelled task IDs in finishing order, with finish timestamps
+        self._failed: Dict[str, float] = {}
+        self._status_counts: Dict[TaskStatus, int] = {status: 0 for status in TaskStatus}
+        # Serialized size of each in-memory result, in the order results were set
+        self._result_sizes: Dict[str, int] = {}
+        # Sizes of results being written to the result store (still in memory)
+        self._spilling: Dict[str, int] = {}
+        self._result_memory = 0
+        self._result_memory_budget = TASK_RESULT_MEMORY_BYTES
+        self._result_dir = TASK_RESULT_DIR
+        self._result_store: Optional[ResultStore] = None
+        self._spilled_results = 0
+    
+    def _publish(self, task_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Record a change to a task and broadcast it to its subscribers.
+        
+        Every change to a task's visible state is published, so this also
+        advances the task's version.
+        """
+        task = self.tasks.get(task_id)
+        if task:
+            task.version += 1
+        self._deliver(task_id, event, data)
+    
+    def _set_status(self, task: Task, status: TaskStatus) -> None:
+        """Change a task's status, keeping counters and finish indexes current."""
+        self._status_counts[task.status] -= 1
+        self._status_counts[status] += 1
+        self._finished.pop(task.task_id, None)
+        self._failed.pop(task.task_id, None)
+        task.status = status
+        if status in TERMINAL_STATUSES:
+            self._finished[task.task_id] = None
+            if status != TaskStatus.COMPLETED:
+                self._failed[task.task_id] = task.completed_at.timestamp()
+    
+    def _get_result_store(self) -> ResultStore:
+        if self._result_store is None:
+            self._result_store = ResultStore(self._result_dir, max_age_seconds=self._task_retention)
+        return self._result_store
+    
+    def _release_result(self, task: Task) -> None:
+        """Drop a task's result from the memory accounting and the result store."""
+        size = self._result_sizes.pop(task.task_id, None)
+        if size is None:
+            size = self._spilling.pop(task.task_id, 0)
+        self._result_memory -= size
+        if task.result_store is not None:
+            task.result_store.discard(task.task_id)
+            self._spilled_results -= 1
+        task.result = None
+    
+    def _set_result(self, task: Task, result: Dict[str, Any]) -> None:
+        """Store a result, spilling the oldest in-memory results past the budget.
+        
+        Inside the event loop, results are written to the result store on a
+        worker thread and stay in memory until the write completes.
+        """
+        self._release_result(task)
+        task.result = result
+        size = result_size(result)
+        self._result_sizes[task.task_id] = size
+        self._result_memory += size
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        while self._result_memory - sum(self._spilling.values()) > self._result_memory_budget and self._result_sizes:
+            task_id = next(iter(self._result_sizes))
+            self._spilling[task_id] = self._result_sizes.pop(task_id)
+            if loop is None:
+                if not self._spill(task_id):
+                    break
+            else:
+                loop.create_task(self._spill_in_background(task_id))
+    
+    async def _spill_in_background(self, task_id: str) -> None:
+        """Write one result to the result store on a worker thread, then drop it from memory."""
+        if task_id not in self._spilling:
+            return  # Removed before the write started
+        result = self.tasks[task_id]._result
+        try:
+            store = await asyncio.to_thread(self._get_result_store)
+            await asyncio.to_thread(store.save, task_id, result)
+        except OSError as e:
+            self._keep_in_memory(task_id, e)
+            return
+        task = self.tasks.get(task_id)
+        if task_id in self._spilling:
+            if task._result is result:
+                self._commit_spill(task, store)
+            return  # Otherwise replaced; the new result's own spill is pending
+        if task is None or task.result_store is None:
+            # Removed or replaced while it was being written
+            await asyncio.to_thread(store.discard, task_id)
+    
+    def _spill(self, task_id: str) -> bool:
+        """Move one result from memory to the result store."""
+        task = self.tasks[task_id]
+        try:
+            store = self._get_result_store()
+            store.save(task_id, task._result)
+        except OSError as e:
+            self._keep_in_memory(task_id, e)
+            return False
+        self._commit_spill(task, store)
+        return True
+    
+    def _keep_in_memory(self, task_id: str, error: OSError) -> None:
+        logger.warning(f"Could not spill result of task {task_id}, keeping it in memory: {error}")
+        if task_id in self._spilling:
+            self._result_sizes[task_id] = self._spilling.pop(task_id)
+    
+    def _commit_spill(self, task: Task, store: ResultStore) -> None:
+        self._result_memory -= self._spilling.pop(task.task_id)
+        task.result_store = store
+        task._result = None
+        self._spilled_results += 1
+        logger.debug(f"Spilled result of task {task.task_id} ({self._result_memory} bytes of results in memory)")
+    
+    def _remove(self, task_id: str) -> None:
+        task = self.tasks.pop(task_id)
+        self._release_result(task)
+        self._status_counts[task.status] -= 1
+        self._finished.pop(task_id, None)
+        self._failed.pop(task_id, None)
+    
+    def _evict_one(self) -> None:
+        """Remove the oldest finished task, or the oldest task if none has finished."""
+        if self._finished:
+            self._remove(next(iter(self._finished)))
+            return
+        
+        task_id = next(iter(self.tasks))
+        logger.warning(f"Task limit ({self._max_tasks}) reached with no finished tasks; dropping active task {task_id}")
+        self.cancel_task(task_id)
+        self._remove(task_id)
+    
+    def _expire(self) -> int:
+        """Remove tasks past their retention period, oldest first.
+        
+        Failed and cancelled tasks are kept for a quarter of the retention
+        period after they finish.
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        cutoff = now - self._task_retention
+        failed_cutoff = now - (self._task_retention / 4)  # Keep failed tasks for 6 hours
+        removed = 0
+        
+        while self.tasks:
+            task_id, task = next(iter(self.tasks.items()))
+            if task.created_at.timestamp() >= cutoff:
+                break
+            self._remove(task_id)
+            removed += 1
+        
+        while self._failed:
+            task_id, finished_at = next(iter(self._failed.items()))
+            if finished_at >= failed_cutoff:
+                break
+            self._remove(task_id)
+            removed += 1
+        
+        return removed
     
     def create_task(self) -> str:
-        """Create a new task and return its ID."""
+        """Create a new task and return its ID.
+        
+        Expired tasks are dropped first, and the oldest finished task is
+        evicted if the store is at its limit.
+        """
         task_id = str(uuid.uuid4())
         task = Task(
             task_id=task_id,
@@ -73,7 +408,11 @@ class TaskManager:
                 message="Task created"
             )
         )
+        self._expire()
+        while self.tasks and len(self.tasks) >= self._max_tasks:
+            self._evict_one()
         self.tasks[task_id] = task
+        self._status_counts[task.status] += 1
         logger.info(f"Created task {task_id}")
         return task_id
     
@@ -94,13 +433,52 @@ class TaskManager:
             logger.warning(f"Attempted to update non-existent task {task_id}")
             return
         
-        task.status = TaskStatus.PROCESSING
+        if task.status != TaskStatus.PROCESSING:
+            self._set_status(task, TaskStatus.PROCESSING)
         task.progress = TaskProgress(
             stage=stage,
             percent=percent,
             message=message
         )
         logger.debug(f"Task {task_id}: {stage.value} - {percent}% - {message}")
+        self._publish(task_id, "progress", self._progress_data(task))
+    
+    def append_summary_tokens(self, task_id: str, text: str) -> None:
+        """Accumulate streamed summary text for a task."""
+        task = self.tasks.get(task_id)
+        if not task:
+            return
+        
+        task.partial_summary += text
+        self._publish(task_id, "token", {"text": text})
+    
+    def set_summary_section(self, task_id: str, key: str, content: str) -> None:
+        """Record a completed summary section for a task."""
+        task = self.tasks.get(task_id)
+        if not task:
+            return
+        
+        task.partial_sections[key] = content
+        self._publish(task_id, "section", {"key": key, "content": content})
+    
+    def reset_summary(self, task_id: str) -> None:
+        """Discard streamed summary output before summarization is retried."""
+        task = self.tasks.get(task_id)
+        if not task:
+            return
+        
+        task.partial_summary = ""
+        task.partial_sections = {}
+        self._publish(task_id, "summary_reset", {})
+    
+    def _progress_data(self, task: Task) -> Dict[str, Any]:
+        """Serialize task status and progress for event subscribers."""
+        return {
+            "status": task.status.value,
+            "stage": task.progress.stage.value,
+            "percent": task.progress.percent,
+            "message": task.progress.message,
+        }
     
     def complete_task(
         self,
@@ -113,33 +491,41 @@ class TaskManager:
             logger.warning(f"Attempted to complete non-existent task {task_id}")
             return
         
-        task.status = TaskStatus.COMPLETED
         task.completed_at = datetime.now(timezone.utc)
-        task.result = result
+        self._set_status(task, TaskStatus.COMPLETED)
+        self._set_result(task, result)
         task.progress = TaskProgress(
             stage=ProcessingStage.COMPLETED,
             percent=100,
             message="Processing completed successfully"
         )
+        # The final result supersedes the streamed partial output
+        task.partial_summary = ""
+        task.partial_sections = {}
         logger.info(f"Task {task_id} completed successfully")
+        self._publish(task_id, "complete", self._progress_data(task))
     
     def fail_task(
         self,
         task_id: str,
         error: str,
-        error_code: Optional[str] = None
+        error_code: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Mark task as failed with error."""
+        """Mark task as failed with error, keeping any partial result."""
         task = self.tasks.get(task_id)
         if not task:
             logger.warning(f"Attempted to fail non-existent task {task_id}")
             return
         
-        task.status = TaskStatus.FAILED
         task.completed_at = datetime.now(timezone.utc)
+        self._set_status(task, TaskStatus.FAILED)
         task.error = error
         task.error_code = error_code
+        if result is not None:
+            self._set_result(task, result)
         logger.error(f"Task {task_id} failed: {error}")
+        self._publish(task_id, "error", {**self._progress_data(task), "error": error, "error_code": error_code})
     
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending or processing task."""
@@ -147,12 +533,13 @@ class TaskManager:
         if not task:
             return False
         
-        if task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
+        if task.status in TERMINAL_STATUSES:
             return False
         
-        task.status = TaskStatus.CANCELLED
         task.completed_at = datetime.now(timezone.utc)
+        self._set_status(task, TaskStatus.CANCELLED)
         logger.info(f"Task {task_id} cancelled")
+        self._publish(task_id, "cancelled", self._progress_data(task))
         return True
     
     def cleanup_old_tasks(self) -> int:
@@ -160,62 +547,47 @@ class TaskManager:
         
         Also removes failed/cancelled tasks more aggressively to prevent memory bloat.
         """
-        cutoff = datetime.now(timezone.utc).timestamp() - self._task_retention
-        failed_cutoff = datetime.now(timezone.utc).timestamp() - (self._task_retention / 4)  # Keep failed tasks for 6 hours
+        removed = self._expire()
         
-        removed = 0
-        
-        for task_id in list(self.tasks.keys()):
-            task = self.tasks[task_id]
-            task_age = task.created_at.timestamp()
-            
-            # Remove old tasks
-            if task_age < cutoff:
-                del self.tasks[task_id]
-                removed += 1
-            # Remove failed/cancelled tasks more aggressively
-            elif task.status in [TaskStatus.FAILED, TaskStatus.CANCELLED] and task_age < failed_cutoff:
-                del self.tasks[task_id]
-                removed += 1
-        
-        # If still over limit, remove oldest completed tasks
-        if len(self.tasks) > self._max_tasks:
-            sorted_tasks = sorted(
-                self.tasks.items(),
-                key=lambda x: x[1].created_at.timestamp()
-            )
-            excess = len(self.tasks) - self._max_tasks
-            for task_id, _ in sorted_tasks[:excess]:
-                if self.tasks[task_id].status == TaskStatus.COMPLETED:
-                    del self.tasks[task_id]
-                    removed += 1
+        # The limit is enforced on every create_task; this covers a lowered limit
+        while len(self.tasks) > self._max_tasks:
+            self._evict_one()
+            removed += 1
         
         if removed > 0:
             logger.info(f"Cleaned up {removed} old tasks (remaining: {len(self.tasks)})")
         
         return removed
     
-    async def start_cleanup_worker(self) -> None:
-        """Start background worker for cleaning up old tasks."""
-        while True:
-            await asyncio.sleep(self._cleanup_interval)
-            try:
-                self.cleanup_old_tasks()
-            except Exception as e:
-                logger.error(f"Task cleanup failed: {str(e)}")
-    
     def get_stats(self) -> dict:
         """Get task manager statistics."""
-        status_counts = {status.value: 0 for status in TaskStatus}
-        for task in self.tasks.values():
-            status_counts[task.status.value] += 1
+        status_counts = {status.value: count for status, count in self._status_counts.items()}
         
         return {
+            "backend": "memory",
             "total_tasks": len(self.tasks),
             "status_breakdown": status_counts,
-            "retention_hours": self._task_retention / 3600
+            "retention_hours": self._task_retention / 3600,
+            "results_in_memory_bytes": self._result_memory,
+            "results_memory_budget_bytes": self._result_memory_budget,
+            "results_spilled": self._spilled_results,
         }
 
 
+def create_task_manager() -> BaseTaskManager:
+    """Create the task store selected by TASK_BACKEND.
+    
+    The Redis store does not connect here: it waits for the background
+    Redis connection and reports the task store as unavailable until
+    Redis answers, so importing the API never blocks on Redis.
+    """
+    if TASK_BACKEND == "redis":
+        from src.api.services.redis_task_manager import RedisTaskManager
+        from src.cache.redis_config import redis_connection
+        logger.info("Task state is shared through Redis")
+        return RedisTaskManager.from_url(REDIS_URL, connection=redis_connection)
+    return TaskManager()
+
+
 # Global task manager instance
-task_manager = TaskManager()
+task_manager = create_task_manager()
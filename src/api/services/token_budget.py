@@ -0,0 +1,124 @@
+"""Token counting and context sizing for Ollama requests.
+
+Counts are exact when ``OLLAMA_TOKENIZER`` points at the tokenizer of the
+summarization model (a ``tokenizer.json`` file or a Hugging Face repo id,
+loaded with the ``tokenizers`` package). Otherwise a conservative estimate
+is used, so prompts are never sized too small for their context.
+"""
+import asyncio
+import os
+import threading
+from typing import Optional
+
+from src.utils.settings import OLLAMA_MIN_NUM_CTX, OLLAMA_NUM_CTX, OLLAMA_TOKENIZER
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Estimate for English lecture speech (~0.75 words per token); dense
+# terminology and numbers are covered by the per-character bound
+_TOKENS_PER_WORD = 1.35
+_CHARS_PER_TOKEN = 4.0
+
+# Headroom applied to estimates, which may undercount
+_ESTIMATE_MARGIN = 1.1
+
+# Tokens added by the model's chat template around the system and user prompt
+TEMPLATE_OVERHEAD_TOKENS = 32
+
+_tokenizer = None
+_tokenizer_loaded = False
+# Held while loading, so concurrent first callers wait for one load
+_tokenizer_lock = threading.Lock()
+
+# Largest num_ctx sent to Ollama by this process
+_num_ctx_in_use: Optional[int] = None
+
+
+def _load_tokenizer(source: str):
+    from tokenizers import Tokenizer
+
+    if os.path.isfile(source):
+        return Tokenizer.from_file(source)
+    return Tokenizer.from_pretrained(source)
+
+
+def get_tokenizer():
+    """Get the configured tokenizer, or None when token counts are estimated.
+
+    The first call loads it, which may download it from Hugging Face; the
+    API loads it in a worker thread at startup (load_tokenizer()).
+    """
+    global _tokenizer, _tokenizer_loaded
+    if _tokenizer_loaded:
+        return _tokenizer
+    with _tokenizer_lock:
+        if not _tokenizer_loaded:
+            if OLLAMA_TOKENIZER:
+                try:
+                    _tokenizer = _load_tokenizer(OLLAMA_TOKENIZER)
+                    logger.info(f"Counting prompt tokens with tokenizer {OLLAMA_TOKENIZER}")
+                except ImportError:
+                    logger.warning("tokenizers package not available, estimating prompt tokens")
+                except Exception as e:
+                    logger.warning(f"Could not load tokenizer {OLLAMA_TOKENIZER}, estimating prompt tokens: {str(e)}")
+            _tokenizer_loaded = True
+    return _tokenizer
+
+
+async def load_tokenizer() -> None:
+    """Load the configured tokenizer in a worker thread, ahead of the first request."""
+    await asyncio.to_thread(get_tokenizer)
+
+
+def is_exact() -> bool:
+    """Whether token counts come from the model's tokenizer."""
+    return get_tokenizer() is not None
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate for text when no tokenizer is configured."""
+    estimate = max(len(text.split()) * _TOKENS_PER_WORD, len(text) / _CHARS_PER_TOKEN)
+    return int(estimate * _ESTIMATE_MARGIN) + 1
+
+
+def count_tokens(text: str) -> int:
+    """Number of model tokens in text (exact with a tokenizer, else estimated)."""
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def working_context_size() -> int:
+    """Context size the model is loaded with: the largest requested so far.
+
+    Starts at ``OLLAMA_MIN_NUM_CTX``, which warm-up loads.
+    """
+    return _num_ctx_in_use or OLLAMA_MIN_NUM_CTX
+
+
+def context_size(required_tokens: int) -> int:
+    """Context window for a request needing ``required_tokens``.
+
+    Ollama reloads the model whenever ``num_ctx`` changes, so requests keep
+    the working size and only step up, in powers of two to
+    ``OLLAMA_NUM_CTX``, when they need more. A larger size is kept for later
+    requests (see ``use_context_size``), so the model is reloaded at most a
+    few times per process rather than on every change in transcript length.
+    """
+    size = working_context_size()
+    while size < required_tokens and size < OLLAMA_NUM_CTX:
+        size *= 2
+    return min(size, OLLAMA_NUM_CTX)
+
+
+def use_context_size(num_ctx: int) -> None:
+    """Record that a request was sent with ``num_ctx``."""
+    global _num_ctx_in_use
+    _num_ctx_in_use = max(num_ctx, working_context_size())
+
+
+def fits_context(required_tokens: int, num_ctx: Optional[int] = None) -> bool:
+    """Whether ``required_tokens`` fit the (default: largest) context window."""
+    return required_tokens <= (num_ctx or OLLAMA_NUM_CTX)
@@ -1,7 +1,7 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from faster_whisper import WhisperModel
 from src.utils.settings import WHISPER_MODEL, DEVICE, COMPUTE_TYPE
-from src.utils.errors import ProcessingError, ErrorCode
+from src.utils.errors import CliniScribeException, ProcessingError, ErrorCode
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -34,12 +34,18 @@ def get_model() -> WhisperModel:
     return _model
 
 
-def transcribe_audio(path: str) -> Dict[str, Any]:
+def transcribe_audio(
+    path: str,
+    on_segment: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
     """
     Transcribe audio file using Whisper.
     
     Args:
         path: Path to audio file
+        on_segment: Called with each segment as Whisper decodes it. A
+            CliniScribeException raised from it stops transcription and
+            propagates unchanged.
         
     Returns:
         Dictionary containing:
@@ -66,6 +72,7 @@ def transcribe_audio(path: str) -> Dict[str, Any]:
         
         logger.debug(f"Processing segments (language: {info.language}, duration: {info.duration:.2f}s)")
         
+        # Segments are decoded lazily, so stopping here stops Whisper
         for segment in segments:
             text_parts.append(segment.text.strip())
             segment_list.append({
@@ -74,6 +81,8 @@ def transcribe_audio(path: str) -> Dict[str, Any]:
                 "text": segment.text.strip(),
                 "confidence": round(segment.avg_logprob, 3)
             })
+            if on_segment is not None:
+                on_segment(segment_list[-1])
         
         result = {
             "text": " ".join(text_parts),
@@ -85,6 +94,8 @@ def transcribe_audio(path: str) -> Dict[str, Any]:
         logger.info(f"Transcription completed: {len(segment_list)} segments, {len(result['text'])} characters")
         return result
         
+    except CliniScribeException:
+        raise
     except FileNotFoundError as e:
         logger.error(f"Audio file not found: {str(e)}")
         raise ProcessingError(
@@ -0,0 +1,178 @@
+"""Extractive compression of lecture transcripts before summarization.
+
+Lecture speech carries filler words, false starts and repeated explanations
+that cost prompt-evaluation time without adding content. Compression first
+strips disfluencies, then ranks sentences with TextRank over TF-IDF vectors
+and keeps the most central ones, skipping near-duplicates, until a token
+budget is filled. Kept sentences are returned in lecture order.
+"""
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from src.api.services.token_budget import count_tokens
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with the audio stack
+    np = None
+
+# Hesitations only; "mm" is left alone since it is also a unit. Words such
+# as "like", "so" or "you know" are kept: they often carry meaning
+_HESITATION = r"(?:u+m+|u+h+|erm|er+|a+h+|h+m+|mhm|uh-huh)\b[,.]?"
+_FILLER_RE = re.compile(rf"\b{_HESITATION}\s*", re.IGNORECASE)
+# A word repeated across a hesitation ("the, uh, the heart")
+_HESITATION_REPEAT_RE = re.compile(rf"\b([a-z]+)[\s,]+(?:{_HESITATION}\s*)+\1\b", re.IGNORECASE)
+# Stutters of three or more ("the the the heart"); doubles such as "had had"
+# or "that that" are often grammatical, and numbers are never collapsed
+_REPEATED_WORD_RE = re.compile(r"\b([a-z]+)(?:[\s,]+\1\b){2,}", re.IGNORECASE)
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([,.!?;:])")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"[a-z][a-z0-9'-]+")
+
+_STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers him his how i if in into is it its itself just me more most my no nor not now of off on once
+only or other our ours out over own same she should so some such than that the their theirs them then
+there these they this those through to too under until up very was we were what when where which while
+who whom why will with would you your yours going gonna okay right yeah well really thing things get got
+""".split())
+
+# Vocabulary cap; keeps the (sentences x terms) matrix small for long lectures
+_MAX_VOCABULARY = 4096
+
+# TextRank damping factor and power-iteration limits
+_DAMPING = 0.85
+_MAX_ITERATIONS = 50
+_TOLERANCE = 1e-6
+
+# Cosine similarity above which a sentence repeats one already kept
+_DUPLICATE_SIMILARITY = 0.8
+
+
+def clean_disfluencies(text: str) -> str:
+    """Remove hesitations and stuttered word repetitions from speech."""
+    text = _HESITATION_REPEAT_RE.sub(r"\1", text)
+    text = _FILLER_RE.sub("", text)
+    text = _REPEATED_WORD_RE.sub(r"\1", text)
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", text)
+    text = re.sub(r"\s{2,}", " ", text).strip()
+    if text and text[0].islower():
+        text = text[0].upper() + text[1:]
+    return text
+
+
+def _split_sentences(segments: List[str]) -> List[str]:
+    sentences = []
+    for segment in segments:
+        for sentence in _SENTENCE_RE.split(clean_disfluencies(segment)):
+            # Drop fragments left with no words (e.g. a segment that was only "Um.")
+            if re.search(r"\w", sentence):
+                sentences.append(sentence)
+    return sentences
+
+
+def _tfidf_matrix(sentences: List[str]) -> Tuple["np.ndarray", List[str]]:
+    """L2-normalised TF-IDF vectors (one row per sentence) and the column terms."""
+    terms = [[w for w in _WORD_RE.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+    document_frequency = Counter(term for words in terms for term in set(words))
+    vocabulary: Dict[str, int] = {
+        term: index for index, (term, _) in enumerate(document_frequency.most_common(_MAX_VOCABULARY))
+    }
+
+    rows, cols = [], []
+    for row, words in enumerate(terms):
+        for word in words:
+            col = vocabulary.get(word)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+
+    matrix = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    df = np.fromiter((document_frequency[t] for t in vocabulary), dtype=np.float32, count=len(vocabulary))
+    matrix *= np.log((1 + len(sentences)) / (1 + df)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix, list(vocabulary)
+
+
+def _textrank(similarity: "np.ndarray") -> "np.ndarray":
+    """TextRank centrality of each sentence from a pairwise similarity matrix."""
+    n = similarity.shape[0]
+    weights = similarity.copy()
+    np.fill_diagonal(weights, 0.0)
+    out_degree = weights.sum(axis=1, keepdims=True)
+    transition = np.divide(weights, out_degree, out=np.zeros_like(weights), where=out_degree > 0)
+
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(_MAX_ITERATIONS):
+        updated = (1 - _DAMPING) / n + _DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < _TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def _select(
+    scores: "np.ndarray",
+    similarity: "np.ndarray",
+    tokens: List[int],
+    target_tokens: int,
+) -> List[int]:
+    """Greedily keep high-scoring, non-redundant sentences within the budget."""
+    selected: List[int] = []
+    used = 0
+    for index in np.argsort(-scores, kind="stable"):
+        if used + tokens[index] > target_tokens:
+            continue
+        if selected and similarity[index, selected].max() > _DUPLICATE_SIMILARITY:
+            continue
+        selected.append(int(index))
+        used += tokens[index]
+    return sorted(selected)
+
+
+def compress_segments(segments: List[str], target_tokens: int) -> Tuple[List[str], Dict]:
+    """Compress transcript segments to about ``target_tokens`` tokens.
+
+    Args:
+        segments: Transcript segment texts in lecture order
+        target_tokens: Token budget for the compressed transcript
+
+    Returns:
+        Tuple of (kept sentences in lecture order, compression stats)
+    """
+    sentences = _split_sentences(segments)
+    tokens = [count_tokens(sentence) for sentence in sentences]
+    original_tokens = sum(count_tokens(segment) for segment in segments)
+
+    if np is None:
+        logger.warning("numpy not available, compressing transcript by removing fillers only")
+        kept = sentences
+    elif sum(tokens) <= target_tokens or len(sentences) < 2:
+        kept = sentences
+    else:
+        matrix, _ = _tfidf_matrix(sentences)
+        similarity = matrix @ matrix.T
+        scores = _textrank(similarity)
+        kept = [sentences[i] for i in _select(scores, similarity, tokens, target_tokens)]
+
+    kept_tokens = sum(count_tokens(sentence) for sentence in kept)
+    stats = {
+        "original_tokens": original_tokens,
+        "compressed_tokens": kept_tokens,
+        "sentences": len(sentences),
+        "kept_sentences": len(kept),
+        "ratio": round(kept_tokens / original_tokens, 3) if original_tokens else 1.0,
+    }
+    logger.info(
+        f"Compressed transcript from {original_tokens} to {kept_tokens} tokens "
+        f"({len(kept)}/{len(sentences)} sentences)"
+    )
+    return kept, stats
+
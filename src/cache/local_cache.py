@@ -0,0 +1,125 @@
+"""In-process cache tier in front of Redis.
+
+Each worker keeps recently read values for a few seconds, so hot keys
+(a task polled every second, a popular cached result) are served from
+memory. Writes made through a Redis client update the local copy and are
+announced on INVALIDATION_CHANNEL, and other workers drop their copies
+when they receive the announcement. The TTL bounds how long a copy can
+be stale, for example after a change made outside the clients or
+announced while a worker was disconnected.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+INVALIDATION_CHANNEL = "cache-invalidate"
+
+# Returned by LocalCache.get() on a miss, since None can be a cached value
+MISSING = object()
+
+
+def _snapshot(value: Any) -> Any:
+    """Shallow copy of dict and list values, so callers cannot change the cached one."""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def invalidation_message(origin: str, key: str) -> str:
+    """Message announcing a change to key by the client identified by origin."""
+    return f"{origin}:{key}"
+
+
+def parse_invalidation(message: Any) -> Tuple[str, str]:
+    """Split an invalidation message into (origin, key)."""
+    if isinstance(message, bytes):
+        message = message.decode("utf-8")
+    origin, _, key = message.partition(":")
+    return origin, key
+
+
+class LocalCache:
+    """Size-bounded LRU of values, each kept for at most ttl seconds.
+
+    Dict and list values are copied (shallowly) on the way in and out, so
+    a caller changing what it stored or got back does not change what
+    other readers see; nested values and other objects are shared and
+    must be treated as read-only. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, max_value_bytes: Optional[int] = None):
+        """
+        Args:
+            max_entries: Least recently used entries are evicted beyond this
+            ttl: Seconds an entry is served before Redis is read again (0 disables the cache)
+            max_value_bytes: Values whose stored size exceeds this are not kept
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_value_bytes = max_value_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _snapshot(entry[1])
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """Cache a value; size is its stored size in bytes, if known."""
+        if not self.enabled:
+            return
+        if self.max_value_bytes is not None and size is not None and size > self.max_value_bytes:
+            self.invalidate(key, count=False)
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, _snapshot(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable, count: bool = True) -> None:
+        """Drop a key, e.g. after it changed in Redis."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None and count:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit and miss counts, hit rate and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
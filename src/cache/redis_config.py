@@ -1,22 +1,148 @@
-"""Redis cache configuration and utilities."""
+"""Redis cache configuration and utilities.
+
+RedisClient is synchronous, for scripts and synchronous services.
+AsyncRedisClient has the same methods as coroutines, over a bounded
+connection pool, and is used from request handlers and background tasks
+so Redis round trips do not block the event loop.
+
+Cached values and long task fields are encoded with src.cache.serializer.
+Both clients keep recently read tasks and cached values in a local tier
+(src.cache.local_cache) and announce their writes so other workers drop
+stale copies.
+
+Request paths get the async client through get_ready_async_redis(), which
+returns None until redis_connection has reached Redis in the background,
+so startup and requests never wait on an unreachable Redis.
+"""
+import asyncio
 import redis
+import redis.asyncio
 from redis import Redis
-import json
 import os
-from typing import Optional, Any
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import timedelta
+from src.cache import serializer
+from src.cache.local_cache import (
+    INVALIDATION_CHANNEL,
+    MISSING,
+    LocalCache,
+    invalidation_message,
+    parse_invalidation,
+)
+from src.utils.settings import (
+    REDIS_LOCAL_CACHE_ENTRIES,
+    REDIS_LOCAL_CACHE_SECONDS,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_URL,
+    TASK_BACKEND,
+)
+from src.utils.connections import LazyConnection, register_connection
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Fields written by set_progress(); a hash holding only these was just created
+_PROGRESS_FIELDS = 2
+
+# Values stored larger than this (after compression) are not kept locally
+_LOCAL_MAX_VALUE_BYTES = 256 * 1024
+
+# GCRA rate limit, checked and updated in one atomic step on the server.
+# Each key holds the theoretical arrival time (TAT) of the next request in
+# microseconds of Redis server time. A request is allowed when, after
+# adding one emission interval (window / limit), the TAT is at most a
+# whole window ahead of now, so up to `limit` requests may arrive in a
+# burst and then one per interval. Returns {allowed, remaining,
+# retry_after_seconds}.
+RATE_LIMIT_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local interval = math.ceil(tonumber(ARGV[2]) * 1000000 / limit)
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+local new_tat = tat + interval
+local allow_at = new_tat - limit * interval
+if allow_at > now then
+    return {0, 0, math.ceil((allow_at - now) / 1000000)}
+end
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+return {1, math.floor((now - allow_at) / interval), 0}
+"""
+
+# Separate from the ratelimit:{key} counters of set_rate_limit()
+_GCRA_PREFIX = "ratelimit:gcra:"
+
 
-# Redis connection configuration
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+class _LocalTier:
+    """Local cache tier and invalidation shared by both clients."""
+    
+    def _init_local_tier(self) -> None:
+        self.local = LocalCache(REDIS_LOCAL_CACHE_ENTRIES, REDIS_LOCAL_CACHE_SECONDS, _LOCAL_MAX_VALUE_BYTES)
+        # Identifies this client's announcements so it ignores its own
+        self._origin = uuid.uuid4().hex
+        self._listener = None
+    
+    def _announce(self, pipe, key: str) -> None:
+        """Drop the local copy of key and queue its invalidation on other workers."""
+        self.local.invalidate(key, count=False)
+        if self.local.enabled:
+            pipe.publish(INVALIDATION_CHANNEL, invalidation_message(self._origin, key))
+    
+    def _on_invalidation(self, data) -> None:
+        origin, key = parse_invalidation(data)
+        if origin != self._origin:
+            self.local.invalidate(key)
+    
+    def _local_tasks(self, task_ids: List[str]):
+        """Split task_ids into ({task_id: task} held locally, task IDs to read)."""
+        tasks, unread = {}, []
+        for task_id in task_ids:
+            task = self.local.get(f"task:{task_id}")
+            if task is MISSING:
+                unread.append(task_id)
+            else:
+                tasks[task_id] = task
+        return tasks, unread
+    
+    def _cache_task(self, key: str, data: dict) -> Optional[dict]:
+        """Decode a task hash read from Redis and keep it locally."""
+        if not data:
+            return None
+        task = serializer.decode_hash(data)
+        self.local.set(key, task, size=sum(len(value) for value in data.values()))
+        return task
+    
+    def _cache_value(self, key: str, data) -> Optional[Any]:
+        """Decode a cached value read from Redis and keep it locally."""
+        if not data:
+            return None
+        value = serializer.loads(data)
+        self.local.set(key, value, size=len(data))
+        return value
+    
+    def get_cache_stats(self) -> dict:
+        """Hit and miss counts of the local tier."""
+        return self.local.get_stats()
 
 
-class RedisClient:
+class RedisClient(_LocalTier):
     """Redis client wrapper for task and cache management."""
     
-    def __init__(self, url: str = REDIS_URL):
-        """Initialize Redis connection."""
-        self.redis = redis.from_url(url, decode_responses=True)
-        self._test_connection()
+    def __init__(self, url: str = REDIS_URL, client: Optional[Redis] = None):
+        """Initialize Redis connection, or wrap an existing client."""
+        if client is None:
+            self.redis = redis.from_url(url, decode_responses=True)
+            self._test_connection()
+        else:
+            self.redis = client
+        self._rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
+        self._init_local_tier()
+        if self.local.enabled:
+            self._start_listener()
     
     def _test_connection(self):
         """Test Redis connection."""
@@ -27,64 +153,137 @@ class RedisClient:
             print(f"❌ Redis connection failed: {e}")
             raise
     
+    def _start_listener(self) -> None:
+        """Drop local copies of keys written by other workers."""
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: lambda message: self._on_invalidation(message["data"])})
+        self._listener_stopped = threading.Event()
+        self._listener = pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=self._listener_failed
+        )
+    
+    def _listener_failed(self, error: Exception, pubsub, thread) -> None:
+        # Runs on the listener thread. Invalidations may have been missed
+        # while disconnected; the subscription is restored on the next read
+        logger.warning(f"Cache invalidation listener error, resubscribing: {error}")
+        self.local.clear()
+        # Pause before retrying, but not past close()
+        self._listener_stopped.wait(1.0)
+    
     def set_task(self, task_id: str, data: dict, ttl: int = 86400) -> bool:
-        """Store task in Redis with TTL (default 24 hours)."""
+        """Store task in Redis with TTL (default 24 hours), in one MULTI."""
         try:
-            self.redis.hset(f"task:{task_id}", mapping=data)
-            self.redis.expire(f"task:{task_id}", ttl)
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(f"task:{task_id}", mapping=serializer.encode_hash(data))
+            pipe.expire(f"task:{task_id}", ttl)
+            self._announce(pipe, f"task:{task_id}")
+            pipe.execute()
             return True
         except Exception as e:
             print(f"❌ Error setting task: {e}")
             return False
     
     def get_task(self, task_id: str) -> Optional[dict]:
-        """Retrieve task from Redis."""
+        """Retrieve task from the local tier or Redis."""
+        key = f"task:{task_id}"
+        task = self.local.get(key)
+        if task is not MISSING:
+            return task
         try:
-            data = self.redis.hgetall(f"task:{task_id}")
-            return data if data else None
+            data = self.redis.execute_command("HGETALL", key, NEVER_DECODE=True)
+            return self._cache_task(key, data)
         except Exception as e:
             print(f"❌ Error getting task: {e}")
             return None
     
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, dict]:
+        """Retrieve several tasks, reading those not held locally in one round trip.
+        
+        Missing tasks are omitted.
+        """
+        tasks, unread = self._local_tasks(task_ids)
+        if not unread:
+            return tasks
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for task_id in unread:
+                pipe.execute_command("HGETALL", f"task:{task_id}", NEVER_DECODE=True)
+            for task_id, data in zip(unread, pipe.execute()):
+                task = self._cache_task(f"task:{task_id}", data)
+                if task is not None:
+                    tasks[task_id] = task
+            return tasks
+        except Exception as e:
+            print(f"❌ Error getting tasks: {e}")
+            return {}
+    
     def update_task(self, task_id: str, data: dict) -> bool:
         """Update task in Redis."""
         try:
-            self.redis.hset(f"task:{task_id}", mapping=data)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(f"task:{task_id}", mapping=serializer.encode_hash(data))
+            self._announce(pipe, f"task:{task_id}")
+            pipe.execute()
             return True
         except Exception as e:
             print(f"❌ Error updating task: {e}")
             return False
     
+    def set_progress(self, task_id: str, progress: str, updated_at: str) -> bool:
+        """Set a task's progress and updated_at in one round trip.
+        
+        Returns False if the task does not exist. HSET would create it, so
+        the hash is removed again when it holds only the two fields written.
+        """
+        key = f"task:{task_id}"
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(key, mapping={"progress": progress, "updated_at": updated_at})
+            pipe.hlen(key)
+            self._announce(pipe, key)
+            _, length, *_ = pipe.execute()
+            if length == _PROGRESS_FIELDS:
+                self.redis.delete(key)
+                return False
+            return True
+        except Exception as e:
+            print(f"❌ Error setting progress: {e}")
+            return False
+    
     def delete_task(self, task_id: str) -> bool:
         """Delete task from Redis."""
         try:
-            self.redis.delete(f"task:{task_id}")
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(f"task:{task_id}")
+            self._announce(pipe, f"task:{task_id}")
+            pipe.execute()
             return True
         except Exception as e:
             print(f"❌ Error deleting task: {e}")
             return False
     
     def set_cache(self, key: str, value: Any, ttl: int = 3600) -> bool:
-        """Store value in cache with TTL (default 1 hour)."""
+        """Store value in cache with TTL (default 1 hour), and in the local tier."""
         try:
-            if isinstance(value, dict):
-                value = json.dumps(value)
-            self.redis.set(f"cache:{key}", value, ex=ttl)
+            data = serializer.dumps(value)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(f"cache:{key}", data, ex=ttl)
+            self._announce(pipe, f"cache:{key}")
+            pipe.execute()
+            self.local.set(f"cache:{key}", value, size=len(data))
             return True
         except Exception as e:
             print(f"❌ Error setting cache: {e}")
             return False
     
     def get_cache(self, key: str) -> Optional[Any]:
-        """Retrieve value from cache."""
-        try:
-            value = self.redis.get(f"cache:{key}")
-            if value:
-                try:
-                    return json.loads(value)
-                except:
-                    return value
-            return None
+        """Retrieve value from the local tier or Redis."""
+        value = self.local.get(f"cache:{key}")
+        if value is not MISSING:
+            return value
+        try:
+            data = self.redis.execute_command("GET", f"cache:{key}", NEVER_DECODE=True)
+            return self._cache_value(f"cache:{key}", data)
         except Exception as e:
             print(f"❌ Error getting cache: {e}")
             return None
@@ -92,7 +291,10 @@ class RedisClient:
     def delete_cache(self, key: str) -> bool:
         """Delete value from cache."""
         try:
-            self.redis.delete(f"cache:{key}")
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(f"cache:{key}")
+            self._announce(pipe, f"cache:{key}")
+            pipe.execute()
             return True
         except Exception as e:
             print(f"❌ Error deleting cache: {e}")
@@ -136,9 +338,26 @@ class RedisClient:
             print(f"❌ Error getting rate limit: {e}")
             return 0
     
+    def check_rate_limit(self, key: str, limit: int, window: int) -> Tuple[bool, int, int]:
+        """Count a request against a limit of `limit` per `window` seconds.
+        
+        Checks and updates the client's GCRA state in one atomic round
+        trip. Unlike the other methods, Redis errors are raised, so the
+        caller can fall back to limiting locally.
+        
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        allowed, remaining, retry_after = self._rate_limit_script(keys=[_GCRA_PREFIX + key], args=[limit, window])
+        return bool(allowed), int(remaining), int(retry_after)
+    
     def close(self):
         """Close Redis connection."""
         try:
+            if self._listener is not None:
+                self._listener_stopped.set()
+                self._listener.stop()
+                self._listener = None
             self.redis.close()
             print("✅ Redis connection closed")
         except Exception as e:
@@ -155,3 +374,401 @@ def get_redis() -> RedisClient:
     if redis_client is None:
         redis_client = RedisClient()
     return redis_client
+
+
+class AsyncRedisClient(_LocalTier):
+    """Async Redis client with the same methods as RedisClient.
+    
+    Connections come from a blocking pool: when all are busy, callers wait
+    up to the socket timeout for one to be released instead of opening
+    more. Connections are opened on first use, so creating the client
+    never blocks; the invalidation listener, which holds one pooled
+    connection, starts with the first read. Like RedisClient, methods log
+    errors and return a default instead of raising.
+    """
+    
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        max_connections: int = REDIS_MAX_CONNECTIONS,
+        socket_timeout: float = REDIS_SOCKET_TIMEOUT,
+        client: Optional[redis.asyncio.Redis] = None,
+    ):
+        """Create the connection pool, or wrap an existing client."""
+        if client is None:
+            client = redis.asyncio.Redis(
+                connection_pool=redis.asyncio.BlockingConnectionPool.from_url(
+                    url,
+                    max_connections=max_connections,
+                    timeout=socket_timeout,
+                    socket_timeout=socket_timeout,
+                    socket_connect_timeout=socket_timeout,
+                    health_check_interval=30,
+                    decode_responses=True,
+                )
+            )
+        self.redis = client
+        self.pool = client.connection_pool
+        self._rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
+        self._init_local_tier()
+    
+    def _start_listener(self) -> None:
+        if self._listener is None and self.local.enabled:
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+    
+    async def _listen(self) -> None:
+        """Drop local copies of keys written by other workers."""
+        while True:
+            try:
+                async with self.redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        self._on_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while disconnected
+                logger.warning(f"Cache invalidation listener error, resubscribing: {e}")
+                self.local.clear()
+                await asyncio.sleep(1.0)
+    
+    async def ping(self) -> bool:
+        """Whether Redis is reachable."""
+        try:
+            return bool(await self.redis.ping())
+        except Exception as e:
+            logger.debug(f"Redis ping failed: {e}")
+            return False
+    
+    async def set_task(self, task_id: str, data: dict, ttl: int = 86400) -> bool:
+        """Store task in Redis with TTL (default 24 hours), in one MULTI."""
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(f"task:{task_id}", mapping=serializer.encode_hash(data))
+            pipe.expire(f"task:{task_id}", ttl)
+            self._announce(pipe, f"task:{task_id}")
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error setting task: {e}")
+            return False
+    
+    async def get_task(self, task_id: str) -> Optional[dict]:
+        """Retrieve task from the local tier or Redis."""
+        self._start_listener()
+        key = f"task:{task_id}"
+        task = self.local.get(key)
+        if task is not MISSING:
+            return task
+        try:
+            data = await self.redis.execute_command("HGETALL", key, NEVER_DECODE=True)
+            return self._cache_task(key, data)
+        except Exception as e:
+            logger.error(f"Error getting task: {e}")
+            return None
+    
+    async def get_tasks(self, task_ids: List[str]) -> Dict[str, dict]:
+        """Retrieve several tasks, reading those not held locally in one round trip."""
+        self._start_listener()
+        tasks, unread = self._local_tasks(task_ids)
+        if not unread:
+            return tasks
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for task_id in unread:
+                pipe.execute_command("HGETALL", f"task:{task_id}", NEVER_DECODE=True)
+            for task_id, data in zip(unread, await pipe.execute()):
+                task = self._cache_task(f"task:{task_id}", data)
+                if task is not None:
+                    tasks[task_id] = task
+            return tasks
+        except Exception as e:
+            logger.error(f"Error getting tasks: {e}")
+            return {}
+    
+    async def update_task(self, task_id: str, data: dict) -> bool:
+        """Update task in Redis."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(f"task:{task_id}", mapping=serializer.encode_hash(data))
+            self._announce(pipe, f"task:{task_id}")
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error updating task: {e}")
+            return False
+    
+    async def set_progress(self, task_id: str, progress: str, updated_at: str) -> bool:
+        """Set a task's progress and updated_at in one round trip (see RedisClient)."""
+        key = f"task:{task_id}"
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.hset(key, mapping={"progress": progress, "updated_at": updated_at})
+            pipe.hlen(key)
+            self._announce(pipe, key)
+            _, length, *_ = await pipe.execute()
+            if length == _PROGRESS_FIELDS:
+                await self.redis.delete(key)
+                return False
+            return True
+        except Exception as e:
+            logger.error(f"Error setting progress: {e}")
+            return False
+    
+    async def delete_task(self, task_id: str) -> bool:
+        """Delete task from Redis."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(f"task:{task_id}")
+            self._announce(pipe, f"task:{task_id}")
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting task: {e}")
+            return False
+    
+    async def set_cache(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """Store value in cache with TTL (default 1 hour), and in the local tier."""
+        try:
+            data = serializer.dumps(value)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(f"cache:{key}", data, ex=ttl)
+            self._announce(pipe, f"cache:{key}")
+            await pipe.execute()
+            self.local.set(f"cache:{key}", value, size=len(data))
+            return True
+        except Exception as e:
+            logger.error(f"Error setting cache: {e}")
+            return False
+    
+    async def get_cache(self, key: str) -> Optional[Any]:
+        """Retrieve value from the local tier or Redis."""
+        self._start_listener()
+        value = self.local.get(f"cache:{key}")
+        if value is not MISSING:
+            return value
+        try:
+            data = await self.redis.execute_command("GET", f"cache:{key}", NEVER_DECODE=True)
+            return self._cache_value(f"cache:{key}", data)
+        except Exception as e:
+            logger.error(f"Error getting cache: {e}")
+            return None
+    
+    async def delete_cache(self, key: str) -> bool:
+        """Delete value from cache."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(f"cache:{key}")
+            self._announce(pipe, f"cache:{key}")
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting cache: {e}")
+            return False
+    
+    async def increment_counter(self, key: str, amount: int = 1) -> int:
+        """Increment counter in Redis."""
+        try:
+            return await self.redis.incrby(f"counter:{key}", amount)
+        except Exception as e:
+            logger.error(f"Error incrementing counter: {e}")
+            return 0
+    
+    async def get_counter(self, key: str) -> int:
+        """Get counter value."""
+        try:
+            value = await self.redis.get(f"counter:{key}")
+            return int(value) if value else 0
+        except Exception as e:
+            logger.error(f"Error getting counter: {e}")
+            return 0
+    
+    async def set_rate_limit(self, key: str, limit: int, window: int) -> bool:
+        """Set rate limit with sliding window."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.incr(f"ratelimit:{key}")
+            pipe.expire(f"ratelimit:{key}", window)
+            result = await pipe.execute()
+            return result[0] <= limit
+        except Exception as e:
+            logger.error(f"Error setting rate limit: {e}")
+            return False
+    
+    async def get_rate_limit(self, key: str) -> int:
+        """Get current rate limit count."""
+        try:
+            value = await self.redis.get(f"ratelimit:{key}")
+            return int(value) if value else 0
+        except Exception as e:
+            logger.error(f"Error getting rate limit: {e}")
+            return 0
+    
+    async def check_rate_limit(self, key: str, limit: int, window: int) -> Tuple[bool, int, int]:
+        """Count a request against a limit of `limit` per `window` seconds.
+        
+        Checks and updates the client's GCRA state in one atomic round
+        trip. Unlike the other methods, Redis errors are raised, so the
+        caller can fall back to limiting locally.
+        
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        allowed, remaining, retry_after = await self._rate_limit_script(
+            keys=[_GCRA_PREFIX + key], args=[limit, window]
+        )
+        return bool(allowed), int(remaining), int(retry_after)
+    
+    async def close(self):
+        """Close the client and its pooled connections."""
+        try:
+            if self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+            await self.redis.aclose()
+            await self.pool.disconnect()
+        except Exception as e:
+            logger.error(f"Error closing Redis: {e}")
+
+
+# Global async Redis client instance, and the event loop using it
+async_redis_client: Optional[AsyncRedisClient] = None
+_async_redis_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_redis() -> AsyncRedisClient:
+    """Get or create the async Redis client (does not connect).
+    
+    A pool's connections and locks belong to the event loop that first
+    uses them, so a client used on another loop (e.g. one started by a
+    previous test client) is replaced rather than shared.
+    """
+    global async_redis_client, _async_redis_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if async_redis_client is not None and loop is not None and _async_redis_loop not in (None, loop):
+        async_redis_client = None
+    if async_redis_client is None:
+        async_redis_client = AsyncRedisClient()
+        _async_redis_loop = None
+    if _async_redis_loop is None:
+        _async_redis_loop = loop
+    return async_redis_client
+
+
+async def close_async_redis() -> None:
+    """Close the async Redis client, if one was created."""
+    global async_redis_client, _async_redis_loop
+    if async_redis_client is not None:
+        await async_redis_client.close()
+        async_redis_client = None
+        _async_redis_loop = None
+
+
+async def _connect_async_redis() -> AsyncRedisClient:
+    client = get_async_redis()
+    await client.redis.ping()
+    return client
+
+
+async def _check_async_redis(client: AsyncRedisClient) -> None:
+    await client.redis.ping()
+
+
+# Connected in the background; request paths use get_ready_async_redis()
+# and fall back to local behaviour until Redis answers
+redis_connection = register_connection(LazyConnection(
+    "redis",
+    _connect_async_redis,
+    check=_check_async_redis,
+    required=TASK_BACKEND == "redis",
+))
+
+
+def get_ready_async_redis() -> Optional[AsyncRedisClient]:
+    """The async Redis client if Redis is reachable, else None (never blocks)."""
+    return redis_connection.get()
+
+
+class ProgressDebouncer:
+    """Coalesce rapid progress writes per task.
+    
+    The first update for a task is written immediately. Updates arriving
+    within `interval` seconds of the last write only replace the pending
+    value, which a timer writes once the interval has passed, so at most
+    one write per task per interval reaches Redis and the latest value is
+    never lost.
+    """
+    
+    # Tasks remembered before entries older than the interval are pruned
+    _PRUNE_THRESHOLD = 1000
+    
+    def __init__(self, write: Callable[[str, Any], Any], interval: float):
+        """
+        Args:
+            write: Called as write(task_id, value) to store a value
+            interval: Minimum seconds between writes for one task (0 disables)
+        """
+        self._write = write
+        self._interval = interval
+        # Held while writing, so writes for a task happen in update order
+        self._lock = threading.Lock()
+        self._last_write: Dict[str, float] = {}
+        self._pending: Dict[str, Any] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self.writes = 0
+        self.coalesced = 0
+    
+    def update(self, task_id: str, value: Any) -> Any:
+        """Record a value; returns the write's result, or True if the write was deferred."""
+        with self._lock:
+            now = time.monotonic()
+            last = self._last_write.get(task_id)
+            if last is not None and now - last < self._interval:
+                if task_id in self._pending:
+                    self.coalesced += 1
+                self._pending[task_id] = value
+                if task_id not in self._timers:
+                    timer = threading.Timer(last + self._interval - now, self.flush, args=(task_id,))
+                    timer.daemon = True
+                    self._timers[task_id] = timer
+                    timer.start()
+                return True
+            return self._store(task_id, value, now)
+    
+    def flush(self, task_id: Optional[str] = None) -> None:
+        """Write pending values now, for one task or all of them."""
+        with self._lock:
+            task_ids = [task_id] if task_id is not None else list(self._pending)
+            for pending_id in task_ids:
+                timer = self._timers.pop(pending_id, None)
+                if timer is not None:
+                    timer.cancel()
+                if pending_id in self._pending:
+                    self._store(pending_id, self._pending.pop(pending_id), time.monotonic())
+    
+    def discard(self, task_id: str) -> None:
+        """Forget a task, dropping any pending value (e.g. once it has finished)."""
+        with self._lock:
+            timer = self._timers.pop(task_id, None)
+            if timer is not None:
+                timer.cancel()
+            self._pending.pop(task_id, None)
+            self._last_write.pop(task_id, None)
+    
+    def _store(self, task_id: str, value: Any, now: float) -> Any:
+        result = None
+        try:
+            result = self._write(task_id, value)
+        except Exception as e:
+            logger.error(f"Error writing progress for task {task_id}: {e}")
+        self.writes += 1
+        self._last_write[task_id] = now
+        if len(self._last_write) > self._PRUNE_THRESHOLD:
+            cutoff = now - self._interval
+            for known_id, written_at in list(self._last_write.items()):
+                if written_at < cutoff and known_id not in self._pending:
+                    del self._last_write[known_id]
+        return result
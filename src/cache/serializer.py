@@ -0,0 +1,145 @@
+"""Compact encoding for values stored in Redis.
+
+Values are serialized with msgpack (or orjson, or json when neither is
+installed) and compressed with zstd, lz4 or zlib once they reach
+CACHE_COMPRESS_MIN_BYTES. Every encoded value starts with a tag naming
+both, so values stay readable when the settings or installed packages
+change. Values written before the tag existed, JSON text or plain
+strings, still decode.
+"""
+import json
+import zlib
+from typing import Any, Callable, Dict, Tuple, Union
+
+from src.utils.logger import setup_logger
+from src.utils.settings import CACHE_COMPRESS_MIN_BYTES, CACHE_COMPRESSION, CACHE_SERIALIZER
+
+logger = setup_logger(__name__)
+
+# First byte of tagged values; JSON text and cached strings never start with it
+MAGIC = b"\x00"
+
+_Codec = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+_SERIALIZERS: Dict[bytes, _Codec] = {
+    b"j": (
+        lambda value: json.dumps(value, separators=(",", ":"), default=str).encode("utf-8"),
+        json.loads,
+    ),
+}
+_COMPRESSIONS: Dict[bytes, _Codec] = {
+    b"n": (lambda data: data, lambda data: data),
+    b"z": (lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+
+try:
+    import msgpack
+
+    _SERIALIZERS[b"m"] = (
+        lambda value: msgpack.packb(value, use_bin_type=True, default=str),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    )
+except ImportError:
+    pass
+
+try:
+    import orjson
+
+    _SERIALIZERS[b"o"] = (
+        lambda value: orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads,
+    )
+except ImportError:
+    pass
+
+try:
+    import zstandard
+
+    _COMPRESSIONS[b"s"] = (
+        lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+except ImportError:
+    pass
+
+try:
+    import lz4.frame
+
+    _COMPRESSIONS[b"4"] = (lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+
+_SERIALIZER_CODES = {"msgpack": b"m", "orjson": b"o", "json": b"j"}
+_COMPRESSION_CODES = {"zstd": b"s", "lz4": b"4", "zlib": b"z", "none": b"n"}
+
+
+def _choose(setting: str, codes: Dict[str, bytes], available: Dict[bytes, _Codec], kind: str) -> bytes:
+    if setting != "auto":
+        code = codes[setting]
+        if code in available:
+            return code
+        logger.warning(f"{kind} '{setting}' is not installed, choosing automatically")
+    return next(code for code in codes.values() if code in available)
+
+
+_serializer = _choose(CACHE_SERIALIZER, _SERIALIZER_CODES, _SERIALIZERS, "Cache serializer")
+_compression = _choose(CACHE_COMPRESSION, _COMPRESSION_CODES, _COMPRESSIONS, "Cache compression")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a value, compressing it if it is large enough to benefit."""
+    data = _SERIALIZERS[_serializer][0](value)
+    compression = _compression if len(data) >= CACHE_COMPRESS_MIN_BYTES else b"n"
+    return MAGIC + _serializer + compression + _COMPRESSIONS[compression][0](data)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize a value written by dumps(), or an untagged JSON or string value.
+
+    Raises:
+        ValueError: If a tagged value uses a format that is not installed or is corrupt
+    """
+    if isinstance(data, bytes) and data[:1] == MAGIC:
+        serializer, compression = data[1:2], data[2:3]
+        if serializer not in _SERIALIZERS or compression not in _COMPRESSIONS:
+            raise ValueError(f"Unsupported cache value format {data[1:3]!r}")
+        try:
+            return _SERIALIZERS[serializer][1](_COMPRESSIONS[compression][1](data[3:]))
+        except Exception as e:
+            raise ValueError(f"Corrupt cache value: {e}") from e
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    try:
+        return json.loads(data)
+    except ValueError:
+        return data
+
+
+def encode_field(value: Any) -> Union[str, bytes]:
+    """Encode a hash field: short values are stored as text, long ones with dumps()."""
+    text = value if isinstance(value, str) else str(value)
+    if len(text) < CACHE_COMPRESS_MIN_BYTES:
+        return text
+    return dumps(text)
+
+
+def decode_field(data: Union[bytes, str]) -> str:
+    """Decode a hash field written by encode_field()."""
+    if isinstance(data, bytes):
+        if data[:1] == MAGIC:
+            return loads(data)
+        return data.decode("utf-8")
+    return data
+
+
+def encode_hash(mapping: Dict[str, Any]) -> Dict[str, Union[str, bytes]]:
+    """Encode every field of a hash with encode_field()."""
+    return {field: encode_field(value) for field, value in mapping.items()}
+
+
+def decode_hash(data: Dict[Union[bytes, str], Union[bytes, str]]) -> Dict[str, str]:
+    """Decode a hash read without response decoding."""
+    return {
+        field.decode("utf-8") if isinstance(field, bytes) else field: decode_field(value)
+        for field, value in data.items()
+    }
@@ -1,8 +1,11 @@
 """Rate limiting middleware for CLINISCRIBE API."""
+import math
 import time
 import os
+from collections import OrderedDict
 from typing import Tuple, Optional
 from fastapi import Request
+from src.cache.redis_config import AsyncRedisClient, get_ready_async_redis, redis_connection
 from src.utils.errors import RateLimitError
 from src.utils.logger import setup_logger
 
@@ -13,22 +16,103 @@ RATE_LIMIT_ENABLED = os.getenv("CLINISCRIBE_RATE_LIMIT_ENABLED", "true").lower()
 RATE_LIMIT_REQUESTS = int(os.getenv("CLINISCRIBE_RATE_LIMIT_REQUESTS", "10"))
 RATE_LIMIT_WINDOW = int(os.getenv("CLINISCRIBE_RATE_LIMIT_WINDOW", "60"))  # seconds
 USE_REDIS_RATE_LIMIT = os.getenv("CLINISCRIBE_USE_REDIS_RATE_LIMIT", "true").lower() in ("true", "1", "yes")
+# Clients tracked by the in-memory fallback; least recently seen are evicted beyond it
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("CLINISCRIBE_RATE_LIMIT_MAX_CLIENTS", "100000"))
 
 if not RATE_LIMIT_ENABLED:
     logger.warning("Rate limiting is DISABLED. Enable for production use.")
 
-# Try to use Redis for rate limiting, fall back to in-memory if unavailable
-_redis_client: Optional[object] = None
-_rate_limit_store: dict = {}  # Fallback in-memory storage
 
-try:
-    if USE_REDIS_RATE_LIMIT:
-        from src.cache.redis_config import get_redis
-        _redis_client = get_redis()
-        logger.info("Using Redis for rate limiting")
-except Exception as e:
-    logger.warning(f"Redis not available for rate limiting, using in-memory fallback: {e}")
-    _redis_client = None
+
+class MemoryRateLimiter:
+    """In-process GCRA rate limit, the same algorithm as the Redis script.
+    
+    Each client's whole state is one float, the theoretical arrival time
+    (TAT) of its next request, kept in an LRU ordered by last request. A
+    client whose TAT has passed is back to a full burst, exactly as if it
+    had never been seen, so such idle entries are evicted from the front
+    of the LRU as requests arrive; beyond max_clients the least recently
+    seen are evicted too. A check costs O(1) time regardless of the limit
+    or the number of clients.
+    
+    Not thread-safe; used from the event loop.
+    """
+    
+    def __init__(self, limit: int, window: float, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.limit = limit
+        self.window = window
+        self.max_clients = max_clients
+        self.interval = window / limit
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._tats)
+    
+    def check(self, client_id: str, now: Optional[float] = None) -> Tuple[bool, int, int]:
+        """Count a request from client_id.
+        
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        if now is None:
+            now = time.monotonic()
+        tats = self._tats
+        new_tat = max(tats.get(client_id, now), now) + self.interval
+        # Earliest time the request fits within the burst allowance
+        allow_at = new_tat - self.window
+        if allow_at > now:
+            tats.move_to_end(client_id)
+            return False, 0, max(1, math.ceil(allow_at - now))
+        tats[client_id] = new_tat
+        tats.move_to_end(client_id)
+        if len(tats) > self.max_clients or tats[next(iter(tats))] <= now:
+            self.evict(now)
+        # The small offset keeps float error from rounding a whole request down
+        return True, int((now - allow_at) / self.interval + 1e-9), 0
+    
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop idle clients, and the least recently seen beyond max_clients.
+        
+        Returns:
+            Number of clients evicted
+        """
+        if now is None:
+            now = time.monotonic()
+        tats = self._tats
+        evicted = 0
+        while tats:
+            client_id = next(iter(tats))
+            if tats[client_id] > now and len(tats) <= self.max_clients:
+                break
+            del tats[client_id]
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+    
+    def outstanding(self, now: Optional[float] = None) -> int:
+        """Requests still counted against all clients' limits."""
+        if now is None:
+            now = time.monotonic()
+        return sum(math.ceil((tat - now) / self.interval - 1e-9) for tat in self._tats.values() if tat > now)
+    
+    def clear(self) -> None:
+        self._tats.clear()
+
+
+# Redis is used once redis_connection has reached it in the background;
+# until then, and whenever it is unreachable, limits are kept in memory
+_memory_limiter = MemoryRateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
+
+if USE_REDIS_RATE_LIMIT:
+    logger.info("Using Redis for rate limiting when available")
+
+
+def _get_redis_client() -> Optional[AsyncRedisClient]:
+    """The async Redis client, if Redis rate limiting is enabled and Redis is reachable."""
+    if not USE_REDIS_RATE_LIMIT:
+        return None
+    return get_ready_async_redis()
 
 
 def get_client_identifier(request: Request) -> str:
@@ -56,10 +140,11 @@ def get_client_identifier(request: Request) -> str:
     return f"ip:{client_host}"
 
 
-def check_rate_limit(client_id: str) -> Tuple[bool, int, int]:
+async def check_rate_limit(client_id: str) -> Tuple[bool, int, int]:
     """Check if client has exceeded rate limit.
     
-    Uses Redis if available, otherwise falls back to in-memory storage.
+    Uses an atomic GCRA check in Redis if available, otherwise falls back
+    to the same algorithm in memory.
     
     Args:
         client_id: Unique client identifier
@@ -70,56 +155,18 @@ def check_rate_limit(client_id: str) -> Tuple[bool, int, int]:
     if not RATE_LIMIT_ENABLED:
         return True, RATE_LIMIT_REQUESTS, 0
     
-    current_time = time.time()
-    
-    # Try Redis first
-    if _redis_client is not None:
+    # Try Redis first: one atomic round trip checks and counts the request
+    redis_client = _get_redis_client()
+    if redis_client is not None:
         try:
-            redis_key = f"ratelimit:{client_id}"
-            current_count = _redis_client.redis.incr(redis_key)
-            
-            # Set expiration on first request
-            if current_count == 1:
-                _redis_client.redis.expire(redis_key, RATE_LIMIT_WINDOW)
-            
-            remaining = max(0, RATE_LIMIT_REQUESTS - current_count)
-            
-            if current_count > RATE_LIMIT_REQUESTS:
-                # Get TTL to calculate retry_after
-                ttl = _redis_client.redis.ttl(redis_key)
-                retry_after = max(1, ttl) if ttl > 0 else RATE_LIMIT_WINDOW
-                return False, 0, retry_after
-            
-            return True, remaining, 0
+            return await redis_client.check_rate_limit(client_id, RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
         except Exception as e:
             logger.warning(f"Redis rate limit check failed, falling back to in-memory: {e}")
+            redis_connection.report_failure(e)
             # Fall through to in-memory implementation
     
     # In-memory fallback
-    window_start = current_time - RATE_LIMIT_WINDOW
-    
-    # Get client's request history
-    if client_id not in _rate_limit_store:
-        _rate_limit_store[client_id] = []
-    requests = _rate_limit_store[client_id]
-    
-    # Remove expired entries
-    requests[:] = [req_time for req_time in requests if req_time > window_start]
-    
-    # Check if limit exceeded
-    request_count = len(requests)
-    remaining = max(0, RATE_LIMIT_REQUESTS - request_count)
-    
-    if request_count >= RATE_LIMIT_REQUESTS:
-        # Calculate when the oldest request will expire
-        oldest_request = min(requests) if requests else current_time
-        retry_after = int(oldest_request + RATE_LIMIT_WINDOW - current_time) + 1
-        return False, 0, retry_after
-    
-    # Add current request
-    requests.append(current_time)
-    
-    return True, remaining - 1, 0
+    return _memory_limiter.check(client_id)
 
 
 async def rate_limit_middleware(request: Request) -> None:
@@ -135,11 +182,11 @@ async def rate_limit_middleware(request: Request) -> None:
         return
     
     # Skip rate limiting for health check endpoint
-    if request.url.path in ["/health", "/api/health"]:
+    if request.url.path in ["/health", "/api/health", "/api/health/ready"]:
         return
     
     client_id = get_client_identifier(request)
-    is_allowed, remaining, retry_after = check_rate_limit(client_id)
+    is_allowed, remaining, retry_after = await check_rate_limit(client_id)
     
     # Add rate limit headers to response (will be added by middleware)
     request.state.rate_limit_limit = RATE_LIMIT_REQUESTS
@@ -160,35 +207,15 @@ async def rate_limit_middleware(request: Request) -> None:
 
 
 def cleanup_old_entries() -> int:
-    """Clean up old rate limit entries to prevent memory bloat.
+    """Evict idle clients from the in-memory fallback.
     
-    Only needed for in-memory fallback. Redis entries expire automatically.
+    Checks already evict idle clients as they go; this also frees them
+    when no requests arrive. Redis entries expire automatically.
     
     Returns:
-        Number of entries cleaned up
+        Number of clients evicted
     """
-    if _redis_client is not None:
-        # Redis handles expiration automatically
-        return 0
-    
-    current_time = time.time()
-    window_start = current_time - RATE_LIMIT_WINDOW
-    
-    cleaned = 0
-    for client_id in list(_rate_limit_store.keys()):
-        requests = _rate_limit_store[client_id]
-        original_count = len(requests)
-        
-        # Remove expired entries
-        requests[:] = [req_time for req_time in requests if req_time > window_start]
-        
-        cleaned += original_count - len(requests)
-        
-        # Remove client entry if no recent requests
-        if not requests:
-            del _rate_limit_store[client_id]
-    
-    return cleaned
+    return _memory_limiter.evict()
 
 
 def get_rate_limit_stats() -> dict:
@@ -197,19 +224,20 @@ def get_rate_limit_stats() -> dict:
     Returns:
         Dictionary with rate limit statistics
     """
-    if _redis_client is not None:
+    redis_backend = _get_redis_client() is not None
+    if redis_backend:
         # Redis doesn't provide easy way to count all keys, so estimate
         active_clients = "N/A (Redis)"
         total_requests = "N/A (Redis)"
     else:
-        active_clients = len(_rate_limit_store)
-        total_requests = sum(len(requests) for requests in _rate_limit_store.values())
+        active_clients = len(_memory_limiter)
+        total_requests = _memory_limiter.outstanding()
     
     return {
         "enabled": RATE_LIMIT_ENABLED,
         "limit": RATE_LIMIT_REQUESTS,
         "window_seconds": RATE_LIMIT_WINDOW,
-        "backend": "Redis" if _redis_client is not None else "in-memory",
+        "backend": "Redis" if redis_backend else "in-memory",
         "active_clients": active_clients,
         "total_tracked_requests": total_requests
     }
@@ -1,9 +1,11 @@
 """Task management with Redis and database persistence."""
-from src.cache.redis_config import get_redis
+from src.cache.redis_config import ProgressDebouncer, get_redis
 from src.database.config import SessionLocal
 from src.database.models import TranscriptionJob
 from src.database.transactions import db_transaction
+from src.utils.settings import PROGRESS_DEBOUNCE_SECONDS
 from datetime import datetime, timezone
+from typing import Dict, List
 from uuid import uuid4
 import json
 
@@ -13,6 +15,7 @@ class TaskManager:
     def __init__(self):
         self.redis = get_redis()
         self.db = SessionLocal()
+        self._progress = ProgressDebouncer(self._write_progress, PROGRESS_DEBOUNCE_SECONDS)
     
     def create_task(self, user_id: str, filename: str, file_size_bytes: int, file_path: str, ratio: float) -> str:
         """Create new task in Redis and database."""
@@ -60,18 +63,31 @@ class TaskManager:
         # Fallback to database
         db_task = self.db.query(TranscriptionJob).filter(TranscriptionJob.id == task_id).first()
         if db_task:
-            return {
-                "task_id": db_task.id,
-                "user_id": db_task.user_id,
-                "filename": db_task.filename,
-                "status": db_task.status,
-                "progress": "0",
-                "transcript_text": db_task.transcript_text or "",
-                "summary_text": db_task.summary_text or "",
-                "created_at": db_task.created_at.isoformat()
-            }
+            return self._task_from_db(db_task)
         return None
     
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, dict]:
+        """Get several tasks: one Redis round trip, one query for any not cached."""
+        tasks = self.redis.get_tasks(task_ids)
+        missing = [task_id for task_id in task_ids if task_id not in tasks]
+        if missing:
+            for db_task in self.db.query(TranscriptionJob).filter(TranscriptionJob.id.in_(missing)):
+                tasks[db_task.id] = self._task_from_db(db_task)
+        return tasks
+    
+    @staticmethod
+    def _task_from_db(db_task: TranscriptionJob) -> dict:
+        return {
+            "task_id": db_task.id,
+            "user_id": db_task.user_id,
+            "filename": db_task.filename,
+            "status": db_task.status,
+            "progress": "0",
+            "transcript_text": db_task.transcript_text or "",
+            "summary_text": db_task.summary_text or "",
+            "created_at": db_task.created_at.isoformat()
+        }
+    
     def update_task(self, task_id: str, data: dict) -> bool:
         """Update task in Redis and database."""
         # Update Redis
@@ -95,14 +111,15 @@ class TaskManager:
             return False
     
     def set_progress(self, task_id: str, progress: str) -> bool:
-        """Update task progress (Redis only, fast)."""
-        task = self.redis.get_task(task_id)
-        if task:
-            task["progress"] = progress
-            task["updated_at"] = datetime.now(timezone.utc).isoformat()
-            self.redis.update_task(task_id, task)
-            return True
-        return False
+        """Update task progress (Redis only, fast).
+        
+        Rapid updates are coalesced (PROGRESS_DEBOUNCE_SECONDS). Returns False
+        if the task does not exist; a deferred update returns True.
+        """
+        return self._progress.update(task_id, progress)
+    
+    def _write_progress(self, task_id: str, progress: str) -> bool:
+        return self.redis.set_progress(task_id, progress, datetime.now(timezone.utc).isoformat())
     
     def complete_task(self, task_id: str, transcript: str, summary: str, duration: float) -> bool:
         """Mark task as completed."""
@@ -115,7 +132,8 @@ class TaskManager:
             "completed_at": datetime.now(timezone.utc).isoformat()
         }
         
-        # Update Redis
+        # Update Redis; a deferred progress write must not land afterwards
+        self._progress.discard(task_id)
         self.redis.update_task(task_id, data)
         
         # Update database with transaction management
@@ -139,7 +157,8 @@ class TaskManager:
             "failed_at": datetime.now(timezone.utc).isoformat()
         }
         
-        # Update Redis
+        # Update Redis; a deferred progress write must not land afterwards
+        self._progress.discard(task_id)
         self.redis.update_task(task_id, data)
         
         # Update database with transaction management
@@ -154,6 +173,7 @@ class TaskManager:
     
     def delete_task(self, task_id: str) -> bool:
         """Delete task from Redis and database."""
+        self._progress.discard(task_id)
         self.redis.delete_task(task_id)
         
         # Delete from database with transaction management
@@ -165,5 +185,6 @@ class TaskManager:
             return False
     
     def close(self):
-        """Close database connection."""
+        """Write pending progress and close database connection."""
+        self._progress.flush()
         self.db.close()
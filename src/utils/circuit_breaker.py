@@ -0,0 +1,131 @@
+"""Circuit breaker for calls to external services."""
+import asyncio
+import time
+from enum import Enum
+from typing import List
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    """State of a circuit breaker."""
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests fail fast
+    HALF_OPEN = "half_open"  # A single probe request is allowed through
+
+
+class CircuitBreaker:
+    """Stop calling a failing service until a probe request succeeds.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are rejected. Once ``reset_timeout`` seconds have passed, one
+    probe request is admitted: success closes the circuit, failure opens it
+    again for another ``reset_timeout``.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now (claims the probe when half-open)."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            logger.info(f"Circuit '{self.name}' half-open, sending probe request")
+            return True
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful request; closes the circuit."""
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        if self._state is not CircuitState.CLOSED:
+            logger.info(f"Circuit '{self.name}' closed, service recovered")
+            self._state = CircuitState.CLOSED
+            self._notify()
+
+    def record_failure(self) -> None:
+        """Record a failed request; opens the circuit at the threshold or on a failed probe."""
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state is not CircuitState.CLOSED or self._consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """Record a request whose outcome says nothing about service health."""
+        self._probe_in_flight = False
+        self._notify()
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (0 when not open)."""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def _open(self) -> None:
+        if self._state is not CircuitState.OPEN:
+            self._times_opened += 1
+            logger.warning(
+                f"Circuit '{self.name}' opened after {self._consecutive_failures} consecutive failures; "
+                f"failing fast for {self.reset_timeout:.0f}s"
+            )
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake tasks blocked in wait_until_ready()."""
+        for future in self._waiters:
+            if not future.done() and not future.get_loop().is_closed():
+                future.set_result(None)
+        self._waiters = []
+
+    def _ready(self) -> bool:
+        state = self.state
+        return state is CircuitState.CLOSED or (state is CircuitState.HALF_OPEN and not self._probe_in_flight)
+
+    async def wait_until_ready(self) -> None:
+        """Wait until a request would be admitted (closed, or a probe is due)."""
+        while not self._ready():
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+            # While open, the probe becomes due after retry_after(); while a
+            # probe is in flight, wait for its outcome
+            timeout = self.retry_after() if self._state is CircuitState.OPEN else None
+            try:
+                await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+
+    def get_stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "times_opened": self._times_opened,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,230 @@
+"""Lazy connections to backing services, opened in the background.
+
+A LazyConnection connects on a background task, so neither importing a
+module nor starting the application waits on Redis or the database. Until
+the connection is ready, get() returns None and callers use their
+fallback (in-memory rate limiting, no result cache), which lets the API
+serve in degraded mode. Failed connects are retried with exponential
+backoff, and a ready connection is checked periodically so a lost service
+is noticed and reconnected.
+
+Connections registered with register_connection() are started by
+start_connections() and reported by get_readiness().
+"""
+import asyncio
+import random
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ConnectionState(str, Enum):
+    """State of a lazy connection."""
+    DISABLED = "disabled"  # Not configured; never connects
+    CONNECTING = "connecting"  # First attempt in progress
+    READY = "ready"
+    UNAVAILABLE = "unavailable"  # Last attempt or check failed; retrying
+
+
+class LazyConnection:
+    """A service client created and health-checked on a background task.
+
+    ``connect`` is a coroutine function returning the client; it should
+    raise if the service cannot be reached. ``check``, if given, is called
+    with the client every ``check_interval`` seconds and should raise when
+    the service is gone.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Awaitable[Any]],
+        check: Optional[Callable[[Any], Awaitable[Any]]] = None,
+        enabled: bool = True,
+        required: bool = False,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        check_interval: float = 30.0,
+    ):
+        self.name = name
+        self.required = required
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.check_interval = check_interval
+        self._connect = connect
+        self._check = check
+        self._state = ConnectionState.CONNECTING if enabled else ConnectionState.DISABLED
+        self._client: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._ready_since: Optional[float] = None
+
+    @property
+    def state(self) -> ConnectionState:
+        return self._state
+
+    @property
+    def ready(self) -> bool:
+        return self._state is ConnectionState.READY
+
+    def get(self) -> Any:
+        """Return the client if connected, else None (starting the connection if needed)."""
+        if self._state is ConnectionState.READY and self._on_running_loop():
+            return self._client
+        self.start()
+        return None
+
+    def _on_running_loop(self) -> bool:
+        """Whether the background task belongs to the running event loop."""
+        try:
+            return self._task is not None and self._task.get_loop() is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    def start(self) -> None:
+        """Start connecting in the background; does nothing without a running event loop."""
+        if self._state is ConnectionState.DISABLED:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        # A client made on another (possibly stopped) event loop cannot be
+        # used from this one, so connect again
+        self._abandon()
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run(), name=f"connect-{self.name}")
+
+    async def stop(self) -> None:
+        """Stop connecting and checking, and forget the client (its owner closes it)."""
+        if self._on_running_loop():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._abandon()
+
+    def _abandon(self) -> None:
+        """Cancel the background task and forget the client."""
+        if self._task is not None and not self._task.done():
+            try:
+                self._task.get_loop().call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # Its event loop is closed
+        self._task = None
+        self._client = None
+        self._ready_since = None
+        if self._state is not ConnectionState.DISABLED:
+            self._state = ConnectionState.CONNECTING
+
+    def report_failure(self, error: Exception) -> None:
+        """Mark the service unavailable after a failed call, so it is checked now."""
+        if self._state is ConnectionState.READY:
+            self._set_unavailable(error)
+            if self._wake is not None:
+                self._wake.set()
+
+    def _set_unavailable(self, error: Exception) -> None:
+        self._failures += 1
+        self._last_error = str(error)
+        if self._state is not ConnectionState.UNAVAILABLE:
+            logger.warning(f"{self.name} unavailable, retrying in the background: {error}")
+        else:
+            logger.debug(f"{self.name} still unavailable: {error}")
+        self._state = ConnectionState.UNAVAILABLE
+        self._ready_since = None
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential delay before retry ``attempt``, with jitter so workers do not retry together."""
+        delay = min(self.initial_backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep, waking early when report_failure() is called."""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            if self._state is ConnectionState.READY:
+                await self._sleep(self.check_interval)
+                if self._state is ConnectionState.READY and self._check is not None:
+                    try:
+                        await self._check(self._client)
+                    except Exception as e:
+                        self._set_unavailable(e)
+                continue
+            try:
+                self._client = await self._connect()
+            except Exception as e:
+                self._set_unavailable(e)
+                await self._sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            attempt = 0
+            self._state = ConnectionState.READY
+            self._ready_since = time.time()
+            self._last_error = None
+            logger.info(f"✅ Connected to {self.name}")
+
+    def status(self) -> Dict[str, Any]:
+        """State, failure count and last error, for readiness reporting."""
+        return {
+            "state": self._state.value,
+            "required": self.required,
+            "failures": self._failures,
+            "last_error": self._last_error,
+            "ready_since": self._ready_since,
+        }
+
+
+_connections: Dict[str, LazyConnection] = {}
+
+
+def register_connection(connection: LazyConnection) -> LazyConnection:
+    """Add a connection to those started at startup and reported for readiness."""
+    _connections[connection.name] = connection
+    return connection
+
+
+def start_connections() -> None:
+    """Start every registered connection in the background (call from the event loop)."""
+    for connection in _connections.values():
+        connection.start()
+
+
+async def stop_connections() -> None:
+    """Stop every registered connection's background task."""
+    for connection in _connections.values():
+        await connection.stop()
+
+
+def get_readiness() -> Dict[str, Any]:
+    """Overall readiness and the state of each registered connection.
+
+    The status is "ready" when every enabled service is connected,
+    "degraded" when only optional ones are missing (fallbacks are in use),
+    and "unavailable" when a required one is not connected.
+    """
+    services = {name: connection.status() for name, connection in _connections.items()}
+    enabled = [c for c in _connections.values() if c.state is not ConnectionState.DISABLED]
+    if any(c.required and not c.ready for c in enabled):
+        status = "unavailable"
+    elif all(c.ready for c in enabled):
+        status = "ready"
+    else:
+        status = "degraded"
+    return {"status": status, "ready": status != "unavailable", "services": services}
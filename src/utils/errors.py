@@ -21,6 +21,7 @@ class ErrorCode(str, Enum):
     OLLAMA_UNAVAILABLE = "ollama_unavailable"
     OLLAMA_TIMEOUT = "ollama_timeout"
     WHISPER_MODEL_LOAD_FAILED = "whisper_model_load_failed"
+    TASK_STORE_UNAVAILABLE = "task_store_unavailable"
     
     # Auth errors
     INVALID_API_KEY = "invalid_api_key"
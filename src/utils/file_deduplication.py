@@ -3,7 +3,7 @@ import os
 import hashlib
 from typing import Optional
 from src.utils.file_utils import get_file_hash
-from src.cache.redis_config import get_redis
+from src.cache.redis_config import get_ready_async_redis
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -14,7 +14,7 @@ def get_file_hash_key(file_hash: str) -> str:
     return f"file_hash:{file_hash}"
 
 
-def check_duplicate_file(file_path: str) -> Optional[dict]:
+async def check_duplicate_file(file_path: str) -> Optional[dict]:
     """Check if a file with the same hash has been processed before.
     
     Args:
@@ -23,14 +23,18 @@ def check_duplicate_file(file_path: str) -> Optional[dict]:
     Returns:
         Dictionary with task_id and result if duplicate found, None otherwise
     """
+    # Without Redis there is nothing to look up, so skip hashing the file
+    redis_client = get_ready_async_redis()
+    if redis_client is None:
+        return None
+    
     try:
         # Calculate file hash
         file_hash = get_file_hash(file_path)
         
         # Check Redis cache
         try:
-            redis_client = get_redis()
-            cached_result = redis_client.get_cache(get_file_hash_key(file_hash))
+            cached_result = await redis_client.get_cache(get_file_hash_key(file_hash))
             if cached_result:
                 logger.info(f"Found duplicate file (hash: {file_hash[:16]}...)")
                 return cached_result
@@ -44,7 +48,7 @@ def check_duplicate_file(file_path: str) -> Optional[dict]:
         return None
 
 
-def cache_file_result(file_path: str, task_id: str, result: dict, ttl: int = 86400 * 7) -> bool:
+async def cache_file_result(file_path: str, task_id: str, result: dict, ttl: int = 86400 * 7) -> bool:
     """Cache file processing result by hash.
     
     Args:
@@ -56,6 +60,10 @@ def cache_file_result(file_path: str, task_id: str, result: dict, ttl: int = 864
     Returns:
         True if cached successfully, False otherwise
     """
+    redis_client = get_ready_async_redis()
+    if redis_client is None:
+        return False
+    
     try:
         file_hash = get_file_hash(file_path)
         
@@ -66,8 +74,8 @@ def cache_file_result(file_path: str, task_id: str, result: dict, ttl: int = 864
         }
         
         try:
-            redis_client = get_redis()
-            redis_client.set_cache(get_file_hash_key(file_hash), cache_data, ttl=ttl)
+            if not await redis_client.set_cache(get_file_hash_key(file_hash), cache_data, ttl=ttl):
+                return False
             logger.debug(f"Cached result for file hash: {file_hash[:16]}...")
             return True
         except Exception as e:
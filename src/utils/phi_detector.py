@@ -9,11 +9,14 @@ actual patient data, use certified PHI detection services.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from src.utils.phi_dictionary import PHIDictionary
+from src.utils.settings import PHI_DICTIONARY_PATH
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +30,7 @@ class PHIType(Enum):
     NAME_WITH_CONTEXT = "name_with_medical_context"
     ADDRESS = "street_address"
     CREDIT_CARD = "credit_card"
+    INSTITUTION_TERM = "institution_term"
     
 
 @dataclass
@@ -96,62 +100,136 @@ class PHIDetector:
         'admitted', 'discharged', 'surgery', 'operation'
     ]
     
-    def __init__(self, custom_patterns: Optional[Dict[PHIType, List[tuple]]] = None):
+    # PHI types whose confidence is raised when the text has medical context
+    CONTEXT_SENSITIVE_TYPES = (PHIType.PHONE, PHIType.EMAIL, PHIType.NAME_WITH_CONTEXT)
+    
+    def __init__(
+        self,
+        custom_patterns: Optional[Dict[PHIType, List[tuple]]] = None,
+        dictionary: Optional[PHIDictionary] = None,
+    ):
         """Initialize PHI detector with optional custom patterns.
         
         Args:
             custom_patterns: Additional institution-specific patterns
+            dictionary: Institution-specific terms matched literally
+            
+        Raises:
+            ValueError: If a custom pattern is not a valid regular expression,
+                or a dictionary term has an unknown PHI type
         """
-        self.patterns = self.PATTERNS.copy()
+        # Copy the lists so custom patterns never leak into the class defaults
+        self.patterns = {phi_type: list(patterns) for phi_type, patterns in self.PATTERNS.items()}
         if custom_patterns:
             for phi_type, patterns in custom_patterns.items():
-                if phi_type in self.patterns:
-                    self.patterns[phi_type].extend(patterns)
-                else:
-                    self.patterns[phi_type] = patterns
+                self.patterns.setdefault(phi_type, []).extend(patterns)
+        self._regexes = self._compile_patterns(self.patterns)
+        
+        self.dictionary = dictionary
+        if dictionary is not None:
+            known_types = {phi_type.value for phi_type in PHIType}
+            unknown_types = dictionary.phi_types - known_types
+            if unknown_types:
+                raise ValueError(f"Unknown PHI types in dictionary: {sorted(unknown_types)}")
     
-    def scan_text(self, text: str) -> PHIDetectionResult:
-        """Scan text for potential PHI.
+    @staticmethod
+    def _compile_patterns(
+        patterns: Dict[PHIType, List[tuple]]
+    ) -> List[Tuple["re.Pattern[str]", Dict[str, Tuple[PHIType, float]]]]:
+        """Compile the patterns of each PHI type into one case-insensitive alternation.
         
-        Args:
-            text: Transcribed text to scan
-            
-        Returns:
-            PHIDetectionResult with findings
+        Each pattern becomes a named group so a match maps back to its
+        confidence. Types are scanned separately, since one alternation
+        returns a single match per position and would hide an overlapping
+        match of another type (a card number read as a phone number).
+        Within a type, alternatives are ordered by confidence so the most
+        specific pattern wins. The leading ``\\b`` shared by most patterns
+        is factored out, which lets the engine skip positions inside words
+        without trying every alternative.
         """
-        matches: List[PHIMatch] = []
+        compiled = []
+        index = 0
+        for phi_type, type_patterns in patterns.items():
+            groups: Dict[str, Tuple[PHIType, float]] = {}
+            bounded: List[str] = []
+            unbounded: List[str] = []
+            for pattern, confidence in sorted(type_patterns, key=lambda entry: -entry[1]):
+                name = f"p{index}"
+                index += 1
+                groups[name] = (phi_type, confidence)
+                alternative = f"(?P<{name}>{pattern})"
+                try:
+                    # Compiled as it is embedded, after another alternative, so
+                    # patterns that only work standalone (global inline flags
+                    # such as "(?i)") are rejected here
+                    re.compile(f"(?:)|{alternative}")
+                except re.error as e:
+                    raise ValueError(f"Invalid PHI pattern for {phi_type.value}: {pattern!r} ({e})") from e
+                if pattern.startswith(r"\b"):
+                    bounded.append(f"(?P<{name}>{pattern[2:]})")
+                else:
+                    unbounded.append(alternative)
+            
+            alternatives = []
+            if bounded:
+                alternatives.append(r"\b(?:" + "|".join(bounded) + ")")
+            alternatives.extend(unbounded)
+            if alternatives:
+                try:
+                    compiled.append((re.compile("|".join(alternatives), re.IGNORECASE), groups))
+                except re.error as e:
+                    # e.g. two patterns defining the same group name
+                    raise ValueError(f"Invalid PHI patterns for {phi_type.value}: {e}") from e
+        return compiled
+    
+    def _has_medical_context(self, text: str) -> bool:
         text_lower = text.lower()
+        return any(keyword in text_lower for keyword in self.MEDICAL_CONTEXT_KEYWORDS)
+    
+    def _find_matches(self, text: str, skip_before: int = 0, offset: int = 0) -> List[PHIMatch]:
+        """Match all patterns and dictionary terms, without the medical-context boost.
         
-        # Check for medical context to adjust confidence
-        has_medical_context = any(
-            keyword in text_lower 
-            for keyword in self.MEDICAL_CONTEXT_KEYWORDS
-        )
-        
-        # Scan for each PHI type
-        for phi_type, patterns in self.patterns.items():
-            for pattern, base_confidence in patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    # Extract context (50 chars before/after)
-                    start = max(0, match.start() - 50)
-                    end = min(len(text), match.end() + 50)
-                    context = text[start:end]
-                    
-                    # Adjust confidence based on medical context
-                    confidence = base_confidence
-                    if has_medical_context and phi_type in [
-                        PHIType.PHONE, PHIType.EMAIL, PHIType.NAME_WITH_CONTEXT
-                    ]:
-                        confidence = min(1.0, confidence + 0.2)
-                    
-                    matches.append(PHIMatch(
-                        phi_type=phi_type,
-                        matched_text=match.group(),
-                        confidence=confidence,
-                        position=match.start(),
-                        context=context
-                    ))
+        Args:
+            text: Text to scan
+            skip_before: Ignore matches ending at or before this index
+            offset: Added to match positions (position of ``text`` in the transcript)
+        """
+        spans = [
+            (match.start(), match.end(), *groups[match.lastgroup])
+            for regex, groups in self._regexes
+            for match in regex.finditer(text)
+        ]
+        if self.dictionary is not None:
+            spans.extend(
+                (start, end, PHIType(phi_type), confidence)
+                for start, end, phi_type, confidence in self.dictionary.find(text)
+            )
+        spans.sort(key=lambda span: span[0])
         
+        matches: List[PHIMatch] = []
+        for start, end, phi_type, confidence in spans:
+            if end <= skip_before:
+                continue
+            matches.append(PHIMatch(
+                phi_type=phi_type,
+                matched_text=text[start:end],
+                confidence=confidence,
+                position=offset + start,
+                # Surrounding context (50 chars before/after)
+                context=text[max(0, start - 50):end + 50]
+            ))
+        return matches
+    
+    def _apply_medical_context(self, matches: List[PHIMatch]) -> List[PHIMatch]:
+        """Raise confidence of context-sensitive matches in medical text."""
+        return [
+            replace(m, confidence=min(1.0, m.confidence + 0.2))
+            if m.phi_type in self.CONTEXT_SENSITIVE_TYPES else m
+            for m in matches
+        ]
+    
+    def _build_result(self, matches: List[PHIMatch], text_length: int) -> PHIDetectionResult:
+        """Score matches against the rejection threshold and log rejections."""
         # Calculate overall confidence score
         if not matches:
             overall_confidence = 0.0
@@ -169,7 +247,7 @@ class PHIDetector:
         
         # Log findings
         if contains_phi:
-            self._log_phi_detection(matches, text)
+            self._log_phi_detection(matches, text_length)
         
         return PHIDetectionResult(
             contains_phi=contains_phi,
@@ -178,6 +256,27 @@ class PHIDetector:
             recommendation=recommendation
         )
     
+    def scan_text(self, text: str) -> PHIDetectionResult:
+        """Scan text for potential PHI with one pass per PHI type.
+        
+        Args:
+            text: Transcribed text to scan
+            
+        Returns:
+            PHIDetectionResult with findings
+        """
+        matches = self._find_matches(text)
+        
+        # Keyword lookup only needed when a context-sensitive type matched
+        if any(m.phi_type in self.CONTEXT_SENSITIVE_TYPES for m in matches) and self._has_medical_context(text):
+            matches = self._apply_medical_context(matches)
+        
+        return self._build_result(matches, len(text))
+    
+    def stream_scanner(self) -> "PHIStreamScanner":
+        """Create an incremental scanner for text that arrives in segments."""
+        return PHIStreamScanner(self)
+    
     def _generate_recommendation(self, contains_phi: bool, 
                                  matches: List[PHIMatch],
                                  confidence: float) -> str:
@@ -211,7 +310,7 @@ class PHIDetector:
             "If this is a false positive, please contact support."
         )
     
-    def _log_phi_detection(self, matches: List[PHIMatch], text: str):
+    def _log_phi_detection(self, matches: List[PHIMatch], text_length: int):
         """Log PHI detection for audit purposes."""
         logger.warning(
             "PHI_DETECTED",
@@ -220,7 +319,7 @@ class PHIDetector:
                 "num_matches": len(matches),
                 "phi_types": [m.phi_type.value for m in matches],
                 "max_confidence": max(m.confidence for m in matches),
-                "text_length": len(text),
+                "text_length": text_length,
                 # DO NOT log actual matched text or context (that would be logging PHI!)
             }
         )
@@ -230,6 +329,74 @@ class PHIDetector:
         return result.contains_phi
 
 
+class PHIStreamScanner:
+    """Scans a transcript for PHI segment by segment while it is produced.
+    
+    Segments are joined with single spaces, as in the final transcript. The
+    tail of the text already scanned is kept and rescanned with each new
+    segment so that PHI split across a segment boundary is still matched;
+    matches lying wholly inside that overlap were reported earlier and are
+    skipped. Medical context counts once any keyword has been seen.
+    """
+    
+    # Longest PHI string expected to straddle a segment boundary
+    OVERLAP_CHARS = 100
+    
+    def __init__(self, detector: PHIDetector):
+        self.detector = detector
+        self.matches: List[PHIMatch] = []
+        self.has_medical_context = False
+        self._tail = ""
+        self._length = 0
+        # Highest confidence so far, split by whether medical context raises it
+        self._peak = 0.0
+        self._context_sensitive_peak = 0.0
+    
+    def feed(self, text: str) -> Optional[PHIDetectionResult]:
+        """Scan the next segment.
+        
+        Args:
+            text: Segment text
+            
+        Returns:
+            The detection result as soon as it crosses the rejection
+            threshold, None while the transcript still looks clean
+        """
+        text = text.strip()
+        if not text:
+            return None
+        
+        separator = " " if self._length else ""
+        window = self._tail + separator + text
+        window_start = self._length - len(self._tail)
+        
+        for match in self.detector._find_matches(window, len(self._tail), window_start):
+            self.matches.append(match)
+            if match.phi_type in self.detector.CONTEXT_SENSITIVE_TYPES:
+                self._context_sensitive_peak = max(self._context_sensitive_peak, match.confidence)
+            else:
+                self._peak = max(self._peak, match.confidence)
+        if not self.has_medical_context:
+            self.has_medical_context = self.detector._has_medical_context(window)
+        
+        self._length += len(separator) + len(text)
+        self._tail = window[-self.OVERLAP_CHARS:]
+        
+        peak = self._context_sensitive_peak
+        if self.has_medical_context and peak:
+            peak = min(1.0, peak + 0.2)
+        if max(self._peak, peak) < self.detector.REJECTION_THRESHOLD:
+            return None
+        return self.result()
+    
+    def result(self) -> PHIDetectionResult:
+        """Detection result for everything scanned so far."""
+        matches = self.matches
+        if self.has_medical_context:
+            matches = self.detector._apply_medical_context(matches)
+        return self.detector._build_result(matches, self._length)
+
+
 # Singleton instance
 _detector: Optional[PHIDetector] = None
 
@@ -238,5 +405,8 @@ def get_phi_detector() -> PHIDetector:
     """Get singleton PHI detector instance."""
     global _detector
     if _detector is None:
-        _detector = PHIDetector()
+        dictionary = None
+        if PHI_DICTIONARY_PATH:
+            dictionary = PHIDictionary.from_file(PHI_DICTIONARY_PATH)
+        _detector = PHIDetector(dictionary=dictionary)
     return _detector
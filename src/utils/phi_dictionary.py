@@ -0,0 +1,251 @@
+"""Dictionary matching of institution-specific PHI terms.
+
+Institutions screen transcripts against large lists of local terms (staff
+names, ward names, MRN prefixes). A regex alternation over tens of
+thousands of terms is far too slow, so terms are compiled into an
+Aho-Corasick automaton that finds every occurrence in one pass over the
+text, in time linear in the text length whatever the dictionary size.
+
+Dictionary files are UTF-8 text with one term per line::
+
+    # comment
+    Dr Jane Doe
+    Ward 7B<TAB>institution_term<TAB>0.9
+    HOSP-*<TAB>medical_record_number
+
+Optional tab-separated columns give the PHI type value and confidence.
+A trailing ``*`` makes the term a prefix, matched without a word
+boundary after it. Matching is case-insensitive and otherwise respects
+word boundaries, so "Ward 7B" does not match inside "toward 7Bx".
+
+Building the automaton for a large list takes seconds, so the built
+tables are cached next to the file (``<path>.cache``) and reused while the
+file's content hash is unchanged.
+"""
+import hashlib
+import marshal
+import os
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_PHI_TYPE = "institution_term"
+DEFAULT_CONFIDENCE = 0.8
+
+# Bump when the cached table layout changes
+CACHE_FORMAT_VERSION = 1
+
+# Transition keys pack the state above the 21 bits of a Unicode codepoint
+_STATE_SHIFT = 21
+
+# (term, phi_type, confidence, is_prefix)
+Term = Tuple[str, str, float, bool]
+
+
+def _fold(text: str) -> str:
+    """Lowercase text without changing its length, so positions still line up."""
+    folded = text.lower()
+    if len(folded) != len(text):
+        folded = "".join(ch.lower()[:1] for ch in text)
+    return folded
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def parse_terms(lines: Iterable[str]) -> List[Term]:
+    """Parse dictionary file lines into terms.
+
+    Raises:
+        ValueError: If a confidence is not a number between 0 and 1
+    """
+    terms: List[Term] = []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = [field.strip() for field in line.split("\t")]
+        term = fields[0]
+        phi_type = fields[1] if len(fields) > 1 and fields[1] else DEFAULT_PHI_TYPE
+        try:
+            confidence = float(fields[2]) if len(fields) > 2 and fields[2] else DEFAULT_CONFIDENCE
+        except ValueError:
+            raise ValueError(f"Line {line_number}: invalid confidence {fields[2]!r}") from None
+        if not 0.0 <= confidence <= 1.0:
+            raise ValueError(f"Line {line_number}: confidence must be between 0 and 1")
+        is_prefix = term.endswith("*")
+        term = term.rstrip("*").strip()
+        if term:
+            terms.append((term, phi_type, confidence, is_prefix))
+    return terms
+
+
+class PHIDictionary:
+    """Aho-Corasick automaton over a list of PHI terms.
+
+    All transitions live in one dict keyed by ``state << 21 | codepoint``
+    rather than a dict per state, so a dictionary with hundreds of
+    thousands of states loads from the cache as a single object.
+    """
+
+    def __init__(self, terms: Iterable[Term]):
+        """Build the automaton.
+
+        Args:
+            terms: (term, phi_type, confidence, is_prefix) tuples; for a
+                term listed twice the last entry wins
+        """
+        unique: Dict[str, Term] = {}
+        for term in terms:
+            unique[_fold(term[0])] = term
+        self.terms: List[Term] = list(unique.values())
+
+        goto: List[Dict[str, int]] = [{}]
+        output: Dict[int, Tuple[int, ...]] = {}
+        for index, key in enumerate(unique):
+            state = 0
+            for ch in key:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    goto[state][ch] = next_state
+                state = next_state
+            output[state] = output.get(state, ()) + (index,)
+
+        # Breadth-first failure links; each state's output also gets the
+        # output of its failure state so matching never walks dictionary links
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(ch, 0)
+                if fail[child] in output:
+                    output[child] = output.get(child, ()) + output[fail[child]]
+
+        self._delta: Dict[int, int] = {
+            (state << _STATE_SHIFT) | ord(ch): child
+            for state, edges in enumerate(goto)
+            for ch, child in edges.items()
+        }
+        self._fail = array("l", fail)
+        self._output = output
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @property
+    def states(self) -> int:
+        return len(self._fail)
+
+    @property
+    def phi_types(self) -> set:
+        """PHI type values used by the dictionary's terms."""
+        return {term[1] for term in self.terms}
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, str, float]]:
+        """Find all dictionary terms in text.
+
+        Yields:
+            (start, end, phi_type, confidence) for each occurrence, ordered
+            by end position
+        """
+        delta, fail, output, terms = self._delta, self._fail, self._output, self.terms
+        length = len(text)
+        state = 0
+        for i, code in enumerate(map(ord, _fold(text))):
+            next_state = delta.get((state << _STATE_SHIFT) | code)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = delta.get((state << _STATE_SHIFT) | code)
+            state = next_state or 0
+            if state not in output:
+                continue
+            end = i + 1
+            for index in output[state]:
+                term, phi_type, confidence, is_prefix = terms[index]
+                start = end - len(term)
+                if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if not is_prefix and _is_word_char(term[-1]) and end < length and _is_word_char(text[end]):
+                    continue
+                yield start, end, phi_type, confidence
+
+    @classmethod
+    def from_file(cls, path: str, cache_path: Optional[str] = None) -> "PHIDictionary":
+        """Load a dictionary file, reusing the prebuilt automaton when current.
+
+        Args:
+            path: Dictionary file
+            cache_path: Prebuilt automaton location (default ``<path>.cache``)
+
+        Raises:
+            OSError: If the dictionary file cannot be read
+            ValueError: If the dictionary file is malformed
+        """
+        cache_path = cache_path or f"{path}.cache"
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+
+        cached = cls._load_cache(cache_path, digest)
+        if cached is not None:
+            logger.info(f"Loaded PHI dictionary from cache: {len(cached)} terms")
+            return cached
+
+        dictionary = cls(parse_terms(content.decode("utf-8").splitlines()))
+        logger.info(f"Built PHI dictionary from {path}: {len(dictionary)} terms, {dictionary.states} states")
+        dictionary._save_cache(cache_path, digest)
+        return dictionary
+
+    @classmethod
+    def _load_cache(cls, cache_path: str, digest: str) -> Optional["PHIDictionary"]:
+        try:
+            # loads() on the whole file is much faster than load() on the stream
+            with open(cache_path, "rb") as f:
+                version, cached_digest, tables = marshal.loads(f.read())
+            if version != CACHE_FORMAT_VERSION or cached_digest != digest:
+                return None
+            terms, delta, fail, output = tables
+            dictionary = cls.__new__(cls)
+            dictionary.terms = terms
+            dictionary._delta = delta
+            dictionary._fail = array("l", fail)
+            dictionary._output = output
+            return dictionary
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable PHI dictionary cache {cache_path}: {e}")
+            return None
+
+    def _save_cache(self, cache_path: str, digest: str) -> None:
+        # marshal only encodes plain containers, so loading a tampered cache
+        # cannot execute code the way unpickling could
+        tables = (
+            self.terms,
+            self._delta,
+            self._fail.tobytes(),
+            self._output,
+        )
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(marshal.dumps((CACHE_FORMAT_VERSION, digest, tables)))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write PHI dictionary cache {cache_path}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
@@ -46,6 +46,86 @@ class CogniScribeSettings(BaseSettings):
         description="Directory for temporary processed audio"
     )
     
+    task_result_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for task results spilled from memory"
+    )
+    
+    task_result_memory_mb: int = Field(
+        default=256,
+        ge=0,
+        description="Memory budget for finished task results; older results are compressed to disk beyond it"
+    )
+    
+    # ======= Task State and Redis =======
+    
+    task_backend: Literal["memory", "redis"] = Field(
+        default="memory",
+        description="Where API task state is kept: 'memory' (single process) or 'redis' (shared by all workers)"
+    )
+    
+    redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        description="Redis connection URL"
+    )
+    
+    redis_max_connections: int = Field(
+        default=20,
+        ge=1,
+        le=1000,
+        description="Connections in each worker's async Redis pool; requests wait for a free one beyond it"
+    )
+    
+    redis_socket_timeout: float = Field(
+        default=2.0,
+        gt=0.0,
+        le=60.0,
+        description="Seconds to wait for a Redis connection or reply before treating Redis as unavailable"
+    )
+    
+    redis_local_cache_entries: int = Field(
+        default=1024,
+        ge=0,
+        description="Tasks and cached values each worker keeps in memory in front of Redis (0 disables)"
+    )
+    
+    redis_local_cache_seconds: float = Field(
+        default=5.0,
+        ge=0.0,
+        le=300.0,
+        description="Longest a worker serves a value from memory; writes through the Redis clients invalidate it sooner"
+    )
+    
+    progress_debounce_seconds: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=60.0,
+        description="Minimum seconds between progress writes to Redis for one task; updates in between are coalesced"
+    )
+    
+    cache_serializer: Literal["auto", "msgpack", "orjson", "json"] = Field(
+        default="auto",
+        description="Serialization of values cached in Redis ('auto' prefers msgpack, then orjson, then json)"
+    )
+    
+    cache_compression: Literal["auto", "zstd", "lz4", "zlib", "none"] = Field(
+        default="auto",
+        description="Compression of large values cached in Redis ('auto' prefers zstd, then lz4, then zlib)"
+    )
+    
+    cache_compress_min_bytes: int = Field(
+        default=1024,
+        ge=0,
+        description="Values cached in Redis are compressed from this size in bytes"
+    )
+    
+    task_cache_seconds: float = Field(
+        default=2.0,
+        ge=0.0,
+        le=60.0,
+        description="How long a worker reuses a task read from Redis; changes from other workers invalidate it sooner"
+    )
+    
     # ======= File Upload Limits =======
     
     max_file_size_mb: int = Field(
@@ -74,6 +154,11 @@ class CogniScribeSettings(BaseSettings):
         description="Enable PHI detection to prevent uploading protected health information"
     )
     
+    phi_dictionary_path: str = Field(
+        default="",
+        description="File of institution-specific PHI terms (staff names, wards, MRN prefixes), one per line"
+    )
+    
     # ======= DeepFilterNet Enhancement =======
     
     deepfilternet_enabled: bool = Field(
@@ -144,16 +229,167 @@ class CogniScribeSettings(BaseSettings):
         description="Ollama request timeout in seconds"
     )
     
+    ollama_connect_timeout: float = Field(
+        default=5.0,
+        gt=0,
+        le=120,
+        description="Seconds allowed for establishing a connection to Ollama"
+    )
+    
+    ollama_read_timeout: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=3600,
+        description="Max seconds to wait for data from Ollama (defaults to ollama_timeout)"
+    )
+    
+    ollama_max_connections: int = Field(
+        default=8,
+        ge=1,
+        le=256,
+        description="Maximum concurrent HTTP connections per Ollama host"
+    )
+    
+    ollama_max_keepalive: int = Field(
+        default=4,
+        ge=0,
+        le=256,
+        description="Maximum idle keep-alive connections kept open per Ollama host"
+    )
+    
+    ollama_num_parallel: int = Field(
+        default=2,
+        ge=1,
+        le=64,
+        description="Concurrent requests sent to each Ollama host (match the server's OLLAMA_NUM_PARALLEL)"
+    )
+    
+    ollama_keep_alive: str = Field(
+        default="30m",
+        description="How long Ollama keeps the model loaded after a request (e.g. '30m', '-1' for forever)"
+    )
+    
+    ollama_warmup_on_startup: bool = Field(
+        default=True,
+        description="Load the summarization model into Ollama when the API starts"
+    )
+    
+    ollama_num_ctx: int = Field(
+        default=8192,
+        ge=2048,
+        le=131072,
+        description="Largest context window (tokens) requested from Ollama; longer transcripts are summarized map-reduce"
+    )
+    
+    ollama_min_num_ctx: int = Field(
+        default=2048,
+        ge=512,
+        le=131072,
+        description="Context window warmed and requested until a request needs more; set equal to OLLAMA_NUM_CTX to pin the context size"
+    )
+    
+    ollama_tokenizer: str = Field(
+        default="",
+        description="tokenizer.json path or Hugging Face repo id matching OLLAMA_MODEL for exact prompt token counts (empty = estimate)"
+    )
+    
+    summary_map_concurrency: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Maximum transcript windows summarized concurrently in map-reduce mode"
+    )
+    
+    summary_compression_enabled: bool = Field(
+        default=False,
+        description="Extractively compress transcripts (drop fillers and redundant sentences) before summarization"
+    )
+    
+    summary_compression_ratio: float = Field(
+        default=0.6,
+        ge=0.1,
+        le=1.0,
+        description="Fraction of transcript tokens kept by extractive compression"
+    )
+    
+    ollama_hosts: str = Field(
+        default="",
+        description="Comma-separated Ollama base URLs to load-balance across (defaults to ollama_host/ollama_port)"
+    )
+    
+    ollama_eject_after_failures: int = Field(
+        default=3,
+        ge=1,
+        le=100,
+        description="Consecutive timeouts/5xx responses before an Ollama host is taken out of rotation"
+    )
+    
+    ollama_ejection_seconds: float = Field(
+        default=30.0,
+        ge=1.0,
+        le=3600.0,
+        description="Initial time an ejected Ollama host stays out of rotation (doubles on repeat ejections)"
+    )
+    
+    ollama_health_interval: int = Field(
+        default=30,
+        ge=5,
+        le=3600,
+        description="Seconds between Ollama host health and model checks"
+    )
+    
+    ollama_circuit_failure_threshold: int = Field(
+        default=5,
+        ge=1,
+        le=100,
+        description="Consecutive failed Ollama requests before summarization fails fast"
+    )
+    
+    ollama_circuit_reset_seconds: float = Field(
+        default=30.0,
+        ge=1.0,
+        le=3600.0,
+        description="Seconds the Ollama circuit stays open before a probe request is allowed"
+    )
+    
+    summary_pending_enabled: bool = Field(
+        default=True,
+        description="Park jobs with finished transcripts while Ollama is unavailable and resume them automatically"
+    )
+    
+    summary_pending_timeout: int = Field(
+        default=1800,
+        ge=0,
+        le=86400,
+        description="Maximum seconds a job waits in summary_pending before failing (transcript is kept)"
+    )
+    
     @computed_field
     @property
-    def ollama_url(self) -> str:
-        """Construct Ollama API URL from host and port."""
+    def ollama_base_url(self) -> str:
+        """Construct Ollama base URL from host and port."""
         # Handle if ollama_host is already a full URL
         if self.ollama_host.startswith("http://") or self.ollama_host.startswith("https://"):
-            base = self.ollama_host.rstrip("/")
-        else:
-            base = f"http://{self.ollama_host}:{self.ollama_port}"
-        return f"{base}/api/generate"
+            return self.ollama_host.rstrip("/")
+        return f"http://{self.ollama_host}:{self.ollama_port}"
+    
+    @computed_field
+    @property
+    def ollama_url(self) -> str:
+        """Construct Ollama generate API URL from host and port."""
+        return f"{self.ollama_base_url}/api/generate"
+    
+    @computed_field
+    @property
+    def ollama_hosts_list(self) -> List[str]:
+        """Parse Ollama hosts from comma-separated string, falling back to the single host."""
+        hosts = []
+        for host in self.ollama_hosts.split(","):
+            host = host.strip().rstrip("/")
+            if not host:
+                continue
+            hosts.append(host if host.startswith(("http://", "https://")) else f"http://{host}")
+        return hosts or [self.ollama_base_url]
     
     # ======= Logging =======
     
@@ -234,6 +470,14 @@ class CogniScribeSettings(BaseSettings):
             return os.path.abspath(self.temp_audio_dir)
         return os.path.join(self.base_data_dir, "temp_processed")
     
+    @computed_field
+    @property
+    def resolved_task_result_dir(self) -> str:
+        """Resolve spilled task result directory path."""
+        if self.task_result_dir:
+            return os.path.abspath(self.task_result_dir)
+        return os.path.join(self.base_data_dir, "task_results")
+    
     @computed_field
     @property
     def max_chunk_bytes(self) -> int:
@@ -288,6 +532,23 @@ AUDIO_RETENTION_DAYS = _s.audio_retention_days
 AUDIO_STORAGE_DIR = _s.resolved_audio_storage_dir
 TEMP_AUDIO_DIR = _s.resolved_temp_audio_dir
 
+# Task results
+TASK_RESULT_DIR = _s.resolved_task_result_dir
+TASK_RESULT_MEMORY_BYTES = _s.task_result_memory_mb * 1024 * 1024
+
+# Task state and Redis
+TASK_BACKEND = _s.task_backend
+REDIS_URL = _s.redis_url
+REDIS_MAX_CONNECTIONS = _s.redis_max_connections
+REDIS_SOCKET_TIMEOUT = _s.redis_socket_timeout
+REDIS_LOCAL_CACHE_ENTRIES = _s.redis_local_cache_entries
+REDIS_LOCAL_CACHE_SECONDS = _s.redis_local_cache_seconds
+PROGRESS_DEBOUNCE_SECONDS = _s.progress_debounce_seconds
+CACHE_SERIALIZER = _s.cache_serializer
+CACHE_COMPRESSION = _s.cache_compression
+CACHE_COMPRESS_MIN_BYTES = _s.cache_compress_min_bytes
+TASK_CACHE_SECONDS = _s.task_cache_seconds
+
 # File limits
 MAX_FILE_SIZE_MB = _s.max_file_size_mb
 MAX_CHUNK_MB = _s.max_chunk_mb
@@ -296,6 +557,7 @@ ALLOWED_AUDIO_FORMATS = _s.allowed_audio_formats
 
 # Security
 PHI_DETECTION_ENABLED = _s.phi_detection_enabled
+PHI_DICTIONARY_PATH = _s.phi_dictionary_path
 
 # DeepFilterNet
 DEEPFILTERNET_ENABLED = _s.deepfilternet_enabled
@@ -312,9 +574,31 @@ COMPUTE_TYPE = _s.compute_type
 # Ollama
 OLLAMA_HOST = _s.ollama_host
 OLLAMA_PORT = _s.ollama_port
+OLLAMA_BASE_URL = _s.ollama_base_url
 OLLAMA_URL = _s.ollama_url
 OLLAMA_MODEL = _s.ollama_model
 OLLAMA_TIMEOUT = _s.ollama_timeout
+OLLAMA_CONNECT_TIMEOUT = _s.ollama_connect_timeout
+OLLAMA_READ_TIMEOUT = _s.ollama_read_timeout or _s.ollama_timeout
+OLLAMA_MAX_CONNECTIONS = _s.ollama_max_connections
+OLLAMA_MAX_KEEPALIVE = _s.ollama_max_keepalive
+OLLAMA_NUM_PARALLEL = _s.ollama_num_parallel
+OLLAMA_KEEP_ALIVE = _s.ollama_keep_alive
+OLLAMA_WARMUP_ON_STARTUP = _s.ollama_warmup_on_startup
+OLLAMA_NUM_CTX = _s.ollama_num_ctx
+OLLAMA_MIN_NUM_CTX = min(_s.ollama_min_num_ctx, _s.ollama_num_ctx)
+OLLAMA_TOKENIZER = _s.ollama_tokenizer
+SUMMARY_MAP_CONCURRENCY = _s.summary_map_concurrency
+SUMMARY_COMPRESSION_ENABLED = _s.summary_compression_enabled
+SUMMARY_COMPRESSION_RATIO = _s.summary_compression_ratio
+OLLAMA_HOSTS = _s.ollama_hosts_list
+OLLAMA_EJECT_AFTER_FAILURES = _s.ollama_eject_after_failures
+OLLAMA_EJECTION_SECONDS = _s.ollama_ejection_seconds
+OLLAMA_HEALTH_INTERVAL = _s.ollama_health_interval
+OLLAMA_CIRCUIT_FAILURE_THRESHOLD = _s.ollama_circuit_failure_threshold
+OLLAMA_CIRCUIT_RESET_SECONDS = _s.ollama_circuit_reset_seconds
+SUMMARY_PENDING_ENABLED = _s.summary_pending_enabled
+SUMMARY_PENDING_TIMEOUT = _s.summary_pending_timeout
 
 # Logging
 LOG_LEVEL = _s.log_level
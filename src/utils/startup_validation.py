@@ -18,7 +18,6 @@ def validate_environment() -> Tuple[bool, List[str]]:
     
     # Required environment variables
     required_vars = {
-        "DATABASE_URL": "Database connection string",
         "JWT_SECRET_KEY": "JWT secret key for token signing"
     }
     
@@ -39,27 +38,25 @@ def validate_environment() -> Tuple[bool, List[str]]:
             "Set this for production use."
         )
     
-    # Check Redis availability (optional)
-    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    try:
-        import redis
-        client = redis.from_url(redis_url, socket_connect_timeout=2)
-        client.ping()
-        logger.info("✅ Redis connection available")
-    except Exception:
-        warnings.append(
-            f"Redis not available at {redis_url}. "
-            "Rate limiting will use in-memory storage (not suitable for multi-instance deployments)."
-        )
+    # Redis and the database (both optional) are connected in the background
+    # after startup; their state is reported by /api/health/ready
+    if not os.getenv("DATABASE_URL"):
+        logger.info("DATABASE_URL not set; database-backed features are disabled")
     
-    # Check database connectivity
-    try:
-        from src.database.config import engine
-        with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        logger.info("✅ Database connection successful")
-    except Exception as e:
-        errors.append(f"Database connection failed: {str(e)}")
+    # With the Redis task store there is no in-memory fallback, so say so
+    # now rather than on the first upload
+    from src.utils.settings import REDIS_URL, TASK_BACKEND
+    if TASK_BACKEND == "redis":
+        try:
+            import redis
+            redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2).ping()
+            logger.info("✅ Redis task store available")
+        except Exception:
+            warnings.append(
+                f"TASK_BACKEND=redis but Redis is not reachable at {REDIS_URL}. "
+                "Task requests will fail with 503 (task_store_unavailable) until it answers. "
+                "Set TASK_BACKEND=memory to run a single process without Redis."
+            )
     
     # Check Ollama availability (optional, but important for functionality)
     ollama_host = os.getenv("OLLAMA_HOST", "localhost")
@@ -0,0 +1,63 @@
+"""Cache of generated summaries keyed by transcript and summary parameters."""
+import hashlib
+from typing import Optional
+from src.cache.redis_config import get_ready_async_redis
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def get_transcript_hash(transcript_text: str) -> str:
+    """Hash identifying a transcript's content."""
+    return hashlib.sha256(transcript_text.encode("utf-8")).hexdigest()
+
+
+def get_summary_key(transcript_hash: str, ratio: float, subject: Optional[str]) -> str:
+    """Get Redis key for a summary of a transcript with the given parameters."""
+    return f"summary:{transcript_hash}:{ratio:g}:{(subject or '').lower()}"
+
+
+async def get_cached_summary(transcript_hash: str, ratio: float, subject: Optional[str]) -> Optional[dict]:
+    """Look up a previously generated summary.
+
+    Returns:
+        Dictionary with summary and summary_text if cached, None otherwise
+    """
+    try:
+        redis_client = get_ready_async_redis()
+        if redis_client is None:
+            return None
+        cached = await redis_client.get_cache(get_summary_key(transcript_hash, ratio, subject))
+        if isinstance(cached, dict):
+            logger.info(f"Found cached summary (hash: {transcript_hash[:16]}..., ratio={ratio}, subject={subject})")
+            return cached
+    except Exception as e:
+        logger.debug(f"Could not check Redis for cached summary: {str(e)}")
+    return None
+
+
+async def cache_summary(
+    transcript_hash: str,
+    ratio: float,
+    subject: Optional[str],
+    summary: dict,
+    summary_text: str,
+    ttl: int = 86400 * 7,
+) -> bool:
+    """Cache a generated summary (default 7 days, like file results).
+
+    Returns:
+        True if cached successfully, False otherwise
+    """
+    try:
+        redis_client = get_ready_async_redis()
+        if redis_client is None:
+            return False
+        return await redis_client.set_cache(
+            get_summary_key(transcript_hash, ratio, subject),
+            {"summary": summary, "summary_text": summary_text},
+            ttl=ttl,
+        )
+    except Exception as e:
+        logger.debug(f"Could not cache summary: {str(e)}")
+        return False
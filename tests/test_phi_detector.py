@@ -221,7 +221,50 @@ class TestPHIDetector:
         
         assert result.contains_phi
         assert any(m.phi_type == PHIType.MRN for m in result.matches)
-    
+
+    def test_custom_patterns_do_not_leak(self):
+        """Custom patterns should not be added to other detectors."""
+        PHIDetector(custom_patterns={PHIType.MRN: [(r'\bHOSP-\d{6}\b', 0.95)]})
+
+        result = PHIDetector().scan_text("Patient medical record: HOSP-123456")
+
+        assert not any(m.phi_type == PHIType.MRN for m in result.matches)
+        assert all('HOSP' not in p for p, _ in PHIDetector.PATTERNS[PHIType.MRN])
+
+    def test_custom_pattern_without_word_boundary(self):
+        """Should match custom patterns that do not start with \\b."""
+        detector = PHIDetector(custom_patterns={PHIType.MRN: [(r'#H\d{6}', 0.9)]})
+
+        result = detector.scan_text("Chart #H123456 was reviewed")
+
+        assert [m.matched_text for m in result.matches] == ['#H123456']
+
+    def test_invalid_custom_pattern_rejected(self):
+        """Should reject invalid custom patterns at construction."""
+        with pytest.raises(ValueError, match="medical_record_number"):
+            PHIDetector(custom_patterns={PHIType.MRN: [(r'\bHOSP-(\d{6}\b', 0.95)]})
+
+    def test_custom_pattern_with_global_flag_rejected(self):
+        """Should reject patterns that cannot be combined, naming the pattern."""
+        with pytest.raises(ValueError, match=r"\(\?i\)hosp"):
+            PHIDetector(custom_patterns={PHIType.MRN: [(r'(?i)hosp-\d{6}', 0.95)]})
+
+    def test_most_specific_pattern_wins(self, detector):
+        """Overlapping patterns should report the highest-confidence match."""
+        result = detector.scan_text("Contact: SSN: 123-45-6789")
+
+        assert len(result.matches) == 1
+        assert result.matches[0].matched_text == "SSN: 123-45-6789"
+        assert result.matches[0].confidence == 0.95
+
+    def test_overlapping_types_all_reported(self, detector):
+        """A phone match should not hide a card number overlapping it."""
+        result = detector.scan_text("Card 555-123-4567 1234 3456 5678")
+
+        assert {m.phi_type for m in result.matches} >= {PHIType.PHONE, PHIType.CREDIT_CARD}
+        assert result.contains_phi
+        assert result.confidence_score == 0.8
+
     # Singleton Test
     def test_singleton_instance(self):
         """Should return same instance from get_phi_detector()."""
@@ -231,6 +274,84 @@ class TestPHIDetector:
         assert detector1 is detector2
 
 
+class TestPHIStreamScanner:
+    """Test incremental PHI scanning over transcript segments."""
+    
+    def test_clean_segments_pass(self):
+        """Should not report PHI for a clean lecture."""
+        scanner = PHIDetector().stream_scanner()
+        
+        for text in ["The heart has four chambers.", "Blood pressure is 120 over 80."]:
+            assert scanner.feed(text) is None
+        
+        assert not scanner.result().contains_phi
+    
+    def test_rejects_as_soon_as_threshold_crossed(self):
+        """Should return the rejection on the segment that crosses the threshold."""
+        scanner = PHIDetector().stream_scanner()
+        
+        assert scanner.feed("Today we review the renal case.") is None
+        result = scanner.feed("Patient SSN: 123-45-6789.")
+        
+        assert result is not None and result.contains_phi
+        assert any(m.phi_type == PHIType.SSN for m in result.matches)
+    
+    def test_phi_split_across_segments(self):
+        """Should match PHI that straddles a segment boundary."""
+        scanner = PHIDetector().stream_scanner()
+        
+        assert scanner.feed("Her date of birth:") is None
+        result = scanner.feed("01/02/1960 was confirmed.")
+        
+        assert result is not None
+        match = next(m for m in result.matches if m.phi_type == PHIType.DATE_OF_BIRTH)
+        assert match.matched_text == "date of birth: 01/02/1960"
+        assert match.position == len("Her ")
+    
+    def test_overlap_matches_reported_once(self):
+        """Should not report matches inside the overlap window twice."""
+        scanner = PHIDetector().stream_scanner()
+        
+        scanner.feed("Call 555-123-4567 for lecture notes.")
+        scanner.feed("The syllabus is online.")
+        
+        assert len(scanner.matches) == 1
+    
+    def test_later_medical_context_raises_confidence(self):
+        """Should reject once medical context appears after a phone number."""
+        scanner = PHIDetector().stream_scanner()
+        
+        assert scanner.feed("Call 555-123-4567 tomorrow.") is None
+        result = scanner.feed("The patient was admitted overnight.")
+        
+        assert result is not None
+        assert result.confidence_score == pytest.approx(0.8)
+    
+    def test_overlapping_types_all_reported(self):
+        """Should reject a card number overlapping a phone number."""
+        scanner = PHIDetector().stream_scanner()
+        
+        assert scanner.feed("Card 555-123-4567") is None
+        result = scanner.feed("1234 3456 5678")
+        
+        assert result is not None
+        assert any(m.phi_type == PHIType.CREDIT_CARD for m in result.matches)
+    
+    def test_matches_full_scan(self):
+        """Should find the same PHI as scanning the joined transcript."""
+        detector = PHIDetector()
+        segments = ["Good morning.", "Email jane.doe@example.com", "or call (555) 123-4567.", "Thanks."]
+        scanner = detector.stream_scanner()
+        for text in segments:
+            scanner.feed(text)
+        
+        full = detector.scan_text(" ".join(segments))
+        streamed = scanner.result()
+        
+        assert [(m.phi_type, m.position, m.confidence) for m in streamed.matches] == \
+            [(m.phi_type, m.position, m.confidence) for m in full.matches]
+
+
 class TestPHIDetectionIntegration:
     """Integration tests for PHI detection in pipeline."""
     
@@ -1,7 +1,15 @@
 """Tests for Redis cache operations."""
+import asyncio
 import pytest
-from src.cache.redis_config import RedisClient
+import json
+import os
+import threading
+import time
+import uuid
+from redis.client import NEVER_DECODE
+from src.cache.redis_config import AsyncRedisClient, ProgressDebouncer, RedisClient
 import fakeredis
+import fakeredis.aioredis
 
 
 @pytest.fixture
@@ -10,9 +18,56 @@ def redis_client():
     # Using fakeredis for testing without actual Redis
     fake_redis = fakeredis.FakeStrictRedis()
     
-    client = RedisClient.__new__(RedisClient)
-    client.redis = fake_redis
-    return client
+    client = RedisClient(client=fake_redis)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def decoded_redis_client(server):
+    """Create fake Redis client returning strings, like get_redis()."""
+    client = RedisClient(client=fakeredis.FakeRedis(server=server, decode_responses=True))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+async def async_redis_client():
+    """Create fake async Redis client for testing."""
+    # fakeredis's async client decodes replies even when asked not to, so
+    # binary cache values are only readable with decoding off
+    client = AsyncRedisClient(client=fakeredis.aioredis.FakeRedis())
+    yield client
+    await client.close()
+
+
+@pytest.fixture(params=["fakeredis", pytest.param("local", marks=pytest.mark.redis)])
+def worker_clients(request, server):
+    """Make clients with separate connections to one Redis, like separate workers.
+    
+    The "local" variant runs against the Redis at REDIS_TEST_URL.
+    """
+    url = os.getenv("REDIS_TEST_URL")
+    if request.param == "local" and not url:
+        pytest.skip("REDIS_TEST_URL is not set")
+    clients = []
+    
+    def make_client():
+        if request.param == "local":
+            client = RedisClient(url)
+        else:
+            client = RedisClient(client=fakeredis.FakeRedis(server=server, decode_responses=True))
+        clients.append(client)
+        return client
+    
+    yield make_client
+    for client in clients:
+        client.close()
 
 
 class TestTaskOperations:
@@ -110,3 +165,330 @@ class TestCounterOperations:
         
         value = redis_client.get_counter("counter1")
         assert value == 10
+
+
+class TestRateLimitScript:
+    """Test the atomic GCRA rate limit."""
+    
+    def test_burst_then_rejected(self, decoded_redis_client):
+        """Test up to the limit is allowed at once, with remaining counting down."""
+        results = [decoded_redis_client.check_rate_limit("client", 3, 60) for _ in range(4)]
+        
+        assert results[:3] == [(True, 2, 0), (True, 1, 0), (True, 0, 0)]
+        allowed, remaining, retry_after = results[3]
+        assert (allowed, remaining) == (False, 0)
+        assert 1 <= retry_after <= 20
+    
+    def test_one_request_per_interval_after_burst(self, decoded_redis_client):
+        """Test a request is allowed again once one emission interval has passed."""
+        for _ in range(10):
+            decoded_redis_client.check_rate_limit("client", 10, 1)
+        assert decoded_redis_client.check_rate_limit("client", 10, 1)[0] is False
+        
+        time.sleep(0.15)
+        
+        assert decoded_redis_client.check_rate_limit("client", 10, 1)[0] is True
+        assert decoded_redis_client.check_rate_limit("client", 10, 1)[0] is False
+    
+    def test_state_expires(self, decoded_redis_client):
+        """Test the key expires once the client would be back to a full burst."""
+        decoded_redis_client.check_rate_limit("client", 10, 60)
+        
+        assert 0 < decoded_redis_client.redis.pttl("ratelimit:gcra:client") <= 6000
+    
+    def test_clients_limited_separately(self, decoded_redis_client):
+        """Test each key has its own limit."""
+        decoded_redis_client.check_rate_limit("a", 1, 60)
+        
+        assert decoded_redis_client.check_rate_limit("a", 1, 60)[0] is False
+        assert decoded_redis_client.check_rate_limit("b", 1, 60)[0] is True
+    
+    def test_concurrent_workers_never_exceed_limit(self, worker_clients):
+        """Test requests racing from several workers admit exactly the limit."""
+        key = f"concurrency-{uuid.uuid4().hex}"
+        clients = [worker_clients() for _ in range(8)]
+        start = threading.Barrier(len(clients))
+        allowed = []
+        
+        def worker(client):
+            start.wait()
+            for _ in range(25):
+                allowed.append(client.check_rate_limit(key, 50, 60)[0])
+        
+        threads = [threading.Thread(target=worker, args=(client,)) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(allowed) == 200
+        assert sum(allowed) == 50
+        clients[0].redis.delete(f"ratelimit:gcra:{key}")
+
+
+class TestPipelinedTaskOperations:
+    """Test task operations that use one round trip."""
+    
+    def test_set_task_sets_ttl(self, decoded_redis_client):
+        """Test the task and its TTL are written together."""
+        decoded_redis_client.set_task("task-001", {"status": "pending"}, ttl=60)
+        
+        assert decoded_redis_client.get_task("task-001") == {"status": "pending"}
+        assert 0 < decoded_redis_client.redis.ttl("task:task-001") <= 60
+    
+    def test_get_tasks(self, decoded_redis_client):
+        """Test several tasks are read at once and missing ones omitted."""
+        decoded_redis_client.set_task("task-001", {"status": "pending"})
+        decoded_redis_client.set_task("task-002", {"status": "completed"})
+        
+        tasks = decoded_redis_client.get_tasks(["task-001", "missing", "task-002"])
+        
+        assert tasks == {"task-001": {"status": "pending"}, "task-002": {"status": "completed"}}
+        assert decoded_redis_client.get_tasks([]) == {}
+    
+    def test_set_progress(self, decoded_redis_client):
+        """Test progress updates only the two fields of an existing task."""
+        decoded_redis_client.set_task("task-001", {"status": "processing", "progress": "0", "updated_at": "t0"})
+        
+        assert decoded_redis_client.set_progress("task-001", "40", "t1") is True
+        assert decoded_redis_client.get_task("task-001") == {"status": "processing", "progress": "40", "updated_at": "t1"}
+    
+    def test_set_progress_missing_task(self, decoded_redis_client):
+        """Test progress for an unknown task is rejected and not stored."""
+        assert decoded_redis_client.set_progress("missing", "40", "t1") is False
+        assert decoded_redis_client.get_task("missing") is None
+
+
+class TestCacheEncoding:
+    """Test cached values are stored compactly."""
+    
+    def test_large_value_compressed(self, decoded_redis_client):
+        """Test a cached transcript takes a fraction of its JSON size in Redis."""
+        result = {"transcript": {"text": "The nephron filters plasma. " * 500}}
+        decoded_redis_client.set_cache("file_hash:abc", result)
+        
+        stored = decoded_redis_client.redis.execute_command("GET", "cache:file_hash:abc", NEVER_DECODE=True)
+        
+        assert len(stored) * 5 < len(json.dumps(result))
+        assert decoded_redis_client.get_cache("file_hash:abc") == result
+    
+    def test_reads_untagged_json(self, decoded_redis_client):
+        """Test values cached as JSON text before encoding was added still read."""
+        decoded_redis_client.redis.set("cache:file_hash:old", json.dumps({"task_id": "t1"}))
+        
+        assert decoded_redis_client.get_cache("file_hash:old") == {"task_id": "t1"}
+    
+    def test_long_task_fields_round_trip(self, decoded_redis_client):
+        """Test long task fields are encoded and read back as text."""
+        transcript = "The nephron filters plasma. " * 500
+        decoded_redis_client.set_task("task-001", {"status": "completed", "transcript_text": transcript})
+        
+        assert decoded_redis_client.get_task("task-001") == {"status": "completed", "transcript_text": transcript}
+        assert decoded_redis_client.redis.hget("task:task-001", "status") == "completed"
+
+
+class TestLocalTier:
+    """Test the in-process tier in front of Redis."""
+    
+    def test_hot_reads_served_locally(self, decoded_redis_client):
+        """Test repeated reads of a task cost one Redis read."""
+        decoded_redis_client.set_task("task-001", {"status": "pending"})
+        
+        for _ in range(5):
+            assert decoded_redis_client.get_task("task-001") == {"status": "pending"}
+        
+        stats = decoded_redis_client.get_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (4, 1)
+    
+    def test_writes_update_local_copy(self, decoded_redis_client):
+        """Test a worker reads its own writes."""
+        decoded_redis_client.set_task("task-001", {"status": "pending", "progress": "0", "updated_at": "t0"})
+        decoded_redis_client.get_task("task-001")
+        decoded_redis_client.set_cache("key1", {"v": 1})
+        decoded_redis_client.get_cache("key1")
+        
+        decoded_redis_client.update_task("task-001", {"status": "processing"})
+        decoded_redis_client.set_cache("key1", {"v": 2})
+        
+        assert decoded_redis_client.get_task("task-001")["status"] == "processing"
+        assert decoded_redis_client.get_cache("key1") == {"v": 2}
+        decoded_redis_client.delete_cache("key1")
+        assert decoded_redis_client.get_cache("key1") is None
+    
+    def test_get_tasks_reads_only_uncached(self, decoded_redis_client):
+        """Test the bulk read combines local copies with one Redis read."""
+        decoded_redis_client.set_task("task-001", {"status": "pending"})
+        decoded_redis_client.set_task("task-002", {"status": "completed"})
+        decoded_redis_client.get_task("task-001")
+        
+        tasks = decoded_redis_client.get_tasks(["task-001", "task-002", "missing"])
+        
+        assert tasks == {"task-001": {"status": "pending"}, "task-002": {"status": "completed"}}
+        assert decoded_redis_client.get_cache_stats()["hits"] == 1
+    
+    def test_other_worker_invalidates(self, server, decoded_redis_client):
+        """Test a write by one worker drops another worker's local copy."""
+        other = RedisClient(client=fakeredis.FakeRedis(server=server, decode_responses=True))
+        try:
+            other.set_cache("key1", "old")
+            assert decoded_redis_client.get_cache("key1") == "old"
+            
+            other.set_cache("key1", "new")
+            deadline = time.monotonic() + 5
+            while decoded_redis_client.get_cache_stats()["invalidations"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            
+            assert decoded_redis_client.get_cache("key1") == "new"
+        finally:
+            other.close()
+    
+    async def test_async_other_worker_invalidates(self, server):
+        """Test the async client drops copies written by another worker."""
+        worker_a = AsyncRedisClient(client=fakeredis.aioredis.FakeRedis(server=server))
+        worker_b = AsyncRedisClient(client=fakeredis.aioredis.FakeRedis(server=server))
+        try:
+            await worker_a.set_cache("key1", "old")
+            assert await worker_b.get_cache("key1") == "old"
+            await asyncio.sleep(0.1)
+            
+            await worker_a.set_cache("key1", "new")
+            for _ in range(100):
+                if worker_b.get_cache_stats()["invalidations"]:
+                    break
+                await asyncio.sleep(0.02)
+            
+            assert await worker_b.get_cache("key1") == "new"
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+
+
+class TestProgressDebouncer:
+    """Test coalescing of progress writes."""
+    
+    def test_first_update_written_immediately(self):
+        """Test a task's first update is written at once and returns the write's result."""
+        writes = []
+        debouncer = ProgressDebouncer(lambda task_id, value: writes.append((task_id, value)) or True, interval=60)
+        
+        assert debouncer.update("task-001", "10") is True
+        assert debouncer.update("task-002", "10") is True
+        assert writes == [("task-001", "10"), ("task-002", "10")]
+    
+    def test_rapid_updates_coalesced(self):
+        """Test updates within the interval collapse into one trailing write of the latest value."""
+        writes = []
+        debouncer = ProgressDebouncer(lambda task_id, value: writes.append(value), interval=60)
+        
+        for value in ["10", "20", "30", "40"]:
+            debouncer.update("task-001", value)
+        debouncer.flush()
+        
+        assert writes == ["10", "40"]
+        assert (debouncer.writes, debouncer.coalesced) == (2, 2)
+    
+    def test_trailing_write_after_interval(self):
+        """Test the pending value is written by the timer without further updates."""
+        written = threading.Event()
+        writes = []
+        
+        def write(task_id, value):
+            writes.append(value)
+            if value == "20":
+                written.set()
+        
+        debouncer = ProgressDebouncer(write, interval=0.05)
+        debouncer.update("task-001", "10")
+        debouncer.update("task-001", "20")
+        
+        assert written.wait(timeout=5)
+        assert writes == ["10", "20"]
+    
+    def test_discard_drops_pending(self):
+        """Test a finished task's pending value is never written."""
+        writes = []
+        debouncer = ProgressDebouncer(lambda task_id, value: writes.append(value), interval=0.05)
+        debouncer.update("task-001", "10")
+        debouncer.update("task-001", "20")
+        
+        debouncer.discard("task-001")
+        time.sleep(0.1)
+        
+        assert writes == ["10"]
+    
+    def test_zero_interval_writes_every_update(self):
+        """Test an interval of 0 disables coalescing."""
+        writes = []
+        debouncer = ProgressDebouncer(lambda task_id, value: writes.append(value), interval=0)
+        
+        for value in ["10", "20", "30"]:
+            debouncer.update("task-001", value)
+        
+        assert writes == ["10", "20", "30"]
+
+
+class TestAsyncRedisClient:
+    """Test the async client mirrors the synchronous one."""
+    
+    async def test_task_round_trip(self, async_redis_client):
+        """Test setting, updating and deleting a task."""
+        await async_redis_client.set_task("task-001", {"status": "pending"})
+        await async_redis_client.update_task("task-001", {"status": "completed"})
+        
+        assert await async_redis_client.get_task("task-001") == {"status": "completed"}
+        assert await async_redis_client.delete_task("task-001") is True
+        assert await async_redis_client.get_task("task-001") is None
+    
+    async def test_cache_decodes_json(self, async_redis_client):
+        """Test dictionaries are stored as JSON and plain strings returned as-is."""
+        await async_redis_client.set_cache("result", {"summary": "notes"})
+        await async_redis_client.set_cache("text", "value1")
+        
+        assert await async_redis_client.get_cache("result") == {"summary": "notes"}
+        assert await async_redis_client.get_cache("text") == "value1"
+        assert await async_redis_client.get_cache("missing") is None
+    
+    async def test_get_tasks_and_progress(self, async_redis_client):
+        """Test the bulk read and single-round-trip progress update."""
+        await async_redis_client.set_task("task-001", {"status": "processing", "progress": "0", "updated_at": "t0"})
+        
+        assert await async_redis_client.set_progress("task-001", "40", "t1") is True
+        assert await async_redis_client.set_progress("missing", "40", "t1") is False
+        assert await async_redis_client.get_tasks(["task-001", "missing"]) == {
+            "task-001": {"status": "processing", "progress": "40", "updated_at": "t1"}
+        }
+    
+    async def test_counters_and_rate_limit(self, async_redis_client):
+        """Test counters and the rate limit window."""
+        assert await async_redis_client.increment_counter("counter1", 5) == 5
+        assert await async_redis_client.get_counter("counter1") == 5
+        assert await async_redis_client.set_rate_limit("client", 1, 60) is True
+        assert await async_redis_client.set_rate_limit("client", 1, 60) is False
+        assert await async_redis_client.get_rate_limit("client") == 2
+    
+    async def test_concurrent_rate_limit_checks(self, async_redis_client):
+        """Test concurrent checks through the pool admit exactly the limit."""
+        results = await asyncio.gather(*(async_redis_client.check_rate_limit("client", 10, 60) for _ in range(30)))
+        
+        assert sum(allowed for allowed, _, _ in results) == 10
+        assert sorted(remaining for allowed, remaining, _ in results if allowed) == list(range(10))
+    
+    async def test_unreachable_redis_returns_defaults(self):
+        """Test connection errors are not raised to callers."""
+        client = AsyncRedisClient("redis://127.0.0.1:1/0", max_connections=2, socket_timeout=0.5)
+        try:
+            assert await client.ping() is False
+            assert await client.get_cache("key1") is None
+            assert await client.set_cache("key1", "value1") is False
+            assert await client.increment_counter("counter1") == 0
+        finally:
+            await client.close()
+    
+    async def test_pool_is_bounded(self):
+        """Test the pool never opens more than the configured connections."""
+        client = AsyncRedisClient(max_connections=3)
+        try:
+            assert client.pool.max_connections == 3
+            assert client.pool.connection_kwargs["socket_timeout"] == client.pool.timeout
+        finally:
+            await client.close()
@@ -0,0 +1,110 @@
+"""Unit tests for the circuit breaker."""
+
+import asyncio
+from src.utils.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class TestCircuitStates:
+    """Test state transitions."""
+    
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+        
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.allow_request() is False
+        assert 59 < breaker.retry_after() <= 60
+    
+    def test_success_resets_failure_count(self):
+        """Test failures must be consecutive."""
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert breaker.state is CircuitState.CLOSED
+    
+    async def test_half_open_allows_single_probe(self):
+        """Test only one request is admitted after the reset timeout."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+        
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+    
+    async def test_probe_success_closes(self):
+        """Test a successful probe closes the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+        breaker.allow_request()
+        
+        breaker.record_success()
+        
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.allow_request() is True
+    
+    async def test_probe_failure_reopens(self):
+        """Test a failed probe opens the circuit again."""
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+        await asyncio.sleep(0.02)
+        breaker.allow_request()
+        
+        breaker.record_failure()
+        
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.get_stats()["times_opened"] == 2
+    
+    async def test_release_frees_probe(self):
+        """Test a neutral outcome lets another probe through."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+        breaker.allow_request()
+        
+        breaker.release()
+        
+        assert breaker.allow_request() is True
+
+
+class TestWaitUntilReady:
+    """Test waiting for the circuit to admit requests."""
+    
+    async def test_returns_immediately_when_closed(self):
+        """Test no wait while closed."""
+        breaker = CircuitBreaker("test")
+        
+        await asyncio.wait_for(breaker.wait_until_ready(), timeout=0.1)
+    
+    async def test_waits_until_probe_due(self):
+        """Test waiting ends when the reset timeout elapses."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        
+        await asyncio.wait_for(breaker.wait_until_ready(), timeout=1)
+        
+        assert breaker.state is CircuitState.HALF_OPEN
+    
+    async def test_waits_for_probe_outcome(self):
+        """Test waiters block while a probe is in flight and wake when it succeeds."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        await asyncio.sleep(0.02)
+        breaker.allow_request()
+        
+        waiter = asyncio.create_task(breaker.wait_until_ready())
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+        
+        breaker.record_success()
+        await asyncio.wait_for(waiter, timeout=1)
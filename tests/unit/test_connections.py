@@ -0,0 +1,182 @@
+"""Unit tests for lazy background connections."""
+
+import asyncio
+import pytest
+from src.utils import connections
+from src.utils.connections import ConnectionState, LazyConnection, get_readiness, register_connection
+
+
+class FlakyService:
+    """Connect and check callables that fail while the service is down."""
+
+    def __init__(self, up=True):
+        self.up = up
+        self.connects = 0
+
+    async def connect(self):
+        self.connects += 1
+        if not self.up:
+            raise ConnectionError("connection refused")
+        return "client"
+
+    async def check(self, client):
+        if not self.up:
+            raise ConnectionError("connection reset")
+
+
+def make_connection(service, **kwargs):
+    kwargs.setdefault("initial_backoff", 0.01)
+    kwargs.setdefault("max_backoff", 0.02)
+    kwargs.setdefault("check_interval", 0.01)
+    return LazyConnection("service", service.connect, check=service.check, **kwargs)
+
+
+async def wait_for_state(connection, state, timeout=1.0):
+    async def wait():
+        while connection.state is not state:
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(wait(), timeout)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty connection registry."""
+    monkeypatch.setattr(connections, "_connections", {})
+    return connections._connections
+
+
+class TestLazyConnection:
+    """Test connecting, reconnecting and degraded operation."""
+
+    async def test_get_does_not_wait(self):
+        """Test get() returns None at once and the client once connected."""
+        connection = make_connection(FlakyService())
+
+        assert connection.get() is None
+        await wait_for_state(connection, ConnectionState.READY)
+
+        assert connection.get() == "client"
+        await connection.stop()
+
+    async def test_retries_until_available(self):
+        """Test failed connects are retried with backoff until the service is up."""
+        service = FlakyService(up=False)
+        connection = make_connection(service)
+        connection.start()
+
+        await wait_for_state(connection, ConnectionState.UNAVAILABLE)
+        assert connection.get() is None
+        service.up = True
+        await wait_for_state(connection, ConnectionState.READY)
+
+        assert service.connects >= 2
+        assert connection.status()["last_error"] is None
+        await connection.stop()
+
+    async def test_lost_service_reconnected(self):
+        """Test a failing health check marks the connection unavailable until it recovers."""
+        service = FlakyService()
+        connection = make_connection(service)
+        connection.start()
+        await wait_for_state(connection, ConnectionState.READY)
+
+        service.up = False
+        await wait_for_state(connection, ConnectionState.UNAVAILABLE)
+        assert connection.get() is None
+        assert connection.status()["last_error"] in ("connection reset", "connection refused")
+
+        service.up = True
+        await wait_for_state(connection, ConnectionState.READY)
+        await connection.stop()
+
+    async def test_report_failure(self):
+        """Test a failure reported by a caller takes effect before the next check."""
+        connection = make_connection(FlakyService(), check_interval=60)
+        connection.start()
+        await wait_for_state(connection, ConnectionState.READY)
+
+        connection.report_failure(ConnectionError("timeout"))
+
+        assert connection.get() is None
+        await wait_for_state(connection, ConnectionState.READY)
+        await connection.stop()
+
+    def test_backoff_grows_to_limit(self):
+        """Test retry delays double up to the maximum, with jitter below it."""
+        connection = LazyConnection("service", FlakyService().connect, initial_backoff=1.0, max_backoff=8.0)
+
+        delays = [connection._backoff(attempt) for attempt in range(6)]
+
+        assert 0.5 <= delays[0] <= 1.0
+        assert 2.0 <= delays[2] <= 4.0
+        assert all(4.0 <= delay <= 8.0 for delay in delays[3:])
+
+    async def test_disabled_never_connects(self):
+        """Test a disabled connection does not start."""
+        service = FlakyService()
+        connection = make_connection(service, enabled=False)
+
+        assert connection.get() is None
+        await asyncio.sleep(0.02)
+
+        assert service.connects == 0
+        assert connection.state is ConnectionState.DISABLED
+
+    def test_start_without_event_loop(self):
+        """Test start() outside an event loop (e.g. at import) does nothing."""
+        service = FlakyService()
+        connection = make_connection(service)
+
+        connection.start()
+
+        assert connection.state is ConnectionState.CONNECTING
+        assert service.connects == 0
+
+    def test_new_event_loop_reconnects(self):
+        """Test a client connected on a stopped event loop is not handed out on the next one."""
+        service = FlakyService()
+        connection = make_connection(service)
+
+        async def connect():
+            connection.start()
+            await wait_for_state(connection, ConnectionState.READY)
+
+        asyncio.run(connect())
+        asyncio.run(connect())
+
+        assert service.connects == 2
+
+
+class TestReadiness:
+    """Test the aggregated readiness report."""
+
+    async def test_optional_service_degrades(self, registry):
+        """Test a missing optional service reports degraded but ready."""
+        register_connection(make_connection(FlakyService(up=False)))
+        connections.start_connections()
+        await wait_for_state(registry["service"], ConnectionState.UNAVAILABLE)
+
+        readiness = get_readiness()
+
+        assert (readiness["status"], readiness["ready"]) == ("degraded", True)
+        assert readiness["services"]["service"]["state"] == "unavailable"
+        await connections.stop_connections()
+
+    async def test_required_service_unavailable(self, registry):
+        """Test a missing required service reports not ready."""
+        register_connection(make_connection(FlakyService(up=False), required=True))
+        connections.start_connections()
+        await wait_for_state(registry["service"], ConnectionState.UNAVAILABLE)
+
+        assert get_readiness()["ready"] is False
+        await connections.stop_connections()
+
+    async def test_all_ready(self, registry):
+        """Test connected and disabled services report ready."""
+        register_connection(make_connection(FlakyService()))
+        register_connection(LazyConnection("database", FlakyService().connect, enabled=False))
+        connections.start_connections()
+        await wait_for_state(registry["service"], ConnectionState.READY)
+
+        assert get_readiness()["status"] == "ready"
+        await connections.stop_connections()
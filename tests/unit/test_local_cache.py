@@ -0,0 +1,99 @@
+"""Unit tests for the in-process cache tier."""
+
+import time
+from src.cache.local_cache import MISSING, LocalCache, invalidation_message, parse_invalidation
+
+
+class TestLocalCache:
+    """Test LRU and TTL behaviour."""
+
+    def test_hit_and_miss(self):
+        """Test cached values are returned and absent keys report MISSING."""
+        cache = LocalCache(max_entries=10, ttl=60)
+        cache.set("task:1", {"status": "pending"})
+
+        assert cache.get("task:1") == {"status": "pending"}
+        assert cache.get("task:2") is MISSING
+
+    def test_callers_cannot_change_cached_dicts(self):
+        """Test changing a stored or returned dict leaves the cached copy intact."""
+        cache = LocalCache(max_entries=10, ttl=60)
+        stored = {"status": "pending"}
+        cache.set("task:1", stored)
+        stored["status"] = "failed"
+        cache.get("task:1")["status"] = "completed"
+
+        assert cache.get("task:1") == {"status": "pending"}
+
+    def test_none_is_a_value(self):
+        """Test None can be cached, distinct from a miss."""
+        cache = LocalCache(max_entries=10, ttl=60)
+        cache.set("cache:empty", None)
+
+        assert cache.get("cache:empty") is None
+
+    def test_least_recently_used_evicted(self):
+        """Test the entry read least recently is evicted first."""
+        cache = LocalCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.evictions == 1
+
+    def test_entries_expire(self):
+        """Test entries are not served after the TTL."""
+        cache = LocalCache(max_entries=10, ttl=0.05)
+        cache.set("a", 1)
+
+        time.sleep(0.1)
+
+        assert cache.get("a") is MISSING
+        assert cache.get_stats()["entries"] == 0
+
+    def test_large_values_not_kept(self):
+        """Test values stored larger than the limit are not cached, and replace older copies."""
+        cache = LocalCache(max_entries=10, ttl=60, max_value_bytes=100)
+        cache.set("a", "small", size=10)
+
+        cache.set("a", "large", size=1000)
+
+        assert cache.get("a") is MISSING
+
+    def test_disabled(self):
+        """Test a TTL of 0 disables caching."""
+        cache = LocalCache(max_entries=10, ttl=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is MISSING
+        assert cache.get_stats()["enabled"] is False
+
+    def test_stats(self):
+        """Test hits, misses and invalidations are counted."""
+        cache = LocalCache(max_entries=10, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        stats = cache.get_stats()
+
+        assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 1, 1)
+        assert stats["hit_rate"] == 0.667
+
+
+class TestInvalidationMessages:
+    """Test the invalidation message format."""
+
+    def test_round_trip(self):
+        """Test keys containing colons survive, as text or bytes."""
+        message = invalidation_message("worker-a", "cache:file_hash:abc")
+
+        assert parse_invalidation(message) == ("worker-a", "cache:file_hash:abc")
+        assert parse_invalidation(message.encode()) == ("worker-a", "cache:file_hash:abc")
@@ -0,0 +1,152 @@
+"""Unit tests for the shared async Ollama client."""
+
+import asyncio
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.api.services import ollama_client
+from src.api.services.ollama_client import OllamaClient, get_ollama_client
+from src.utils.errors import ServiceUnavailableError, ErrorCode
+
+
+def make_client(handler, **kwargs) -> OllamaClient:
+    return OllamaClient("http://ollama.test", transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestClientConfiguration:
+    """Test pooling and timeout configuration."""
+
+    def test_timeouts_split(self):
+        """Test connect, read and total timeouts are configured separately."""
+        client = OllamaClient("http://ollama.test", connect_timeout=3, read_timeout=40, total_timeout=90)
+
+        assert client.timeout.connect == 3
+        assert client.timeout.read == 40
+        assert client.total_timeout == 90
+
+    def test_connection_limits(self):
+        """Test per-host connection limits."""
+        client = OllamaClient("http://ollama.test", max_connections=2, max_keepalive=1)
+
+        assert client.limits.max_connections == 2
+        assert client.limits.max_keepalive_connections == 1
+
+    def test_shared_client_per_host(self):
+        """Test get_ollama_client returns one client per base URL."""
+        with patch.dict(ollama_client._clients, clear=True):
+            first = get_ollama_client("http://a:11434")
+            assert get_ollama_client("http://a:11434/") is first
+            assert get_ollama_client("http://b:11434") is not first
+
+    async def test_pool_reused_across_requests(self):
+        """Test the underlying httpx client is reused."""
+        client = make_client(lambda request: httpx.Response(200, json={}))
+
+        await client.request("GET", "/api/tags")
+        pool = client._client
+        await client.request("GET", "/api/tags")
+
+        assert client._client is pool
+        await client.aclose()
+        assert client._client is None
+
+
+class TestGenerateRetries:
+    """Test async retry behavior."""
+
+    async def test_backoff_uses_async_sleep(self):
+        """Test retries back off without blocking the event loop."""
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+        client = make_client(handler)
+
+        with patch("src.api.services.ollama_client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            with pytest.raises(ServiceUnavailableError) as exc_info:
+                await client.generate({"model": "m", "prompt": "p"})
+
+        assert exc_info.value.error_code == ErrorCode.OLLAMA_UNAVAILABLE
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [2.0, 4.0]
+
+    async def test_total_timeout(self):
+        """Test the total timeout bounds slow responses."""
+        async def slow_handler(request):
+            await asyncio.Event().wait()  # Never answers
+        client = make_client(slow_handler, total_timeout=0.01)
+
+        with patch("src.api.services.ollama_client.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(ServiceUnavailableError) as exc_info:
+                await client.generate({"model": "m", "prompt": "p"})
+
+        assert exc_info.value.error_code == ErrorCode.OLLAMA_TIMEOUT
+
+
+class TestKeepAlive:
+    """Test model keep-alive and warm-up."""
+    
+    def test_numeric_keep_alive_sent_as_int(self):
+        """Test bare numbers are converted to seconds."""
+        assert ollama_client._parse_keep_alive("-1") == -1
+        assert ollama_client._parse_keep_alive("600") == 600
+        assert ollama_client._parse_keep_alive("30m") == "30m"
+    
+    async def test_keep_alive_added_to_requests(self):
+        """Test generation requests carry keep_alive unless the caller sets it."""
+        payloads = []
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            return httpx.Response(200, json={"response": "ok"})
+        client = make_client(handler, keep_alive="1h")
+        
+        await client.generate({"model": "m", "prompt": "p"})
+        await client.generate({"model": "m", "prompt": "p", "keep_alive": 0})
+        
+        assert payloads[0]["keep_alive"] == "1h"
+        assert payloads[1]["keep_alive"] == 0
+    
+    async def test_warm_up_loads_model_without_prompt(self):
+        """Test warm-up sends a prompt-less request for the model."""
+        payloads = []
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            return httpx.Response(200, json={"done": True})
+        client = make_client(handler, keep_alive="-1")
+        
+        await client.warm_up("llama3.1:8b")
+        
+        assert payloads == [{"model": "llama3.1:8b", "keep_alive": -1}]
+    
+    async def test_warm_up_evaluates_system_prompt(self):
+        """Test warm-up with a system prompt generates one token from a non-empty prompt."""
+        payloads = []
+        def handler(request):
+            payloads.append(json.loads(request.content))
+            return httpx.Response(200, json={"done": True, "done_reason": "length"})
+        client = make_client(handler)
+        
+        await client.warm_up("llama3.1:8b", system="You are a tutor.")
+        
+        assert payloads[0]["system"] == "You are a tutor."
+        assert payloads[0]["prompt"].strip() == "" and payloads[0]["prompt"] != ""
+        assert payloads[0]["options"]["num_predict"] == 1
+
+
+class TestGovernedRequests:
+    """Test generation requests pass through the governor."""
+    
+    async def test_generate_limited_by_num_parallel(self):
+        """Test concurrent generate calls are capped per host."""
+        in_flight = []
+        peak = []
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return httpx.Response(200, json={"response": "ok"})
+        client = make_client(handler, num_parallel=1)
+        
+        await asyncio.gather(*(client.generate({"model": "m", "prompt": "p"}) for _ in range(3)))
+        
+        assert max(peak) == 1
+        assert client.get_stats()["wait"]["interactive"]["acquired"] == 3
@@ -0,0 +1,96 @@
+"""Unit tests for the Ollama concurrency governor."""
+
+import asyncio
+import pytest
+from src.api.services.ollama_governor import OllamaGovernor, Priority
+
+
+async def settle():
+    """Let scheduled tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestSlots:
+    """Test slot limiting."""
+    
+    async def test_concurrency_capped(self):
+        """Test no more than the configured number of holders run at once."""
+        governor = OllamaGovernor(slots=2)
+        release = asyncio.Event()
+        peak = []
+        
+        async def job():
+            async with governor.slot():
+                peak.append(governor.active)
+                await release.wait()
+        
+        tasks = [asyncio.create_task(job()) for _ in range(5)]
+        await settle()
+        
+        assert governor.active == 2
+        assert governor.waiting() == {"interactive": 0, "batch": 3}
+        
+        release.set()
+        await asyncio.gather(*tasks)
+        assert max(peak) == 2
+        assert governor.active == 0
+    
+    async def test_interactive_admitted_before_batch(self):
+        """Test queued interactive requests jump ahead of batch requests."""
+        governor = OllamaGovernor(slots=1)
+        order = []
+        await governor.acquire()
+        
+        async def job(name, priority):
+            async with governor.slot(priority):
+                order.append(name)
+        
+        tasks = [
+            asyncio.create_task(job("batch-1", Priority.BATCH)),
+            asyncio.create_task(job("batch-2", Priority.BATCH)),
+        ]
+        await settle()
+        tasks.append(asyncio.create_task(job("interactive", Priority.INTERACTIVE)))
+        await settle()
+        
+        governor.release()
+        await asyncio.gather(*tasks)
+        
+        assert order == ["interactive", "batch-1", "batch-2"]
+    
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test cancelling a queued request leaves the slot count intact."""
+        governor = OllamaGovernor(slots=1)
+        await governor.acquire()
+        waiter = asyncio.create_task(governor.acquire())
+        await settle()
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        governor.release()
+        
+        assert governor.active == 0
+        await asyncio.wait_for(governor.acquire(), timeout=1)
+
+
+class TestMetrics:
+    """Test queue-wait metrics."""
+    
+    async def test_wait_recorded_per_priority(self):
+        """Test acquisitions and waits are counted by priority."""
+        governor = OllamaGovernor(slots=1)
+        await governor.acquire(Priority.INTERACTIVE)
+        waiter = asyncio.create_task(governor.acquire(Priority.BATCH))
+        await settle()
+        governor.release()
+        await waiter
+        
+        stats = governor.get_stats()
+        
+        assert stats["slots"] == 1
+        assert stats["active"] == 1
+        assert stats["wait"]["interactive"]["acquired"] == 1
+        assert stats["wait"]["batch"]["acquired"] == 1
+        assert stats["wait"]["batch"]["max_wait_seconds"] >= 0.0
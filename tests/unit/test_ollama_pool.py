@@ -0,0 +1,313 @@
+"""Unit tests for multi-host Ollama load balancing, using local stub servers."""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import patch
+from src.api.services import ollama_pool
+from src.api.services.ollama_client import OllamaClient
+from src.api.services.ollama_pool import OllamaPool
+from src.utils.errors import ServiceUnavailableError
+
+MODEL = "llama3.1:8b"
+
+
+class StubOllama:
+    """Minimal Ollama HTTP server running in a background thread."""
+
+    def __init__(self, name, models=(MODEL,), status=200, delay=0.0):
+        self.name = name
+        self.models = list(models)
+        self.status = status
+        self.delay = delay
+        self.generate_calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, content_type="application/json"):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                models = [{"name": name} for name in stub.models]
+                self._reply(200, json.dumps({"models": models}))
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if "prompt" not in payload:
+                    return self._reply(200, json.dumps({"model": payload["model"], "done": True}))
+                with stub._lock:
+                    stub.generate_calls += 1
+                    stub.in_flight += 1
+                    stub.peak = max(stub.peak, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    if stub.status != 200:
+                        return self._reply(stub.status, json.dumps({"error": "stub failure"}))
+                    model = payload["model"] if ":" in payload["model"] else f"{payload['model']}:latest"
+                    if model not in stub.models:
+                        return self._reply(404, json.dumps({"error": "model not found"}))
+                    if payload.get("stream"):
+                        lines = [
+                            json.dumps({"response": stub.name, "done": False}),
+                            json.dumps({"response": "", "done": True}),
+                        ]
+                        return self._reply(200, "\n".join(lines), "application/x-ndjson")
+                    self._reply(200, json.dumps({"response": stub.name, "done": True}))
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+        return Handler
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    """Factory for stub Ollama servers, shut down after the test."""
+    servers = []
+
+    def start(*args, **kwargs):
+        server = StubOllama(*args, **kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def make_pool(*urls, **kwargs) -> OllamaPool:
+    clients = [OllamaClient(url, num_parallel=4, total_timeout=5) for url in urls]
+    return OllamaPool(clients, **kwargs)
+
+
+def free_url() -> str:
+    """URL of a local port with nothing listening."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+async def generate(pool, model=MODEL) -> str:
+    response = await pool.generate({"model": model, "prompt": "p", "stream": False})
+    return response.json()["response"]
+
+
+class TestRouting:
+    """Test least-outstanding-requests routing."""
+
+    async def test_concurrent_requests_spread_across_hosts(self, stubs):
+        """Test in-flight requests are balanced by outstanding count."""
+        a, b = stubs("a", delay=0.2), stubs("b", delay=0.2)
+        pool = make_pool(a.url, b.url)
+
+        served = await asyncio.gather(*(generate(pool) for _ in range(4)))
+
+        assert sorted(served) == ["a", "a", "b", "b"]
+        assert a.peak == 2 and b.peak == 2
+
+    async def test_only_hosts_with_model_used(self, stubs):
+        """Test /api/tags model lists restrict routing."""
+        a, b = stubs("a", models=["mistral:7b"]), stubs("b")
+        pool = make_pool(a.url, b.url)
+        await pool.refresh()
+
+        served = [await generate(pool) for _ in range(3)]
+
+        assert served == ["b", "b", "b"]
+        assert a.generate_calls == 0
+
+    async def test_untagged_model_matches_latest(self, stubs):
+        """Test a model listed as name:latest serves requests for the bare name."""
+        a = stubs("a", models=["phi3:latest"])
+        pool = make_pool(a.url)
+        await pool.refresh()
+
+        assert await generate(pool, model="phi3") == "a"
+
+    async def test_missing_model_everywhere(self, stubs):
+        """Test a clear error when no host has the model."""
+        a = stubs("a", models=["mistral:7b"])
+        pool = make_pool(a.url)
+        await pool.refresh()
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await generate(pool)
+
+        assert exc_info.value.details["model"] == MODEL
+
+    async def test_404_fails_over_and_marks_model_missing(self, stubs):
+        """Test a host answering 404 for the model is skipped afterwards."""
+        a, b = stubs("a", models=["mistral:7b"]), stubs("b")
+        pool = make_pool(a.url, b.url)
+
+        assert await generate(pool) == "b"
+        assert not pool.backends[0].serves(MODEL)
+        assert await generate(pool) == "b"
+        assert a.generate_calls == 1
+
+
+class TestHealth:
+    """Test passive health tracking, ejection and re-admission."""
+
+    async def test_server_errors_fail_over_and_eject(self, stubs):
+        """Test 5xx responses fail over and eventually eject the host."""
+        a, b = stubs("a", status=500), stubs("b")
+        pool = make_pool(a.url, b.url, eject_after_failures=2)
+
+        served = [await generate(pool) for _ in range(4)]
+
+        assert served == ["b", "b", "b", "b"]
+        assert a.generate_calls == 2
+        assert pool.get_stats()["hosts"][0]["ejected"] is True
+
+    async def test_connection_failures_eject(self, stubs):
+        """Test an unreachable host is ejected."""
+        b = stubs("b")
+        pool = make_pool(free_url(), b.url, eject_after_failures=1)
+
+        assert await generate(pool) == "b"
+        assert pool.backends[0].is_ejected()
+
+    async def test_readmitted_after_health_check(self, stubs):
+        """Test an ejected host returns to rotation once it answers again."""
+        a, b = stubs("a", status=500), stubs("b")
+        pool = make_pool(a.url, b.url, eject_after_failures=1)
+        await generate(pool)
+        assert pool.backends[0].is_ejected()
+
+        a.status = 200
+        await pool.refresh()
+
+        assert not pool.backends[0].is_ejected()
+        assert "a" in {await generate(pool) for _ in range(2)}
+
+    async def test_failed_health_check_ejects(self, stubs):
+        """Test hosts failing /api/tags are ejected without any traffic."""
+        b = stubs("b")
+        pool = make_pool(free_url(), b.url, eject_after_failures=1)
+
+        await pool.refresh()
+
+        assert pool.backends[0].is_ejected()
+        assert not pool.backends[1].is_ejected()
+
+    def test_ejection_backs_off(self):
+        """Test repeat ejections double the ejection period up to the cap."""
+        pool = make_pool("http://a.test", eject_after_failures=1, ejection_seconds=10, max_ejection_seconds=25)
+        backend = pool.backends[0]
+        durations = []
+        for _ in range(3):
+            pool.record_failure(backend)
+            durations.append(round(backend.ejected_until - time.monotonic()))
+
+        assert durations == [10, 20, 25]
+
+    async def test_all_ejected_still_routes(self, stubs):
+        """Test requests still go out when every host is ejected."""
+        a = stubs("a")
+        pool = make_pool(a.url, eject_after_failures=1)
+        pool.record_failure(pool.backends[0])
+
+        assert await generate(pool) == "a"
+
+
+class TestStreamingAndWarmUp:
+    """Test streaming through the pool and startup warm-up."""
+
+    async def test_stream_fails_over_before_first_chunk(self, stubs):
+        """Test a streaming request moves to a healthy host."""
+        a, b = stubs("a", status=503), stubs("b")
+        pool = make_pool(a.url, b.url)
+
+        chunks = [chunk async for chunk in pool.stream_generate({"model": MODEL, "prompt": "p"})]
+
+        assert chunks[0]["response"] == "b"
+        assert pool.backends[0].outstanding == 0
+        assert pool.backends[1].outstanding == 0
+
+    async def test_warm_up_all_hosts(self, stubs):
+        """Test warm-up loads the model on every host that has it."""
+        a, b = stubs("a"), stubs("b", models=["mistral:7b"])
+        pool = make_pool(a.url, b.url)
+
+        with patch.object(ollama_pool, "get_ollama_pool", return_value=pool):
+            assert await ollama_pool.warm_up_ollama(MODEL) is True
+        assert pool.backends[1].models == {"mistral:7b"}
+
+    async def test_warm_up_failure_is_not_raised(self):
+        """Test startup warm-up only logs when Ollama is down."""
+        pool = make_pool(free_url())
+
+        with patch.object(ollama_pool, "get_ollama_pool", return_value=pool):
+            assert await ollama_pool.warm_up_ollama(MODEL) is False
+
+
+class TestCircuitBreaker:
+    """Test the pool-wide circuit breaker."""
+
+    async def test_open_circuit_fails_fast(self, stubs):
+        """Test requests are rejected without contacting Ollama once the circuit opens."""
+        a = stubs("a", status=500)
+        pool = make_pool(a.url, circuit_failure_threshold=2, circuit_reset_seconds=60)
+        for _ in range(2):
+            with pytest.raises(ServiceUnavailableError):
+                await generate(pool)
+        calls = a.generate_calls
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await generate(pool)
+
+        assert exc_info.value.error_code.value == "ollama_unavailable"
+        assert exc_info.value.details["circuit"] == "open"
+        assert a.generate_calls == calls
+        assert pool.get_stats()["circuit"]["state"] == "open"
+
+    async def test_probe_closes_circuit_after_recovery(self, stubs):
+        """Test a successful probe restores normal routing."""
+        a = stubs("a", status=500)
+        pool = make_pool(a.url, circuit_failure_threshold=1, circuit_reset_seconds=0.05)
+        with pytest.raises(ServiceUnavailableError):
+            await generate(pool)
+
+        a.status = 200
+        await asyncio.sleep(0.06)
+
+        assert await generate(pool) == "a"
+        assert pool.breaker.state.value == "closed"
+
+    async def test_client_errors_do_not_trip(self, stubs):
+        """Test a missing model does not count against the circuit."""
+        a = stubs("a", models=["mistral:7b"])
+        pool = make_pool(a.url, circuit_failure_threshold=1)
+
+        with pytest.raises(ServiceUnavailableError):
+            await generate(pool)
+
+        assert pool.breaker.state.value == "closed"
@@ -0,0 +1,162 @@
+"""Unit tests for the Aho-Corasick PHI dictionary."""
+
+import os
+import pytest
+from src.utils import phi_dictionary
+from src.utils.phi_dictionary import PHIDictionary, parse_terms
+from src.utils.phi_detector import PHIDetector, PHIType
+
+
+def build(*lines):
+    return PHIDictionary(parse_terms(lines))
+
+
+def found(dictionary, text):
+    return [text[start:end] for start, end, _, _ in dictionary.find(text)]
+
+
+class TestParseTerms:
+    """Test dictionary file parsing."""
+
+    def test_columns_and_defaults(self):
+        """Test optional type and confidence columns, comments and prefixes."""
+        terms = parse_terms([
+            "# staff",
+            "Jane Doe",
+            "",
+            "Ward 7B\tinstitution_term\t0.9",
+            "HOSP-*\tmedical_record_number",
+        ])
+
+        assert terms == [
+            ("Jane Doe", "institution_term", 0.8, False),
+            ("Ward 7B", "institution_term", 0.9, False),
+            ("HOSP-", "medical_record_number", 0.8, True),
+        ]
+
+    @pytest.mark.parametrize("line", ["Jane\tinstitution_term\thigh", "Jane\tinstitution_term\t1.5"])
+    def test_invalid_confidence(self, line):
+        """Test malformed confidences are rejected with the line number."""
+        with pytest.raises(ValueError, match="Line 1"):
+            parse_terms([line])
+
+
+class TestMatching:
+    """Test automaton matching."""
+
+    def test_finds_all_terms_case_insensitively(self):
+        """Test every occurrence is found, including terms inside other terms."""
+        dictionary = build("he", "she", "his", "hers", "Ward 7B")
+
+        assert found(dictionary, "USHERS visit ward 7b; she and his") == ["ward 7b", "she", "his"]
+        assert found(dictionary, "she hers") == ["she", "hers"]
+
+    def test_word_boundaries(self):
+        """Test terms only match as whole words."""
+        dictionary = build("Ward 7B", "Ana")
+
+        assert found(dictionary, "toward 7B, Ward 7Bx, banana") == []
+        assert found(dictionary, "(Ana) on Ward 7B.") == ["Ana", "Ward 7B"]
+
+    def test_prefix_terms(self):
+        """Test a trailing * matches the term as a prefix."""
+        dictionary = build("HOSP-*", "AB*")
+
+        assert found(dictionary, "MRN HOSP-123456 and AB998877 but not XAB1") == ["HOSP-", "AB"]
+
+    def test_overlapping_and_failure_transitions(self):
+        """Test matches found after following failure links."""
+        dictionary = build("a b c", "b c d")
+
+        assert found(dictionary, "a b c d") == ["a b c", "b c d"]
+
+    def test_positions_survive_case_folding(self):
+        """Test characters whose lowercase is longer do not shift positions."""
+        dictionary = build("Jane Doe")
+        text = "İstanbul visit: Jane Doe"
+
+        assert found(dictionary, text) == ["Jane Doe"]
+
+    def test_duplicate_terms_last_wins(self):
+        """Test a term listed twice uses its last entry."""
+        dictionary = PHIDictionary([("Jane", "institution_term", 0.5, False), ("JANE", "institution_term", 0.9, False)])
+
+        assert [c for _, _, _, c in dictionary.find("Jane")] == [0.9]
+        assert len(dictionary) == 1
+
+
+class TestCache:
+    """Test the prebuilt automaton cache."""
+
+    @pytest.fixture
+    def terms_file(self, tmp_path):
+        path = tmp_path / "phi_terms.txt"
+        path.write_text("Jane Doe\nWard 7B\n")
+        return str(path)
+
+    def test_cache_written_and_reused(self, terms_file, monkeypatch):
+        """Test the second load comes from the cache without rebuilding."""
+        PHIDictionary.from_file(terms_file)
+        assert os.path.exists(f"{terms_file}.cache")
+
+        monkeypatch.setattr(PHIDictionary, "__init__", lambda self, terms: pytest.fail("rebuilt"))
+        dictionary = PHIDictionary.from_file(terms_file)
+
+        assert found(dictionary, "Jane Doe on Ward 7B") == ["Jane Doe", "Ward 7B"]
+
+    def test_cache_rebuilt_when_file_changes(self, terms_file):
+        """Test edits to the dictionary invalidate the cache."""
+        PHIDictionary.from_file(terms_file)
+        with open(terms_file, "a") as f:
+            f.write("Kofi Mensah\n")
+
+        dictionary = PHIDictionary.from_file(terms_file)
+
+        assert found(dictionary, "Kofi Mensah") == ["Kofi Mensah"]
+
+    def test_stale_format_ignored(self, terms_file, monkeypatch):
+        """Test caches from an older layout are rebuilt."""
+        PHIDictionary.from_file(terms_file)
+        monkeypatch.setattr(phi_dictionary, "CACHE_FORMAT_VERSION", phi_dictionary.CACHE_FORMAT_VERSION + 1)
+
+        assert len(PHIDictionary.from_file(terms_file)) == 2
+
+    def test_corrupt_cache_ignored(self, terms_file):
+        """Test an unreadable cache falls back to building."""
+        with open(f"{terms_file}.cache", "wb") as f:
+            f.write(b"not marshal data")
+
+        assert len(PHIDictionary.from_file(terms_file)) == 2
+
+    def test_unwritable_cache_tolerated(self, terms_file, tmp_path):
+        """Test loading still works when the cache cannot be written."""
+        cache_path = str(tmp_path / "missing" / "phi_terms.cache")
+
+        assert len(PHIDictionary.from_file(terms_file, cache_path=cache_path)) == 2
+
+
+class TestDetectorIntegration:
+    """Test dictionary terms in PHIDetector scans."""
+
+    def test_dictionary_terms_rejected(self):
+        """Test a staff name from the dictionary fails the scan."""
+        detector = PHIDetector(dictionary=build("Jane Doe"))
+
+        result = detector.scan_text("Today Jane Doe will cover the renal lecture.")
+
+        assert result.contains_phi
+        assert [(m.phi_type, m.matched_text, m.position) for m in result.matches] == [
+            (PHIType.INSTITUTION_TERM, "Jane Doe", 6)
+        ]
+
+    def test_dictionary_terms_in_stream(self):
+        """Test dictionary terms split across segments are found while streaming."""
+        scanner = PHIDetector(dictionary=build("Ward 7B")).stream_scanner()
+
+        assert scanner.feed("The patient on Ward") is None
+        assert scanner.feed("7B was discharged.") is not None
+
+    def test_unknown_phi_type_rejected(self):
+        """Test dictionaries naming unknown PHI types fail at construction."""
+        with pytest.raises(ValueError, match="staff_name"):
+            PHIDetector(dictionary=build("Jane Doe\tstaff_name"))
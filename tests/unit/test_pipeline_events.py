@@ -0,0 +1,345 @@
+"""Unit tests for the pipeline server-sent events endpoint."""
+
+import asyncio
+import json
+import pytest
+from fastapi import HTTPException
+from src.api.routers import pipeline
+from src.api.services.task_manager import TaskManager, ProcessingStage
+from src.utils.errors import ErrorCode, ServiceUnavailableError
+
+
+def parse_events(chunks):
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            continue
+        event_line, data_line = chunk.strip().split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Isolated task manager used by the router."""
+    manager = TaskManager()
+    monkeypatch.setattr(pipeline, "task_manager", manager)
+    return manager
+
+
+class TestPipelineEvents:
+    """Test GET /api/pipeline/{task_id}/events."""
+    
+    async def test_unknown_task(self, manager):
+        """Test 404 for unknown tasks."""
+        with pytest.raises(HTTPException) as exc_info:
+            await pipeline.stream_pipeline_events("missing")
+        
+        assert exc_info.value.status_code == 404
+    
+    async def test_completed_task_snapshot(self, manager):
+        """Test a finished task yields a snapshot then completes."""
+        task_id = manager.create_task()
+        manager.complete_task(task_id, {"summary": "done"})
+        
+        response = await pipeline.stream_pipeline_events(task_id)
+        chunks = [chunk async for chunk in response.body_iterator]
+        
+        assert response.media_type == "text/event-stream"
+        assert [event for event, _ in parse_events(chunks)] == ["snapshot", "complete"]
+    
+    async def test_streams_live_events(self, manager):
+        """Test tokens, sections and completion are pushed as they happen."""
+        task_id = manager.create_task()
+        manager.append_summary_tokens(task_id, "### Learning Objectives\n")
+        
+        response = await pipeline.stream_pipeline_events(task_id)
+        body = response.body_iterator
+        snapshot = await body.__anext__()
+        
+        manager.update_progress(task_id, ProcessingStage.SUMMARIZING, 75, "Summarizing")
+        manager.append_summary_tokens(task_id, "Know cells\n### Summary\n")
+        manager.set_summary_section(task_id, "objectives", "Know cells")
+        manager.complete_task(task_id, {"summary": "done"})
+        
+        chunks = [snapshot] + [chunk async for chunk in body]
+        events = parse_events(chunks)
+        
+        assert events[0][1]["partial_summary"] == "### Learning Objectives\n"
+        assert [event for event, _ in events] == ["snapshot", "progress", "token", "section", "complete"]
+        assert events[3][1] == {"key": "objectives", "content": "Know cells"}
+        assert manager._subscribers == {}
+    
+    async def test_snapshot_read_when_stream_starts(self, manager):
+        """Test a change made after the request but before streaming is in the snapshot."""
+        task_id = manager.create_task()
+        
+        response = await pipeline.stream_pipeline_events(task_id)
+        manager.update_progress(task_id, ProcessingStage.TRANSCRIBING, 50, "Transcribing")
+        snapshot = await response.body_iterator.__anext__()
+        await response.body_iterator.aclose()
+        
+        assert parse_events([snapshot])[0][1]["percent"] == 50
+    
+    async def test_store_unavailable_ends_stream(self, manager, monkeypatch):
+        """Test an unreachable task store ends the stream with an error event."""
+        task_id = manager.create_task()
+        
+        def unavailable(task_id):
+            raise ServiceUnavailableError("Task store is unavailable", ErrorCode.TASK_STORE_UNAVAILABLE)
+        
+        monkeypatch.setattr(manager, "subscribe", unavailable)
+        response = await pipeline.stream_pipeline_events(task_id)
+        events = parse_events([chunk async for chunk in response.body_iterator])
+        
+        assert events == [("error", {"error": "Task store is unavailable", "error_code": "task_store_unavailable"})]
+    
+    async def test_keepalive_while_idle(self, manager, monkeypatch):
+        """Test keep-alive comments are sent while waiting."""
+        monkeypatch.setattr(pipeline, "SSE_KEEPALIVE_INTERVAL", 0.01)
+        task_id = manager.create_task()
+        
+        response = await pipeline.stream_pipeline_events(task_id)
+        body = response.body_iterator
+        await body.__anext__()
+        
+        assert await asyncio.wait_for(body.__anext__(), timeout=1) == ": keepalive\n\n"
+        await body.aclose()
+
+
+def get_status(task_id, wait=0, fields=None, exclude=None, if_none_match=None):
+    """Call the status endpoint with explicit defaults for its query parameters."""
+    return pipeline.get_pipeline_status(
+        task_id, wait=wait, fields=fields, exclude=exclude, if_none_match=if_none_match
+    )
+
+
+def body(response):
+    return json.loads(response.body)
+
+
+class TestLongPoll:
+    """Test GET /api/pipeline/{task_id}?wait=N."""
+    
+    async def test_responds_when_task_changes(self, manager):
+        """Test the response is held until the task progresses."""
+        task_id = manager.create_task()
+        request = asyncio.create_task(get_status(task_id, wait=30))
+        await asyncio.sleep(0)
+        assert not request.done()
+        
+        manager.update_progress(task_id, ProcessingStage.TRANSCRIBING, 50, "Transcribing")
+        response = await asyncio.wait_for(request, timeout=1)
+        
+        assert body(response)["progress"] == {"stage": "transcribing", "percent": 50, "message": "Transcribing"}
+    
+    async def test_responds_with_result_on_completion(self, manager):
+        """Test a waiting request returns the result as soon as the task completes."""
+        task_id = manager.create_task()
+        request = asyncio.create_task(get_status(task_id, wait=30))
+        await asyncio.sleep(0)
+        
+        manager.complete_task(task_id, {"summary": "done"})
+        response = await asyncio.wait_for(request, timeout=1)
+        
+        assert body(response)["status"] == "completed"
+        assert body(response)["result"] == {"summary": "done"}
+    
+    async def test_responds_on_timeout(self, manager):
+        """Test the current state is returned when nothing changes."""
+        task_id = manager.create_task()
+        
+        response = await get_status(task_id, wait=0.01)
+        
+        assert body(response)["status"] == "pending"
+    
+    async def test_task_removed_while_waiting(self, manager):
+        """Test 404 if the task expires during the wait."""
+        task_id = manager.create_task()
+        request = asyncio.create_task(get_status(task_id, wait=30))
+        await asyncio.sleep(0)
+        
+        manager.cancel_task(task_id)
+        manager._remove(task_id)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await asyncio.wait_for(request, timeout=1)
+        assert exc_info.value.status_code == 404
+    
+    async def test_stale_etag_responds_without_waiting(self, manager):
+        """Test a client that missed an update is answered at once."""
+        task_id = manager.create_task()
+        etag = (await get_status(task_id)).headers["etag"]
+        manager.update_progress(task_id, ProcessingStage.PREPROCESSING, 25)
+        
+        response = await asyncio.wait_for(get_status(task_id, wait=30, if_none_match=etag), timeout=1)
+        
+        assert response.status_code == 200
+        assert body(response)["progress"]["percent"] == 25
+
+
+RESULT = {
+    "success": True,
+    "transcription": "Cells divide.",
+    "transcript": {"text": "Cells divide.", "segments": [{"start": 0.0, "end": 1.0, "text": "Cells divide."}]},
+    "summary": {"summary": "Mitosis"},
+}
+
+
+class TestConditionalStatus:
+    """Test ETags and 304 responses."""
+    
+    async def test_not_modified_until_task_changes(self, manager):
+        """Test the ETag is stable while the task is unchanged."""
+        task_id = manager.create_task()
+        first = await get_status(task_id)
+        
+        unchanged = await get_status(task_id, if_none_match=first.headers["etag"])
+        manager.update_progress(task_id, ProcessingStage.TRANSCRIBING, 50)
+        changed = await get_status(task_id, if_none_match=first.headers["etag"])
+        
+        assert unchanged.status_code == 304
+        assert unchanged.body == b""
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != first.headers["etag"]
+    
+    async def test_streamed_tokens_change_etag(self, manager):
+        """Test partial summary text is part of the versioned state."""
+        task_id = manager.create_task()
+        etag = (await get_status(task_id)).headers["etag"]
+        
+        manager.append_summary_tokens(task_id, "### Summary")
+        
+        assert (await get_status(task_id, if_none_match=etag)).status_code == 200
+    
+    @pytest.mark.parametrize("header", ["W/{}", '"other", {}', "*"])
+    async def test_if_none_match_forms(self, manager, header):
+        """Test weak, listed and wildcard validators."""
+        task_id = manager.create_task()
+        etag = (await get_status(task_id)).headers["etag"]
+        
+        response = await get_status(task_id, if_none_match=header.format(etag))
+        
+        assert response.status_code == 304
+    
+    async def test_projection_has_own_etag(self, manager):
+        """Test different projections of one version have different ETags."""
+        task_id = manager.create_task()
+        
+        full = await get_status(task_id)
+        projected = await get_status(task_id, fields="status")
+        
+        assert full.headers["etag"] != projected.headers["etag"]
+    
+    async def test_long_poll_with_current_etag(self, manager):
+        """Test a current client waits, then gets the change."""
+        task_id = manager.create_task()
+        etag = (await get_status(task_id)).headers["etag"]
+        request = asyncio.create_task(get_status(task_id, wait=30, if_none_match=etag))
+        await asyncio.sleep(0)
+        assert not request.done()
+        
+        manager.complete_task(task_id, RESULT)
+        response = await asyncio.wait_for(request, timeout=1)
+        
+        assert response.status_code == 200
+        assert body(response)["result"] == RESULT
+    
+    async def test_finished_task_not_modified_without_waiting(self, manager):
+        """Test a current copy of a finished task gets 304 at once."""
+        task_id = manager.create_task()
+        manager.complete_task(task_id, RESULT)
+        etag = (await get_status(task_id)).headers["etag"]
+        
+        response = await asyncio.wait_for(get_status(task_id, wait=30, if_none_match=etag), timeout=1)
+        
+        assert response.status_code == 304
+
+
+class TestStatusProjection:
+    """Test ?fields= and ?exclude=."""
+    
+    @pytest.fixture
+    def task_id(self, manager):
+        task_id = manager.create_task()
+        manager.complete_task(task_id, RESULT)
+        return task_id
+    
+    async def test_fields(self, task_id):
+        """Test only the selected fields (and task_id) are returned."""
+        response = await get_status(task_id, fields="status, progress.percent,result.summary")
+        
+        assert body(response) == {
+            "task_id": task_id,
+            "status": "completed",
+            "progress": {"percent": 100},
+            "result": {"summary": {"summary": "Mitosis"}},
+        }
+    
+    async def test_exclude(self, task_id):
+        """Test excluded nested fields are dropped."""
+        response = await get_status(task_id, exclude="result.transcript.segments,result.transcription")
+        
+        result = body(response)["result"]
+        assert result["transcript"] == {"text": "Cells divide."}
+        assert "transcription" not in result
+        assert "created_at" in body(response)
+    
+    async def test_excluded_result_not_loaded(self, manager, task_id, monkeypatch):
+        """Test a spilled result is not read back when it is not returned."""
+        manager.get_task(task_id).result_store = type(
+            "Store", (), {"load_async": lambda self, task_id: pytest.fail("result loaded")}
+        )()
+        
+        assert "result" not in body(await get_status(task_id, fields="status"))
+        assert "result" not in body(await get_status(task_id, exclude="result"))
+    
+    async def test_does_not_modify_stored_result(self, manager, task_id):
+        """Test projections copy rather than edit the task's result."""
+        await get_status(task_id, exclude="result.transcript.segments")
+        
+        assert manager.get_task(task_id).result == RESULT
+
+
+class TestEncodedStatusCache:
+    """Test reuse of encoded responses for finished tasks."""
+    
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch):
+        cache = pipeline._EncodedResponseCache(1024)
+        monkeypatch.setattr(pipeline, "_status_cache", cache)
+        return cache
+    
+    async def test_finished_task_encoded_once(self, manager, monkeypatch):
+        """Test repeated fetches of a finished task reuse the encoded body."""
+        task_id = manager.create_task()
+        manager.complete_task(task_id, RESULT)
+        first = await get_status(task_id)
+        
+        monkeypatch.setattr(pipeline, "_status_response", lambda *args: pytest.fail("re-encoded"))
+        second = await get_status(task_id)
+        
+        assert second.body == first.body
+        assert second.headers["etag"] == first.headers["etag"]
+        assert body(second)["result"] == RESULT
+    
+    async def test_running_tasks_not_cached(self, manager, cache):
+        """Test only finished tasks are cached."""
+        task_id = manager.create_task()
+        
+        await get_status(task_id)
+        
+        assert cache.get((task_id, 0, "")) is None
+    
+    def test_bounded_in_bytes(self, cache):
+        """Test least recently used bodies are evicted past the byte limit."""
+        cache.put(("a", 1, ""), b"x" * 400)
+        cache.put(("b", 1, ""), b"x" * 400)
+        cache.get(("a", 1, ""))
+        cache.put(("c", 1, ""), b"x" * 400)
+        cache.put(("d", 1, ""), b"x" * 2000)
+        
+        assert cache.get(("a", 1, "")) is not None
+        assert cache.get(("b", 1, "")) is None
+        assert cache.get(("c", 1, "")) is not None
+        assert cache.get(("d", 1, "")) is None
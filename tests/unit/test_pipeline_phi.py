@@ -0,0 +1,86 @@
+"""Unit tests for PHI scanning during pipeline transcription."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.api.routers import pipeline
+from src.api.services import transcriber
+from src.api.services.task_manager import TaskManager, TaskStatus
+from src.utils.errors import ErrorCode
+
+
+class Segment:
+    """Minimal Whisper segment."""
+    def __init__(self, index, text):
+        self.start = float(index)
+        self.end = float(index + 1)
+        self.text = text
+        self.avg_logprob = -0.3
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Isolated task manager used by the router."""
+    manager = TaskManager()
+    monkeypatch.setattr(pipeline, "task_manager", manager)
+    monkeypatch.setattr(pipeline, "PHI_DETECTION_ENABLED", True)
+    monkeypatch.setattr(pipeline, "safe_remove_file", MagicMock())
+    monkeypatch.setattr(pipeline.audio_preprocess, "preprocess_audio",
+                        lambda path, use_deepfilter: ("clean.wav", {"enhanced": False, "enhancer": None}))
+    monkeypatch.setattr(pipeline.audio_preprocess, "cleanup_temp_file", MagicMock())
+    return manager
+
+
+@pytest.fixture
+def whisper(monkeypatch):
+    """Whisper model whose segments are decoded lazily, recording how far it got."""
+    decoded = []
+    model = MagicMock()
+    
+    def transcribe_lines(lines):
+        def segments():
+            for i, line in enumerate(lines):
+                decoded.append(i)
+                yield Segment(i, line)
+        info = MagicMock(language="en", duration=float(len(lines)))
+        model.transcribe.return_value = (segments(), info)
+    
+    monkeypatch.setattr(transcriber, "_model", model)
+    return transcribe_lines, decoded
+
+
+class TestStreamingPHIScan:
+    """Test process_pipeline_task rejects PHI while transcribing."""
+    
+    async def test_rejects_before_transcription_finishes(self, manager, whisper):
+        """Test transcription stops at the segment that reveals PHI."""
+        transcribe_lines, decoded = whisper
+        lines = ["Good morning.", "The patient SSN: 123-45-6789."] + ["More of the encounter."] * 50
+        transcribe_lines(lines)
+        task_id = manager.create_task()
+        summarize = AsyncMock(return_value="notes")
+        
+        with patch.object(pipeline.summarizer, "generate_summary", summarize):
+            await pipeline.process_pipeline_task(task_id, "raw.mp3", "visit.mp3", 0.15, None, False)
+        
+        task = manager.get_task(task_id)
+        assert task.status == TaskStatus.FAILED
+        assert task.error_code == ErrorCode.PHI_DETECTED.value
+        assert decoded == [0, 1]
+        summarize.assert_not_awaited()
+        pipeline.safe_remove_file.assert_called_with("raw.mp3")
+    
+    async def test_clean_lecture_completes(self, manager, whisper, monkeypatch):
+        """Test a clean lecture is transcribed in full and summarized."""
+        transcribe_lines, decoded = whisper
+        transcribe_lines(["The nephron filters plasma."] * 5)
+        monkeypatch.setattr(pipeline, "cache_file_result", AsyncMock())
+        monkeypatch.setattr(pipeline, "cache_summary", AsyncMock())
+        task_id = manager.create_task()
+        
+        with patch.object(pipeline.summarizer, "generate_summary", AsyncMock(return_value="### Summary\nNotes")):
+            await pipeline.process_pipeline_task(task_id, "raw.mp3", "lecture.mp3", 0.15, None, False)
+        
+        task = manager.get_task(task_id)
+        assert task.status == TaskStatus.COMPLETED
+        assert decoded == [0, 1, 2, 3, 4]
+        assert task.result["metadata"]["phi_scanned"] is True
@@ -0,0 +1,179 @@
+"""Unit tests for re-summarizing a stored transcript."""
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from unittest.mock import AsyncMock, patch
+from src.api.routers import pipeline
+from src.api.services.task_manager import TaskManager, TaskStatus
+
+TRANSCRIPT = {
+    "text": "The nephron filters plasma.",
+    "segments": [{"text": "The nephron filters plasma."}],
+    "duration": 60.0,
+    "language": "en",
+}
+SUMMARY_TEXT = "### Summary\nNephron notes"
+
+
+def pipeline_result(ratio=0.15, subject=None):
+    return {
+        "success": True,
+        "transcription": TRANSCRIPT["text"],
+        "transcript": TRANSCRIPT,
+        "summary": {"summary": "Original"},
+        "summary_text": "### Summary\nOriginal",
+        "metadata": {"filename": "lecture.mp3", "ratio": ratio, "subject": subject},
+    }
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Isolated task manager and summary-task registry used by the router."""
+    manager = TaskManager()
+    monkeypatch.setattr(pipeline, "task_manager", manager)
+    monkeypatch.setattr(pipeline, "_summary_tasks", {})
+    return manager
+
+
+@pytest.fixture
+def summary_cache(monkeypatch):
+    """In-memory stand-in for the Redis summary cache."""
+    store = {}
+
+    async def get_cached_summary(transcript_hash, ratio, subject):
+        return store.get((transcript_hash, ratio, subject))
+
+    async def cache_summary(transcript_hash, ratio, subject, summary, summary_text):
+        store[(transcript_hash, ratio, subject)] = {"summary": summary, "summary_text": summary_text}
+
+    monkeypatch.setattr(pipeline, "get_cached_summary", get_cached_summary)
+    monkeypatch.setattr(pipeline, "cache_summary", cache_summary)
+    return store
+
+
+@pytest.fixture
+def summarize():
+    mock = AsyncMock(return_value=SUMMARY_TEXT)
+    with patch.object(pipeline.summarizer, "generate_summary", mock):
+        yield mock
+
+
+async def run_background(background_tasks: BackgroundTasks) -> None:
+    for task in background_tasks.tasks:
+        await task.func(*task.args, **task.kwargs)
+
+
+class TestResummarize:
+    """Test POST /api/pipeline/{task_id}/summary."""
+
+    async def test_summarizes_stored_transcript(self, manager, summary_cache, summarize):
+        """Test a new task summarizes the transcript with the new parameters."""
+        source_id = manager.create_task()
+        manager.complete_task(source_id, pipeline_result())
+        background_tasks = BackgroundTasks()
+
+        response = await pipeline.resummarize_pipeline_task(
+            source_id, background_tasks, ratio=0.3, subject="physiology", async_mode=True
+        )
+        await run_background(background_tasks)
+
+        task = manager.get_task(response["task_id"])
+        assert response["status"] == "processing"
+        assert response["task_id"] != source_id
+        assert task.status == TaskStatus.COMPLETED
+        assert task.result["summary_text"] == SUMMARY_TEXT
+        assert task.result["transcript"] == TRANSCRIPT
+        assert task.result["metadata"]["ratio"] == 0.3
+        assert task.result["metadata"]["source_task_id"] == source_id
+        assert task.result["metadata"]["filename"] == "lecture.mp3"
+        args, kwargs = summarize.await_args
+        assert args[0] == TRANSCRIPT["text"]
+        assert kwargs["ratio"] == 0.3 and kwargs["subject"] == "physiology"
+
+    async def test_same_parameters_return_source(self, manager, summary_cache, summarize):
+        """Test asking for the summary the task already has makes no LLM call."""
+        source_id = manager.create_task()
+        manager.complete_task(source_id, pipeline_result(ratio=0.2, subject="Anatomy"))
+
+        response = await pipeline.resummarize_pipeline_task(
+            source_id, BackgroundTasks(), ratio=0.2, subject="anatomy", async_mode=True
+        )
+
+        assert response["task_id"] == source_id
+        assert response["cached"] is True
+        summarize.assert_not_awaited()
+
+    async def test_cached_summary_reused(self, manager, summary_cache, summarize):
+        """Test a summary generated before is served from cache as a completed task."""
+        source_id = manager.create_task()
+        manager.complete_task(source_id, pipeline_result())
+        background_tasks = BackgroundTasks()
+        await pipeline.resummarize_pipeline_task(source_id, background_tasks, ratio=0.5, subject=None, async_mode=True)
+        await run_background(background_tasks)
+        pipeline._summary_tasks.clear()
+
+        response = await pipeline.resummarize_pipeline_task(
+            source_id, BackgroundTasks(), ratio=0.5, subject=None, async_mode=True
+        )
+
+        assert response["cached"] is True
+        assert response["result"]["summary_text"] == SUMMARY_TEXT
+        assert manager.get_task(response["task_id"]).status == TaskStatus.COMPLETED
+        assert summarize.await_count == 1
+
+    async def test_identical_requests_share_task(self, manager, summary_cache, summarize):
+        """Test a request matching an in-flight summary returns that task."""
+        source_id = manager.create_task()
+        manager.complete_task(source_id, pipeline_result())
+
+        first = await pipeline.resummarize_pipeline_task(
+            source_id, BackgroundTasks(), ratio=0.4, subject=None, async_mode=True
+        )
+        second = await pipeline.resummarize_pipeline_task(
+            source_id, BackgroundTasks(), ratio=0.4, subject=None, async_mode=True
+        )
+
+        assert second["task_id"] == first["task_id"]
+        assert "already being generated" in second["message"]
+
+    async def test_sync_mode_returns_result(self, manager, summary_cache, summarize):
+        """Test sync mode waits for and returns the new result."""
+        source_id = manager.create_task()
+        manager.complete_task(source_id, pipeline_result())
+
+        result = await pipeline.resummarize_pipeline_task(
+            source_id, BackgroundTasks(), ratio=0.25, subject=None, async_mode=False
+        )
+
+        assert result["summary_text"] == SUMMARY_TEXT
+        assert result["metadata"]["ratio"] == 0.25
+
+    async def test_failed_summarization_keeps_transcript(self, manager, summary_cache):
+        """Test a transcript left by an Ollama outage can be summarized later."""
+        source_id = manager.create_task()
+        manager.fail_task(source_id, "Ollama down", "ollama_unavailable", result={
+            "success": False, "transcription": TRANSCRIPT["text"], "transcript": TRANSCRIPT,
+        })
+
+        with patch.object(pipeline.summarizer, "generate_summary", AsyncMock(return_value=SUMMARY_TEXT)):
+            result = await pipeline.resummarize_pipeline_task(
+                source_id, BackgroundTasks(), ratio=0.15, subject=None, async_mode=False
+            )
+
+        assert result["success"] is True
+
+    async def test_unknown_task(self, manager):
+        """Test 404 for unknown tasks."""
+        with pytest.raises(HTTPException) as exc_info:
+            await pipeline.resummarize_pipeline_task("missing", BackgroundTasks(), ratio=0.15, subject=None)
+
+        assert exc_info.value.status_code == 404
+
+    async def test_no_transcript_yet(self, manager):
+        """Test 409 while the source task is still transcribing."""
+        source_id = manager.create_task()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pipeline.resummarize_pipeline_task(source_id, BackgroundTasks(), ratio=0.15, subject=None)
+
+        assert exc_info.value.status_code == 409
@@ -0,0 +1,126 @@
+"""Unit tests for parking pipeline jobs while summarization is unavailable."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.api.routers import pipeline
+from src.api.services.ollama_client import OllamaClient
+from src.api.services.ollama_pool import OllamaPool
+from src.api.services.task_manager import TaskManager, ProcessingStage, TaskStatus
+from src.utils.errors import ServiceUnavailableError, ErrorCode
+
+TRANSCRIPT = {"text": "Lecture text", "segments": [{"text": "Lecture text"}]}
+
+
+def outage(**details):
+    return ServiceUnavailableError(
+        message="Cannot connect to Ollama",
+        error_code=ErrorCode.OLLAMA_UNAVAILABLE,
+        details=details,
+    )
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Isolated task manager used by the router."""
+    manager = TaskManager()
+    monkeypatch.setattr(pipeline, "task_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool whose circuit resets quickly."""
+    pool = OllamaPool([OllamaClient("http://ollama.test")], circuit_reset_seconds=0.01)
+    monkeypatch.setattr(pipeline, "get_ollama_pool", lambda: pool)
+    return pool
+
+
+class TestSummaryPending:
+    """Test _summarize_when_available."""
+    
+    async def test_resumes_after_outage(self, manager, pool):
+        """Test the job waits in summary_pending and resumes automatically."""
+        task_id = manager.create_task()
+        stages = []
+        queue = manager.subscribe(task_id)
+        summarize = AsyncMock(side_effect=[outage(), outage(), "### Summary\nDone"])
+        
+        with patch.object(pipeline.summarizer, "generate_summary", summarize):
+            summary = await pipeline._summarize_when_available(task_id, TRANSCRIPT, 0.15, None)
+        
+        while not queue.empty():
+            event, data = queue.get_nowait()
+            if event == "progress":
+                stages.append(data["stage"])
+        assert summary == "### Summary\nDone"
+        assert summarize.await_count == 3
+        assert ProcessingStage.SUMMARY_PENDING.value in stages
+        assert manager.get_task(task_id).progress.stage == ProcessingStage.SUMMARIZING
+    
+    async def test_waits_for_open_circuit(self, manager, pool):
+        """Test parked jobs wait for the circuit's probe window."""
+        task_id = manager.create_task()
+        for _ in range(pool.breaker.failure_threshold):
+            pool.breaker.record_failure()
+        summarize = AsyncMock(side_effect=[outage(circuit="open"), "notes"])
+        
+        with patch.object(pipeline.summarizer, "generate_summary", summarize):
+            assert await pipeline._summarize_when_available(task_id, TRANSCRIPT, 0.15, None) == "notes"
+    
+    async def test_gives_up_after_timeout(self, manager, pool, monkeypatch):
+        """Test the original error is raised once the pending timeout passes."""
+        monkeypatch.setattr(pipeline, "SUMMARY_PENDING_TIMEOUT", 0.05)
+        task_id = manager.create_task()
+        
+        with patch.object(pipeline.summarizer, "generate_summary", AsyncMock(side_effect=outage())):
+            with pytest.raises(ServiceUnavailableError):
+                await pipeline._summarize_when_available(task_id, TRANSCRIPT, 0.15, None)
+    
+    async def test_missing_model_not_parked(self, manager, pool):
+        """Test errors that will not clear up on their own fail immediately."""
+        task_id = manager.create_task()
+        summarize = AsyncMock(side_effect=outage(model="llama3.1:8b"))
+        
+        with patch.object(pipeline.summarizer, "generate_summary", summarize):
+            with pytest.raises(ServiceUnavailableError):
+                await pipeline._summarize_when_available(task_id, TRANSCRIPT, 0.15, None)
+        
+        assert summarize.await_count == 1
+    
+    async def test_disabled(self, manager, pool, monkeypatch):
+        """Test parking can be turned off."""
+        monkeypatch.setattr(pipeline, "SUMMARY_PENDING_ENABLED", False)
+        task_id = manager.create_task()
+        summarize = AsyncMock(side_effect=outage())
+        
+        with patch.object(pipeline.summarizer, "generate_summary", summarize):
+            with pytest.raises(ServiceUnavailableError):
+                await pipeline._summarize_when_available(task_id, TRANSCRIPT, 0.15, None)
+        
+        assert summarize.await_count == 1
+    
+    async def test_cancelled_while_parked(self, manager, pool):
+        """Test a job cancelled during the outage stops quietly."""
+        task_id = manager.create_task()
+        
+        async def fail_and_cancel(*args, **kwargs):
+            manager.cancel_task(task_id)
+            raise outage()
+        
+        with patch.object(pipeline.summarizer, "generate_summary", side_effect=fail_and_cancel):
+            assert await pipeline._summarize_when_available(task_id, TRANSCRIPT, 0.15, None) is None
+
+
+class TestTranscriptKept:
+    """Test the transcript survives a summarization outage."""
+    
+    def test_fail_task_keeps_partial_result(self):
+        """Test fail_task stores a partial result alongside the error."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        
+        manager.fail_task(task_id, "down", "ollama_unavailable", result={"transcription": "text"})
+        
+        task = manager.get_task(task_id)
+        assert task.status == TaskStatus.FAILED
+        assert task.result == {"transcription": "text"}
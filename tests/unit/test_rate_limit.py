@@ -0,0 +1,96 @@
+"""Unit tests for the in-memory rate limit fallback."""
+
+import pytest
+from src.middleware import rate_limit
+from src.middleware.rate_limit import MemoryRateLimiter
+
+
+class TestMemoryRateLimiter:
+    """Test GCRA limiting and eviction."""
+
+    def test_burst_then_rejected(self):
+        """Test up to the limit is allowed at once, with remaining counting down."""
+        limiter = MemoryRateLimiter(limit=3, window=60)
+
+        results = [limiter.check("ip:1", now=100.0) for _ in range(4)]
+
+        assert results == [(True, 2, 0), (True, 1, 0), (True, 0, 0), (False, 0, 20)]
+
+    def test_one_request_per_interval(self):
+        """Test a request is allowed again after each emission interval."""
+        limiter = MemoryRateLimiter(limit=3, window=60)
+        for _ in range(3):
+            limiter.check("ip:1", now=100.0)
+
+        assert limiter.check("ip:1", now=119.0) == (False, 0, 1)
+        assert limiter.check("ip:1", now=120.0) == (True, 0, 0)
+        assert limiter.check("ip:1", now=120.0)[0] is False
+
+    def test_no_double_burst_at_window_edge(self):
+        """Test a full burst just before a window ends does not allow another just after."""
+        limiter = MemoryRateLimiter(limit=10, window=60)
+        allowed = [limiter.check("ip:1", now=59.9)[0] for _ in range(10)]
+        allowed += [limiter.check("ip:1", now=60.1)[0] for _ in range(10)]
+
+        assert sum(allowed) == 10
+
+    def test_rejections_do_not_count(self):
+        """Test rejected requests do not delay the next allowed one."""
+        limiter = MemoryRateLimiter(limit=1, window=10)
+        limiter.check("ip:1", now=0.0)
+        for _ in range(100):
+            limiter.check("ip:1", now=5.0)
+
+        assert limiter.check("ip:1", now=10.0)[0] is True
+
+    def test_idle_clients_evicted(self):
+        """Test clients back to a full burst are dropped as other requests arrive."""
+        limiter = MemoryRateLimiter(limit=10, window=60)
+        limiter.check("ip:1", now=0.0)
+        limiter.check("ip:2", now=1.0)
+
+        limiter.check("ip:3", now=6.5)
+
+        assert len(limiter) == 2
+        assert limiter.evict(now=100.0) == 2
+        assert len(limiter) == 0
+
+    def test_least_recently_seen_evicted_beyond_limit(self):
+        """Test memory stays bounded when many clients are active at once."""
+        limiter = MemoryRateLimiter(limit=10, window=60, max_clients=1000)
+
+        for i in range(5000):
+            limiter.check(f"ip:{i}", now=0.0)
+
+        assert len(limiter) == 1000
+        assert limiter.evictions == 4000
+        assert limiter.check("ip:4999", now=0.0)[1] == 8
+
+    def test_outstanding(self):
+        """Test requests still counted against limits are reported."""
+        limiter = MemoryRateLimiter(limit=10, window=60)
+        for _ in range(3):
+            limiter.check("ip:1", now=0.0)
+        limiter.check("ip:2", now=0.0)
+
+        assert limiter.outstanding(now=0.0) == 4
+        assert limiter.outstanding(now=6.0) == 2
+
+
+class TestCheckRateLimit:
+    """Test the middleware's fallback path."""
+
+    @pytest.fixture
+    def limiter(self, monkeypatch):
+        limiter = MemoryRateLimiter(limit=2, window=60)
+        monkeypatch.setattr(rate_limit, "_memory_limiter", limiter)
+        monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(rate_limit, "_get_redis_client", lambda: None)
+        return limiter
+
+    async def test_falls_back_to_memory(self, limiter):
+        """Test checks use the in-memory limiter without Redis."""
+        assert await rate_limit.check_rate_limit("ip:1") == (True, 1, 0)
+        assert await rate_limit.check_rate_limit("ip:1") == (True, 0, 0)
+        assert (await rate_limit.check_rate_limit("ip:1"))[0] is False
+        assert rate_limit.get_rate_limit_stats()["active_clients"] == 1
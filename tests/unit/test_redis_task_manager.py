@@ -0,0 +1,394 @@
+"""Unit tests for the Redis-backed task store."""
+
+import asyncio
+import json
+import time
+import fakeredis
+import pytest
+import redis
+from src.api.services import task_manager as task_manager_module
+from src.api.services.redis_task_manager import EXPIRY_KEY, STATUS_SET, RedisTaskManager
+from src.api.services.task_manager import ProcessingStage, TaskManager, TaskStatus
+from src.utils.connections import LazyConnection
+from src.utils.errors import ErrorCode, ServiceUnavailableError
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_manager(server, cache_seconds=0.0):
+    return RedisTaskManager(fakeredis.FakeRedis(server=server, decode_responses=True), cache_seconds=cache_seconds)
+
+
+@pytest.fixture
+def manager(server):
+    manager = make_manager(server)
+    yield manager
+    manager.close()
+
+
+class TestRedisTaskState:
+    """Test task state round trips through Redis."""
+
+    def test_create_and_get(self, manager):
+        """Test a new task reads back as pending."""
+        task_id = manager.create_task()
+
+        task = manager.get_task(task_id)
+
+        assert task.status == TaskStatus.PENDING
+        assert task.progress.stage == ProcessingStage.UPLOADING
+        assert task.created_at.tzinfo is not None
+        assert manager.get_task("missing") is None
+
+    def test_progress_and_version(self, manager):
+        """Test progress updates mark the task processing and bump its version."""
+        task_id = manager.create_task()
+
+        manager.update_progress(task_id, ProcessingStage.TRANSCRIBING, 50, "Transcribing")
+        task = manager.get_task(task_id)
+
+        assert task.status == TaskStatus.PROCESSING
+        assert (task.progress.stage, task.progress.percent, task.progress.message) == (
+            ProcessingStage.TRANSCRIBING, 50, "Transcribing"
+        )
+        assert task.version == 1
+
+    def test_streamed_summary(self, manager):
+        """Test tokens and sections accumulate and can be reset."""
+        task_id = manager.create_task()
+
+        manager.append_summary_tokens(task_id, "### Summary\n")
+        manager.append_summary_tokens(task_id, "Cells")
+        manager.set_summary_section(task_id, "summary", "Cells")
+        task = manager.get_task(task_id)
+        manager.reset_summary(task_id)
+        reset = manager.get_task(task_id)
+
+        assert task.partial_summary == "### Summary\nCells"
+        assert task.partial_sections == {"summary": "Cells"}
+        assert (reset.partial_summary, reset.partial_sections) == ("", {})
+
+    def test_complete_stores_result(self, manager, server):
+        """Test the result is stored separately and read when accessed."""
+        task_id = manager.create_task()
+        manager.append_summary_tokens(task_id, "partial")
+        result = {"success": True, "transcription": "text", "transcript": {"text": "text"}}
+
+        manager.complete_task(task_id, result)
+        task = manager.get_task(task_id)
+
+        assert task.status == TaskStatus.COMPLETED
+        assert task.progress.percent == 100
+        assert task.partial_summary == ""
+        assert task.result == result
+
+    def test_reads_untagged_json_result(self, manager, server):
+        """Test results stored as JSON text before encoding was added still load."""
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        task_id = manager.create_task()
+        manager.complete_task(task_id, {"summary_text": "old"})
+        manager.flush()
+        client.set(f"task:{task_id}:result", json.dumps({"summary_text": "old", "transcription": "text"}))
+
+        assert manager.get_task(task_id).result == {"summary_text": "old", "transcription": "text"}
+
+    def test_fail_keeps_partial_result(self, manager):
+        """Test failures record the error and any partial result."""
+        task_id = manager.create_task()
+
+        manager.fail_task(task_id, "Ollama down", "service_unavailable", result={"transcription": "text"})
+        task = manager.get_task(task_id)
+
+        assert task.status == TaskStatus.FAILED
+        assert (task.error, task.error_code) == ("Ollama down", "service_unavailable")
+        assert task.result == {"transcription": "text"}
+
+    def test_cancel_only_active_tasks(self, manager):
+        """Test finished tasks cannot be cancelled."""
+        active = manager.create_task()
+        finished = manager.create_task()
+        manager.complete_task(finished, {})
+
+        assert manager.cancel_task(active) is True
+        assert manager.cancel_task(active) is False
+        assert manager.cancel_task(finished) is False
+        assert manager.cancel_task("missing") is False
+        assert manager.get_task(active).status == TaskStatus.CANCELLED
+
+    def test_updates_to_missing_tasks_ignored(self, manager):
+        """Test writes to unknown tasks do not create them."""
+        manager.update_progress("missing", ProcessingStage.TRANSCRIBING, 50)
+        manager.complete_task("missing", {})
+        manager.append_summary_tokens("missing", "x")
+
+        assert manager.get_task("missing") is None
+
+
+class TestStatusIndex:
+    """Test the per-status sets and statistics."""
+
+    def test_status_sets_follow_transitions(self, manager, server):
+        """Test each task is in exactly the set for its status."""
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        pending = manager.create_task()
+        processing = manager.create_task()
+        manager.update_progress(processing, ProcessingStage.TRANSCRIBING, 50)
+        completed = manager.create_task()
+        manager.update_progress(completed, ProcessingStage.TRANSCRIBING, 50)
+        manager.complete_task(completed, {})
+        manager.flush()
+
+        members = {status: client.smembers(STATUS_SET.format(status.value)) for status in TaskStatus}
+
+        assert members[TaskStatus.PENDING] == {pending}
+        assert members[TaskStatus.PROCESSING] == {processing}
+        assert members[TaskStatus.COMPLETED] == {completed}
+
+    def test_stats(self, manager):
+        """Test counts come from the status sets."""
+        manager.create_task()
+        manager.fail_task(manager.create_task(), "error")
+
+        stats = manager.get_stats()
+
+        assert stats["backend"] == "redis"
+        assert stats["total_tasks"] == 2
+        assert stats["status_breakdown"]["pending"] == 1
+        assert stats["status_breakdown"]["failed"] == 1
+
+
+class TestCleanup:
+    """Test removal of expired tasks."""
+
+    def test_expired_tasks_removed(self, manager, server):
+        """Test tasks past their expiry lose their keys and index entries."""
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        old = manager.create_task()
+        manager.complete_task(old, {"summary": "x"})
+        new = manager.create_task()
+        manager.flush()
+        client.zadd(EXPIRY_KEY, {old: time.time() - 1})
+
+        removed = manager.cleanup_old_tasks()
+
+        assert removed == 1
+        assert manager.get_task(old) is None
+        assert manager.get_task(new) is not None
+        assert client.keys(f"task:{old}*") == []
+        assert client.scard(STATUS_SET.format("completed")) == 0
+
+    def test_failed_tasks_expire_sooner(self, manager, server):
+        """Test failed tasks are kept for a quarter of the retention."""
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        task_id = manager.create_task()
+
+        manager.fail_task(task_id, "error")
+        manager.flush()
+
+        assert client.zscore(EXPIRY_KEY, task_id) <= time.time() + manager._task_retention / 4
+        assert client.ttl(f"task:{task_id}") <= manager._task_retention / 4
+
+    def test_limit_enforced(self, manager):
+        """Test tasks closest to expiry are removed beyond the limit."""
+        manager._max_tasks = 2
+        task_ids = [manager.create_task() for _ in range(3)]
+        manager.fail_task(task_ids[2], "error")
+
+        assert manager.cleanup_old_tasks() == 1
+        assert manager.get_task(task_ids[2]) is None
+
+
+class TestWorkers:
+    """Test two workers sharing one Redis."""
+
+    async def test_task_visible_to_other_worker(self, server):
+        """Test a task created by one worker is readable and cancellable by another."""
+        worker_a, worker_b = make_manager(server), make_manager(server)
+        task_id = worker_a.create_task()
+
+        assert worker_b.get_task(task_id).status == TaskStatus.PENDING
+        assert worker_b.cancel_task(task_id) is True
+        assert worker_a.get_task(task_id).status == TaskStatus.CANCELLED
+
+    async def test_events_relayed_between_workers(self, server):
+        """Test subscribers on one worker receive another worker's events once."""
+        worker_a, worker_b = make_manager(server), make_manager(server)
+        try:
+            task_id = worker_a.create_task()
+            queue_a = worker_a.subscribe(task_id)
+            queue_b = worker_b.subscribe(task_id)
+            # Reads queue behind the subscription, as the event stream's snapshot does
+            await worker_b.get_task_async(task_id)
+
+            worker_a.update_progress(task_id, ProcessingStage.SUMMARIZING, 75, "Summarizing")
+            event, data = await asyncio.wait_for(queue_b.get(), timeout=5)
+
+            assert event == "progress"
+            assert data["percent"] == 75
+            assert data["status"] == "processing"
+            await asyncio.sleep(0.1)
+            assert queue_a.qsize() == 1
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    async def test_long_poll_on_other_worker(self, server):
+        """Test waiting on one worker wakes on completion by another."""
+        worker_a, worker_b = make_manager(server), make_manager(server)
+        try:
+            task_id = worker_a.create_task()
+            waiter = asyncio.create_task(worker_b.wait_for_update(task_id, 5))
+            await asyncio.sleep(0.1)
+
+            worker_a.complete_task(task_id, {"summary": "done"})
+
+            assert await asyncio.wait_for(waiter, timeout=5) is True
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    async def test_cached_task_invalidated_by_other_worker(self, server):
+        """Test a worker's cached copy is dropped when another worker changes the task."""
+        worker_a, worker_b = make_manager(server), make_manager(server, cache_seconds=60)
+        try:
+            task_id = worker_a.create_task()
+            queue = worker_b.subscribe(task_id)
+            assert worker_b.get_task(task_id).status == TaskStatus.PENDING
+
+            worker_a.update_progress(task_id, ProcessingStage.TRANSCRIBING, 50)
+            await asyncio.wait_for(queue.get(), timeout=5)
+
+            assert worker_b.get_task(task_id).status == TaskStatus.PROCESSING
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+
+class TestBackendSelection:
+    """Test choosing the task store."""
+
+    def test_memory_by_default(self, monkeypatch):
+        """Test tasks are kept in memory unless Redis is configured."""
+        monkeypatch.setattr(task_manager_module, "TASK_BACKEND", "memory")
+
+        assert type(task_manager_module.create_task_manager()) is TaskManager
+
+    def test_redis_created_without_connecting(self, monkeypatch):
+        """Test an unreachable Redis neither blocks nor falls back at startup."""
+        monkeypatch.setattr(task_manager_module, "TASK_BACKEND", "redis")
+        monkeypatch.setattr(task_manager_module, "REDIS_URL", "redis://127.0.0.1:1/0")
+
+        manager = task_manager_module.create_task_manager()
+        try:
+            assert type(manager) is RedisTaskManager
+            with pytest.raises(ServiceUnavailableError):
+                manager.create_task()
+        finally:
+            manager.close()
+
+
+class TestEventLoop:
+    """Test Redis calls made from the event loop."""
+
+    async def test_async_reads(self, manager):
+        """Test the async reads return what the sync ones do."""
+        task_id = manager.create_task()
+
+        task = await manager.get_task_async(task_id)
+        cancelled = await manager.cancel_task_async(task_id)
+        stats = await manager.get_stats_async()
+
+        assert task.status == TaskStatus.PENDING
+        assert cancelled is True
+        assert stats["status_breakdown"]["cancelled"] == 1
+
+    async def test_unavailable_until_connected(self, server):
+        """Test tasks are refused while the background connection has not reached Redis."""
+        async def connect():
+            raise redis.ConnectionError("connection refused")
+
+        connection = LazyConnection("redis", connect)
+        manager = RedisTaskManager(
+            fakeredis.FakeRedis(server=server, decode_responses=True), cache_seconds=0.0, connection=connection
+        )
+        try:
+            with pytest.raises(ServiceUnavailableError) as exc_info:
+                manager.create_task()
+            with pytest.raises(ServiceUnavailableError):
+                await manager.get_task_async("missing")
+            with pytest.raises(ServiceUnavailableError):
+                manager.subscribe("missing")
+
+            assert exc_info.value.error_code == ErrorCode.TASK_STORE_UNAVAILABLE
+        finally:
+            await connection.stop()
+            manager.close()
+
+    async def test_failed_create_raises(self, manager, server):
+        """Test no task ID is returned when Redis fails to store the task."""
+        server.connected = False
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await manager.create_task_async()
+
+        assert exc_info.value.error_code == ErrorCode.TASK_STORE_UNAVAILABLE
+
+    async def test_failed_subscription_retried(self, manager, server):
+        """Test a subscription that fails on Redis is retried by the next subscriber."""
+        server.connected = False
+        manager.subscribe("task")
+        with pytest.raises(ServiceUnavailableError):
+            await manager.get_task_async("task")
+        assert manager._listener is None
+
+        server.connected = True
+        manager.subscribe("task")
+        await manager.get_task_async("task")
+
+        assert manager._listener is not None
+
+    async def test_tokens_written_in_batches(self, server):
+        """Test streamed tokens reach local subscribers at once and Redis in one write."""
+        worker_a = RedisTaskManager(
+            fakeredis.FakeRedis(server=server, decode_responses=True), cache_seconds=0.0, token_flush_seconds=0.05
+        )
+        worker_b = make_manager(server)
+        try:
+            task_id = worker_a.create_task()
+            local = worker_a.subscribe(task_id)
+            remote = worker_b.subscribe(task_id)
+            await worker_b.get_task_async(task_id)
+
+            for token in ("Cells ", "divide ", "by mitosis"):
+                worker_a.append_summary_tokens(task_id, token)
+
+            assert [local.get_nowait()[1]["text"] for _ in range(3)] == ["Cells ", "divide ", "by mitosis"]
+            event, data = await asyncio.wait_for(remote.get(), timeout=5)
+            task = await worker_a.get_task_async(task_id)
+
+            assert (event, data) == ("token", {"text": "Cells divide by mitosis"})
+            assert task.partial_summary == "Cells divide by mitosis"
+            assert task.version == 1
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    async def test_section_writes_pending_tokens_first(self, server):
+        """Test batched tokens are written before the section that follows them."""
+        manager = RedisTaskManager(
+            fakeredis.FakeRedis(server=server, decode_responses=True), cache_seconds=0.0, token_flush_seconds=60
+        )
+        try:
+            task_id = manager.create_task()
+            manager.append_summary_tokens(task_id, "Cells")
+            manager.set_summary_section(task_id, "summary", "Cells")
+
+            task = await manager.get_task_async(task_id)
+
+            assert task.partial_summary == "Cells"
+            assert task.partial_sections == {"summary": "Cells"}
+        finally:
+            manager.close()
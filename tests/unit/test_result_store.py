@@ -0,0 +1,103 @@
+"""Unit tests for compressed task result storage."""
+
+import os
+import time
+import pytest
+from src.api.services.result_store import (
+    ResultStore,
+    encode_result,
+    from_stored_form,
+    to_stored_form,
+)
+
+SUMMARY_TEXT = "### Learning Objectives\n- Nephron\n\n### Key Concepts\n- Filtration"
+
+
+@pytest.fixture
+def result():
+    from src.api.services.summarizer import parse_summary_sections
+    text = "The nephron filters plasma. " * 50
+    return {
+        "success": True,
+        "transcription": text,
+        "transcript": {"text": text, "segments": [{"start": 0.0, "end": 5.0, "text": text}]},
+        "summary": parse_summary_sections(SUMMARY_TEXT),
+        "summary_text": SUMMARY_TEXT,
+        "metadata": {"filename": "lecture.mp3", "ratio": 0.15},
+    }
+
+
+class TestStoredForm:
+    """Test removal and restoration of duplicated payloads."""
+
+    def test_duplicates_dropped_and_restored(self, result):
+        """Test the transcript and summary are stored once and rebuilt on load."""
+        stored = to_stored_form(result)
+
+        assert "transcription" not in stored
+        assert "summary" not in stored
+        assert from_stored_form(stored) == result
+
+    def test_differing_fields_kept(self, result):
+        """Test fields are only dropped when they really duplicate another."""
+        result["transcription"] = "edited transcription"
+        result["summary"] = {"custom": "notes"}
+
+        stored = to_stored_form(result)
+
+        assert stored["transcription"] == "edited transcription"
+        assert stored["summary"] == {"custom": "notes"}
+        assert from_stored_form(stored) == result
+
+    def test_partial_results(self):
+        """Test results without a summary (e.g. transcript kept after an outage)."""
+        partial = {"success": False, "transcription": "text", "transcript": {"text": "text"}}
+
+        assert from_stored_form(to_stored_form(partial)) == partial
+
+    def test_encoded_form_smaller(self, result):
+        """Test deduplication shrinks the serialized result."""
+        import json
+        assert len(encode_result(result)) < len(json.dumps(result)) * 0.75
+
+
+class TestResultStore:
+    """Test spill files."""
+
+    def test_save_and_load(self, tmp_path, result):
+        """Test a saved result loads back unchanged and is compressed."""
+        store = ResultStore(str(tmp_path))
+
+        size = store.save("task-1", result)
+
+        assert store.load("task-1") == result
+        assert size < len(encode_result(result)) / 5
+
+    def test_discard(self, tmp_path, result):
+        """Test discarded results are deleted."""
+        store = ResultStore(str(tmp_path))
+        store.save("task-1", result)
+
+        store.discard("task-1")
+        store.discard("task-1")
+
+        assert os.listdir(tmp_path) == []
+
+    def test_missing_or_corrupt_result(self, tmp_path):
+        """Test unreadable results load as None."""
+        store = ResultStore(str(tmp_path))
+        (tmp_path / "task-2.json.z").write_bytes(b"garbage")
+
+        assert store.load("task-1") is None
+        assert store.load("task-2") is None
+
+    def test_stale_files_removed(self, tmp_path, result):
+        """Test results left by an earlier run are removed past the retention."""
+        ResultStore(str(tmp_path)).save("old", result)
+        ResultStore(str(tmp_path)).save("new", result)
+        old_time = time.time() - 7200
+        os.utime(tmp_path / "old.json.z", (old_time, old_time))
+
+        ResultStore(str(tmp_path), max_age_seconds=3600)
+
+        assert os.listdir(tmp_path) == ["new.json.z"]
@@ -0,0 +1,118 @@
+"""Unit tests for Redis value serialization."""
+
+import json
+import pytest
+from src.cache import serializer
+
+
+def make_result(segments=200):
+    """A pipeline result shaped like a cached lecture."""
+    segment_texts = [f"The loop of Henle concentrates urine in segment {i}." for i in range(segments)]
+    return {
+        "success": True,
+        "transcript": {
+            "text": " ".join(segment_texts),
+            "segments": [{"start": i * 4.0, "end": i * 4.0 + 3.5, "text": text} for i, text in enumerate(segment_texts)],
+        },
+        "summary_text": "### Summary\nThe nephron filters plasma.",
+    }
+
+
+@pytest.fixture(params=sorted(serializer._SERIALIZERS))
+def serializer_code(request, monkeypatch):
+    monkeypatch.setattr(serializer, "_serializer", request.param)
+    return request.param
+
+
+@pytest.fixture(params=sorted(serializer._COMPRESSIONS))
+def compression_code(request, monkeypatch):
+    monkeypatch.setattr(serializer, "_compression", request.param)
+    return request.param
+
+
+class TestRoundTrip:
+    """Test values survive encoding with every installed format."""
+
+    def test_round_trip(self, serializer_code, compression_code):
+        """Test results, strings and numbers decode unchanged."""
+        for value in [make_result(), "value1", 42, {"nested": [1, 2.5, None, True]}]:
+            assert serializer.loads(serializer.dumps(value)) == value
+
+    def test_tag_records_format(self, serializer_code, compression_code):
+        """Test the tag names the serializer, and the compression only for large values."""
+        small = serializer.dumps("x")
+        large = serializer.dumps(make_result())
+
+        assert small[:3] == serializer.MAGIC + serializer_code + b"n"
+        assert large[:3] == serializer.MAGIC + serializer_code + compression_code
+
+    def test_reads_values_written_with_other_settings(self, monkeypatch):
+        """Test decoding follows the tag, not the current settings."""
+        monkeypatch.setattr(serializer, "_serializer", b"j")
+        monkeypatch.setattr(serializer, "_compression", b"z")
+        data = serializer.dumps(make_result())
+
+        monkeypatch.setattr(serializer, "_serializer", max(serializer._SERIALIZERS))
+        monkeypatch.setattr(serializer, "_compression", b"n")
+
+        assert serializer.loads(data) == make_result()
+
+
+class TestCompression:
+    """Test large values are compressed."""
+
+    def test_transcript_compresses(self):
+        """Test a cached lecture result is several times smaller than its JSON."""
+        result = make_result()
+
+        assert len(serializer.dumps(result)) * 5 < len(json.dumps(result))
+
+    def test_small_values_not_compressed(self):
+        """Test values below the threshold are stored without compression."""
+        assert serializer.dumps({"status": "done"})[2:3] == b"n"
+
+
+class TestLegacyValues:
+    """Test values written before the tag existed."""
+
+    def test_json_text(self):
+        """Test untagged JSON decodes as before."""
+        assert serializer.loads(b'{"task_id": "t1"}') == {"task_id": "t1"}
+        assert serializer.loads('{"task_id": "t1"}') == {"task_id": "t1"}
+
+    def test_plain_string(self):
+        """Test untagged non-JSON strings are returned as strings."""
+        assert serializer.loads(b"value1") == "value1"
+
+    def test_unknown_format(self):
+        """Test tags for formats that are not installed are reported."""
+        with pytest.raises(ValueError, match="Unsupported"):
+            serializer.loads(serializer.MAGIC + b"?n{}")
+
+    def test_corrupt_value(self):
+        """Test truncated compressed values are reported."""
+        data = serializer.dumps(make_result())
+
+        with pytest.raises(ValueError, match="Corrupt"):
+            serializer.loads(data[:-10])
+
+
+class TestHashFields:
+    """Test encoding of task hash fields."""
+
+    def test_short_fields_stay_text(self):
+        """Test short fields remain readable strings in Redis."""
+        assert serializer.encode_hash({"status": "pending", "progress": 5}) == {"status": "pending", "progress": "5"}
+
+    def test_long_fields_compressed(self):
+        """Test long fields are encoded and decode back to text."""
+        transcript = make_result()["transcript"]["text"]
+
+        encoded = serializer.encode_field(transcript)
+
+        assert encoded[:1] == serializer.MAGIC
+        assert len(encoded) < len(transcript)
+        assert serializer.decode_hash({b"transcript_text": encoded, b"status": b"done"}) == {
+            "transcript_text": transcript,
+            "status": "done",
+        }
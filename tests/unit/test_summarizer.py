@@ -1,12 +1,54 @@
 """Unit tests for Ollama summarization service."""
 
+import json
+import asyncio
+import httpx
 import pytest
-import requests
-from unittest.mock import Mock, patch, MagicMock
-from src.api.services import summarizer
+from unittest.mock import AsyncMock, patch
+from src.api.services import summarizer, token_budget
+from src.api.services.ollama_client import OllamaClient
+from src.api.services.ollama_pool import OllamaPool
 from src.utils.errors import ProcessingError, ServiceUnavailableError, ErrorCode
 
 
+class FakeOllama:
+    """Records requests and replies through an httpx mock transport."""
+    
+    def __init__(self, handler):
+        self.requests = []
+        self._handler = handler
+        self.client = OllamaClient(
+            "http://ollama.test",
+            transport=httpx.MockTransport(self._handle),
+        )
+    
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self._handler(request)
+    
+    @property
+    def last_payload(self) -> dict:
+        return json.loads(self.requests[-1].content)
+
+
+@pytest.fixture
+def fake_ollama():
+    """Patch the summarizer to use a client backed by a mock transport."""
+    def install(handler):
+        fake = FakeOllama(handler)
+        patcher = patch.object(summarizer, "get_ollama_pool", return_value=OllamaPool([fake.client]))
+        patcher.start()
+        fakes.append(patcher)
+        return fake
+    
+    fakes = []
+    with patch("src.api.services.ollama_client.asyncio.sleep", new_callable=AsyncMock), \
+            patch.object(token_budget, "_num_ctx_in_use", None):
+        yield install
+    for patcher in fakes:
+        patcher.stop()
+
+
 class TestSummaryGeneration:
     """Test summary generation with Ollama."""
     
@@ -31,17 +73,15 @@ This lecture covered cell biology basics.""",
             "model": "llama3.1:8b"
         }
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_basic(self, mock_post, mock_ollama_response):
+    @pytest.fixture
+    def ok_ollama(self, fake_ollama, mock_ollama_response):
+        """Fake Ollama that always succeeds."""
+        return fake_ollama(lambda request: httpx.Response(200, json=mock_ollama_response))
+    
+    async def test_generate_summary_basic(self, ok_ollama):
         """Test basic summary generation."""
-        # Mock successful API call
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
         text = "This is a lecture about cells. Cells are important."
-        summary = summarizer.generate_summary(text)
+        summary = await summarizer.generate_summary(text)
         
         # Verify summary returned
         assert isinstance(summary, str)
@@ -49,190 +89,188 @@ This lecture covered cell biology basics.""",
         assert "Learning Objectives" in summary
         
         # Verify API was called
-        assert mock_post.called
-        call_kwargs = mock_post.call_args[1]
-        assert "json" in call_kwargs
-        assert call_kwargs["json"]["model"] == "llama3.1:8b"
+        assert len(ok_ollama.requests) == 1
+        assert ok_ollama.requests[0].url.path == "/api/generate"
+        assert ok_ollama.last_payload["model"] == "llama3.1:8b"
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_with_subject(self, mock_post, mock_ollama_response):
+    async def test_generate_summary_with_subject(self, ok_ollama):
         """Test subject-specific summarization."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
         text = "Anatomy lecture content"
-        summary = summarizer.generate_summary(text, subject="anatomy")
+        summary = await summarizer.generate_summary(text, subject="anatomy")
         
         assert summary
         # Verify subject was included in prompt
-        call_kwargs = mock_post.call_args[1]
-        prompt = call_kwargs["json"]["prompt"]
-        assert "anatomy" in prompt.lower()
+        assert "anatomy" in ok_ollama.last_payload["prompt"].lower()
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_custom_ratio(self, mock_post, mock_ollama_response):
+    async def test_generate_summary_custom_ratio(self, ok_ollama):
         """Test summary with custom length ratio."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
         text = "Short lecture content"
-        summary = summarizer.generate_summary(text, ratio=0.3)
+        summary = await summarizer.generate_summary(text, ratio=0.3)
         
         assert summary
         # Verify num_predict was adjusted for ratio
-        call_kwargs = mock_post.call_args[1]
-        options = call_kwargs["json"]["options"]
+        options = ok_ollama.last_payload["options"]
         assert "num_predict" in options
         assert options["num_predict"] > 0
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_ratio_validation(self, mock_post, mock_ollama_response):
+    async def test_generate_summary_ratio_validation(self, ok_ollama):
         """Test invalid ratio is corrected to default."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
         text = "Test content"
         
         # Test ratio > 1.0
-        summary = summarizer.generate_summary(text, ratio=1.5)
+        summary = await summarizer.generate_summary(text, ratio=1.5)
         assert summary  # Should not raise, uses default
         
         # Test ratio < 0.0
-        summary = summarizer.generate_summary(text, ratio=-0.5)
+        summary = await summarizer.generate_summary(text, ratio=-0.5)
         assert summary  # Should not raise, uses default
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_temperature_setting(self, mock_post, mock_ollama_response):
+    async def test_generate_summary_temperature_setting(self, ok_ollama):
         """Test temperature is set for consistent output."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
-        text = "Test content"
-        summarizer.generate_summary(text)
+        await summarizer.generate_summary("Test content")
         
         # Verify low temperature for consistency
-        call_kwargs = mock_post.call_args[1]
-        options = call_kwargs["json"]["options"]
-        assert options["temperature"] == 0.2
-    
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_stream_disabled(self, mock_post, mock_ollama_response):
-        """Test streaming is disabled for batch processing."""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
+        assert ok_ollama.last_payload["options"]["temperature"] == 0.2
+    
+    async def test_generate_summary_stream_enabled(self, ok_ollama):
+        """Test the streaming API is used."""
+        await summarizer.generate_summary("Test content")
         
-        text = "Test content"
-        summarizer.generate_summary(text)
+        # Verify streaming is on
+        assert ok_ollama.last_payload["stream"] is True
+
+
+class TestSummaryStreaming:
+    """Test token streaming and incremental section callbacks."""
+    
+    @staticmethod
+    def ndjson(tokens):
+        lines = [json.dumps({"response": token, "done": False}) for token in tokens]
+        lines.append(json.dumps({"response": "", "done": True}))
+        return "\n".join(lines).encode()
+    
+    async def test_tokens_accumulated(self, fake_ollama):
+        """Test streamed chunks are concatenated and reported."""
+        tokens = ["### Summary\n", "Cells ", "are ", "small."]
+        fake_ollama(lambda request: httpx.Response(200, content=self.ndjson(tokens)))
+        received = []
+        
+        summary = await summarizer.generate_summary("Test content", on_token=received.append)
+        
+        assert summary == "".join(tokens)
+        assert received == tokens
+    
+    async def test_sections_emitted_as_headings_close(self, fake_ollama):
+        """Test each section is emitted once the following heading arrives."""
+        tokens = ["### Learning", " Objectives\nKnow cells\n", "### Core Concepts\n", "Membranes\n"]
+        fake_ollama(lambda request: httpx.Response(200, content=self.ndjson(tokens)))
+        events = []
+        
+        def on_token(token):
+            events.append(("token", token))
+        
+        def on_section(key, content):
+            events.append(("section", key, content))
+        
+        await summarizer.generate_summary("Test content", on_token=on_token, on_section=on_section)
         
-        # Verify streaming is off
-        call_kwargs = mock_post.call_args[1]
-        assert call_kwargs["json"]["stream"] is False
+        assert events.index(("section", "objectives", "Know cells")) == 3
+        assert events[-1] == ("section", "concepts", "Membranes")
+    
+    async def test_stream_error_chunk(self, fake_ollama):
+        """Test an error reported mid-stream fails the summary."""
+        body = json.dumps({"error": "model not found"}).encode()
+        fake_ollama(lambda request: httpx.Response(200, content=body))
+        
+        with pytest.raises(ProcessingError) as exc_info:
+            await summarizer.generate_summary("Test content")
+        
+        assert exc_info.value.error_code == ErrorCode.SUMMARIZATION_FAILED
 
 
 class TestSummaryErrors:
     """Test error handling in summarization."""
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_timeout(self, mock_post):
+    async def test_generate_summary_timeout(self, fake_ollama):
         """Test handling of Ollama timeout."""
-        # Mock timeout
-        mock_post.side_effect = requests.exceptions.Timeout("Request timed out")
+        def handler(request):
+            raise httpx.ReadTimeout("Request timed out", request=request)
+        fake = fake_ollama(handler)
         
         text = "Very long lecture content" * 1000
         
         with pytest.raises(ServiceUnavailableError) as exc_info:
-            summarizer.generate_summary(text)
+            await summarizer.generate_summary(text)
         
         assert exc_info.value.error_code == ErrorCode.OLLAMA_TIMEOUT
         assert "timed out" in exc_info.value.message.lower()
+        assert len(fake.requests) == 3  # Retried before giving up
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_connection_error(self, mock_post):
+    async def test_generate_summary_connection_error(self, fake_ollama):
         """Test handling of Ollama connection error."""
-        # Mock connection error
-        mock_post.side_effect = requests.exceptions.ConnectionError("Connection refused")
-        
-        text = "Test content"
+        def handler(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+        fake_ollama(handler)
         
         with pytest.raises(ServiceUnavailableError) as exc_info:
-            summarizer.generate_summary(text)
+            await summarizer.generate_summary("Test content")
         
         assert exc_info.value.error_code == ErrorCode.OLLAMA_UNAVAILABLE
         assert "Cannot connect" in exc_info.value.message
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_http_error(self, mock_post):
-        """Test handling of HTTP errors from Ollama."""
-        # Mock HTTP error
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Server error")
-        mock_post.return_value = mock_response
+    async def test_generate_summary_recovers_after_retry(self, fake_ollama):
+        """Test a transient connection failure is retried."""
+        attempts = []
         
-        text = "Test content"
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("Connection refused", request=request)
+            return httpx.Response(200, json={"response": "### Summary\nRecovered"})
+        fake_ollama(handler)
+        
+        summary = await summarizer.generate_summary("Test content")
+        
+        assert "Recovered" in summary
+        assert len(attempts) == 2
+    
+    async def test_generate_summary_http_error(self, fake_ollama):
+        """Test handling of HTTP errors from Ollama."""
+        fake = fake_ollama(lambda request: httpx.Response(500, text="Server error"))
         
         with pytest.raises(ServiceUnavailableError) as exc_info:
-            summarizer.generate_summary(text)
+            await summarizer.generate_summary("Test content")
         
         assert exc_info.value.error_code == ErrorCode.OLLAMA_UNAVAILABLE
+        assert exc_info.value.details["status_code"] == 500
+        assert len(fake.requests) == 1  # HTTP errors are not retried
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_invalid_json(self, mock_post):
+    async def test_generate_summary_invalid_json(self, fake_ollama):
         """Test handling of invalid JSON response."""
-        # Mock invalid JSON
-        mock_response = Mock()
-        mock_response.json.side_effect = ValueError("Invalid JSON")
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
-        text = "Test content"
+        fake_ollama(lambda request: httpx.Response(200, text="not json"))
         
         with pytest.raises(ProcessingError) as exc_info:
-            summarizer.generate_summary(text)
+            await summarizer.generate_summary("Test content")
         
         assert exc_info.value.error_code == ErrorCode.SUMMARIZATION_FAILED
-        assert "invalid JSON" in exc_info.value.message.lower()
+        assert "invalid json" in exc_info.value.message.lower()
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_empty_response(self, mock_post):
+    async def test_generate_summary_empty_response(self, fake_ollama):
         """Test handling of empty response from Ollama."""
-        # Mock empty response
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": ""}
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
-        text = "Test content"
+        fake_ollama(lambda request: httpx.Response(200, json={"response": ""}))
         
         with pytest.raises(ProcessingError) as exc_info:
-            summarizer.generate_summary(text)
+            await summarizer.generate_summary("Test content")
         
         assert exc_info.value.error_code == ErrorCode.SUMMARIZATION_FAILED
         assert "empty response" in exc_info.value.message.lower()
     
-    @patch('src.api.services.summarizer.requests.post')
-    def test_generate_summary_whitespace_only_response(self, mock_post):
+    async def test_generate_summary_whitespace_only_response(self, fake_ollama):
         """Test handling of whitespace-only response."""
-        # Mock whitespace response
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": "   \n  \t  "}
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-        
-        text = "Test content"
+        fake_ollama(lambda request: httpx.Response(200, json={"response": "   \n  \t  "}))
         
         with pytest.raises(ProcessingError) as exc_info:
-            summarizer.generate_summary(text)
+            await summarizer.generate_summary("Test content")
         
         assert exc_info.value.error_code == ErrorCode.SUMMARIZATION_FAILED
 
@@ -369,3 +407,300 @@ Summary content"""
         assert sections["terms"] == "Terms content"
         assert sections["procedures"] == "Protocol content"
         assert sections["summary"] == "Summary content"
+
+
+class TestIncrementalParser:
+    """Test the incremental section parser."""
+    
+    SAMPLE = """### Learning Objectives
+Understand basic concepts
+
+### Core Concepts
+Key principles explained
+
+### Summary
+Overall summary content"""
+    
+    def test_char_by_char_matches_batch_parse(self):
+        """Test feeding one character at a time matches a full parse."""
+        parser = summarizer.SummarySectionParser()
+        for char in self.SAMPLE:
+            parser.feed(char)
+        parser.close()
+        
+        assert parser.sections == summarizer.parse_summary_sections(self.SAMPLE)
+    
+    def test_section_held_until_next_heading(self):
+        """Test a section is not emitted while it may still grow."""
+        parser = summarizer.SummarySectionParser()
+        
+        assert parser.feed("### Learning Objectives\nFirst line\n") == []
+        assert parser.feed("Second line\n### Summary\n") == [
+            ("objectives", "First line\nSecond line")
+        ]
+        assert parser.close() == []
+    
+    def test_close_emits_last_section(self):
+        """Test the final section is emitted on close."""
+        parser = summarizer.SummarySectionParser()
+        parser.feed("### Summary\nDone")
+        
+        assert parser.close() == [("summary", "Done")]
+
+
+class TestWindowing:
+    """Test splitting transcripts into context-sized windows."""
+    
+    def test_windows_end_on_segment_boundaries(self):
+        """Test segments are packed whole and in order."""
+        segments = ["one two three", "four five", "six seven eight", "nine"]
+        
+        windows = summarizer.split_into_windows(segments, max_tokens=8)
+        
+        assert windows == ["one two three four five", "six seven eight nine"]
+    
+    def test_oversized_segment_split_on_words(self):
+        """Test a segment longer than the budget is cut on word boundaries."""
+        segment = " ".join(f"w{i}" for i in range(20))
+        
+        windows = summarizer.split_into_windows([segment], max_tokens=8)
+        
+        assert len(windows) > 1
+        assert " ".join(windows) == segment
+        assert all(summarizer.count_tokens(w) <= 8 for w in windows)
+
+
+class TestBudgeting:
+    """Test num_predict and num_ctx are sized from prompt token counts."""
+    
+    @pytest.fixture
+    def ok_ollama(self, fake_ollama):
+        return fake_ollama(lambda request: httpx.Response(200, json={"response": "### Summary\nDone", "done": True}))
+    
+    async def test_short_transcript_gets_small_context(self, ok_ollama):
+        """Test a short transcript requests the smallest context window."""
+        await summarizer.generate_summary("Brief lecture on hand hygiene.")
+        
+        options = ok_ollama.last_payload["options"]
+        assert options["num_ctx"] == token_budget.OLLAMA_MIN_NUM_CTX
+        assert options["num_predict"] == summarizer._MIN_PREDICT
+    
+    async def test_context_fits_prompt_and_output(self, ok_ollama):
+        """Test num_ctx is the smallest size holding the prompt plus num_predict."""
+        text = " ".join(["The nephron filters plasma and reabsorbs sodium."] * 150)
+        
+        await summarizer.generate_summary(text, ratio=0.2)
+        
+        payload = ok_ollama.last_payload
+        options = payload["options"]
+        needed = summarizer._prompt_tokens(payload["system"], payload["prompt"]) + options["num_predict"]
+        assert options["num_ctx"] // 2 < needed <= options["num_ctx"]
+        assert options["num_predict"] == int(summarizer.count_tokens(text) * 0.2) + summarizer._FORMAT_OVERHEAD_TOKENS
+    
+    async def test_context_kept_after_larger_request(self, ok_ollama):
+        """Test a shorter request keeps a larger context already loaded, avoiding a reload."""
+        await summarizer.generate_summary(" ".join(["The nephron filters plasma and reabsorbs sodium."] * 150), ratio=0.2)
+        loaded = ok_ollama.last_payload["options"]["num_ctx"]
+        
+        await summarizer.generate_summary("Brief lecture on hand hygiene.")
+        
+        assert loaded > token_budget.OLLAMA_MIN_NUM_CTX
+        assert ok_ollama.last_payload["options"]["num_ctx"] == loaded
+    
+    def test_num_predict_capped(self):
+        """Test output budgets stay within the minimum and maximum."""
+        assert summarizer._summary_predict(10, 0.15) == summarizer._MIN_PREDICT
+        assert summarizer._summary_predict(100_000, 0.5) == summarizer._MAX_PREDICT
+    
+    async def test_overflow_routes_to_map_reduce(self, fake_ollama):
+        """Test a prompt that would not fit the largest context is split."""
+        fake = fake_ollama(lambda request: httpx.Response(200, json={"response": "### Summary\nDone", "done": True}))
+        text = " ".join(["Cardiac output equals stroke volume times heart rate."] * 1200)
+        
+        await summarizer.generate_summary(text)
+        
+        assert len(fake.requests) > 1
+        for request in fake.requests:
+            payload = json.loads(request.content)
+            options = payload["options"]
+            assert options["num_ctx"] <= summarizer.OLLAMA_NUM_CTX
+            assert summarizer._prompt_tokens(payload["system"], payload["prompt"]) + options["num_predict"] <= options["num_ctx"]
+
+
+class TestCompression:
+    """Test optional extractive compression before summarization."""
+    
+    LECTURE = [
+        "Um, so today we cover the renal system.",
+        "The nephron filters plasma in the glomerulus.",
+        "Uh, the the loop of Henle concentrates urine.",
+        "So again, the nephron filters plasma in the glomerulus.",
+        "Okay, let's take a short break.",
+    ] * 4
+    
+    async def test_compressed_prompt_full_output_budget(self, fake_ollama):
+        """Test fillers and repeats are dropped while num_predict follows the original."""
+        fake = fake_ollama(lambda request: httpx.Response(200, json={"response": "### Summary\nDone", "done": True}))
+        text = " ".join(self.LECTURE)
+        
+        with patch.object(summarizer, "SUMMARY_COMPRESSION_ENABLED", True), \
+                patch.object(summarizer, "SUMMARY_COMPRESSION_RATIO", 0.3):
+            await summarizer.generate_summary(text, ratio=0.5, segments=self.LECTURE)
+        
+        prompt = fake.last_payload["prompt"]
+        assert summarizer.count_tokens(prompt) < summarizer.count_tokens(text) * 0.5
+        assert "Um," not in prompt and "the the" not in prompt
+        assert prompt.count("filters plasma") == 1
+        assert fake.last_payload["options"]["num_predict"] == summarizer._summary_predict(
+            summarizer.count_tokens(text), 0.5
+        )
+    
+    async def test_disabled_by_default(self, fake_ollama):
+        """Test the transcript is sent unchanged unless compression is enabled."""
+        fake = fake_ollama(lambda request: httpx.Response(200, json={"response": "### Summary\nDone", "done": True}))
+        text = " ".join(self.LECTURE)
+        
+        await summarizer.generate_summary(text, segments=self.LECTURE)
+        
+        assert text in fake.last_payload["prompt"]
+
+
+class TestPromptCaching:
+    """Test prompts keep a stable prefix Ollama can reuse between calls."""
+    
+    @pytest.fixture
+    def ok_ollama(self, fake_ollama):
+        return fake_ollama(lambda request: httpx.Response(200, json={"response": "### Summary\nDone", "done": True}))
+    
+    async def test_instructions_sent_as_fixed_system_prompt(self, ok_ollama):
+        """Test the system prompt is identical whatever the transcript or subject."""
+        await summarizer.generate_summary("Cardiology lecture on arrhythmias", subject="cardiology")
+        await summarizer.generate_summary("Pharmacology of beta blockers")
+        
+        systems = {json.loads(r.content)["system"] for r in ok_ollama.requests}
+        assert systems == {summarizer.SUMMARY_SYSTEM_PROMPT}
+        assert "### Learning Objectives" in summarizer.SUMMARY_SYSTEM_PROMPT
+    
+    async def test_prompt_holds_only_variable_content(self, ok_ollama):
+        """Test the user prompt carries the subject and transcript, not the instructions."""
+        await summarizer.generate_summary("Renal physiology lecture", subject="physiology")
+        
+        prompt = ok_ollama.last_payload["prompt"]
+        assert prompt.startswith("Focus on physiology content.")
+        assert prompt.rstrip().endswith("Renal physiology lecture")
+        assert "CogniScribe" not in prompt
+        assert ok_ollama.last_payload["keep_alive"] == "30m"
+    
+    async def test_warm_up_evaluates_system_prompt(self, fake_ollama):
+        """Test warm-up caches the system prompt with the num_ctx the next summary uses."""
+        fake = fake_ollama(lambda request: (
+            httpx.Response(200, json={"models": [{"name": "llama3.1:8b"}]})
+            if request.url.path == "/api/tags"
+            else httpx.Response(200, json={"response": "### Summary\nDone", "done": True})
+        ))
+        
+        with patch("src.api.services.ollama_pool.get_ollama_pool", summarizer.get_ollama_pool):
+            assert await summarizer.warm_up() is True
+        
+        payload = fake.last_payload
+        assert payload["system"] == summarizer.SUMMARY_SYSTEM_PROMPT
+        assert payload["prompt"]
+        assert payload["options"]["num_predict"] == 1
+        
+        await summarizer.generate_summary("Brief lecture on hand hygiene.")
+        assert fake.last_payload["options"]["num_ctx"] == payload["options"]["num_ctx"]
+
+
+class TestMapReduce:
+    """Test map-reduce summarization of long transcripts."""
+    
+    FINAL = "### Summary\nWhole lecture"
+    
+    @pytest.fixture
+    def small_context(self):
+        """Shrink the context so a few hundred words overflow it."""
+        with patch.object(summarizer, "OLLAMA_NUM_CTX", 1000), \
+                patch.object(token_budget, "OLLAMA_NUM_CTX", 1000), \
+                patch.object(summarizer, "SUMMARY_MAP_CONCURRENCY", 2):
+            yield
+    
+    @staticmethod
+    def long_segments(count=6, words=150):
+        return [" ".join(f"s{i}w{j}" for j in range(words)) for i in range(count)]
+    
+    def reply(self, request):
+        payload = json.loads(request.content)
+        if payload["stream"]:
+            return httpx.Response(200, json={"response": self.FINAL, "done": True})
+        part = payload["prompt"].split("Transcript part ")[1].split(":")[0]
+        return httpx.Response(200, json={"response": f"- notes {part}"})
+    
+    async def test_short_transcript_single_call(self, fake_ollama, small_context):
+        """Test transcripts that fit the context use one request."""
+        fake = fake_ollama(self.reply)
+        
+        await summarizer.generate_summary("Short lecture", segments=["Short lecture"])
+        
+        assert len(fake.requests) == 1
+        assert fake.last_payload["options"]["num_ctx"] == 1000
+    
+    async def test_windows_mapped_then_reduced(self, fake_ollama, small_context):
+        """Test each window is summarized and the notes merged in order."""
+        fake = fake_ollama(self.reply)
+        segments = self.long_segments()
+        tokens = []
+        
+        summary = await summarizer.generate_summary(
+            " ".join(segments), segments=segments, on_token=tokens.append
+        )
+        
+        map_payloads = [json.loads(r.content) for r in fake.requests[:-1]]
+        assert len(map_payloads) == 6
+        assert not any(p["stream"] for p in map_payloads)
+        assert fake.last_payload["stream"] is True
+        
+        assert all(p["system"] == summarizer.NOTES_SYSTEM_PROMPT for p in map_payloads)
+        assert fake.last_payload["system"] == summarizer.SUMMARY_SYSTEM_PROMPT
+        reduce_prompt = fake.last_payload["prompt"]
+        positions = [reduce_prompt.index(f"- notes {i}/6") for i in range(1, 7)]
+        assert positions == sorted(positions)
+        assert summary == self.FINAL
+        assert tokens == [self.FINAL]
+        
+        # Partial notes are background work; the streamed merge is interactive
+        waits = fake.client.get_stats()["wait"]
+        assert waits["batch"]["acquired"] == 6
+        assert waits["interactive"]["acquired"] == 1
+    
+    async def test_map_concurrency_bounded(self, fake_ollama, small_context):
+        """Test no more than SUMMARY_MAP_CONCURRENCY windows run at once."""
+        in_flight = []
+        peak = []
+        
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            # asyncio.sleep is patched by the fixture; wait on a timer instead
+            done = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_later(0.01, done.set_result, None)
+            await done
+            in_flight.remove(request)
+            return self.reply(request)
+        fake_ollama(handler)
+        segments = self.long_segments()
+        
+        await summarizer.generate_summary(" ".join(segments), segments=segments)
+        
+        assert max(peak) == 2
+    
+    async def test_map_failure_propagates(self, fake_ollama, small_context):
+        """Test a failing window fails the whole summary."""
+        def handler(request):
+            if "Transcript part 3/" in json.loads(request.content)["prompt"]:
+                return httpx.Response(500, text="Server error")
+            return self.reply(request)
+        fake_ollama(handler)
+        segments = self.long_segments()
+        
+        with pytest.raises(ServiceUnavailableError):
+            await summarizer.generate_summary(" ".join(segments), segments=segments)
@@ -1,5 +1,8 @@
 """Unit tests for background task manager."""
 
+import json
+import os
+import threading
 import pytest
 import asyncio
 from datetime import datetime, timedelta
@@ -38,6 +41,17 @@ class TestTaskCreation:
         assert task.error is None
         assert task.completed_at is None
     
+    def test_task_constructed_with_result(self):
+        """Test a result passed to the constructor is kept."""
+        task = Task(
+            task_id="t1",
+            status=TaskStatus.COMPLETED,
+            progress=TaskProgress(stage=ProcessingStage.COMPLETED),
+            initial_result={"x": 1},
+        )
+        
+        assert task.result == {"x": 1}
+    
     def test_get_nonexistent_task(self):
         """Test retrieving non-existent task."""
         manager = TaskManager()
@@ -387,3 +401,298 @@ class TestTaskStatistics:
         
         assert "retention_hours" in stats
         assert stats["retention_hours"] == manager._task_retention / 3600
+
+
+class TestTaskIndex:
+    """Test incremental status counts, retention expiry and the task limit."""
+    
+    def test_counts_follow_transitions(self):
+        """Test status counts stay correct through every state change."""
+        manager = TaskManager()
+        task_ids = [manager.create_task() for _ in range(4)]
+        manager.update_progress(task_ids[0], ProcessingStage.TRANSCRIBING, 50)
+        manager.update_progress(task_ids[0], ProcessingStage.SUMMARIZING, 75)
+        manager.complete_task(task_ids[0], {})
+        manager.fail_task(task_ids[1], "Error")
+        manager.cancel_task(task_ids[2])
+        manager.update_progress(task_ids[3], ProcessingStage.PREPROCESSING, 25)
+        
+        breakdown = manager.get_stats()["status_breakdown"]
+        
+        assert breakdown == {
+            "pending": 0, "processing": 1, "completed": 1, "failed": 1, "cancelled": 1,
+        }
+        assert sum(breakdown.values()) == len(manager.tasks)
+    
+    def test_limit_enforced_on_create(self):
+        """Test the oldest finished task is evicted whatever its status."""
+        manager = TaskManager()
+        manager._max_tasks = 3
+        failed_id = manager.create_task()
+        manager.fail_task(failed_id, "Error")
+        active_id = manager.create_task()
+        completed_id = manager.create_task()
+        manager.complete_task(completed_id, {})
+        
+        manager.create_task()
+        assert manager.get_task(failed_id) is None
+        manager.create_task()
+        assert manager.get_task(completed_id) is None
+        
+        assert len(manager.tasks) == 3
+        assert manager.get_task(active_id) is not None
+        assert manager.get_stats()["total_tasks"] == 3
+    
+    def test_limit_drops_oldest_active_task_when_none_finished(self):
+        """Test a flood of pending tasks cannot grow past the limit."""
+        manager = TaskManager()
+        manager._max_tasks = 2
+        oldest_id = manager.create_task()
+        queue = manager.subscribe(oldest_id)
+        
+        for _ in range(5):
+            manager.create_task()
+        
+        assert len(manager.tasks) == 2
+        assert manager.get_task(oldest_id) is None
+        assert queue.get_nowait()[0] == "cancelled"
+        assert manager.get_stats()["status_breakdown"]["pending"] == 2
+    
+    def test_failed_tasks_expire_after_finishing(self):
+        """Test failed tasks are kept for a quarter of the retention after failing."""
+        manager = TaskManager()
+        manager._task_retention = 3600
+        old_failure = manager.create_task()
+        recent_failure = manager.create_task()
+        manager.fail_task(old_failure, "Error")
+        manager.fail_task(recent_failure, "Error")
+        manager._failed[old_failure] -= 901
+        
+        removed = manager.cleanup_old_tasks()
+        
+        assert removed == 1
+        assert manager.get_task(old_failure) is None
+        assert manager.get_task(recent_failure) is not None
+        assert manager.get_stats()["status_breakdown"]["failed"] == 1
+    
+    def test_expiry_removes_expired_prefix(self):
+        """Test expiry removes the oldest tasks up to the first live one."""
+        manager = TaskManager()
+        manager._task_retention = 60
+        task_ids = [manager.create_task() for _ in range(1000)]
+        for task_id in task_ids[:10]:
+            manager.get_task(task_id).created_at -= timedelta(seconds=120)
+        
+        removed = manager.cleanup_old_tasks()
+        
+        assert removed == 10
+        assert len(manager.tasks) == 990
+        assert next(iter(manager.tasks)) == task_ids[10]
+
+
+class TestResultBudget:
+    """Test the memory budget for task results."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        manager = TaskManager()
+        manager._result_dir = str(tmp_path)
+        manager._result_memory_budget = 3500
+        return manager
+    
+    def finish(self, manager, size=1000):
+        task_id = manager.create_task()
+        manager.complete_task(task_id, {"success": True, "text": "x" * size})
+        return task_id
+    
+    def test_oldest_results_spilled_past_budget(self, manager, tmp_path):
+        """Test results beyond the budget move to disk, oldest first."""
+        task_ids = [self.finish(manager) for _ in range(5)]
+        
+        spilled = [manager.get_task(t).result_store is not None for t in task_ids]
+        stats = manager.get_stats()
+        
+        assert spilled == [True, True, False, False, False]
+        assert stats["results_spilled"] == 2
+        assert stats["results_in_memory_bytes"] <= 3500
+        assert len(os.listdir(tmp_path)) == 2
+    
+    def test_spilled_result_loads_on_access(self, manager):
+        """Test reading a spilled result rehydrates it transparently."""
+        first = self.finish(manager)
+        for _ in range(4):
+            self.finish(manager)
+        
+        task = manager.get_task(first)
+        
+        assert task.result_store is not None
+        assert task.result == {"success": True, "text": "x" * 1000}
+    
+    def test_removed_tasks_delete_spilled_results(self, manager, tmp_path):
+        """Test expiry and eviction clean up spill files and accounting."""
+        manager._max_tasks = 2
+        for _ in range(5):
+            self.finish(manager)
+        
+        stats = manager.get_stats()
+        
+        assert len(manager.tasks) == 2
+        assert len(os.listdir(tmp_path)) == stats["results_spilled"]
+        assert stats["results_in_memory_bytes"] == sum(manager._result_sizes.values())
+    
+    def test_failed_task_partial_result_counted(self, manager):
+        """Test partial results kept on failure share the budget."""
+        task_id = manager.create_task()
+        manager.fail_task(task_id, "Ollama down", result={"success": False, "transcription": "x" * 5000})
+        
+        assert manager.get_task(task_id).result_store is not None
+        assert manager.get_task(task_id).result["transcription"] == "x" * 5000
+    
+    def test_budget_counts_full_result(self, manager):
+        """Test duplicated transcript text is counted as it is held in memory."""
+        result = {"success": True, "transcription": "x" * 1000, "transcript": {"text": "x" * 1000}}
+        task_id = manager.create_task()
+        manager.complete_task(task_id, result)
+        
+        assert manager.get_stats()["results_in_memory_bytes"] == len(json.dumps(result, separators=(",", ":")))
+    
+    async def test_spill_and_load_off_event_loop(self, manager, monkeypatch):
+        """Test spill writes and reads run on worker threads inside the event loop."""
+        threads = []
+        store_class = type(manager._get_result_store())
+        save, load = store_class.save, store_class.load
+        monkeypatch.setattr(store_class, "save", lambda *args: threads.append(threading.current_thread()) or save(*args))
+        monkeypatch.setattr(store_class, "load", lambda *args: threads.append(threading.current_thread()) or load(*args))
+        
+        first = self.finish(manager)
+        for _ in range(4):
+            self.finish(manager)
+        task = manager.get_task(first)
+        assert task.result_store is None  # Still in memory while it is written
+        while task.result_store is None:
+            await asyncio.sleep(0.01)
+        
+        assert await task.load_result() == {"success": True, "text": "x" * 1000}
+        assert manager.get_stats()["results_in_memory_bytes"] <= 3500
+        assert threads and threading.main_thread() not in threads
+    
+    async def test_removed_while_spilling(self, manager, tmp_path):
+        """Test a task removed before its spill finishes leaves no file or accounting behind."""
+        task_ids = [self.finish(manager) for _ in range(5)]
+        manager._remove(task_ids[0])
+        manager._remove(task_ids[1])
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        
+        assert manager.get_stats()["results_spilled"] == 0
+        assert manager.get_stats()["results_in_memory_bytes"] == sum(manager._result_sizes.values())
+        assert os.listdir(tmp_path) == []
+    
+    def test_spill_failure_keeps_result(self, manager, monkeypatch):
+        """Test results stay in memory if the spill directory is unusable."""
+        manager._result_dir = "/proc/forbidden/results"
+        task_ids = [self.finish(manager) for _ in range(5)]
+        
+        assert all(manager.get_task(t).result == {"success": True, "text": "x" * 1000} for t in task_ids)
+        assert manager.get_stats()["results_spilled"] == 0
+
+
+class TestTaskEvents:
+    """Test streamed summary state and event broadcasting."""
+    
+    async def test_subscriber_receives_progress(self):
+        """Test progress updates are broadcast to subscribers."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        queue = manager.subscribe(task_id)
+        
+        manager.update_progress(task_id, ProcessingStage.SUMMARIZING, 75, "Summarizing")
+        
+        event, data = queue.get_nowait()
+        assert event == "progress"
+        assert data["stage"] == "summarizing"
+        assert data["percent"] == 75
+    
+    async def test_summary_tokens_accumulated(self):
+        """Test streamed tokens and sections are stored on the task."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        
+        manager.append_summary_tokens(task_id, "### Summary\n")
+        manager.append_summary_tokens(task_id, "Cells")
+        manager.set_summary_section(task_id, "summary", "Cells")
+        
+        task = manager.get_task(task_id)
+        assert task.partial_summary == "### Summary\nCells"
+        assert task.partial_sections == {"summary": "Cells"}
+    
+    async def test_complete_clears_partial_summary(self):
+        """Test completion publishes and drops the partial output."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        queue = manager.subscribe(task_id)
+        manager.append_summary_tokens(task_id, "partial")
+        
+        manager.complete_task(task_id, {"summary": "final"})
+        
+        task = manager.get_task(task_id)
+        assert task.partial_summary == ""
+        events = [queue.get_nowait()[0] for _ in range(queue.qsize())]
+        assert events == ["token", "complete"]
+    
+    async def test_slow_subscriber_keeps_terminal_event(self):
+        """Test a full queue drops tokens but never the completion event."""
+        manager = TaskManager()
+        manager._subscriber_queue_size = 2
+        task_id = manager.create_task()
+        queue = manager.subscribe(task_id)
+        
+        for _ in range(5):
+            manager.append_summary_tokens(task_id, "x")
+        manager.complete_task(task_id, {})
+        
+        events = [queue.get_nowait()[0] for _ in range(queue.qsize())]
+        assert events[-1] == "complete"
+    
+    async def test_unsubscribe(self):
+        """Test unsubscribed queues stop receiving events."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        queue = manager.subscribe(task_id)
+        manager.unsubscribe(task_id, queue)
+        
+        manager.update_progress(task_id, ProcessingStage.PREPROCESSING, 25)
+        
+        assert queue.empty()
+    
+    async def test_wait_for_update_wakes_on_progress(self):
+        """Test waiters wake on progress but not on streamed tokens."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        waiter = asyncio.create_task(manager.wait_for_update(task_id, 5))
+        await asyncio.sleep(0)
+        
+        manager.append_summary_tokens(task_id, "x")
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        manager.update_progress(task_id, ProcessingStage.SUMMARIZING, 75)
+        assert await waiter is True
+        assert manager._subscribers == {}
+    
+    async def test_wait_for_update_timeout(self):
+        """Test waiting gives up after the timeout."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        
+        assert await manager.wait_for_update(task_id, 0.01) is False
+        assert manager._subscribers == {}
+    
+    async def test_wait_for_finished_or_missing_task(self):
+        """Test finished and unknown tasks return without waiting."""
+        manager = TaskManager()
+        task_id = manager.create_task()
+        manager.complete_task(task_id, {})
+        
+        assert await asyncio.wait_for(manager.wait_for_update(task_id, 30), timeout=1) is False
+        assert await asyncio.wait_for(manager.wait_for_update("missing", 30), timeout=1) is False
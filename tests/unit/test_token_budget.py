@@ -0,0 +1,103 @@
+"""Unit tests for prompt token counting and context sizing."""
+
+import threading
+import pytest
+from unittest.mock import patch
+from src.api.services import token_budget
+
+
+@pytest.fixture
+def tokenizer_source(tmp_path):
+    """Configure a word-level tokenizer.json and reset the cached tokenizer."""
+    tokenizers = pytest.importorskip("tokenizers")
+    vocab = {"[UNK]": 0, "the": 1, "heart": 2, "pumps": 3, "blood": 4}
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    path = tmp_path / "tokenizer.json"
+    tokenizer.save(str(path))
+
+    def configure(source):
+        return patch.multiple(token_budget, OLLAMA_TOKENIZER=source, _tokenizer=None, _tokenizer_loaded=False)
+
+    return str(path), configure
+
+
+class TestCounting:
+    """Test exact and estimated token counts."""
+
+    def test_counts_with_configured_tokenizer(self, tokenizer_source):
+        """Test counts come from the tokenizer when one is configured."""
+        path, configure = tokenizer_source
+        with configure(path):
+            assert token_budget.is_exact()
+            assert token_budget.count_tokens("the heart pumps blood") == 4
+            assert token_budget.count_tokens("the heart, pumps") == 4
+
+    def test_missing_tokenizer_falls_back_to_estimate(self, tokenizer_source, tmp_path):
+        """Test an unloadable tokenizer is logged and counts are estimated."""
+        _, configure = tokenizer_source
+        with configure(str(tmp_path / "missing" / "tokenizer.json")), \
+                patch.object(token_budget, "_load_tokenizer", side_effect=OSError("not found")):
+            assert not token_budget.is_exact()
+            assert token_budget.count_tokens("the heart pumps blood") == token_budget.estimate_tokens(
+                "the heart pumps blood"
+            )
+
+    async def test_loaded_off_the_event_loop(self, tokenizer_source):
+        """Test load_tokenizer() loads once in a worker thread."""
+        path, configure = tokenizer_source
+        threads = []
+        load = token_budget._load_tokenizer
+
+        def record(source):
+            threads.append(threading.current_thread())
+            return load(source)
+
+        with configure(path), patch.object(token_budget, "_load_tokenizer", side_effect=record):
+            await token_budget.load_tokenizer()
+
+            assert token_budget.is_exact()
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    def test_estimate_errs_high(self):
+        """Test the estimate covers both word-heavy and character-heavy text."""
+        words = " ".join(["a"] * 100)
+        terms = " ".join(["pneumonoultramicroscopicsilicovolcanoconiosis"] * 10)
+
+        assert token_budget.estimate_tokens(words) >= 135
+        assert token_budget.estimate_tokens(terms) >= len(terms) / 4
+
+
+class TestContextSize:
+    """Test context windows are right-sized in powers of two."""
+
+    @pytest.fixture(autouse=True)
+    def limits(self):
+        with patch.multiple(token_budget, OLLAMA_MIN_NUM_CTX=2048, OLLAMA_NUM_CTX=16384, _num_ctx_in_use=None):
+            yield
+
+    @pytest.mark.parametrize("required, expected", [
+        (10, 2048),
+        (2048, 2048),
+        (2049, 4096),
+        (9000, 16384),
+        (50000, 16384),
+    ])
+    def test_smallest_power_of_two(self, required, expected):
+        """Test the smallest size holding the tokens, capped at the maximum."""
+        assert token_budget.context_size(required) == expected
+
+    def test_larger_size_kept(self):
+        """Test once a larger context is used, smaller requests keep it."""
+        token_budget.use_context_size(token_budget.context_size(5000))
+
+        assert token_budget.working_context_size() == 8192
+        assert token_budget.context_size(10) == 8192
+        assert token_budget.context_size(9000) == 16384
+
+    def test_fits_context(self):
+        """Test overflow is checked against the largest context by default."""
+        assert token_budget.fits_context(16384)
+        assert not token_budget.fits_context(16385)
+        assert not token_budget.fits_context(3000, num_ctx=2048)
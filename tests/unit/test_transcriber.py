@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.api.services import transcriber
-from src.utils.errors import ProcessingError, ErrorCode
+from src.utils.errors import ProcessingError, ValidationError, ErrorCode
 
 
 class MockSegment:
@@ -194,6 +194,37 @@ class TestTranscription:
         # Confidence rounded to 3 decimals
         assert result["segments"][0]["confidence"] == -0.456
     
+    def test_on_segment_called_per_segment(self, mock_model, tmp_path):
+        """Test the segment callback sees each segment as it is decoded."""
+        segments = [MockSegment(0.0, 5.0, " Hello world "), MockSegment(5.0, 10.0, "Bye")]
+        mock_model.transcribe.return_value = (iter(segments), MockTranscriptionInfo(duration=10.0))
+        seen = []
+        
+        transcriber.transcribe_audio(str(tmp_path / "test.mp3"), on_segment=seen.append)
+        
+        assert [segment["text"] for segment in seen] == ["Hello world", "Bye"]
+    
+    def test_on_segment_error_stops_transcription(self, mock_model, tmp_path):
+        """Test an error from the callback stops decoding and propagates unchanged."""
+        decoded = []
+        
+        def lazy_segments():
+            for i in range(100):
+                decoded.append(i)
+                yield MockSegment(i, i + 1, f"Segment {i}")
+        
+        def reject(segment):
+            if segment["text"] == "Segment 2":
+                raise ValidationError("PHI detected", ErrorCode.PHI_DETECTED)
+        
+        mock_model.transcribe.return_value = (lazy_segments(), MockTranscriptionInfo(duration=100.0))
+        
+        with pytest.raises(ValidationError) as exc_info:
+            transcriber.transcribe_audio(str(tmp_path / "test.mp3"), on_segment=reject)
+        
+        assert exc_info.value.error_code == ErrorCode.PHI_DETECTED
+        assert decoded == [0, 1, 2]
+    
     def test_transcribe_with_whitespace(self, mock_model, tmp_path):
         """Test handling of segments with extra whitespace."""
         audio_path = str(tmp_path / "test.mp3")
@@ -0,0 +1,102 @@
+"""Unit tests for extractive transcript compression."""
+
+import pytest
+from src.api.services import transcript_compression
+from src.api.services.token_budget import count_tokens
+from src.api.services.transcript_compression import clean_disfluencies, compress_segments
+
+
+LECTURE = [
+    "Um, so today we are going to talk about the cardiac cycle.",
+    "The cardiac cycle has two phases, systole and diastole.",
+    "During systole the ventricles contract and eject blood into the aorta.",
+    "Uh, during diastole the ventricles relax and fill with blood.",
+    "Okay, so, you know, that's the basic idea.",
+    "So again, the ventricles contract during systole and eject blood into the aorta.",
+    "Preload is the end-diastolic volume that stretches the ventricle.",
+    "Afterload is the resistance the ventricle must overcome to eject blood.",
+    "Any questions so far? Okay.",
+    "Cardiac output equals stroke volume times heart rate.",
+    "Stroke volume depends on preload, afterload and contractility.",
+    "Right, let's take a short break.",
+]
+
+
+class TestDisfluencies:
+    """Test filler and repetition removal."""
+
+    @pytest.mark.parametrize("raw, expected", [
+        ("Um, the heart has four chambers.", "The heart has four chambers."),
+        ("The the the mitral valve, uh, closes.", "The mitral valve, closes."),
+        ("The, uh, the aorta is elastic.", "The aorta is elastic."),
+        ("Hmm. Erm, next slide.", "Next slide."),
+    ])
+    def test_fillers_removed(self, raw, expected):
+        """Test hesitations, discourse fillers and stutters are dropped."""
+        assert clean_disfluencies(raw) == expected
+
+    @pytest.mark.parametrize("text", [
+        "The patient had had chest pain for a week.",
+        "He said that that dose was too high.",
+        "The kidney is shaped like, roughly, a bean.",
+        "So, the result is a lower preload.",
+    ])
+    def test_meaningful_words_kept(self, text):
+        """Test grammatical doubles and discourse words are not treated as fillers."""
+        assert clean_disfluencies(text) == text
+
+    def test_clinical_content_kept(self):
+        """Test units and repeated numbers are not mistaken for disfluencies."""
+        text = "Make a 5 mm incision. Pressure was 80, 80 and stable."
+
+        assert clean_disfluencies(text) == text
+
+
+class TestCompression:
+    """Test TextRank sentence selection within a token budget."""
+
+    def test_within_budget_and_in_order(self):
+        """Test the kept sentences fit the budget and keep lecture order."""
+        original = sum(count_tokens(s) for s in LECTURE)
+
+        kept, stats = compress_segments(LECTURE, target_tokens=original // 2)
+
+        assert sum(count_tokens(s) for s in kept) <= original // 2
+        assert stats["compressed_tokens"] <= original // 2
+        positions = [next(i for i, s in enumerate(LECTURE) if sentence in clean_disfluencies(s)) for sentence in kept]
+        assert positions == sorted(positions)
+
+    def test_keeps_content_drops_chatter(self):
+        """Test central clinical sentences win over housekeeping remarks."""
+        original = sum(count_tokens(s) for s in LECTURE)
+
+        kept, _ = compress_segments(LECTURE, target_tokens=int(original * 0.55))
+        text = " ".join(kept)
+
+        assert "systole" in text and "diastole" in text
+        assert "short break" not in text
+        assert "Any questions" not in text
+
+    def test_near_duplicates_removed(self):
+        """Test a restated sentence is not kept twice."""
+        original = sum(count_tokens(s) for s in LECTURE)
+
+        kept, _ = compress_segments(LECTURE, target_tokens=int(original * 0.9))
+        repeats = [s for s in kept if "contract" in s and "aorta" in s]
+
+        assert len(repeats) == 1
+
+    def test_short_transcript_only_cleaned(self):
+        """Test a transcript already within budget is returned in full, minus fillers."""
+        kept, stats = compress_segments(["Um, hello.", "The heart pumps blood."], target_tokens=1000)
+
+        assert kept == ["Hello.", "The heart pumps blood."]
+        assert stats["kept_sentences"] == stats["sentences"] == 2
+
+    def test_without_numpy_only_cleans(self, monkeypatch):
+        """Test compression degrades to filler removal when numpy is missing."""
+        monkeypatch.setattr(transcript_compression, "np", None)
+
+        kept, _ = compress_segments(LECTURE, target_tokens=10)
+
+        assert len(kept) == len(LECTURE) + 1  # "Any questions so far? Okay." is two sentences